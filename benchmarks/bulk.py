@@ -0,0 +1,53 @@
+"""
+Benchmark pentru adăugarea cheltuielilor în bloc.
+
+Rulare din rădăcina proiectului: python -m benchmarks.bulk
+"""
+import random
+import time
+
+from bussines import adauga_cheltuiala, adauga_cheltuieli_bulk
+
+TIPURI = ("apa", "gaz", "lumina")
+
+
+def genereaza_inregistrari(numar, numar_apartamente=None, seed=0):
+    """
+    Generează înregistrări (apartament, tip, suma, zi) reproductibile.
+
+    :param numar: Numărul de înregistrări generate.
+    :param numar_apartamente: Numărul de apartamente distincte (implicit numar // 10).
+    :param seed: Sămânța generatorului aleator.
+    :return: Lista de înregistrări.
+    """
+    rng = random.Random(seed)
+    numar_apartamente = numar_apartamente or max(1, numar // 10)
+    return [(rng.randrange(1, numar_apartamente + 1), rng.choice(TIPURI), round(rng.uniform(1, 500), 2),
+             f"2023-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}") for _ in range(numar)]
+
+
+def masoara_bulk(inregistrari):
+    start = time.perf_counter()
+    adauga_cheltuieli_bulk({}, inregistrari)
+    return time.perf_counter() - start
+
+
+def masoara_individual(inregistrari):
+    start = time.perf_counter()
+    apartamente = {}
+    for apartament, tip, suma, zi in inregistrari:
+        apartamente = adauga_cheltuiala(apartamente, apartament, tip, suma, zi)
+    return time.perf_counter() - start
+
+
+def main(dimensiuni=(10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6), limita_individual=2 * 10 ** 4):
+    print(f"{'inregistrari':>12} | {'bulk (s)':>9} | {'ns/inreg':>9} | {'individual (s)':>14}")
+    for numar in dimensiuni:
+        inregistrari = genereaza_inregistrari(numar)
+        durata_bulk = masoara_bulk(inregistrari)
+        individual = f"{masoara_individual(inregistrari):14.3f}" if numar <= limita_individual else f"{'-':>14}"
+        print(f"{numar:>12} | {durata_bulk:9.3f} | {durata_bulk / numar * 1e9:9.0f} | {individual}")
+
+
+if __name__ == "__main__":
+    main()
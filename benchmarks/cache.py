@@ -0,0 +1,43 @@
+"""
+Rapoarte cerute repetat, cu și fără cache, când o modificare apare la fiecare `la_fiecare` rapoarte.
+
+Rulare din rădăcina proiectului: python -m benchmarks.cache
+"""
+import random
+import time
+
+from benchmarks.bulk import genereaza_inregistrari
+from bussines import (TIPURI_CHELTUIELI, adauga_cheltuieli_bulk, adauga_cheltuiala, afiseaza_cheltuieli_tip,
+                      tipareste_apartamente_sortate_dupa_tip, afiseaza_apartamente_cu_cheltuieli_mai_mari_decat)
+from cache import RegistruCuCache
+from store import ExpenseStore
+
+
+def ruleaza(registru, cereri, la_fiecare):
+    start = time.perf_counter()
+    for numar, (raport, tip) in enumerate(cereri, 1):
+        raport(registru, tip)
+        if numar % la_fiecare == 0:
+            registru = adauga_cheltuiala(registru, 1, "apa", 10, "2023-01-01")
+    afiseaza_apartamente_cu_cheltuieli_mai_mari_decat(registru, 495)
+    return time.perf_counter() - start
+
+
+def main(numar=10 ** 5, numar_cereri=300):
+    generator = random.Random(1)
+    rapoarte = (afiseaza_cheltuieli_tip, tipareste_apartamente_sortate_dupa_tip)
+    cereri = [(generator.choice(rapoarte), generator.choice(TIPURI_CHELTUIELI)) for _ in range(numar_cereri)]
+
+    print(f"{'modificare la':>13} | {'fara cache (ms)':>15} | {'cu cache (ms)':>13} | {'gasite':>6} | {'ratate':>6}")
+    for la_fiecare in (1, 10, 100):
+        fara_cache = ruleaza(adauga_cheltuieli_bulk(ExpenseStore(), genereaza_inregistrari(numar))[0], cereri,
+                             la_fiecare)
+        registru = RegistruCuCache(adauga_cheltuieli_bulk(ExpenseStore(), genereaza_inregistrari(numar))[0])
+        cu_cache = ruleaza(registru, cereri, la_fiecare)
+        statistici = registru.statistici()
+        print(f"{la_fiecare:>13} | {fara_cache * 1e3:15.0f} | {cu_cache * 1e3:13.0f} | {statistici['gasite']:>6} | "
+              f"{statistici['ratate']:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Debitul modului neinteractiv (comenzi.py): comenzi pe secundă pentru un script de sfârșit de lună, format
+mai ales din adăugări, cu câte o corectură și un raport la fiecare sută de linii.
+
+Rulare din rădăcina proiectului: python -m benchmarks.comenzi
+"""
+import io
+import time
+
+from benchmarks.generator import genereaza_registru
+from comenzi import ruleaza_script
+from store import ExpenseStore
+
+FABRICI = {"dict": dict, "store": ExpenseStore}
+
+
+def genereaza_script(numar_apartamente, cheltuieli_pe_apartament=10, seed=0):
+    linii = []
+    for pozitie, (apartament, tip, suma, zi) in enumerate(genereaza_registru(numar_apartamente,
+                                                                              cheltuieli_pe_apartament, seed)):
+        linii.append(f"add {apartament} {tip} {suma} {zi}")
+        if pozitie % 100 == 99:
+            linii.append(f"modify {apartament} {tip} {suma} {suma + 1}")
+            linii.append(f"report total {apartament}")
+    return linii
+
+
+def main(numar_apartamente=10000, repetari=3):
+    linii = genereaza_script(numar_apartamente)
+    print(f"{len(linii)} comenzi")
+    for nume, fabrica in FABRICI.items():
+        durate = []
+        for _ in range(repetari):
+            start = time.perf_counter()
+            _, statistici = ruleaza_script(fabrica(), linii, io.StringIO(), io.StringIO())
+            durate.append(time.perf_counter() - start)
+        assert statistici["erori"] == 0
+        print(f"{nume:>6}: {min(durate) * 1e3:8.1f} ms, {len(linii) / min(durate):10.0f} comenzi/s")
+
+
+if __name__ == "__main__":
+    main()
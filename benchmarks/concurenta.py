@@ -0,0 +1,65 @@
+"""
+Debitul RegistruConcurent după numărul de fire: rapoarte în paralel, cu și fără un fir care modifică registrul.
+
+Rulare din rădăcina proiectului: python -m benchmarks.concurenta
+"""
+import threading
+import time
+
+from benchmarks.bulk import genereaza_inregistrari
+from bussines import adauga_cheltuieli_bulk, adauga_cheltuiala, calculeaza_total_cheltuieli, totaluri_interval
+from concurenta import RegistruConcurent
+from store import ExpenseStore
+
+
+def raport(registru, pas):
+    totaluri_interval(registru, pas % 900, pas % 900 + 100)
+    calculeaza_total_cheltuieli(registru, pas % 1000 + 1)
+
+
+def ruleaza(registru, numar_fire, cu_scriitor, durata=2.0):
+    operatii = [0] * numar_fire
+    scrieri = [0]
+    gata = threading.Event()
+
+    def cititor(fir):
+        pas = fir
+        while not gata.is_set():
+            raport(registru, pas)
+            pas += 1
+            operatii[fir] += 1
+
+    def scriitor():
+        while not gata.is_set():
+            adauga_cheltuiala(registru, scrieri[0] % 1000 + 1, "apa", 10, "2023-01-01")
+            scrieri[0] += 1
+
+    fire = [threading.Thread(target=cititor, args=(fir,)) for fir in range(numar_fire)]
+    if cu_scriitor:
+        fire.append(threading.Thread(target=scriitor))
+    for fir in fire:
+        fir.start()
+    time.sleep(durata)
+    gata.set()
+    for fir in fire:
+        fir.join()
+    return sum(operatii) / durata, scrieri[0] / durata
+
+
+def main(numar=10 ** 5):
+    store, _ = adauga_cheltuieli_bulk(ExpenseStore(), genereaza_inregistrari(numar))
+    start = time.perf_counter()
+    for pas in range(2000):
+        raport(store, pas)
+    print(f"fără blocare, un fir: {2000 / (time.perf_counter() - start):.0f} rapoarte/s")
+
+    registru = RegistruConcurent(store)
+    print(f"{'fire':>4} | {'rapoarte/s':>10} | {'rapoarte/s + scriitor':>21} | {'scrieri/s':>9}")
+    for numar_fire in (1, 2, 4, 8):
+        doar_citiri, _ = ruleaza(registru, numar_fire, False)
+        cu_scrieri, scrieri = ruleaza(registru, numar_fire, True)
+        print(f"{numar_fire:>4} | {doar_citiri:10.0f} | {cu_scrieri:21.0f} | {scrieri:9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Microbenchmark pentru validarea datelor: validarea cu datetime.strptime (folosită înainte de parseaza_data)
+față de parseaza_data.
+
+Rulare din rădăcina proiectului: python -m benchmarks.date
+"""
+import random
+import time
+from datetime import datetime
+
+from bussines import parseaza_data
+
+
+def genereaza_date(numar, seed=0):
+    rng = random.Random(seed)
+    return [f"{rng.randint(2000, 2030)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}" for _ in range(numar)]
+
+
+def valideaza_cu_strptime(zi):
+    return datetime.strptime(zi, "%Y-%m-%d")
+
+
+def debit(functie, date_de_validat):
+    """
+    Măsoară câte date pe secundă validează o funcție.
+
+    :param functie: Funcția de validare, apelată cu un singur argument.
+    :param date_de_validat: Lista de date.
+    :return: Date validate pe secundă.
+    """
+    start = time.perf_counter()
+    for zi in date_de_validat:
+        functie(zi)
+    return len(date_de_validat) / (time.perf_counter() - start)
+
+
+def main(numar=10 ** 6):
+    date_de_validat = genereaza_date(numar)
+    for nume, functie in (("strptime", valideaza_cu_strptime), ("parseaza_data", parseaza_data)):
+        print(f"{nume:>24}: {debit(functie, date_de_validat) / 1e6:6.2f} M date/s")
+
+
+if __name__ == "__main__":
+    main()
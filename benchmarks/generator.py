@@ -0,0 +1,48 @@
+"""
+Generator reproductibil de registre pentru un bloc: N apartamente cu câte M cheltuieli fiecare.
+
+Tipurile nu apar la fel de des (apa este cea mai frecventă), sumele au o distribuție log-normală pe tip, iar
+gazul costă mai mult iarna; datele sunt împrăștiate pe un număr de luni consecutive.
+"""
+import random
+from datetime import date
+
+# Tip -> (pondere în registru, suma mediană, factor de iarnă)
+PROFIL_TIPURI = {
+    "apa": (0.55, 90.0, 1.0),
+    "gaz": (0.30, 150.0, 2.2),
+    "lumina": (0.15, 70.0, 1.3),
+}
+LUNI_IARNA = (1, 2, 12)
+
+
+def genereaza_registru(numar_apartamente, cheltuieli_pe_apartament=10, seed=0, profil=PROFIL_TIPURI,
+                       inceput=date(2023, 1, 1), luni=12):
+    """
+    Generează înregistrările unui registru, în ordinea în care ar fi introduse: lună după lună.
+
+    :param numar_apartamente: Numărul de apartamente (numerotate de la 1).
+    :param cheltuieli_pe_apartament: Câte cheltuieli are fiecare apartament.
+    :param seed: Sămânța generatorului aleator.
+    :param profil: Dicționar tip -> (pondere, suma mediană, factor de iarnă).
+    :param inceput: Prima lună acoperită.
+    :param luni: Numărul de luni peste care sunt împrăștiate datele.
+    :return: Lista de înregistrări (apartament, tip, suma, zi).
+    """
+    rng = random.Random(seed)
+    tipuri = list(profil)
+    ponderi = [profil[tip][0] for tip in tipuri]
+    zile_luni = []
+    for pas in range(luni):
+        an, luna = divmod(inceput.month - 1 + pas, 12)
+        zile_luni.append((inceput.year + an, luna + 1))
+
+    inregistrari = []
+    for apartament in range(1, numar_apartamente + 1):
+        for tip in rng.choices(tipuri, ponderi, k=cheltuieli_pe_apartament):
+            an, luna = rng.choice(zile_luni)
+            _, mediana, iarna = profil[tip]
+            suma = rng.lognormvariate(0, 0.5) * mediana * (iarna if luna in LUNI_IARNA else 1.0)
+            inregistrari.append((apartament, tip, round(suma, 2), f"{an}-{luna:02d}-{rng.randint(1, 28):02d}"))
+    inregistrari.sort(key=lambda inregistrare: inregistrare[3][:7])
+    return inregistrari
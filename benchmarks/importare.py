@@ -0,0 +1,54 @@
+"""
+Debitul importului și exportului în flux (CSV și JSONL), pe un singur nucleu.
+
+Rulare din rădăcina proiectului: python -m benchmarks.importare
+"""
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks.bulk import genereaza_inregistrari
+from import_export import exporta, importa, citeste_randuri, _interpreteaza
+from store import ExpenseStore
+
+
+def doar_interpretare(cale, format_cerut):
+    with open(cale, newline="", encoding="utf-8") as fisier:
+        for _, campuri in citeste_randuri(fisier, format_cerut):
+            _interpreteaza(campuri)
+
+
+def main(numar=10 ** 6):
+    director = tempfile.mkdtemp()
+    try:
+        sursa = {}
+        for apartament, tip, suma, zi in genereaza_inregistrari(numar):
+            sursa.setdefault(apartament, {}).setdefault(tip, []).append((suma, zi))
+
+        print(f"{'format':>6} | {'operatie':>22} | {'randuri/s (k)':>13}")
+        for format_cerut in ("csv", "jsonl"):
+            cale = os.path.join(director, f"citiri.{format_cerut}")
+
+            masuratori = []
+            start = time.perf_counter()
+            exporta(sursa, cale)
+            masuratori.append(("export din dict", time.perf_counter() - start))
+
+            start = time.perf_counter()
+            doar_interpretare(cale, format_cerut)
+            masuratori.append(("citire + interpretare", time.perf_counter() - start))
+
+            for nume, fabrica in (("import in dict", dict), ("import in ExpenseStore", ExpenseStore)):
+                start = time.perf_counter()
+                importa(fabrica(), cale)
+                masuratori.append((nume, time.perf_counter() - start))
+
+            for operatie, durata in masuratori:
+                print(f"{format_cerut:>6} | {operatie:>22} | {numar / durata / 1000:13.0f}")
+    finally:
+        shutil.rmtree(director)
+
+
+if __name__ == "__main__":
+    main()
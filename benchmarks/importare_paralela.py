@@ -0,0 +1,54 @@
+"""
+Scalarea importului paralel (import_export.import_many) cu numărul de procese.
+
+Rulare din rădăcina proiectului: python -m benchmarks.importare_paralela
+"""
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks.bulk import genereaza_inregistrari
+from import_export import import_many, importa
+from store import ExpenseStore
+
+
+def scrie_fisiere(director, numar_fisiere, randuri_pe_fisier):
+    cai = []
+    for numar in range(numar_fisiere):
+        cale = os.path.join(director, f"bloc{numar:03d}.csv")
+        with open(cale, "w", encoding="utf-8") as fisier:
+            fisier.write("apartament,tip,suma,zi\n")
+            for apartament, tip, suma, zi in genereaza_inregistrari(randuri_pe_fisier, seed=numar):
+                fisier.write(f"{numar * 1000 + apartament},{tip},{suma},{zi}\n")
+        cai.append(cale)
+    return cai
+
+
+def main(numar_fisiere=32, randuri_pe_fisier=25000, lucratori=None):
+    lucratori = lucratori or sorted({1, 2, 4, os.cpu_count() or 1})
+    director = tempfile.mkdtemp()
+    try:
+        cai = scrie_fisiere(director, numar_fisiere, randuri_pe_fisier)
+        total = numar_fisiere * randuri_pe_fisier
+
+        start = time.perf_counter()
+        store = ExpenseStore()
+        for cale in cai:
+            store, _ = importa(store, cale)
+        secvential = time.perf_counter() - start
+
+        print(f"{total} rânduri în {numar_fisiere} fișiere, {os.cpu_count()} nuclee disponibile")
+        print(f"{'procese':>8} | {'durata (s)':>10} | {'randuri/s (k)':>13} | {'accelerare':>10}")
+        print(f"{'importa':>8} | {secvential:10.2f} | {total / secvential / 1000:13.0f} | {1:10.2f}")
+        for numar in lucratori:
+            start = time.perf_counter()
+            import_many(ExpenseStore(), cai, lucratori=numar)
+            durata = time.perf_counter() - start
+            print(f"{numar:>8} | {durata:10.2f} | {total / durata / 1000:13.0f} | {secvential / durata:10.2f}")
+    finally:
+        shutil.rmtree(director)
+
+
+if __name__ == "__main__":
+    main()
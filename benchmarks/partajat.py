@@ -0,0 +1,57 @@
+"""
+Rapoarte globale pe registrul partajat în funcție de numărul de partiții, față de un singur ExpenseStore.
+
+Rulare din rădăcina proiectului: python -m benchmarks.partajat
+"""
+import os
+import time
+from contextlib import redirect_stdout
+
+from benchmarks.bulk import genereaza_inregistrari
+from bussines import (TIPURI_CHELTUIELI, adauga_cheltuieli_bulk, afiseaza_apartamente_cu_cheltuieli_mai_mari_decat,
+                      calculeaza_total_cheltuieli, group_by, suma_cheltuieli_tip,
+                      tipareste_apartamente_sortate_dupa_tip)
+from registru_partajat import RegistruPartajat
+from store import ExpenseStore
+
+RAPOARTE = {
+    "suma_tip": lambda registru: [suma_cheltuieli_tip(registru, tip) for tip in TIPURI_CHELTUIELI],
+    "group_by": lambda registru: group_by(registru, "luna", "mean"),
+    "peste_prag": lambda registru: afiseaza_apartamente_cu_cheltuieli_mai_mari_decat(registru, 490),
+    "sortate": lambda registru: tipareste_apartamente_sortate_dupa_tip(registru, "gaz"),
+    "punctuale": lambda registru: [calculeaza_total_cheltuieli(registru, apartament) for apartament in range(1, 201)],
+}
+
+
+def masoara(registru, repetari=3):
+    durate = {}
+    for nume, raport in RAPOARTE.items():
+        start = time.perf_counter()
+        for _ in range(repetari):
+            raport(registru)
+        durate[nume] = (time.perf_counter() - start) / repetari
+    return durate
+
+
+def main(numar=10 ** 6, apartamente=40000, partitii=(1, 2, 4, 8)):
+    inregistrari = genereaza_inregistrari(numar, apartamente)
+    print(f"{numar} cheltuieli pe {apartamente} apartamente, {os.cpu_count()} nuclee disponibile")
+    print(f"{'partitii':>8} | " + " | ".join(f"{nume + ' (ms)':>16}" for nume in RAPOARTE))
+
+    with open(os.devnull, "w") as nul, redirect_stdout(nul):
+        store, _ = adauga_cheltuieli_bulk(ExpenseStore(), inregistrari)
+        durate = masoara(store)
+    print(f"{'store':>8} | " + " | ".join(f"{durate[nume] * 1e3:16.1f}" for nume in RAPOARTE))
+
+    for numar_partitii in partitii:
+        registru = RegistruPartajat(numar_partitii, apartament_maxim=apartamente)
+        try:
+            adauga_cheltuieli_bulk(registru, inregistrari)
+            durate = masoara(registru)
+        finally:
+            registru.inchide()
+        print(f"{numar_partitii:>8} | " + " | ".join(f"{durate[nume] * 1e3:16.1f}" for nume in RAPOARTE))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Timpul de pornire al registrului salvat pe disc, în funcție de mărimea lui: reaplicarea întregului jurnal
+față de încărcarea snapshot-ului plus reaplicarea unei cozi scurte de jurnal, și timpul până la primul raport
+peste snapshot-ul mapat în memorie (fără refacerea depozitului).
+
+Rulare din rădăcina proiectului: python -m benchmarks.pornire
+"""
+import shutil
+import tempfile
+import time
+
+from benchmarks.bulk import genereaza_inregistrari
+from persistenta import RegistruPersistent, SnapshotMapat
+
+
+def cronometreaza_deschiderea(director):
+    start = time.perf_counter()
+    registru = RegistruPersistent.deschide(director)
+    durata = time.perf_counter() - start
+    registru.inchide()
+    return durata
+
+
+def cronometreaza_raportul(director):
+    start = time.perf_counter()
+    vedere = SnapshotMapat.deschide(director)
+    vedere.suma_cheltuieli_tip("apa")
+    vedere.calculeaza_total_cheltuieli(1)
+    durata = time.perf_counter() - start
+    vedere.inchide()
+    return durata
+
+
+def main(dimensiuni=(10 ** 4, 10 ** 5, 10 ** 6), lot_import=10 ** 4, coada=1000):
+    print(f"{'inregistrari':>12} | {'doar jurnal (s)':>15} | {'snapshot (s)':>12} | {'snapshot + coada (s)':>20} | "
+          f"{'raport mmap (ms)':>16}")
+    for numar in dimensiuni:
+        director = tempfile.mkdtemp()
+        try:
+            registru = RegistruPersistent.deschide(director, snapshot_la=float("inf"))
+            inregistrari = genereaza_inregistrari(numar)
+            for start in range(0, numar, lot_import):
+                registru.adauga_cheltuieli_bulk(inregistrari[start:start + lot_import])
+            registru.inchide()
+            doar_jurnal = cronometreaza_deschiderea(director)
+
+            registru = RegistruPersistent.deschide(director, snapshot_la=float("inf"))
+            registru.snapshot()
+            registru.inchide()
+            doar_snapshot = cronometreaza_deschiderea(director)
+
+            registru = RegistruPersistent.deschide(director, snapshot_la=float("inf"))
+            for apartament, tip, suma, zi in inregistrari[:coada]:
+                registru.adauga_cheltuiala(apartament, tip, suma, zi)
+            registru.inchide()
+            cu_coada = cronometreaza_deschiderea(director)
+            raport = cronometreaza_raportul(director) * 1000
+
+            print(f"{numar:>12} | {doar_jurnal:15.3f} | {doar_snapshot:12.3f} | {cu_coada:20.3f} | {raport:16.1f}")
+        finally:
+            shutil.rmtree(director)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Generator de încărcare pentru serviciu.py: mai mulți clienți cu conexiuni păstrate deschise trimit un amestec
+de adăugări și rapoarte; se raportează latența p50/p99 și numărul de cereri pe secundă.
+
+Rulare din rădăcina proiectului: python -m benchmarks.serviciu [--port P] [--conexiuni N] [--cereri M]
+Fără --port, serviciul este pornit într-un proces separat, peste un ExpenseStore cu `--randuri` cheltuieli.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import random
+import time
+
+from benchmarks.bulk import genereaza_inregistrari
+from bussines import TIPURI_CHELTUIELI, adauga_cheltuieli_bulk
+from serviciu import Client, serveste
+from store import ExpenseStore
+
+
+def ruleaza_serviciu(port, randuri):
+    registru, _ = adauga_cheltuieli_bulk(ExpenseStore(), genereaza_inregistrari(randuri))
+    asyncio.run(serveste(registru, port=port))
+
+
+def cerere_aleatoare(generator, procent_scrieri):
+    if generator.random() < procent_scrieri:
+        return "POST", "/adauga_cheltuiala", {"apartament": generator.randint(1, 1000),
+                                              "tip": generator.choice(TIPURI_CHELTUIELI),
+                                              "suma": generator.randint(1, 500), "zi": "2023-10-30"}
+    apartament = generator.randint(1, 990)
+    return "GET", generator.choice([
+        f"/calculeaza_total_cheltuieli?apartament={apartament}",
+        f"/totaluri_interval?apartament_start={apartament}&apartament_end={apartament + 10}",
+        f"/suma_cheltuieli_tip?tip={generator.choice(TIPURI_CHELTUIELI)}",
+    ]), None
+
+
+async def client(port, numar_cereri, procent_scrieri, seed, latente):
+    generator = random.Random(seed)
+    conexiune = await Client.conecteaza("127.0.0.1", port)
+    try:
+        for _ in range(numar_cereri):
+            metoda, cale, date = cerere_aleatoare(generator, procent_scrieri)
+            start = time.perf_counter()
+            stare, _ = await conexiune.cere(metoda, cale, date)
+            latente.append(time.perf_counter() - start)
+            assert stare == 200, (cale, stare)
+    finally:
+        await conexiune.inchide()
+
+
+async def genereaza_incarcare(port, conexiuni, cereri, procent_scrieri):
+    latente = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, cereri // conexiuni, procent_scrieri, seed, latente)
+                           for seed in range(conexiuni)))
+    return latente, time.perf_counter() - start
+
+
+async def asteapta_serviciul(port, secunde=60):
+    limita = time.perf_counter() + secunde
+    while True:
+        try:
+            conexiune = await Client.conecteaza("127.0.0.1", port)
+        except OSError:
+            if time.perf_counter() > limita:
+                raise
+            await asyncio.sleep(0.1)
+            continue
+        await conexiune.inchide()
+        return
+
+
+def percentila(valori, procent):
+    return valori[min(len(valori) - 1, int(len(valori) * procent / 100))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, help="Portul unui serviciu deja pornit.")
+    parser.add_argument("--conexiuni", type=int, default=32)
+    parser.add_argument("--cereri", type=int, default=20000)
+    parser.add_argument("--scrieri", type=float, default=0.2, help="Fracțiunea de cereri care adaugă cheltuieli.")
+    parser.add_argument("--randuri", type=int, default=10 ** 5)
+    argumente = parser.parse_args(argv)
+
+    proces = None
+    port = argumente.port
+    if port is None:
+        port = 8765
+        proces = multiprocessing.Process(target=ruleaza_serviciu, args=(port, argumente.randuri), daemon=True)
+        proces.start()
+    try:
+        asyncio.run(asteapta_serviciul(port))
+        latente, durata = asyncio.run(genereaza_incarcare(port, argumente.conexiuni, argumente.cereri,
+                                                          argumente.scrieri))
+    finally:
+        if proces is not None:
+            proces.terminate()
+            proces.join()
+
+    latente.sort()
+    print(f"{len(latente)} cereri, {argumente.conexiuni} conexiuni, {argumente.scrieri:.0%} scrieri")
+    print(f"{'cereri/s':>9} | {'p50 (ms)':>8} | {'p99 (ms)':>8}")
+    print(f"{len(latente) / durata:9.0f} | {percentila(latente, 50) * 1e3:8.2f} | {percentila(latente, 99) * 1e3:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Listarea sortată și interogările după prag: sortare la fiecare apel (dicționar) față de indexul pe sume.
+
+Rulare din rădăcina proiectului: python -m benchmarks.sortare
+"""
+import contextlib
+import io
+import time
+
+from benchmarks.bulk import genereaza_inregistrari
+from bussines import (TIPURI_CHELTUIELI, adauga_cheltuieli_bulk, tipareste_apartamente_sortate_dupa_tip,
+                      afiseaza_apartamente_cu_cheltuieli_mai_mari_decat, afiseaza_cheltuieli_inainte_de_o_zi,
+                      elimina_cheltuieli_mai_mici_decat)
+from store import ExpenseStore
+
+
+def cronometreaza(functie, *args):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        functie(*args)
+    return time.perf_counter() - start
+
+
+def main(dimensiuni=(10 ** 5, 10 ** 6)):
+    print(f"{'inregistrari':>12} | {'layout':>12} | {'sortate (ms)':>12} | {'> 495 (ms)':>10} | "
+          f"{'elimina < 5 (ms)':>16}")
+    for numar in dimensiuni:
+        inregistrari = genereaza_inregistrari(numar)
+        for nume, fabrica in (("dict", dict), ("ExpenseStore", ExpenseStore)):
+            registru, _ = adauga_cheltuieli_bulk(fabrica(), inregistrari)
+            # Primele apeluri pun în ordine rândurile adunate la import; se măsoară apelurile următoare
+            with contextlib.redirect_stdout(io.StringIO()):
+                for tip in TIPURI_CHELTUIELI:
+                    tipareste_apartamente_sortate_dupa_tip(registru, tip)
+                afiseaza_cheltuieli_inainte_de_o_zi(registru, 0, "2000-01-01")
+            sortate = cronometreaza(tipareste_apartamente_sortate_dupa_tip, registru, "gaz")
+            prag = cronometreaza(afiseaza_apartamente_cu_cheltuieli_mai_mari_decat, registru, 495)
+            elimina = cronometreaza(elimina_cheltuieli_mai_mici_decat, registru, 5)
+            print(f"{numar:>12} | {nume:>12} | {sortate * 1e3:12.1f} | {prag * 1e3:10.1f} | {elimina * 1e3:16.1f}")
+
+
+if __name__ == "__main__":
+    main()
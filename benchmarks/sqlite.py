@@ -0,0 +1,59 @@
+"""
+Debitul registrului SQLite comparat cu dicționarul clasic și cu ExpenseStore.
+
+Rulare din rădăcina proiectului: python -m benchmarks.sqlite
+"""
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks.bulk import genereaza_inregistrari
+from bussines import (adauga_cheltuieli_bulk, suma_cheltuieli_tip, calculeaza_total_cheltuieli,
+                      afiseaza_apartamente_cu_cheltuieli_mai_mari_decat, tipareste_apartamente_sortate_dupa_tip,
+                      sterge_apartamente_consecutive)
+from sqlite_store import SqliteStore
+from store import ExpenseStore
+
+
+def cronometreaza(functie, *args, repetari=3):
+    start = time.perf_counter()
+    for _ in range(repetari):
+        functie(*args)
+    return (time.perf_counter() - start) / repetari
+
+
+def main(dimensiuni=(10 ** 4, 10 ** 5, 10 ** 6)):
+    print(f"{'inregistrari':>12} | {'registru':>14} | {'inserare (k/s)':>14} | {'suma tip (ms)':>13} | "
+          f"{'total ap. (us)':>14} | {'peste prag (ms)':>15} | {'sortate (ms)':>12} | {'sterge interval (ms)':>20}")
+    director = tempfile.mkdtemp()
+    try:
+        for numar in dimensiuni:
+            inregistrari = genereaza_inregistrari(numar)
+            prag = 495
+            fabrici = (("dict", dict), ("ExpenseStore", ExpenseStore), ("SQLite memorie", SqliteStore),
+                       ("SQLite disc", lambda: SqliteStore(os.path.join(director, f"{numar}.sqlite"))))
+            for nume, fabrica in fabrici:
+                start = time.perf_counter()
+                registru, _ = adauga_cheltuieli_bulk(fabrica(), inregistrari)
+                inserare = numar / (time.perf_counter() - start) / 1000
+
+                suma = cronometreaza(suma_cheltuieli_tip, registru, "apa")
+                total = cronometreaza(calculeaza_total_cheltuieli, registru, 1, repetari=1000)
+                peste_prag = cronometreaza(afiseaza_apartamente_cu_cheltuieli_mai_mari_decat, registru, prag)
+                sortate = cronometreaza(tipareste_apartamente_sortate_dupa_tip, registru, "gaz")
+
+                start = time.perf_counter()
+                sterge_apartamente_consecutive(registru, 1, max(1, numar // 100))
+                sterge = time.perf_counter() - start
+
+                print(f"{numar:>12} | {nume:>14} | {inserare:14.0f} | {suma * 1e3:13.2f} | {total * 1e6:14.2f} | "
+                      f"{peste_prag * 1e3:15.2f} | {sortate * 1e3:12.2f} | {sterge * 1e3:20.2f}")
+                if isinstance(registru, SqliteStore):
+                    registru.inchide()
+    finally:
+        shutil.rmtree(director)
+
+
+if __name__ == "__main__":
+    main()
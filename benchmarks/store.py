@@ -0,0 +1,53 @@
+"""
+Comparație memorie/viteză între dicționarul clasic și ExpenseStore.
+
+Rulare din rădăcina proiectului: python -m benchmarks.store
+"""
+import time
+import tracemalloc
+
+from benchmarks.bulk import genereaza_inregistrari
+from bussines import adauga_cheltuieli_bulk, suma_cheltuieli_tip, calculeaza_total_cheltuieli, group_by
+from store import ExpenseStore
+
+
+def construieste(fabrica, inregistrari):
+    """
+    Construiește un registru și măsoară memoria ocupată și timpul de construcție.
+
+    :param fabrica: Funcție fără argumente care întoarce un registru gol.
+    :param inregistrari: Înregistrările de inserat.
+    :return: Tuplu (registru, octeți alocați, secunde).
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    registru, _ = adauga_cheltuieli_bulk(fabrica(), inregistrari)
+    durata = time.perf_counter() - start
+    memorie, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return registru, memorie, durata
+
+
+def cronometreaza(functie, *args, repetari=5):
+    start = time.perf_counter()
+    for _ in range(repetari):
+        functie(*args)
+    return (time.perf_counter() - start) / repetari
+
+
+def main(dimensiuni=(10 ** 4, 10 ** 5)):
+    print(f"{'inregistrari':>12} | {'layout':>12} | {'MiB':>8} | {'constr. (s)':>11} | {'suma tip (ms)':>13} | "
+          f"{'total ap. (us)':>14} | {'pe luna (ms)':>12}")
+    for numar in dimensiuni:
+        inregistrari = genereaza_inregistrari(numar)
+        for nume, fabrica in (("dict", dict), ("ExpenseStore", ExpenseStore)):
+            registru, memorie, durata = construieste(fabrica, inregistrari)
+            suma = cronometreaza(suma_cheltuieli_tip, registru, "apa")
+            total = cronometreaza(calculeaza_total_cheltuieli, registru, 1, repetari=1000)
+            pe_luna = cronometreaza(group_by, registru, "luna")
+            print(f"{numar:>12} | {nume:>12} | {memorie / 2 ** 20:8.1f} | {durata:11.3f} | {suma * 1e3:13.2f} | "
+                  f"{total * 1e6:14.2f} | {pe_luna * 1e3:12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+Suita de benchmark-uri: cronometrează fiecare funcție publică din bussines.py pe registre generate
+(benchmarks.generator) de 10^3–10^6 cheltuieli, pentru fiecare registru ales, și scrie rezultatele în JSON.
+
+Rulare din rădăcina proiectului:
+    python -m benchmarks.suita [--scari 1000 10000] [--backend dict store] [--iesire rezultate.json]
+    python -m benchmarks.suita --compara vechi.json nou.json [--prag 0.2]
+
+Modul de comparare afișează raportul timpilor pentru fiecare (operație, registru, scară) și se termină cu
+codul 1 dacă vreo operație a devenit mai lentă decât permite pragul.
+"""
+import argparse
+import gc
+import itertools
+import json
+import platform
+import statistics
+import sys
+import time
+from collections import deque
+from datetime import datetime
+
+import bussines
+from benchmarks.generator import genereaza_registru
+from sqlite_store import SqliteStore
+from store import ExpenseStore
+
+FABRICI = {"dict": dict, "store": ExpenseStore, "sqlite": SqliteStore}
+CHELTUIELI_PE_APARTAMENT = 10
+TIMP_ESANTION = 0.05
+
+
+class Context:
+    """
+    Argumentele operațiilor pentru un registru generat: un apartament din mijloc, praguri de sumă alese din
+    distribuția sumelor și o cheltuială existentă pe care modificările o comută între două valori.
+    """
+
+    def __init__(self, inregistrari, numar_apartamente):
+        self.inregistrari = inregistrari
+        self.numar_apartamente = numar_apartamente
+        self.apartament = numar_apartamente // 2 + 1
+        sume = sorted(suma for _, _, suma, _ in inregistrari)
+        self.mediana = sume[len(sume) // 2]
+        self.prag_90 = sume[len(sume) * 9 // 10]
+        self.prag_99 = sume[len(sume) * 99 // 100]
+        self.zi = sorted(zi for _, _, _, zi in inregistrari)[len(inregistrari) // 2]
+        self.cheltuiala = next(inregistrare for inregistrare in inregistrari if inregistrare[0] == self.apartament)
+        self.corecturi = inregistrari[:100]
+        self.noi = [(numar_apartamente + 1 + pozitie % 100, tip, suma, zi)
+                    for pozitie, (_, tip, suma, zi) in enumerate(inregistrari[:1000])]
+
+    def comutare_suma(self):
+        apartament, tip, suma, _ = self.cheltuiala
+        return itertools.cycle([(apartament, tip, suma, suma + 0.5), (apartament, tip, suma + 0.5, suma)])
+
+    def comutare_corecturi(self):
+        inainte = [(apartament, tip, suma, suma + 0.5) for apartament, tip, suma, _ in self.corecturi]
+        inapoi = [(apartament, tip, suma_noua, suma) for apartament, tip, suma, suma_noua in reversed(inainte)]
+        return itertools.cycle([inainte, inapoi])
+
+
+def _modifica_cheltuiala(context):
+    comutare = context.comutare_suma()
+    return lambda registru: bussines.modifica_cheltuiala(registru, *next(comutare))
+
+
+def _modifica_cheltuieli(context):
+    comutare = context.comutare_corecturi()
+    return lambda registru: bussines.modifica_cheltuieli(registru, next(comutare))
+
+
+# Operație -> (distructivă, funcție care primește contextul și întoarce apelul de cronometrat). O operație
+# distructivă schimbă registrul prea mult ca să fie repetată, așa că fiecare eșantion pornește de la un
+# registru reconstruit și conține un singur apel.
+OPERATII = {
+    "adauga_cheltuiala": (False, lambda c: lambda r: bussines.adauga_cheltuiala(r, c.apartament, "apa", 12.5,
+                                                                                c.zi)),
+    "adauga_cheltuieli_bulk": (True, lambda c: lambda r: bussines.adauga_cheltuieli_bulk(r, c.noi)),
+    "itereaza_cheltuieli": (False, lambda c: lambda r: deque(bussines.itereaza_cheltuieli(r), maxlen=0)),
+    "modifica_cheltuiala": (False, _modifica_cheltuiala),
+    "modifica_cheltuieli": (False, _modifica_cheltuieli),
+    "sterge_apartament": (True, lambda c: lambda r: bussines.sterge_apartament(r, c.apartament)),
+    "sterge_apartamente_consecutive": (True, lambda c: lambda r: bussines.sterge_apartamente_consecutive(
+        r, c.apartament, c.apartament + c.numar_apartamente // 10)),
+    "sterge_cheltuieli_tip": (True, lambda c: lambda r: bussines.sterge_cheltuieli_tip(r, "gaz")),
+    "elimina_cheltuiala": (True, lambda c: lambda r: bussines.elimina_cheltuiala(r, "lumina")),
+    "elimina_cheltuieli_mai_mici_decat": (True, lambda c: lambda r: bussines.elimina_cheltuieli_mai_mici_decat(
+        r, c.mediana)),
+    "afiseaza_apartamente_cu_cheltuieli_mai_mari_decat": (False, lambda c: lambda r: (
+        bussines.afiseaza_apartamente_cu_cheltuieli_mai_mari_decat(r, c.prag_99))),
+    "afiseaza_cheltuieli_tip": (False, lambda c: lambda r: bussines.afiseaza_cheltuieli_tip(r, "lumina")),
+    "afiseaza_cheltuieli_inainte_de_o_zi": (False, lambda c: lambda r: (
+        bussines.afiseaza_cheltuieli_inainte_de_o_zi(r, c.prag_90, c.zi))),
+    "cheltuieli_mai_mari_decat": (False, lambda c: lambda r: deque(bussines.cheltuieli_mai_mari_decat(
+        r, c.prag_99), maxlen=0)),
+    "cheltuieli_de_tip": (False, lambda c: lambda r: deque(bussines.cheltuieli_de_tip(r, "lumina"), maxlen=0)),
+    "cheltuieli_inainte_de_o_zi": (False, lambda c: lambda r: deque(bussines.cheltuieli_inainte_de_o_zi(
+        r, c.prag_90, c.zi), maxlen=0)),
+    "pagina_raport": (False, lambda c: lambda r: bussines.pagina_raport(r, bussines.cheltuieli_de_tip, "lumina",
+                                                                        limita=100, cursor=(c.apartament, 0))),
+    "tipareste_apartamente_sortate_dupa_tip": (False, lambda c: lambda r: (
+        bussines.tipareste_apartamente_sortate_dupa_tip(r, "gaz"))),
+    "suma_cheltuieli_tip": (False, lambda c: lambda r: bussines.suma_cheltuieli_tip(r, "apa")),
+    "calculeaza_total_cheltuieli": (False, lambda c: lambda r: bussines.calculeaza_total_cheltuieli(
+        r, c.apartament)),
+    "totaluri_interval": (False, lambda c: lambda r: bussines.totaluri_interval(
+        r, c.apartament, c.apartament + c.numar_apartamente // 10)),
+    "totaluri_perioada": (False, lambda c: lambda r: bussines.totaluri_perioada(
+        r, c.apartament, c.apartament + c.numar_apartamente // 10, c.zi[:7], c.zi[:7], "gaz")),
+    "totaluri_pe_perioade": (False, lambda c: lambda r: bussines.totaluri_pe_perioade(
+        r, c.apartament, c.apartament, tip="apa", pas="an")),
+    "top_k": (False, lambda c: lambda r: bussines.top_k(r, "gaz", None, 10)),
+    "top_k_apartament": (False, lambda c: lambda r: bussines.top_k(r, None, c.apartament, 3)),
+    "group_by": (False, lambda c: lambda r: bussines.group_by(r, "luna", "mean")),
+}
+
+
+def construieste(backend, inregistrari):
+    registru, _ = bussines.adauga_cheltuieli_bulk(FABRICI[backend](), inregistrari)
+    return registru
+
+
+def _cronometreaza(apel, registru, numar):
+    gc.collect()
+    gc.disable()  # Ca timeit: colectorul nu rulează în interiorul eșantionului
+    try:
+        start = time.perf_counter()
+        for _ in range(numar):
+            apel(registru)
+        return time.perf_counter() - start
+    finally:
+        gc.enable()
+
+
+def masoara(backend, context, nume, repetari):
+    """
+    Cronometrează o operație.
+
+    :return: Tuplu (durate pe apel ale eșantioanelor, numărul de apeluri dintr-un eșantion).
+    """
+    distructiva, pregateste = OPERATII[nume]
+    apel = pregateste(context)
+    if distructiva:
+        durate = []
+        for _ in range(repetari):
+            registru = construieste(backend, context.inregistrari)
+            durate.append(_cronometreaza(apel, registru, 1))
+        return durate, 1
+
+    registru = construieste(backend, context.inregistrari)
+    estimare = _cronometreaza(apel, registru, 1)
+    numar = max(1, min(1000, int(TIMP_ESANTION / max(estimare, 1e-9))))
+    return [_cronometreaza(apel, registru, numar) / numar for _ in range(repetari)], numar
+
+
+def ruleaza(scari, backenduri, operatii, repetari, seed):
+    rezultate = []
+    print(f"{'operatie':>50} | {'backend':>7} | {'randuri':>8} | {'min (ms)':>10} | {'mediana (ms)':>12}")
+    for randuri in scari:
+        numar_apartamente = max(1, randuri // CHELTUIELI_PE_APARTAMENT)
+        context = Context(genereaza_registru(numar_apartamente, CHELTUIELI_PE_APARTAMENT, seed), numar_apartamente)
+        for backend in backenduri:
+            for nume in operatii:
+                durate, apeluri = masoara(backend, context, nume, repetari)
+                rezultate.append({"operatie": nume, "backend": backend, "randuri": len(context.inregistrari),
+                                  "min_s": min(durate), "mediana_s": statistics.median(durate),
+                                  "apeluri": apeluri, "esantioane": len(durate)})
+                print(f"{nume:>50} | {backend:>7} | {len(context.inregistrari):>8} | {min(durate) * 1e3:10.3f} | "
+                      f"{statistics.median(durate) * 1e3:12.3f}")
+    return rezultate
+
+
+def _cheie(rezultat):
+    return rezultat["operatie"], rezultat["backend"], rezultat["randuri"]
+
+
+def compara(vechi, nou, prag):
+    """
+    Compară două rulări după timpul minim al fiecărei operații.
+
+    :param vechi: Rezultatele rulării de referință (conținutul fișierului JSON).
+    :param nou: Rezultatele rulării noi.
+    :param prag: Creșterea relativă tolerată (0.2 înseamnă cu 20% mai lent).
+    :return: Lista de tupluri (operație, backend, rânduri, raport nou/vechi, stare), stare fiind 'regresie',
+        'mai rapid' sau ''.
+    """
+    referinta = {_cheie(rezultat): rezultat for rezultat in vechi["rezultate"]}
+    comparatii = []
+    for rezultat in nou["rezultate"]:
+        anterior = referinta.get(_cheie(rezultat))
+        if anterior is None:
+            continue
+        raport = rezultat["min_s"] / anterior["min_s"] if anterior["min_s"] else float("inf")
+        stare = "regresie" if raport > 1 + prag else "mai rapid" if raport < 1 / (1 + prag) else ""
+        comparatii.append(_cheie(rezultat) + (raport, stare))
+    return comparatii
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scari", type=int, nargs="+", default=[10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6],
+                        help="Numărul de cheltuieli al registrelor generate.")
+    parser.add_argument("--backend", nargs="+", choices=tuple(FABRICI), default=["dict", "store"])
+    parser.add_argument("--operatii", nargs="+", choices=tuple(OPERATII), default=list(OPERATII))
+    parser.add_argument("--repetari", type=int, default=5, help="Numărul de eșantioane pe operație.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--iesire", default="rezultate_benchmark.json", help="Fișierul JSON cu rezultatele.")
+    parser.add_argument("--compara", nargs=2, metavar=("VECHI", "NOU"), help="Compară două fișiere de rezultate.")
+    parser.add_argument("--prag", type=float, default=0.2, help="Încetinirea relativă tolerată la comparare.")
+    argumente = parser.parse_args(argv)
+
+    if argumente.compara:
+        fisiere = []
+        for cale in argumente.compara:
+            with open(cale, encoding="utf-8") as fisier:
+                fisiere.append(json.load(fisier))
+        comparatii = compara(*fisiere, argumente.prag)
+        print(f"{'operatie':>50} | {'backend':>7} | {'randuri':>8} | {'nou/vechi':>9} | stare")
+        for nume, backend, randuri, raport, stare in comparatii:
+            print(f"{nume:>50} | {backend:>7} | {randuri:>8} | {raport:9.2f} | {stare}")
+        regresii = sum(stare == "regresie" for *_, stare in comparatii)
+        print(f"{len(comparatii)} operații comparate, {regresii} regresii (prag {argumente.prag:.0%})")
+        return 1 if regresii else 0
+
+    rezultate = ruleaza(argumente.scari, argumente.backend, argumente.operatii, argumente.repetari, argumente.seed)
+    with open(argumente.iesire, "w", encoding="utf-8") as fisier:
+        json.dump({"meta": {"data": datetime.now().isoformat(timespec="seconds"), "python": platform.python_version(),
+                            "platforma": platform.platform(), "seed": argumente.seed,
+                            "repetari": argumente.repetari},
+                   "rezultate": rezultate}, fisier, indent=1, ensure_ascii=False)
+    print(f"Rezultatele au fost scrise în {argumente.iesire}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
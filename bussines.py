@@ -1,19 +1,57 @@
-from datetime import datetime
+import heapq
+import math
+from bisect import insort
+from datetime import date, datetime
+from functools import lru_cache, wraps
+from itertools import dropwhile, islice
+from operator import itemgetter
 
+TIPURI_CHELTUIELI = ("apa", "gaz", "lumina")
+CHEI_GRUPARE = ("apartament", "tip", "luna")
+AGREGARI = ("sum", "count", "mean", "max")
+PASI_PERIOADA = ("luna", "an")
+# Numărul de ordine al ultimei luni reprezentabile (9999-12), folosit ca limită când perioada nu are sfârșit
+LUNA_MAXIMA = 9999 * 12 + 11
 
-def este_format_data_valid(data, format_data="%Y-%m-%d"):
+
+# Observatorul apelurilor (vezi instrumentare.py); cât timp este None, apelurile nu plătesc decât acest test
+_observator = None
+
+
+def seteaza_observator(observator):
     """
-       Verifică dacă o dată este într-un format valid.
+    Instalează sau scoate observatorul apelurilor funcțiilor din acest modul.
+
+    :param observator: Funcție (nume, executa, apartamente, args, kwargs) care trebuie să întoarcă
+        executa(apartamente, *args, **kwargs), sau None pentru a opri observarea.
+    """
+    global _observator
+    _observator = observator
 
-       :param data: Data de verificat.
-       :param format_data: Formatul dată (implicit "%Y-%m-%d").
-       :return: True dacă data este în formatul specificat, False în caz contrar.
-       """
-    try:
-        datetime.strptime(data, format_data)
-        return True
-    except ValueError:
-        return False
+
+def _delegheaza(functie):
+    """
+    Permite funcției să primească, în locul dicționarului de apartamente, un depozit (de exemplu
+    store.ExpenseStore) care implementează o metodă cu același nume; apelul este transmis metodei.
+
+    :param functie: Funcția care lucrează pe dicționarul de apartamente.
+    :return: Funcția care acceptă atât dicționarul, cât și un depozit.
+    """
+
+    def executa(apartamente, *args, **kwargs):
+        if isinstance(apartamente, (dict, list)):
+            return functie(apartamente, *args, **kwargs)
+        return getattr(apartamente, functie.__name__)(*args, **kwargs)
+
+    @wraps(functie)
+    def apel(apartamente, *args, **kwargs):
+        if _observator is not None:
+            return _observator(functie.__name__, executa, apartamente, args, kwargs)
+        if isinstance(apartamente, (dict, list)):
+            return functie(apartamente, *args, **kwargs)
+        return getattr(apartamente, functie.__name__)(*args, **kwargs)
+
+    return apel
 
 
 def validare_numar_apartament(apartament):
@@ -37,7 +75,7 @@ def validare_tip_cheltuiala(tip):
         :return: Tipul cheltuielii validat.
         :raises: ValueError dacă tipul cheltuielii nu este valid.
         """
-    if tip not in ["apa", "gaz", "lumina"]:
+    if tip not in TIPURI_CHELTUIELI:
         raise ValueError("Eroare: Tipul cheltuielii trebuie să fie 'apa', 'gaz' sau 'lumina.")
     return tip
 
@@ -48,17 +86,65 @@ def validare_suma(suma):
 
        :param suma: Suma cheltuielii de validat.
        :return: Suma cheltuielii validată.
-       :raises: ValueError dacă suma nu este un număr valid sau este negativă.
+       :raises: ValueError dacă suma nu este un număr valid și finit sau este negativă.
        """
     try:
         suma = float(suma)
     except ValueError:
         raise ValueError("Eroare: Suma cheltuielii trebuie să fie un număr valid.")
+    if not math.isfinite(suma):
+        raise ValueError("Eroare: Suma cheltuielii trebuie să fie un număr finit.")
     if suma < 0:
         raise ValueError("Eroare: Suma cheltuielii nu poate fi negativă.")
     return suma
 
 
+def _parseaza_data_lent(zi):
+    """
+    Calea generală de interpretare a unei date, pentru formele pe care calea rapidă nu le acceptă
+    (de exemplu '2023-1-2').
+
+    :param zi: Data de interpretat.
+    :return: Ziua ordinală.
+    :raises: ValueError dacă data nu este în formatul yyyy-mm-dd.
+    """
+    try:
+        return datetime.strptime(zi, "%Y-%m-%d").toordinal()
+    except ValueError:
+        raise ValueError("Eroare: Data introdusă nu este în formatul corect (yyyy-mm-dd).")
+
+
+def parseaza_data(zi):
+    """
+    Transformă o dată yyyy-mm-dd în ziua ordinală (date.toordinal), care se poate compara ca număr întreg.
+
+    Forma uzuală, cu zerouri în față, este interpretată direct din felii de șir, fără strptime.
+
+    :param zi: Data de interpretat.
+    :return: Ziua ordinală (int).
+    :raises: ValueError dacă data nu este în formatul corect sau nu există în calendar.
+    """
+    if not isinstance(zi, str):
+        raise ValueError("Eroare: Data introdusă nu este în formatul corect (yyyy-mm-dd).")
+    return _ordinal_zi(zi)
+
+
+@lru_cache(maxsize=4096)
+def _ordinal_zi(zi):
+    """
+    Interpretarea propriu-zisă din parseaza_data, memorată: un fișier de citiri are puține date distincte.
+    """
+    if len(zi) == 10 and zi[4] == "-" and zi[7] == "-" and zi.isascii():
+        an, luna, ziua = zi[:4], zi[5:7], zi[8:]
+        if an.isdigit() and luna.isdigit() and ziua.isdigit():
+            try:
+                return date(int(an), int(luna), int(ziua)).toordinal()
+            except ValueError:
+                raise ValueError("Eroare: Data introdusă nu este în formatul corect (yyyy-mm-dd).")
+
+    return _parseaza_data_lent(zi)
+
+
 def validare_data(zi):
     """
         Validează formatul datei.
@@ -67,11 +153,31 @@ def validare_data(zi):
         :return: Data validată.
         :raises: ValueError dacă data nu este în formatul specificat.
         """
-    if not este_format_data_valid(zi):
-        raise ValueError("Eroare: Data introdusă nu este în formatul corect (yyyy-mm-dd).")
+    parseaza_data(zi)
     return zi
 
 
+def validare_inregistrare(inregistrare, zi_ordinala=False):
+    """
+        Validează o înregistrare completă de cheltuială.
+
+        :param inregistrare: Tuplu (apartament, tip, suma, zi).
+        :param zi_ordinala: Dacă este True, data este întoarsă ca zi ordinală (vezi parseaza_data).
+        :return: Tuplul validat, cu suma convertită la float.
+        :raises: ValueError dacă înregistrarea nu are patru câmpuri sau unul dintre ele este invalid.
+        """
+    try:
+        apartament, tip, suma, zi = inregistrare
+    except (TypeError, ValueError):
+        raise ValueError("Eroare: Înregistrarea trebuie să aibă forma (apartament, tip, suma, zi).")
+
+    apartament = validare_numar_apartament(apartament)
+    tip = validare_tip_cheltuiala(tip)
+    suma = validare_suma(suma)
+    return apartament, tip, suma, parseaza_data(zi) if zi_ordinala else validare_data(zi)
+
+
+@_delegheaza
 def adauga_cheltuiala(apartamente, apartament, tip, suma, zi):
     """
     Adaugă o cheltuială în dicționarul apartamentelor.
@@ -103,6 +209,54 @@ def adauga_cheltuiala(apartamente, apartament, tip, suma, zi):
     return new_apartamente
 
 
+@_delegheaza
+def adauga_cheltuieli_bulk(apartamente, inregistrari):
+    """
+    Adaugă mai multe cheltuieli într-o singură trecere, fără a copia dicționarul pentru fiecare înregistrare.
+
+    Înregistrările invalide nu opresc importul: sunt sărite și raportate în lista de erori.
+
+    :param apartamente: Dicționarul care conține datele despre apartamente (modificat pe loc).
+    :param inregistrari: Iterabil de tupluri (apartament, tip, suma, zi).
+    :return: Tuplu (apartamente, erori), unde erori este lista de (poziție, mesaj) pentru înregistrările respinse.
+    """
+    erori = []
+
+    for pozitie, inregistrare in enumerate(inregistrari):
+        try:
+            apartament, tip, suma, zi = validare_inregistrare(inregistrare)
+        except ValueError as e:
+            erori.append((pozitie, str(e)))
+            continue
+
+        cheltuieli = apartamente.get(apartament)
+        if cheltuieli is None:
+            cheltuieli = apartamente[apartament] = {}
+
+        lista_cheltuieli = cheltuieli.get(tip)
+        if lista_cheltuieli is None:
+            lista_cheltuieli = cheltuieli[tip] = []
+
+        lista_cheltuieli.append((suma, zi))
+
+    return apartamente, erori
+
+
+@_delegheaza
+def itereaza_cheltuieli(apartamente):
+    """
+    Parcurge cheltuielile registrului în ordine, fără a construi o copie a lui.
+
+    :param apartamente: Dicționarul care conține datele despre apartamente.
+    :return: Generator de tupluri (apartament, tip, suma, zi).
+    """
+    for apartament, cheltuieli in apartamente.items():
+        for tip, lista_cheltuieli in cheltuieli.items():
+            for suma, zi in lista_cheltuieli:
+                yield apartament, tip, suma, zi
+
+
+@_delegheaza
 def modifica_cheltuiala(apartamente, apartament, tip, suma_veche, suma_noua):
     """
         Modifică o cheltuială existentă în dicționarul apartamentelor.
@@ -134,6 +288,66 @@ def modifica_cheltuiala(apartamente, apartament, tip, suma_veche, suma_noua):
     return apartamente
 
 
+def validare_corectura(actualizare):
+    """
+        Validează o corectură de sumă.
+
+        :param actualizare: Tuplu (apartament, tip, suma_veche, suma_noua).
+        :return: Tuplul validat, cu sumele convertite la float.
+        :raises: ValueError dacă corectura nu are patru câmpuri sau unul dintre ele este invalid.
+        """
+    try:
+        apartament, tip, suma_veche, suma_noua = actualizare
+    except (TypeError, ValueError):
+        raise ValueError("Eroare: Corectura trebuie să aibă forma (apartament, tip, suma_veche, suma_noua).")
+    return validare_numar_apartament(apartament), tip, validare_suma(suma_veche), validare_suma(suma_noua)
+
+
+@_delegheaza
+def modifica_cheltuieli(apartamente, actualizari):
+    """
+    Aplică mai multe corecturi de sume într-o singură trecere.
+
+    Pentru fiecare listă atinsă se construiește o singură dată harta suma -> poziții, așa că o corectură
+    nu mai parcurge lista; corecturile se aplică în ordine, exact ca apeluri succesive ale modifica_cheltuiala.
+
+    :param apartamente: Dicționarul care conține datele despre apartamente (modificat pe loc).
+    :param actualizari: Iterabil de tupluri (apartament, tip, suma_veche, suma_noua).
+    :return: Tuplu (apartamente, erori), unde erori este lista de (poziție, mesaj) pentru corecturile respinse.
+    """
+    pozitii_pe_lista = {}
+    erori = []
+
+    for pozitie, actualizare in enumerate(actualizari):
+        try:
+            apartament, tip, suma_veche, suma_noua = validare_corectura(actualizare)
+        except ValueError as e:
+            erori.append((pozitie, str(e)))
+            continue
+
+        cheltuieli = apartamente.get(apartament, {}).get(tip)
+        if cheltuieli is None:
+            continue
+
+        pozitii_sume = pozitii_pe_lista.get((apartament, tip))
+        if pozitii_sume is None:
+            pozitii_sume = pozitii_pe_lista[(apartament, tip)] = {}
+            for i, (suma, _) in enumerate(cheltuieli):
+                pozitii_sume.setdefault(suma, []).append(i)
+
+        pozitii = pozitii_sume.get(suma_veche)
+        if not pozitii:
+            erori.append((pozitie, 'Eroare: Suma veche nu a fost găsită'))
+            continue
+
+        i = pozitii.pop(0)
+        cheltuieli[i] = (suma_noua, cheltuieli[i][1])
+        insort(pozitii_sume.setdefault(suma_noua, []), i)
+
+    return apartamente, erori
+
+
+@_delegheaza
 def sterge_apartament(apartamente, apartament):
     """
             Sterge Apartament din dictionar
@@ -151,6 +365,7 @@ def sterge_apartament(apartamente, apartament):
         raise ValueError('Eroare: Apartamentul nu există în înregistrări.')
 
 
+@_delegheaza
 def sterge_apartamente_consecutive(apartamente, apartament_start, apartament_end):
     """
                 Sterge Apartamente consecutive din dictionar
@@ -164,13 +379,25 @@ def sterge_apartamente_consecutive(apartamente, apartament_start, apartament_end
     apartament_end = validare_numar_apartament(apartament_end)
     new_apartamente = apartamente.copy()
 
-    for apartament in range(apartament_start, apartament_end + 1):
-        if apartament in new_apartamente:
-            new_apartamente.pop(apartament)
+    for apartament in _apartamente_in_interval(apartamente, apartament_start, apartament_end):
+        new_apartamente.pop(apartament)
 
     return new_apartamente
 
 
+def _apartamente_in_interval(apartamente, apartament_start, apartament_end):
+    """
+    Apartamentele existente din intervalul [apartament_start, apartament_end]. Se parcurge intervalul sau
+    cheile dicționarului, după care este mai scurt, deci un interval larg nu costă mai mult decât registrul.
+
+    :return: Lista apartamentelor, în ordinea registrului când sunt parcurse cheile.
+    """
+    if apartament_end - apartament_start + 1 > len(apartamente):
+        return [apartament for apartament in apartamente if apartament_start <= apartament <= apartament_end]
+    return [apartament for apartament in range(apartament_start, apartament_end + 1) if apartament in apartamente]
+
+
+@_delegheaza
 def sterge_cheltuieli_tip(apartamente, tip):
     """
                  Sterge cheltuieli de un anumit tip
@@ -190,6 +417,154 @@ def sterge_cheltuieli_tip(apartamente, tip):
     return new_apartamente
 
 
+def _apartamente_de_la(apartamente, de_la):
+    """
+    Perechile (apartament, cheltuieli.items()) ale dicționarului, începând cu apartamentul de_la.
+
+    :raises: ValueError dacă apartamentul de_la nu (mai) există în registru.
+    """
+    perechi = iter(apartamente.items())
+    if de_la is not None:
+        if de_la not in apartamente:
+            raise ValueError("Eroare: Apartamentul de la care continuă raportul nu mai există în registru.")
+        perechi = dropwhile(lambda pereche: pereche[0] != de_la, perechi)
+    return ((apartament, cheltuieli.items()) for apartament, cheltuieli in perechi)
+
+
+def _randuri_mai_mari_decat(perechi, suma):
+    for apartament, cheltuieli in perechi:
+        for tip, lista_cheltuieli in cheltuieli:
+            for suma_cheltuiala, _ in lista_cheltuieli:
+                if suma_cheltuiala > suma:
+                    yield apartament, tip, suma_cheltuiala
+
+
+def _randuri_de_tip(perechi, tip):
+    for apartament, cheltuieli in perechi:
+        for tip_cheltuiala, lista_cheltuieli in cheltuieli:
+            if tip_cheltuiala == tip:
+                yield apartament, tip, lista_cheltuieli
+
+
+def _randuri_inainte_de_o_zi(perechi, suma, ordinal):
+    for apartament, cheltuieli in perechi:
+        cheltuiala_gasita = False
+        for tip, lista_cheltuieli in cheltuieli:
+            for suma_cheltuiala, data in lista_cheltuieli:
+                if suma_cheltuiala > suma and parseaza_data(data) < ordinal:
+                    yield apartament, tip
+                    cheltuiala_gasita = True
+        if not cheltuiala_gasita:
+            yield apartament, None
+
+
+@_delegheaza
+def cheltuieli_mai_mari_decat(apartamente, suma, de_la=None):
+    """
+    Parcurge, în ordinea registrului, cheltuielile mai mari decât o sumă.
+
+    Argumentele sunt validate la apel; rândurile sunt produse pe măsură ce sunt cerute, deci registrul nu
+    trebuie modificat cât timp generatorul este parcurs.
+
+    :param apartamente: Dicționarul care conține datele despre apartamente.
+    :param suma: Suma minimă (exclusiv).
+    :param de_la: Apartamentul de la care începe parcurgerea (None: de la început); vezi pagina_raport.
+    :return: Generator de tupluri (apartament, tip, suma).
+    :raises: ValueError dacă suma nu este validă sau apartamentul de_la nu există.
+    """
+    return _randuri_mai_mari_decat(_apartamente_de_la(apartamente, de_la), validare_suma(suma))
+
+
+@_delegheaza
+def cheltuieli_de_tip(apartamente, tip, de_la=None):
+    """
+    Parcurge, în ordinea registrului, apartamentele care au cheltuieli de un tip.
+
+    :param apartamente: Dicționarul care conține datele despre apartamente.
+    :param tip: Tipul cheltuielii (apa, gaz, lumina).
+    :param de_la: Apartamentul de la care începe parcurgerea (None: de la început).
+    :return: Generator de tupluri (apartament, tip, lista de (suma, zi)).
+    :raises: ValueError dacă tipul nu este valid sau apartamentul de_la nu există.
+    """
+    return _randuri_de_tip(_apartamente_de_la(apartamente, de_la), validare_tip_cheltuiala(tip))
+
+
+@_delegheaza
+def cheltuieli_inainte_de_o_zi(apartamente, suma, zi, de_la=None):
+    """
+    Parcurge, pe apartamente, cheltuielile efectuate înainte de o zi și mai mari decât o sumă.
+
+    :param apartamente: Dicționarul care conține datele despre apartamente.
+    :param suma: Suma minimă (exclusiv).
+    :param zi: Data limită (exclusiv), format yyyy-mm-dd.
+    :param de_la: Apartamentul de la care începe parcurgerea (None: de la început).
+    :return: Generator de tupluri (apartament, tip); tipul este None pentru apartamentele fără astfel de
+        cheltuieli.
+    :raises: ValueError dacă suma nu este validă, data nu este în formatul corect sau apartamentul de_la nu există.
+    """
+    suma = validare_suma(suma)
+    return _randuri_inainte_de_o_zi(_apartamente_de_la(apartamente, de_la), suma, parseaza_data(zi))
+
+
+def formateaza_cheltuiala_mai_mare(apartament, tip, suma):
+    """
+    :return: Linia de raport a unui rând din cheltuieli_mai_mari_decat.
+    """
+    return f"Apartamentul {apartament} | Cheltuiala: {tip} | Suma ce depășește: {suma}."
+
+
+def formateaza_cheltuieli_de_tip(apartament, tip, cheltuieli):
+    """
+    :return: Linia de raport a unui rând din cheltuieli_de_tip.
+    """
+    return f"Apartamentul {apartament}: Cheltuiala de tip {tip} este {cheltuieli}."
+
+
+def formateaza_cheltuiala_inainte_de_o_zi(apartament, tip, suma, zi):
+    """
+    :param suma: Suma minimă a raportului.
+    :param zi: Data limită a raportului.
+    :return: Linia de raport a unui rând din cheltuieli_inainte_de_o_zi.
+    """
+    if tip is None:
+        return f'Nu a fost efectuată o astfel de cheltuială în apartamentul {apartament}'
+    return f"Apartament {apartament}: Cheltuiala {tip} efectuată înainte de {zi} și mai mare decât {suma}."
+
+
+def pagina_raport(apartamente, raport, *args, limita=100, cursor=None):
+    """
+    O pagină dintr-un raport parcurs pe apartamente (cheltuieli_mai_mari_decat, cheltuieli_de_tip,
+    cheltuieli_inainte_de_o_zi).
+
+    Cursorul este perechea (apartament, rânduri ale lui deja întoarse), așa că pagina următoare pornește
+    direct de la apartamentul respectiv, fără a produce din nou rândurile paginilor anterioare.
+
+    :param apartamente: Registrul.
+    :param raport: Funcția raportului.
+    :param args: Argumentele raportului.
+    :param limita: Numărul maxim de rânduri din pagină.
+    :param cursor: None pentru prima pagină sau cursorul întors de pagina anterioară.
+    :return: Tuplu (rânduri, cursor), cursorul fiind None după ultima pagină.
+    :raises: ValueError dacă limita nu este validă sau apartamentul cursorului a fost șters între timp.
+    """
+    if not isinstance(limita, int) or limita < 1:
+        raise ValueError("Eroare: Limita paginii trebuie să fie un număr natural nenul.")
+    de_la, sarite = cursor if cursor is not None else (None, 0)
+
+    pagina = list(islice(raport(apartamente, *args, de_la=de_la), sarite, sarite + limita + 1))
+    if len(pagina) <= limita:
+        return pagina, None
+
+    apartament = pagina.pop()[0]
+    intoarse = 0
+    while intoarse < len(pagina) and pagina[-1 - intoarse][0] == apartament:
+        intoarse += 1
+    if intoarse == len(pagina) and apartament == de_la:
+        intoarse += sarite
+    return pagina, (apartament, intoarse)
+
+
+@_delegheaza
 def afiseaza_apartamente_cu_cheltuieli_mai_mari_decat(apartamente, suma):
     """
         Afișează apartamentele cu cheltuieli mai mari decât o anumită sumă.
@@ -199,14 +574,7 @@ def afiseaza_apartamente_cu_cheltuieli_mai_mari_decat(apartamente, suma):
     """
 
     suma = validare_suma(suma)
-    rezultat = []
-
-    for apartament, cheltuieli in apartamente.items():
-        for tip, lista_cheltuieli in cheltuieli.items():
-            for suma_cheltuiala, _ in lista_cheltuieli:
-                if suma_cheltuiala > suma:
-                    rezultat.append(
-                        f"Apartamentul {apartament} | Cheltuiala: {tip} | Suma ce depășește: {suma_cheltuiala}.")
+    rezultat = [formateaza_cheltuiala_mai_mare(*rand) for rand in cheltuieli_mai_mari_decat(apartamente, suma)]
 
     if not rezultat:
         print(f"Nicio cheltuială depășește suma {suma}.")
@@ -214,6 +582,7 @@ def afiseaza_apartamente_cu_cheltuieli_mai_mari_decat(apartamente, suma):
     return rezultat
 
 
+@_delegheaza
 def afiseaza_cheltuieli_tip(apartamente, tip):
     """
         Afișează cheltuielile de un anumit tip pentru toate apartamentele.
@@ -222,33 +591,24 @@ def afiseaza_cheltuieli_tip(apartamente, tip):
         :param tip: Tipul cheltuielii de afișat (apa, gaz, lumina).
         """
 
-    tip = validare_tip_cheltuiala(tip)
-    rezultat = []
-
-    for apartament, cheltuieli in apartamente.items():
-        if tip in cheltuieli:
-            rezultat.append(f"Apartamentul {apartament}: Cheltuiala de tip {tip} este {cheltuieli[tip]}.")
-
-    return rezultat
+    return [formateaza_cheltuieli_de_tip(*rand) for rand in cheltuieli_de_tip(apartamente, tip)]
 
 
+@_delegheaza
 def afiseaza_cheltuieli_inainte_de_o_zi(apartamente, suma, zi):
-    rezultat = []
-
-    for apartament, cheltuieli in apartamente.items():
-        cheltuiala_gasita = False  # Variabilă pentru a verifica dacă s-a găsit o cheltuială validă
-        for tip, lista_cheltuieli in cheltuieli.items():
-            for suma_cheltuiala, data in lista_cheltuieli:
-                if data < zi and suma_cheltuiala > suma:
-                    rezultat.append(
-                        f"Apartament {apartament}: Cheltuiala {tip} efectuată înainte de {zi} și mai mare decât {suma}.")
-                    cheltuiala_gasita = True  # O cheltuială a fost găsită
-        if not cheltuiala_gasita:
-            rezultat.append(f'Nu a fost efectuată o astfel de cheltuială în apartamentul {apartament}')
+    """
+        Afișează, pe apartamente, cheltuielile efectuate înainte de o zi și mai mari decât o sumă.
 
-    return rezultat
+        :param apartamente: Dicționarul care conține datele despre apartamente.
+        :param suma: Suma minimă (exclusiv).
+        :param zi: Data limită (exclusiv), format yyyy-mm-dd.
+        :raises: ValueError dacă data nu este în formatul corect.
+        """
+    return [formateaza_cheltuiala_inainte_de_o_zi(apartament, tip, suma, zi)
+            for apartament, tip in cheltuieli_inainte_de_o_zi(apartamente, suma, zi)]
 
 
+@_delegheaza
 def tipareste_apartamente_sortate_dupa_tip(apartamente, tip):
     """
     Tipărește toate cheltuielile de un anumit tip, sortate după valoare.
@@ -273,6 +633,57 @@ def tipareste_apartamente_sortate_dupa_tip(apartamente, tip):
     return cheltuieli_sortate
 
 
+def validare_numar_rezultate(k):
+    """
+        Validează numărul de rezultate cerut unui clasament.
+
+        :param k: Numărul de rezultate.
+        :return: Numărul validat.
+        :raises: ValueError dacă nu este un număr natural nenul.
+        """
+    if not isinstance(k, int) or k < 1:
+        raise ValueError("Eroare: Numărul de rezultate trebuie să fie un număr natural nenul.")
+    return k
+
+
+@_delegheaza
+def top_k(apartamente, tip=None, apartament=None, k=10):
+    """
+    Cele mai mari k cheltuieli din registru, opțional doar de un tip și/sau doar ale unui apartament.
+
+    :param apartamente: Dicționarul care conține datele despre apartamente.
+    :param tip: Tipul cheltuielii sau None pentru toate tipurile.
+    :param apartament: Apartamentul sau None pentru toate apartamentele.
+    :param k: Numărul maxim de cheltuieli întoarse.
+    :return: Lista de tupluri (apartament, tip, suma, zi), descrescător după sumă; la sume egale se păstrează
+        ordinea din registru.
+    :raises: ValueError dacă tipul, apartamentul sau k nu sunt valide.
+    """
+    if tip is not None:
+        tip = validare_tip_cheltuiala(tip)
+    if apartament is not None:
+        apartament = validare_numar_apartament(apartament)
+    k = validare_numar_rezultate(k)
+
+    if apartament is None:
+        surse = apartamente.items()
+    else:
+        surse = [(apartament, apartamente[apartament])] if apartament in apartamente else []
+    randuri = ((apartament_curent, tip_cheltuiala, suma_cheltuiala, data) for apartament_curent, cheltuieli in surse
+               for tip_cheltuiala, lista_cheltuieli in cheltuieli.items() if tip in (None, tip_cheltuiala)
+               for suma_cheltuiala, data in lista_cheltuieli)
+    # nlargest este stabil: la sume egale, rândurile rămân în ordinea în care au fost parcurse
+    return heapq.nlargest(k, randuri, key=itemgetter(2))
+
+
+def formateaza_cheltuiala(apartament, tip, suma, zi):
+    """
+    :return: Linia de raport a unui rând din top_k.
+    """
+    return f"Apartamentul {apartament}: {tip} {suma} ({zi})"
+
+
+@_delegheaza
 def suma_cheltuieli_tip(apartamente, tip):
     """
                 Calculeaza suma cheltuielilor de un anumit tip
@@ -295,6 +706,7 @@ def suma_cheltuieli_tip(apartamente, tip):
     return suma
 
 
+@_delegheaza
 def calculeaza_total_cheltuieli(apartamente, numar_apartament):
     """
     Calculează totalul de cheltuieli pentru un apartament dat.
@@ -315,6 +727,219 @@ def calculeaza_total_cheltuieli(apartamente, numar_apartament):
         return None
 
 
+@_delegheaza
+def totaluri_interval(apartamente, apartament_start, apartament_end, tip=None):
+    """
+    Calculează totalul și numărul cheltuielilor apartamentelor dintr-un interval (de exemplu un etaj sau o scară).
+
+    :param apartamente: Dicționarul care conține datele despre apartamente.
+    :param apartament_start: Primul apartament din interval.
+    :param apartament_end: Ultimul apartament din interval.
+    :param tip: Tipul cheltuielii sau None pentru toate tipurile.
+    :return: Tuplu (suma, număr de cheltuieli); (0.0, 0) dacă intervalul nu are cheltuieli.
+    :raises: ValueError dacă apartamentele sau tipul nu sunt valide.
+    """
+    apartament_start = validare_numar_apartament(apartament_start)
+    apartament_end = validare_numar_apartament(apartament_end)
+    if tip is not None:
+        tip = validare_tip_cheltuiala(tip)
+
+    sume = [suma_cheltuiala for apartament in _apartamente_in_interval(apartamente, apartament_start, apartament_end)
+            for tip_cheltuiala, lista_cheltuieli in apartamente[apartament].items() if tip in (None, tip_cheltuiala)
+            for suma_cheltuiala, _ in lista_cheltuieli]
+    return math.fsum(sume), len(sume)
+
+
+def parseaza_luna(luna):
+    """
+    Transformă o lună yyyy-mm în numărul ei de ordine (an * 12 + lună - 1), care se poate compara ca număr întreg.
+
+    :param luna: Luna de interpretat.
+    :return: Numărul de ordine al lunii (int).
+    :raises: ValueError dacă luna nu este în formatul yyyy-mm.
+    """
+    try:
+        data = datetime.strptime(luna, "%Y-%m")
+    except (TypeError, ValueError):
+        raise ValueError("Eroare: Luna introdusă nu este în formatul corect (yyyy-mm).")
+    return data.year * 12 + data.month - 1
+
+
+def formateaza_luna(luna, pas="luna"):
+    """
+    Inversa lui parseaza_luna.
+
+    :param luna: Numărul de ordine al lunii.
+    :param pas: 'luna' pentru yyyy-mm sau 'an' pentru yyyy.
+    :return: Luna sau anul ca șir de caractere.
+    """
+    an, numar = divmod(luna, 12)
+    return f"{an:04d}" if pas == "an" else f"{an:04d}-{numar + 1:02d}"
+
+
+@lru_cache(maxsize=4096)
+def _luna_datei(zi):
+    data = date.fromordinal(parseaza_data(zi))
+    return data.year * 12 + data.month - 1
+
+
+def validare_perioada(luna_start=None, luna_end=None):
+    """
+        Validează capetele unei perioade de luni.
+
+        :param luna_start: Prima lună (yyyy-mm) sau None pentru o perioadă fără început.
+        :param luna_end: Ultima lună (yyyy-mm) sau None pentru o perioadă fără sfârșit.
+        :return: Tuplu (început, sfârșit) cu numerele de ordine ale lunilor, ambele incluse.
+        :raises: ValueError dacă lunile nu sunt în formatul yyyy-mm.
+        """
+    return (parseaza_luna(luna_start) if luna_start is not None else 0,
+            parseaza_luna(luna_end) if luna_end is not None else LUNA_MAXIMA)
+
+
+def validare_pas(pas):
+    """
+        Validează pasul unei serii de totaluri.
+
+        :param pas: 'luna' sau 'an'.
+        :return: Pasul validat.
+        :raises: ValueError dacă pasul nu este acceptat.
+        """
+    if pas not in PASI_PERIOADA:
+        raise ValueError("Eroare: Pasul seriei trebuie să fie 'luna' sau 'an'.")
+    return pas
+
+
+def _sume_pe_luni(apartamente, apartament_start, apartament_end, tip, inceput, sfarsit):
+    """
+    Sumele cheltuielilor din intervalul de apartamente și din perioada dată, grupate pe numărul de ordine al lunii.
+    """
+    luni = {}
+    for apartament in _apartamente_in_interval(apartamente, apartament_start, apartament_end):
+        for tip_cheltuiala, lista_cheltuieli in apartamente[apartament].items():
+            if tip in (None, tip_cheltuiala):
+                for suma_cheltuiala, data in lista_cheltuieli:
+                    luna = _luna_datei(data)
+                    if inceput <= luna <= sfarsit:
+                        luni.setdefault(luna, []).append(suma_cheltuiala)
+    return luni
+
+
+@_delegheaza
+def totaluri_perioada(apartamente, apartament_start, apartament_end, luna_start=None, luna_end=None, tip=None):
+    """
+    Calculează totalul și numărul cheltuielilor unui interval de apartamente într-o perioadă de luni
+    (de exemplu gazul scării B în martie).
+
+    :param apartamente: Dicționarul care conține datele despre apartamente.
+    :param apartament_start: Primul apartament din interval.
+    :param apartament_end: Ultimul apartament din interval.
+    :param luna_start: Prima lună (yyyy-mm) sau None pentru o perioadă fără început.
+    :param luna_end: Ultima lună (yyyy-mm), inclusă, sau None pentru o perioadă fără sfârșit.
+    :param tip: Tipul cheltuielii sau None pentru toate tipurile.
+    :return: Tuplu (suma, număr de cheltuieli); (0.0, 0) dacă nu există cheltuieli.
+    :raises: ValueError dacă apartamentele, lunile sau tipul nu sunt valide.
+    """
+    apartament_start = validare_numar_apartament(apartament_start)
+    apartament_end = validare_numar_apartament(apartament_end)
+    inceput, sfarsit = validare_perioada(luna_start, luna_end)
+    if tip is not None:
+        tip = validare_tip_cheltuiala(tip)
+
+    sume = [suma_cheltuiala for sume_luna in _sume_pe_luni(apartamente, apartament_start, apartament_end, tip,
+                                                           inceput, sfarsit).values()
+            for suma_cheltuiala in sume_luna]
+    return math.fsum(sume), len(sume)
+
+
+@_delegheaza
+def totaluri_pe_perioade(apartamente, apartament_start, apartament_end, luna_start=None, luna_end=None, tip=None,
+                         pas="luna"):
+    """
+    Totalurile unui interval de apartamente pe fiecare lună sau an, de exemplu pentru a compara apa unui
+    apartament de la un an la altul.
+
+    :param apartamente: Dicționarul care conține datele despre apartamente.
+    :param apartament_start: Primul apartament din interval.
+    :param apartament_end: Ultimul apartament din interval.
+    :param luna_start: Prima lună (yyyy-mm) sau None pentru o perioadă fără început.
+    :param luna_end: Ultima lună (yyyy-mm), inclusă, sau None pentru o perioadă fără sfârșit.
+    :param tip: Tipul cheltuielii sau None pentru toate tipurile.
+    :param pas: 'luna' (chei yyyy-mm) sau 'an' (chei yyyy).
+    :return: Dicționar {perioadă: sumă}, ordonat crescător, doar cu perioadele care au cheltuieli.
+    :raises: ValueError dacă apartamentele, lunile, tipul sau pasul nu sunt valide.
+    """
+    apartament_start = validare_numar_apartament(apartament_start)
+    apartament_end = validare_numar_apartament(apartament_end)
+    inceput, sfarsit = validare_perioada(luna_start, luna_end)
+    if tip is not None:
+        tip = validare_tip_cheltuiala(tip)
+    pas = validare_pas(pas)
+
+    perioade = {}
+    for luna, sume in _sume_pe_luni(apartamente, apartament_start, apartament_end, tip, inceput, sfarsit).items():
+        perioade.setdefault(formateaza_luna(luna, pas), []).extend(sume)
+    return {perioada: math.fsum(perioade[perioada]) for perioada in sorted(perioade)}
+
+
+def validare_grupare(cheie, agregare):
+    """
+        Validează cheia de grupare și funcția de agregare.
+
+        :param cheie: Cheia de grupare ('apartament', 'tip' sau 'luna').
+        :param agregare: Agregarea ('sum', 'count', 'mean' sau 'max').
+        :return: Tuplu (cheie, agregare) validat.
+        :raises: ValueError dacă cheia sau agregarea nu sunt acceptate.
+        """
+    if cheie not in CHEI_GRUPARE:
+        raise ValueError("Eroare: Gruparea se poate face după 'apartament', 'tip' sau 'luna'.")
+    if agregare not in AGREGARI:
+        raise ValueError("Eroare: Agregarea trebuie să fie 'sum', 'count', 'mean' sau 'max'.")
+    return cheie, agregare
+
+
+def agrega(valori, agregare):
+    """
+    Aplică o agregare pe o listă nevidă de sume.
+
+    :param valori: Sumele de agregat.
+    :param agregare: 'sum', 'count', 'mean' sau 'max'.
+    :return: Valoarea agregată.
+    """
+    if agregare == "count":
+        return len(valori)
+    if agregare == "max":
+        return max(valori)
+    total = sum(valori)
+    return total / len(valori) if agregare == "mean" else total
+
+
+@_delegheaza
+def group_by(apartamente, cheie, agregare="sum"):
+    """
+    Grupează cheltuielile după apartament, tip sau lună (yyyy-mm) și le agregă.
+
+    :param apartamente: Dicționarul care conține datele despre apartamente.
+    :param cheie: Cheia de grupare ('apartament', 'tip' sau 'luna').
+    :param agregare: Agregarea ('sum', 'count', 'mean' sau 'max').
+    :return: Dicționar {cheie: valoare}, ordonat crescător după cheie.
+    :raises: ValueError dacă cheia sau agregarea nu sunt valide.
+    """
+    cheie, agregare = validare_grupare(cheie, agregare)
+    grupuri = {}
+
+    for apartament, cheltuieli in apartamente.items():
+        for tip, lista_cheltuieli in cheltuieli.items():
+            for suma_cheltuiala, data in lista_cheltuieli:
+                if cheie == "luna":
+                    valoare_cheie = formateaza_luna(_luna_datei(data))
+                else:
+                    valoare_cheie = apartament if cheie == "apartament" else tip
+                grupuri.setdefault(valoare_cheie, []).append(suma_cheltuiala)
+
+    return {valoare_cheie: agrega(grupuri[valoare_cheie], agregare) for valoare_cheie in sorted(grupuri)}
+
+
+@_delegheaza
 def elimina_cheltuiala(apartamente, tip):
     """
                  Elimina o cheltuiala a unui apartament
@@ -334,13 +959,46 @@ def elimina_cheltuiala(apartamente, tip):
     return new_apartamente
 
 
+@_delegheaza
 def elimina_cheltuieli_mai_mici_decat(apartamente, suma_minima):
+    suma_minima = validare_suma(suma_minima)
     for ap in apartamente:
         for tip, lista_cheltuieli in apartamente[ap].items():
             lista_cheltuieli[:] = [(suma, data) for suma, data in lista_cheltuieli if suma >= suma_minima]
     return apartamente
 
 
+def test_parseaza_data():
+    assert parseaza_data("2023-10-30") == date(2023, 10, 30).toordinal()
+    assert parseaza_data("2024-02-29") == date(2024, 2, 29).toordinal()
+    # Formele fără zerouri în față trec prin calea generală
+    assert parseaza_data("2023-1-2") == date(2023, 1, 2).toordinal()
+
+    for zi in ["2023-02-29", "2023-13-01", "2023-00-10", "2023/10/30", "2023-1a-02", "", None, 20231030]:
+        try:
+            parseaza_data(zi)
+            assert False, zi
+        except ValueError:
+            assert True
+
+    # Data limită este validată și în rapoarte
+    try:
+        afiseaza_cheltuieli_inainte_de_o_zi({1: {"apa": [(10, "2023-10-30")]}}, 5, "30-10-2023")
+        assert False
+    except ValueError:
+        assert True
+
+
+def test_validare_suma():
+    assert validare_suma("12.5") == 12.5
+    for suma in ("nan", "inf", "-inf", float("nan"), math.inf, "abc", -1):
+        try:
+            validare_suma(suma)
+            assert False
+        except ValueError:
+            assert True
+
+
 def test_adauga_cheltuiala():
     apartamente = []
     apartament = 101
@@ -357,6 +1015,36 @@ def test_adauga_cheltuiala():
     assert (suma, zi) in apartamente_actualizat[apartament][tip]
 
 
+def test_adauga_cheltuieli_bulk():
+    apartamente = {1: {"apa": [(100.0, "2023-10-30")]}}
+    inregistrari = [
+        (1, "apa", 50, "2023-11-02"),
+        (2, "gaz", "75.5", "2023-11-03"),
+        (2, "curent", 10, "2023-11-03"),  # tip invalid
+        (3, "apa", -5, "2023-11-03"),  # suma negativă
+        (3, "apa", 5, "2023-13-03"),  # dată invalidă
+        (3, "apa", 5),  # înregistrare incompletă
+        (1, "lumina", 20, "2023-11-04"),
+    ]
+
+    rezultat, erori = adauga_cheltuieli_bulk(apartamente, inregistrari)
+
+    # Dicționarul este modificat pe loc, iar înregistrările valide sunt adăugate în ordine
+    assert rezultat is apartamente
+    assert apartamente == {
+        1: {"apa": [(100.0, "2023-10-30"), (50.0, "2023-11-02")], "lumina": [(20.0, "2023-11-04")]},
+        2: {"gaz": [(75.5, "2023-11-03")]}
+    }
+
+    # Erorile sunt raportate pentru fiecare înregistrare respinsă, fără a opri importul
+    assert [pozitie for pozitie, _ in erori] == [2, 3, 4, 5]
+
+    # Acceptă orice iterabil, inclusiv generatoare
+    _, erori = adauga_cheltuieli_bulk(apartamente, ((4, "gaz", i, "2023-11-05") for i in range(3)))
+    assert erori == []
+    assert len(apartamente[4]["gaz"]) == 3
+
+
 def test_modifica_cheltuiala():
     apartamente = {1: {"apa": [(100, "2023-10-30")]}}
 
@@ -372,6 +1060,25 @@ def test_modifica_cheltuiala():
         assert True  # Se așteaptă o excepție ValueError
 
 
+def test_modifica_cheltuieli():
+    apartamente = {1: {"apa": [(100, "2023-10-30"), (100, "2023-11-30"), (80, "2023-12-30")]}}
+
+    actualizari = [
+        (1, "apa", 100, 150),
+        (1, "apa", 150, 90),  # corecturile se aplică în ordine, deci găsește suma tocmai modificată
+        (1, "apa", 100, 120),
+        (1, "apa", 100, 130),  # nu mai există nicio sumă de 100
+        (1, "gaz", 10, 20),  # tip inexistent: ignorat, ca în modifica_cheltuiala
+        (1, "apa", 80),  # corectură incompletă
+    ]
+
+    rezultat, erori = modifica_cheltuieli(apartamente, actualizari)
+
+    assert rezultat is apartamente
+    assert apartamente == {1: {"apa": [(90, "2023-10-30"), (120, "2023-11-30"), (80, "2023-12-30")]}}
+    assert [pozitie for pozitie, _ in erori] == [3, 5]
+
+
 def test_sterge_apartament():
     apartamente = {1: {"apa": [(100, "2023-10-30")]}}
 
@@ -387,6 +1094,16 @@ def test_sterge_apartament():
         assert True  # Se așteaptă o excepție ValueError
 
 
+def test_sterge_apartamente_consecutive():
+    apartamente = {101: {"apa": [(100, "2023-10-30")]}, 5: {}, 150: {"gaz": [(50, "2023-10-29")]}, 200: {}}
+
+    # Intervalul larg nu este parcurs număr cu număr; dicționarul primit rămâne neschimbat
+    assert sterge_apartamente_consecutive(apartamente, 100, 10 ** 12) == {5: {}}
+    assert sterge_apartamente_consecutive(apartamente, 149, 151) == {101: {"apa": [(100, "2023-10-30")]}, 5: {},
+                                                                       200: {}}
+    assert len(apartamente) == 4
+
+
 def test_sterge_cheltuieli_tip():
     apartamente = {1: {"apa": [(200, "2023-10-30")], "gaz": [(60, "2023-10-29")], "lumina": [(275, "2023-10-28")]}}
 
@@ -435,6 +1152,60 @@ def test_afiseaza_cheltuieli_inainte_de_o_zi():
     assert afiseaza_cheltuieli_inainte_de_o_zi(apartamente, suma_invalida, zi_invalida) == rezultat_invalid
 
 
+def test_rapoarte_pe_apartamente():
+    apartamente = {
+        1: {"apa": [(230, "2023-10-30")], "gaz": [(50, "2023-10-29")]},
+        2: {"gaz": [(40, "2023-10-30")]},
+        3: {"apa": [(120, "2023-10-28"), (90, "2023-10-27")]}
+    }
+
+    randuri = cheltuieli_mai_mari_decat(apartamente, 45)
+    assert next(randuri) == (1, "apa", 230)
+    assert list(randuri) == [(1, "gaz", 50), (3, "apa", 120), (3, "apa", 90)]
+    assert list(cheltuieli_mai_mari_decat(apartamente, 45, de_la=2)) == [(3, "apa", 120), (3, "apa", 90)]
+    assert list(cheltuieli_de_tip(apartamente, "apa", de_la=2)) == [(3, "apa", [(120, "2023-10-28"),
+                                                                              (90, "2023-10-27")])]
+    assert list(cheltuieli_inainte_de_o_zi(apartamente, 45, "2023-10-30")) == [(1, "gaz"), (2, None), (3, "apa"),
+                                                                               (3, "apa")]
+
+    # Argumentele sunt verificate la apel, nu la primul rând cerut
+    for apel in (lambda: cheltuieli_mai_mari_decat(apartamente, -1), lambda: cheltuieli_de_tip(apartamente, "gazz"),
+                 lambda: cheltuieli_inainte_de_o_zi(apartamente, 1, "30-10-2023"),
+                 lambda: cheltuieli_mai_mari_decat(apartamente, 1, de_la=7)):
+        try:
+            apel()
+            assert False
+        except ValueError:
+            pass
+
+
+def test_pagina_raport():
+    apartamente = {1: {"apa": [(10, "2023-01-01"), (20, "2023-01-02"), (30, "2023-01-03")]},
+                   2: {"gaz": [(40, "2023-01-04")]},
+                   3: {"apa": [(50, "2023-01-05")], "lumina": [(60, "2023-01-06")]}}
+    toate = list(cheltuieli_mai_mari_decat(apartamente, 0))
+
+    for limita in (1, 2, 3, 4, 6, 100):
+        randuri, cursor, pagini = [], None, 0
+        while True:
+            pagina, cursor = pagina_raport(apartamente, cheltuieli_mai_mari_decat, 0, limita=limita, cursor=cursor)
+            randuri.extend(pagina)
+            pagini += 1
+            if cursor is None:
+                break
+        assert randuri == toate and pagini == max(1, -(-len(toate) // limita))
+
+    assert pagina_raport(apartamente, cheltuieli_mai_mari_decat, 0, limita=2) == ([(1, "apa", 10), (1, "apa", 20)],
+                                                                                 (1, 2))
+    assert pagina_raport(apartamente, cheltuieli_de_tip, "apa", limita=1, cursor=(3, 0)) == \
+        ([(3, "apa", [(50, "2023-01-05")])], None)
+    try:
+        pagina_raport(apartamente, cheltuieli_mai_mari_decat, 0, limita=0)
+        assert False
+    except ValueError:
+        pass
+
+
 def test_suma_cheltuieli_tip():
     apartamente = {
         1: {"apa": [(100, "2023-10-30")], "gaz": [(50, "2023-10-29")], "lumina": [(75, "2023-10-28")]},
@@ -464,6 +1235,100 @@ def test_calculeaza_total_cheltuieli():
     assert total_apartament_3 is None  # Apartamentul 3 nu există în înregistrări
 
 
+def test_totaluri_interval():
+    apartamente = {
+        101: {"apa": [(100, "2023-10-30"), (0.1, "2023-10-01")], "gaz": [(50, "2023-10-29")]},
+        150: {"apa": [(0.2, "2023-10-28")]},
+        201: {"gaz": [(40, "2023-10-30")]},
+    }
+
+    assert totaluri_interval(apartamente, 100, 199) == (150.3, 4)
+    assert totaluri_interval(apartamente, 100, 199, "apa") == (100.3, 3)
+    assert totaluri_interval(apartamente, 1, 10 ** 12, "gaz") == (90.0, 2)
+    assert totaluri_interval(apartamente, 300, 399) == (0.0, 0)
+
+    try:
+        totaluri_interval(apartamente, 100, 199, "gazz")
+        assert False
+    except ValueError:
+        assert True
+
+
+def test_totaluri_perioada():
+    apartamente = {
+        101: {"apa": [(100, "2023-03-30"), (0.1, "2023-04-01")], "gaz": [(50, "2023-3-9")]},
+        150: {"apa": [(0.2, "2024-03-28")]},
+        201: {"gaz": [(40, "2023-03-30")]},
+    }
+
+    assert totaluri_perioada(apartamente, 100, 199, "2023-03", "2023-03") == (150.0, 2)
+    assert totaluri_perioada(apartamente, 100, 199, "2023-04") == (0.30000000000000004, 2)
+    assert totaluri_perioada(apartamente, 1, 10 ** 12, None, "2023-12", "gaz") == (90.0, 2)
+    assert totaluri_perioada(apartamente, 100, 199) == totaluri_interval(apartamente, 100, 199)
+    assert totaluri_perioada(apartamente, 100, 199, "2023-05", "2023-04") == (0.0, 0)
+
+    assert totaluri_pe_perioade(apartamente, 1, 200) == {"2023-03": 150.0, "2023-04": 0.1, "2024-03": 0.2}
+    assert totaluri_pe_perioade(apartamente, 101, 201, tip="gaz", pas="an") == {"2023": 90.0}
+    assert totaluri_pe_perioade(apartamente, 1, 200, "2023-04", pas="an") == {"2023": 0.1, "2024": 0.2}
+    assert totaluri_pe_perioade(apartamente, 150, 150, None, "2023-12") == {}
+
+    for argumente in [(100, 199, "2023-13"), (100, 199, "2023/03"), (100, 199, None, None, "gazz")]:
+        try:
+            totaluri_perioada(apartamente, *argumente)
+            assert False, argumente
+        except ValueError:
+            assert True
+    try:
+        totaluri_pe_perioade(apartamente, 1, 200, pas="zi")
+        assert False
+    except ValueError:
+        assert True
+
+
+def test_top_k():
+    apartamente = {
+        1: {"apa": [(10, "2023-10-01"), (50, "2023-10-02")], "gaz": [(50, "2023-10-03")]},
+        2: {"gaz": [(70, "2023-10-04"), (5, "2023-10-05")]},
+        3: {},
+    }
+
+    assert top_k(apartamente, k=3) == [(2, "gaz", 70, "2023-10-04"), (1, "apa", 50, "2023-10-02"),
+                                        (1, "gaz", 50, "2023-10-03")]
+    assert top_k(apartamente, "gaz") == [(2, "gaz", 70, "2023-10-04"), (1, "gaz", 50, "2023-10-03"),
+                                         (2, "gaz", 5, "2023-10-05")]
+    assert top_k(apartamente, apartament=1, k=2) == [(1, "apa", 50, "2023-10-02"), (1, "gaz", 50, "2023-10-03")]
+    assert top_k(apartamente, "apa", 2) == [] and top_k(apartamente, apartament=4) == []
+
+    for argumente in [("gazz",), (None, "1"), (None, None, 0), (None, None, 2.5)]:
+        try:
+            top_k(apartamente, *argumente)
+            assert False, argumente
+        except ValueError:
+            assert True
+
+
+def test_group_by():
+    apartamente = {
+        1: {"apa": [(100, "2023-10-30"), (50, "2023-11-02")], "gaz": [(50, "2023-10-29")]},
+        2: {"apa": [(120, "2023-10-28")], "gaz": [(40, "2023-11-30")]}
+    }
+
+    assert group_by(apartamente, "apartament") == {1: 200, 2: 160}
+    assert group_by(apartamente, "tip", "count") == {"apa": 3, "gaz": 2}
+    assert group_by(apartamente, "luna", "mean") == {"2023-10": 90, "2023-11": 45}
+    assert group_by(apartamente, "tip", "max") == {"apa": 120, "gaz": 50}
+
+    # Datele fără zerouri în față sunt grupate în aceeași lună ca forma canonică
+    apartamente[3] = {"lumina": [(30, "2023-3-9"), (10, "2023-03-01")]}
+    assert group_by(apartamente, "luna", "sum") == {"2023-03": 40, "2023-10": 270, "2023-11": 90}
+
+    try:
+        group_by(apartamente, "an")
+        assert False
+    except ValueError:
+        assert True
+
+
 def test_tipareste_apartamente_sortate_dupa_tip():
     # Definiți un dicționar de apartamente pentru test
     apartamente = {
@@ -535,15 +1400,26 @@ def test_elimina_cheltuieli_mai_mici_decat():
 
 
 if __name__ == "__main__":
+    test_parseaza_data()
+    test_validare_suma()
     test_adauga_cheltuiala()
+    test_adauga_cheltuieli_bulk()
     test_modifica_cheltuiala()
+    test_modifica_cheltuieli()
     test_sterge_cheltuieli_tip()
     test_sterge_apartament()
+    test_sterge_apartamente_consecutive()
     test_afiseaza_apartamente_cu_cheltuieli_mai_mari_decat()
     test_afiseaza_cheltuieli_tip()
     test_afiseaza_cheltuieli_inainte_de_o_zi()
+    test_rapoarte_pe_apartamente()
+    test_pagina_raport()
     test_suma_cheltuieli_tip()
     test_calculeaza_total_cheltuieli()
+    test_totaluri_interval()
+    test_totaluri_perioada()
+    test_group_by()
     test_tipareste_apartamente_sortate_dupa_tip()
+    test_top_k()
     test_elimina_cheltuiala()
     test_elimina_cheltuieli_mai_mici_decat()
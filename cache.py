@@ -0,0 +1,293 @@
+"""
+Cache LRU pentru rapoartele cerute repetat între două modificări ale registrului.
+
+Un rezultat este refolosit cât timp versiunea datelor de care depinde (un tip de cheltuială sau tot
+registrul) nu s-a schimbat; versiunile sunt avansate de metodele care modifică registrul (vezi
+indexuri.IndexVersiuni), deci o modificare a unui tip nu invalidează rapoartele celorlalte tipuri.
+"""
+from collections import OrderedDict
+
+import bussines
+from bussines import TIPURI_CHELTUIELI, validare_tip_cheltuiala, validare_suma
+from store import ExpenseStore
+
+
+class RegistruCuCache:
+    """
+    Registru care păstrează ultimele `marime` rapoarte calculate, cheia fiind (funcție, argumente).
+
+    Învelește orice registru cu metoda `versiune` (ExpenseStore, RegistruPersistent, SqliteStore) și expune
+    aceleași metode, deci poate fi transmis funcțiilor din bussines.py. Rapoartele din cache sunt întoarse
+    ca liste noi, așa că modificarea unui rezultat nu atinge intrarea din cache. Rapoartele pe rânduri
+    (cheltuieli_mai_mari_decat, cheltuieli_de_tip, cheltuieli_inainte_de_o_zi), din care meniul afișează
+    liniile pe măsură ce sunt produse, sunt păstrate ca liste de rânduri și întoarse ca iteratoare peste ele.
+    """
+
+    def __init__(self, registru, marime=256):
+        if not isinstance(marime, int) or marime < 0:
+            raise ValueError("Eroare: Mărimea cache-ului trebuie să fie un număr natural.")
+        self._registru = registru
+        self.marime = marime
+        self._intrari = OrderedDict()
+        self._gasite = 0
+        self._ratate = 0
+
+    def __len__(self):
+        return len(self._registru)
+
+    def _raport(self, nume, args, versiune):
+        """
+        Întoarce raportul din cache dacă versiunea lui este cea curentă, altfel îl calculează și îl păstrează.
+
+        :return: Tuplu (rezultat, din_cache).
+        """
+        cheie = (nume, args)
+        intrare = self._intrari.get(cheie)
+        if intrare is not None and intrare[0] == versiune:
+            self._intrari.move_to_end(cheie)
+            self._gasite += 1
+            return _copie(intrare[1]), True
+
+        self._ratate += 1
+        rezultat = _copie(getattr(self._registru, nume)(*args))
+        if self.marime:
+            self._intrari[cheie] = (versiune, _copie(rezultat))
+            self._intrari.move_to_end(cheie)
+            if len(self._intrari) > self.marime:
+                self._intrari.popitem(last=False)
+        return rezultat, False
+
+    def statistici(self):
+        """
+        :return: Dicționar cu numărul de rapoarte găsite în cache, numărul celor recalculate, intrările
+            păstrate și mărimea maximă a cache-ului.
+        """
+        return {"gasite": self._gasite, "ratate": self._ratate, "intrari": len(self._intrari),
+                "marime": self.marime}
+
+    def goleste_cache(self):
+        """
+        Șterge toate intrările și statisticile.
+        """
+        self._intrari.clear()
+        self._gasite = self._ratate = 0
+
+    def afiseaza_cheltuieli_tip(self, tip):
+        """
+        Cheltuielile de un anumit tip pe apartamente; depinde doar de versiunea tipului.
+        """
+        tip = validare_tip_cheltuiala(tip)
+        return self._raport("afiseaza_cheltuieli_tip", (tip,), self._registru.versiune(tip=tip))[0]
+
+    def tipareste_apartamente_sortate_dupa_tip(self, tip):
+        """
+        Cheltuielile de un anumit tip sortate după valoare; depinde doar de versiunea tipului.
+        """
+        if tip not in TIPURI_CHELTUIELI:
+            # Tipul invalid este raportat de registru (mesaj tipărit și None), ca fără cache
+            return self._registru.tipareste_apartamente_sortate_dupa_tip(tip)
+        return self._raport("tipareste_apartamente_sortate_dupa_tip", (tip,), self._registru.versiune(tip=tip))[0]
+
+    def afiseaza_apartamente_cu_cheltuieli_mai_mari_decat(self, suma):
+        """
+        Cheltuielile mai mari decât o sumă; depinde de versiunea întregului registru.
+        """
+        suma = validare_suma(suma)
+        rezultat, din_cache = self._raport("afiseaza_apartamente_cu_cheltuieli_mai_mari_decat", (suma,),
+                                           self._registru.versiune())
+        if din_cache and not rezultat:
+            print(f"Nicio cheltuială depășește suma {suma}.")
+        return rezultat
+
+    def cheltuieli_mai_mari_decat(self, suma, de_la=None):
+        """
+        Rândurile (apartament, tip, suma) cu sume mai mari decât o sumă; depinde de versiunea întregului registru.
+        """
+        suma = validare_suma(suma)
+        return iter(self._raport("cheltuieli_mai_mari_decat", (suma, de_la), self._registru.versiune())[0])
+
+    def cheltuieli_de_tip(self, tip, de_la=None):
+        """
+        Rândurile (apartament, tip, cheltuieli) ale unui tip; fără de_la depinde doar de versiunea tipului, iar
+        cu de_la de versiunea întregului registru (apartamentul de la care continuă raportul poate fi șters).
+        """
+        tip = validare_tip_cheltuiala(tip)
+        versiune = self._registru.versiune(tip=tip) if de_la is None else self._registru.versiune()
+        randuri = self._raport("cheltuieli_de_tip", (tip, de_la), versiune)[0]
+        # Listele de cheltuieli sunt copiate, ca rândurile din cache să nu poată fi modificate de apelant
+        return ((apartament, tip, list(cheltuieli)) for apartament, tip, cheltuieli in randuri)
+
+    def cheltuieli_inainte_de_o_zi(self, suma, zi, de_la=None):
+        """
+        Rândurile (apartament, tip) cu cheltuieli înainte de o zi și mai mari decât o sumă; depinde de versiunea
+        întregului registru.
+        """
+        suma = validare_suma(suma)
+        return iter(self._raport("cheltuieli_inainte_de_o_zi", (suma, zi, de_la), self._registru.versiune())[0])
+
+    def __getattr__(self, nume):
+        atribut = getattr(self._registru, nume)
+        if not callable(atribut):
+            return atribut
+
+        def operatie(*args, **kwargs):
+            rezultat = atribut(*args, **kwargs)
+            # Modificările întorc registrul; apelantul păstrează în continuare registrul cu cache
+            if rezultat is self._registru:
+                return self
+            if isinstance(rezultat, tuple) and rezultat and rezultat[0] is self._registru:
+                return (self,) + rezultat[1:]
+            return rezultat
+
+        return operatie
+
+
+def _copie(rezultat):
+    return list(rezultat) if rezultat is not None else None
+
+
+def _registru_exemplu():
+    return ExpenseStore.din_dictionar({
+        1: {"apa": [(230.0, "2023-10-30"), (20.0, "2023-01-01")], "gaz": [(50.0, "2023-10-29")]},
+        2: {"apa": [(120.0, "2023-10-28")], "gaz": [(40.0, "2023-10-30")]},
+    })
+
+
+def test_cache_rapoarte(fabrica=_registru_exemplu):
+    registru = RegistruCuCache(fabrica())
+    gaz = bussines.afiseaza_cheltuieli_tip(registru, "gaz")
+    sortate_apa = registru.tipareste_apartamente_sortate_dupa_tip("apa")
+    peste = registru.afiseaza_apartamente_cu_cheltuieli_mai_mari_decat(100)
+    assert registru.statistici() == {"gasite": 0, "ratate": 3, "intrari": 3, "marime": 256}
+
+    assert bussines.afiseaza_cheltuieli_tip(registru, "gaz") == gaz
+    assert registru.tipareste_apartamente_sortate_dupa_tip("apa") == sortate_apa
+    assert registru.afiseaza_apartamente_cu_cheltuieli_mai_mari_decat(100.0) == peste
+    assert registru.statistici()["gasite"] == 3
+
+    # Un rezultat modificat de apelant nu schimbă intrarea din cache
+    gaz.clear()
+    assert registru.afiseaza_cheltuieli_tip("gaz") != []
+
+    # Modificarea unui tip invalidează rapoartele acelui tip și pe cele ale întregului registru, nu și pe celelalte
+    registru, erori = bussines.adauga_cheltuieli_bulk(registru, [(2, "apa", 500, "2023-11-01")])
+    assert isinstance(registru, RegistruCuCache) and erori == []
+    inainte = registru.statistici()
+    assert registru.afiseaza_cheltuieli_tip("gaz") == ["Apartamentul 1: Cheltuiala de tip gaz este "
+                                                       "[(50.0, '2023-10-29')].",
+                                                       "Apartamentul 2: Cheltuiala de tip gaz este "
+                                                       "[(40.0, '2023-10-30')]."]
+    assert registru.tipareste_apartamente_sortate_dupa_tip("apa")[-1] == (500.0, "2023-11-01")
+    assert len(registru.afiseaza_apartamente_cu_cheltuieli_mai_mari_decat(100)) == len(peste) + 1
+    dupa = registru.statistici()
+    assert (dupa["gasite"] - inainte["gasite"], dupa["ratate"] - inainte["ratate"]) == (1, 2)
+
+    registru = bussines.sterge_cheltuieli_tip(registru, "gaz")
+    assert registru.afiseaza_cheltuieli_tip("gaz") == []
+    assert registru.tipareste_apartamente_sortate_dupa_tip("gazz") is None
+
+    try:
+        registru.afiseaza_cheltuieli_tip("gazz")
+        assert False
+    except ValueError:
+        assert True
+
+
+def test_cache_lru():
+    registru = RegistruCuCache(_registru_exemplu(), marime=2)
+    for tip in ("apa", "gaz", "apa", "lumina", "gaz"):
+        registru.afiseaza_cheltuieli_tip(tip)
+
+    # "gaz" a fost scos la adăugarea lui "lumina", fiind cel mai vechi folosit
+    assert registru.statistici() == {"gasite": 1, "ratate": 4, "intrari": 2, "marime": 2}
+
+    fara_cache = RegistruCuCache(_registru_exemplu(), marime=0)
+    fara_cache.afiseaza_cheltuieli_tip("apa")
+    fara_cache.afiseaza_cheltuieli_tip("apa")
+    assert fara_cache.statistici() == {"gasite": 0, "ratate": 2, "intrari": 0, "marime": 0}
+
+    try:
+        RegistruCuCache(_registru_exemplu(), marime=-1)
+        assert False
+    except ValueError:
+        assert True
+
+
+def test_cache_randuri(fabrica=_registru_exemplu):
+    registru = RegistruCuCache(fabrica())
+    peste = list(bussines.cheltuieli_mai_mari_decat(registru, 45))
+    gaz = list(bussines.cheltuieli_de_tip(registru, "gaz"))
+    inainte = list(bussines.cheltuieli_inainte_de_o_zi(registru, 30, "2023-10-30"))
+    assert registru.statistici()["ratate"] == 3
+
+    assert list(bussines.cheltuieli_mai_mari_decat(registru, 45.0)) == peste == [
+        (1, "apa", 230.0), (1, "gaz", 50.0), (2, "apa", 120.0)]
+    assert list(bussines.cheltuieli_de_tip(registru, "gaz")) == gaz
+    assert list(bussines.cheltuieli_inainte_de_o_zi(registru, 30, "2023-10-30")) == inainte == [(1, "gaz"),
+                                                                                                 (2, "apa")]
+    assert registru.statistici()["gasite"] == 3
+
+    # Listele din rânduri sunt copii
+    next(bussines.cheltuieli_de_tip(registru, "gaz"))[2].clear()
+    assert list(bussines.cheltuieli_de_tip(registru, "gaz")) == gaz
+
+    # O modificare a tipului apa invalidează rapoartele pe tot registrul, nu și cheltuielile de tip gaz
+    registru = bussines.adauga_cheltuiala(registru, 2, "apa", 60, "2023-10-01")
+    inainte = registru.statistici()
+    assert list(bussines.cheltuieli_mai_mari_decat(registru, 45))[-1] == (2, "apa", 60.0)
+    assert list(bussines.cheltuieli_de_tip(registru, "gaz")) == gaz
+    assert list(bussines.cheltuieli_inainte_de_o_zi(registru, 30, "2023-10-30")) == [(1, "gaz"), (2, "apa"),
+                                                                                      (2, "apa")]
+    dupa = registru.statistici()
+    assert (dupa["gasite"] - inainte["gasite"], dupa["ratate"] - inainte["ratate"]) == (1, 2)
+
+    for argumente in (("cheltuieli_mai_mari_decat", "abc"), ("cheltuieli_de_tip", "gazz")):
+        try:
+            getattr(bussines, argumente[0])(registru, argumente[1])
+            assert False
+        except ValueError:
+            assert True
+
+
+def test_cache_meniu():
+    import builtins
+    import contextlib
+    import io
+    import ui
+
+    registru = RegistruCuCache(_registru_exemplu())
+    raspunsuri = iter(["6", "45", "6", "45", "7", "gaz", "7", "gaz", "8", "30", "2023-10-30", "8", "30", "2023-10-30",
+                       "16"])
+    citeste = builtins.input
+    builtins.input = lambda mesaj="": next(raspunsuri)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()) as iesire:
+            ui.main(registru)
+    finally:
+        builtins.input = citeste
+
+    # Opțiunile 6, 7 și 8 cerute a doua oară sunt luate din cache
+    assert registru.statistici() == {"gasite": 3, "ratate": 3, "intrari": 3, "marime": 256}
+    linii = iesire.getvalue().splitlines()
+    for linie in ("Apartamentul 2 | Cheltuiala: apa | Suma ce depășește: 120.0.",
+                  "Apartamentul 1: Cheltuiala de tip gaz este [(50.0, '2023-10-29')].",
+                  "Apartament 2: Cheltuiala apa efectuată înainte de 2023-10-30 și mai mare decât 30."):
+        assert linii.count(linie) == 2, linie
+
+
+def test_cache_sqlite():
+    from sqlite_store import SqliteStore
+
+    def fabrica():
+        return SqliteStore.din_dictionar(_registru_exemplu().ca_dictionar())
+
+    test_cache_rapoarte(fabrica)
+    test_cache_randuri(fabrica)
+
+
+if __name__ == "__main__":
+    test_cache_rapoarte()
+    test_cache_lru()
+    test_cache_randuri()
+    test_cache_meniu()
+    test_cache_sqlite()
@@ -0,0 +1,352 @@
+"""
+Modul neinteractiv: rulează un fișier de comenzi (main.py --script FISIER, sau --script - pentru stdin).
+
+Limbajul are o comandă pe linie; liniile goale și cele care încep cu # sunt ignorate:
+    add AP TIP SUMA ZI                  modify AP TIP SUMA_VECHE SUMA_NOUA
+    delete AP                           delete-range START END
+    delete-type TIP                     remove-below SUMA
+    import FISIER                       export FISIER
+    report sum TIP                      report total AP
+    report range START END [TIP]        report type TIP
+    report above SUMA                   report before SUMA ZI
+    report sorted TIP                   report group CHEIE [AGREGARE]
+    report period START END LUNA_START LUNA_END [TIP]
+    report months START END PAS [TIP]
+    report top K [TIP] [AP]
+
+Comenzile add (respectiv modify) consecutive sunt aplicate împreună, printr-un singur apel
+adauga_cheltuieli_bulk (modifica_cheltuieli). Ieșirea este scrisă în blocuri, iar erorile sunt raportate
+pe fluxul de erori cu numărul liniei.
+"""
+import io
+import sys
+from contextlib import redirect_stdout
+
+from bussines import (adauga_cheltuieli_bulk, modifica_cheltuieli, sterge_apartament, sterge_apartamente_consecutive,
+                      sterge_cheltuieli_tip, elimina_cheltuieli_mai_mici_decat, suma_cheltuieli_tip,
+                      calculeaza_total_cheltuieli, totaluri_interval, totaluri_perioada, totaluri_pe_perioade,
+                      cheltuieli_mai_mari_decat, cheltuieli_de_tip, cheltuieli_inainte_de_o_zi, top_k,
+                      formateaza_cheltuiala, formateaza_cheltuiala_mai_mare, formateaza_cheltuieli_de_tip,
+                      formateaza_cheltuiala_inainte_de_o_zi, tipareste_apartamente_sortate_dupa_tip, group_by,
+                      validare_suma, validare_tip_cheltuiala)
+from import_export import importa, exporta
+
+SINTAXA = {
+    "add": "add AP TIP SUMA ZI",
+    "modify": "modify AP TIP SUMA_VECHE SUMA_NOUA",
+    "delete": "delete AP",
+    "delete-range": "delete-range START END",
+    "delete-type": "delete-type TIP",
+    "remove-below": "remove-below SUMA",
+    "import": "import FISIER",
+    "export": "export FISIER",
+    "report sum": "report sum TIP",
+    "report total": "report total AP",
+    "report range": "report range START END [TIP]",
+    "report type": "report type TIP",
+    "report above": "report above SUMA",
+    "report before": "report before SUMA ZI",
+    "report sorted": "report sorted TIP",
+    "report group": "report group CHEIE [AGREGARE]",
+    "report period": "report period START END LUNA_START LUNA_END [TIP]",
+    "report months": "report months START END PAS [TIP]",
+    "report top": "report top K [TIP] [AP]",
+}
+LINII_PE_BLOC = 4096
+
+
+def _apartament(text):
+    try:
+        return int(text)
+    except ValueError:
+        raise ValueError("Eroare: Numărul apartamentului trebuie să fie un număr întreg.")
+
+
+def _numar(text):
+    try:
+        return int(text)
+    except ValueError:
+        raise ValueError("Eroare: Numărul de rezultate trebuie să fie un număr natural nenul.")
+
+
+def _argumente(comanda, cuvinte):
+    """
+    Verifică numărul de argumente ale unei comenzi.
+
+    :param comanda: Cheia din SINTAXA.
+    :param cuvinte: Argumentele de după numele comenzii.
+    :return: Argumentele, completate cu None pentru cele opționale lipsă.
+    :raises: ValueError dacă numărul argumentelor nu corespunde sintaxei.
+    """
+    forma = SINTAXA[comanda].split()[len(comanda.split()):]
+    obligatorii = sum(not parte.startswith("[") for parte in forma)
+    if not obligatorii <= len(cuvinte) <= len(forma):
+        raise ValueError(f"Eroare: Comanda are forma '{SINTAXA[comanda]}'.")
+    return cuvinte + [None] * (len(forma) - len(cuvinte))
+
+
+class _Executor:
+    def __init__(self, apartamente, iesire, erori):
+        self.apartamente = apartamente
+        self._iesire = iesire
+        self._erori = erori
+        self._tampon = io.StringIO()
+        self._linii_erori = []
+        self._lot = []  # (număr linie, înregistrare sau corectură) pentru comenzile add / modify în așteptare
+        self._comanda_lot = None
+        self.comenzi = 0
+        self.numar_erori = 0
+
+    def eroare(self, numar_linie, mesaj):
+        self.numar_erori += 1
+        self._linii_erori.append(f"Linia {numar_linie}: {mesaj}\n")
+
+    def goleste(self):
+        self._iesire.write(self._tampon.getvalue())
+        self._tampon.seek(0)
+        self._tampon.truncate()
+        self._erori.write("".join(self._linii_erori))
+        self._linii_erori.clear()
+
+    def scrie(self, linie):
+        # Rapoartele lungi sunt scrise pe măsură ce sunt parcurse, nu ținute întregi în tampon
+        self._tampon.write(linie + "\n")
+        if self._tampon.tell() // 64 >= LINII_PE_BLOC:
+            self.goleste()
+
+    def aplica_lotul(self):
+        if not self._lot:
+            return
+        numere_linii = [numar_linie for numar_linie, _ in self._lot]
+        elemente = [element for _, element in self._lot]
+        try:
+            if self._comanda_lot == "add":
+                self.apartamente, erori = adauga_cheltuieli_bulk(self.apartamente, elemente)
+            else:
+                self.apartamente, erori = modifica_cheltuieli(self.apartamente, elemente)
+        except ValueError as e:
+            # Registrul a respins tot lotul (de exemplu o vedere doar pentru citire)
+            erori = [(pozitie, str(e)) for pozitie in range(len(elemente))]
+        for pozitie, mesaj in erori:
+            self.eroare(numere_linii[pozitie], mesaj)
+        self._lot = []
+        self._comanda_lot = None
+
+    def ruleaza(self, linii):
+        # Mesajele tipărite de funcțiile din bussines ajung în același tampon, în ordine
+        with redirect_stdout(self._tampon):
+            for numar_linie, linie in enumerate(linii, 1):
+                cuvinte = linie.split()
+                if not cuvinte or cuvinte[0].startswith("#"):
+                    continue
+                self.comenzi += 1
+                try:
+                    self.executa(numar_linie, cuvinte)
+                except ValueError as e:
+                    self.eroare(numar_linie, str(e))
+                except OSError as e:
+                    self.eroare(numar_linie, f"Eroare: {e}")
+                if len(self._linii_erori) + self._tampon.tell() // 64 >= LINII_PE_BLOC:
+                    self.goleste()
+            self.aplica_lotul()
+        self.goleste()
+
+    def executa(self, numar_linie, cuvinte):
+        comanda = cuvinte[0]
+        if comanda in ("add", "modify"):
+            ap, tip, prima, a_doua = _argumente(comanda, cuvinte[1:])
+            element = (_apartament(ap), tip, prima, a_doua) if comanda == "add" else \
+                (_apartament(ap), tip, validare_suma(prima), validare_suma(a_doua))
+            if self._comanda_lot != comanda:
+                self.aplica_lotul()
+                self._comanda_lot = comanda
+            self._lot.append((numar_linie, element))
+            return
+
+        self.aplica_lotul()
+        if comanda == "report":
+            if len(cuvinte) < 2 or f"report {cuvinte[1]}" not in SINTAXA:
+                raise ValueError(f"Eroare: Raportul '{' '.join(cuvinte[1:2])}' nu există; rapoartele sunt: "
+                                 f"{', '.join(nume.split()[1] for nume in SINTAXA if nume.startswith('report'))}.")
+            self.raport(cuvinte[1], _argumente(f"report {cuvinte[1]}", cuvinte[2:]))
+            return
+        if comanda not in SINTAXA:
+            raise ValueError(f"Eroare: Comanda '{comanda}' nu există.")
+
+        argumente = _argumente(comanda, cuvinte[1:])
+        if comanda == "delete":
+            self.apartamente = sterge_apartament(self.apartamente, _apartament(argumente[0]))
+        elif comanda == "delete-range":
+            self.apartamente = sterge_apartamente_consecutive(self.apartamente, _apartament(argumente[0]),
+                                                              _apartament(argumente[1]))
+        elif comanda == "delete-type":
+            self.apartamente = sterge_cheltuieli_tip(self.apartamente, argumente[0])
+        elif comanda == "remove-below":
+            self.apartamente = elimina_cheltuieli_mai_mici_decat(self.apartamente, validare_suma(argumente[0]))
+        elif comanda == "import":
+            self.apartamente, statistici = importa(self.apartamente, argumente[0])
+            print(f"Importate: {statistici['importate']}, respinse: {statistici['respinse']}.")
+        else:
+            print(f"Exportate: {exporta(self.apartamente, argumente[0])} cheltuieli.")
+
+    def raport(self, nume, argumente):
+        if nume == "sum":
+            tip = validare_tip_cheltuiala(argumente[0])
+            print(f"Suma cheltuielilor de tip '{tip}' este: {suma_cheltuieli_tip(self.apartamente, tip)}")
+        elif nume == "total":
+            apartament = _apartament(argumente[0])
+            total = calculeaza_total_cheltuieli(self.apartamente, apartament)
+            print(f"Total cheltuieli pentru apartamentul {apartament}: {total}" if total is not None else
+                  f"Apartamentul {apartament} nu există în înregistrări.")
+        elif nume == "range":
+            start, sfarsit = _apartament(argumente[0]), _apartament(argumente[1])
+            total, numar = totaluri_interval(self.apartamente, start, sfarsit, argumente[2])
+            print(f"Apartamentele {start}-{sfarsit}: {numar} cheltuieli, total {total}")
+        elif nume == "period":
+            start, sfarsit = _apartament(argumente[0]), _apartament(argumente[1])
+            total, numar = totaluri_perioada(self.apartamente, start, sfarsit, *argumente[2:])
+            print(f"Apartamentele {start}-{sfarsit}, lunile {argumente[2]} - {argumente[3]}: {numar} cheltuieli, "
+                  f"total {total}")
+        elif nume == "months":
+            start, sfarsit = _apartament(argumente[0]), _apartament(argumente[1])
+            for perioada, suma in totaluri_pe_perioade(self.apartamente, start, sfarsit, tip=argumente[3],
+                                                       pas=argumente[2]).items():
+                self.scrie(f"{perioada}: {suma}")
+        elif nume == "top":
+            apartament = _apartament(argumente[2]) if argumente[2] is not None else None
+            for rand in top_k(self.apartamente, argumente[1], apartament, _numar(argumente[0])):
+                self.scrie(formateaza_cheltuiala(*rand))
+        elif nume == "sorted":
+            tip = validare_tip_cheltuiala(argumente[0])
+            rezultat = tipareste_apartamente_sortate_dupa_tip(self.apartamente, tip)
+            if not rezultat:
+                print(f"Niciun apartament nu are cheltuieli de tipul '{tip}'.")
+            else:
+                print(f"Cheltuieli de tip '{tip}', sortate după sumă:")
+                for suma, data in rezultat:
+                    print(f"  - Suma: {suma}, Data: {data}")
+        elif nume == "group":
+            grupuri = group_by(self.apartamente, argumente[0], argumente[1] or "sum")
+            for cheie, valoare in grupuri.items():
+                print(f"{cheie}: {valoare}")
+        elif nume == "type":
+            for rand in cheltuieli_de_tip(self.apartamente, argumente[0]):
+                self.scrie(formateaza_cheltuieli_de_tip(*rand))
+        elif nume == "above":
+            suma = validare_suma(argumente[0])
+            gasite = False
+            for rand in cheltuieli_mai_mari_decat(self.apartamente, suma):
+                self.scrie(formateaza_cheltuiala_mai_mare(*rand))
+                gasite = True
+            if not gasite:
+                print(f"Nicio cheltuială depășește suma {suma}.")
+        else:
+            suma, zi = validare_suma(argumente[0]), argumente[1]
+            for apartament, tip in cheltuieli_inainte_de_o_zi(self.apartamente, suma, zi):
+                self.scrie(formateaza_cheltuiala_inainte_de_o_zi(apartament, tip, suma, zi))
+
+
+def ruleaza_script(apartamente, linii, iesire=None, erori=None):
+    """
+    Rulează comenzile, în ordine, pe registru.
+
+    :param apartamente: Registrul (dicționarul clasic sau un depozit).
+    :param linii: Iterabil de linii de comandă (de exemplu un fișier deschis).
+    :param iesire: Fluxul pentru rezultatele rapoartelor (implicit sys.stdout).
+    :param erori: Fluxul pentru erori (implicit sys.stderr).
+    :return: Tuplu (apartamente, statistici), statistici fiind {"comenzi": ..., "erori": ...}.
+    """
+    executor = _Executor(apartamente, iesire or sys.stdout, erori or sys.stderr)
+    executor.ruleaza(linii)
+    return executor.apartamente, {"comenzi": executor.comenzi, "erori": executor.numar_erori}
+
+
+SCRIPT_EXEMPLU = """\
+# Cheltuielile lunii
+add 101 apa 50.0 2023-11-02
+add 101 gaz 80 2023-11-03
+add 102 apa 20 2023-11-03
+add 103 internet 5 2023-11-03
+add 104 lumina 30 2023-11-31
+report sum apa
+modify 101 apa 50 55
+modify 102 apa 999 1
+report total 101
+report total 7
+report range 100 102 apa
+report sorted apa
+delete 103
+delete-range 102 104
+report group apartament
+remove-below abc
+report avg apa
+stergere 1
+add 105 apa
+report period 100 102 2023-11 2023-11 gaz
+report months 101 101 an
+report top 1 gaz
+"""
+
+
+def test_ruleaza_script(fabrica=dict):
+    import instrumentare
+
+    iesire, erori = io.StringIO(), io.StringIO()
+    masurare = instrumentare.activeaza()
+    try:
+        apartamente, statistici = ruleaza_script(fabrica(), io.StringIO(SCRIPT_EXEMPLU), iesire, erori)
+        apeluri = {linie["nume"]: linie["apeluri"] for linie in masurare.raport()}
+    finally:
+        instrumentare.dezactiveaza()
+
+    # Cele cinci adăugări consecutive sunt un singur lot, la fel cele două corecturi
+    assert apeluri["adauga_cheltuieli_bulk"] == 1 and apeluri["modifica_cheltuieli"] == 1
+    assert "adauga_cheltuiala" not in apeluri
+    assert statistici == {"comenzi": 22, "erori": 8}
+    assert iesire.getvalue().splitlines() == [
+        "Suma cheltuielilor de tip 'apa' este: 70.0",
+        "Total cheltuieli pentru apartamentul 101: 135.0",
+        "Apartamentul 7 nu există în înregistrări.",
+        "Apartamentele 100-102: 2 cheltuieli, total 75.0",
+        "Cheltuieli de tip 'apa', sortate după sumă:",
+        "  - Suma: 20.0, Data: 2023-11-03",
+        "  - Suma: 55.0, Data: 2023-11-02",
+        "101: 135.0",
+        "Apartamentele 100-102, lunile 2023-11 - 2023-11: 1 cheltuieli, total 80.0",
+        "2023: 135.0",
+        "Apartamentul 101: gaz 80.0 (2023-11-03)",
+    ]
+    assert [linie.split(":")[0] for linie in erori.getvalue().splitlines()] == \
+        ["Linia 5", "Linia 6", "Linia 9", "Linia 14", "Linia 17", "Linia 18", "Linia 19", "Linia 20"]
+    assert erori.getvalue().splitlines()[3] == "Linia 14: Eroare: Apartamentul nu există în înregistrări."
+    assert erori.getvalue().splitlines()[7] == "Linia 20: Eroare: Comanda are forma 'add AP TIP SUMA ZI'."
+    registru = apartamente if isinstance(apartamente, dict) else apartamente.ca_dictionar()
+    assert registru == {101: {"apa": [(55.0, "2023-11-02")], "gaz": [(80.0, "2023-11-03")]}}
+
+
+def test_ruleaza_script_store():
+    from store import ExpenseStore
+    test_ruleaza_script(ExpenseStore)
+
+
+def test_ruleaza_script_fisiere():
+    import os
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as director:
+        cale = os.path.join(director, "export.csv")
+        iesire, erori = io.StringIO(), io.StringIO()
+        apartamente, _ = ruleaza_script({}, ["add 1 apa 10 2023-01-01", f"export {cale}", "delete 1",
+                                             f"import {cale}", f"import {os.path.join(director, 'lipsa.csv')}",
+                                             "report above 1000", "report type apa"], iesire, erori)
+        assert iesire.getvalue().splitlines() == [
+            "Exportate: 1 cheltuieli.", "Importate: 1, respinse: 0.", "Nicio cheltuială depășește suma 1000.0.",
+            "Apartamentul 1: Cheltuiala de tip apa este [(10.0, '2023-01-01')]."]
+        assert erori.getvalue().startswith("Linia 5: Eroare:")
+        assert apartamente == {1: {"apa": [(10.0, "2023-01-01")]}}
+
+
+if __name__ == "__main__":
+    test_ruleaza_script()
+    test_ruleaza_script_store()
+    test_ruleaza_script_fisiere()
@@ -0,0 +1,256 @@
+"""
+Registru care poate fi folosit din mai multe fire de execuție (de exemplu o interfață web și un import).
+
+Funcțiile din bussines.py modifică dicționarul pe loc, iar un raport care parcurge `apartamente.items()` în
+timp ce alt fir șterge un apartament se oprește cu "dictionary changed size during iteration". RegistruConcurent
+pune fiecare operație sub o blocare cititori–scriitor: rapoartele rulează simultan, modificările rulează singure.
+"""
+import io
+import threading
+from contextlib import contextmanager, redirect_stdout
+
+import bussines
+from persistenta import MUTATORI
+
+# Operațiile care doar citesc registrul; toate celelalte metode ale registrului învelit rulează exclusiv
+CITIRI = frozenset({
+    "itereaza_cheltuieli", "afiseaza_apartamente_cu_cheltuieli_mai_mari_decat", "afiseaza_cheltuieli_tip",
+    "afiseaza_cheltuieli_inainte_de_o_zi", "tipareste_apartamente_sortate_dupa_tip", "suma_cheltuieli_tip",
+    "calculeaza_total_cheltuieli", "totaluri_interval", "group_by", "versiune", "cheltuieli_mai_mari_decat",
+    "cheltuieli_de_tip", "cheltuieli_inainte_de_o_zi", "totaluri_perioada", "totaluri_pe_perioade",
+    "top_k",
+})
+
+# Citirile care întorc generatoare: rândurile sunt produse cât timp blocarea este ținută
+GENERATOARE = frozenset({"itereaza_cheltuieli", "cheltuieli_mai_mari_decat", "cheltuieli_de_tip",
+                         "cheltuieli_inainte_de_o_zi"})
+
+# Operațiile pe care bussines.py le are ca funcții; celelalte sunt metode ale registrului învelit
+OPERATII_BUSSINES = frozenset(nume for nume in CITIRI | MUTATORI if hasattr(bussines, nume))
+
+
+class BlocareCititoriScriitor:
+    """
+    Blocare care permite mai mulți cititori simultan sau un singur scriitor.
+
+    Un scriitor care așteaptă oprește intrarea cititorilor noi, așa că un flux continuu de rapoarte nu poate
+    amâna la nesfârșit o modificare. Blocarea nu este reentrantă.
+    """
+
+    def __init__(self):
+        self._conditie = threading.Condition(threading.Lock())
+        self._cititori = 0
+        self._scriitor_activ = False
+        self._scriitori_in_asteptare = 0
+
+    @contextmanager
+    def citire(self):
+        with self._conditie:
+            while self._scriitor_activ or self._scriitori_in_asteptare:
+                self._conditie.wait()
+            self._cititori += 1
+        try:
+            yield
+        finally:
+            with self._conditie:
+                self._cititori -= 1
+                if not self._cititori:
+                    self._conditie.notify_all()
+
+    @contextmanager
+    def scriere(self):
+        with self._conditie:
+            self._scriitori_in_asteptare += 1
+            try:
+                while self._scriitor_activ or self._cititori:
+                    self._conditie.wait()
+            finally:
+                self._scriitori_in_asteptare -= 1
+            self._scriitor_activ = True
+        try:
+            yield
+        finally:
+            with self._conditie:
+                self._scriitor_activ = False
+                self._conditie.notify_all()
+
+
+class RegistruConcurent:
+    """
+    Registru sigur pentru mai multe fire de execuție, peste un dicționar sau un depozit din memorie
+    (ExpenseStore, RegistruVersionat); poate fi transmis funcțiilor din bussines.py.
+
+    Modificările întorc registrul concurent, iar registrul întors de operația învelită (de exemplu copia
+    făcută de sterge_apartamente_consecutive pe dicționar) îl înlocuiește pe cel vechi. Un SqliteStore nu
+    poate fi învelit, conexiunea lui fiind legată de firul care a creat-o.
+    """
+
+    def __init__(self, registru=None):
+        self._registru = {} if registru is None else registru
+        self.blocare = BlocareCititoriScriitor()
+
+    def __len__(self):
+        with self.blocare.citire():
+            return len(self._registru)
+
+    def ca_dictionar(self):
+        """
+        :return: O copie a registrului ca dicționar {apartament: {tip: [(suma, zi), ...]}}.
+        """
+        with self.blocare.citire():
+            if isinstance(self._registru, dict):
+                return {apartament: {tip: list(lista_cheltuieli) for tip, lista_cheltuieli in cheltuieli.items()}
+                        for apartament, cheltuieli in self._registru.items()}
+            return self._registru.ca_dictionar()
+
+    def _functie(self, nume):
+        # Dicționarul nu are metode: operațiile lui sunt funcțiile din bussines.py
+        if nume in OPERATII_BUSSINES:
+            functie = getattr(bussines, nume)
+            return lambda *args, **kwargs: functie(self._registru, *args, **kwargs)
+        return getattr(self._registru, nume)
+
+    def __getattr__(self, nume):
+        if nume.startswith("_"):
+            raise AttributeError(nume)
+        if nume not in OPERATII_BUSSINES:
+            atribut = getattr(self._registru, nume)
+            if not callable(atribut):
+                return atribut
+
+        if nume in CITIRI:
+            def citire(*args, **kwargs):
+                with self.blocare.citire():
+                    rezultat = self._functie(nume)(*args, **kwargs)
+                    return iter(list(rezultat)) if nume in GENERATOARE else rezultat
+
+            return citire
+
+        def scriere(*args, **kwargs):
+            with self.blocare.scriere():
+                rezultat = self._functie(nume)(*args, **kwargs)
+                tip_registru = type(self._registru)
+                if isinstance(rezultat, tip_registru):
+                    self._registru = rezultat
+                    return self
+                if isinstance(rezultat, tuple) and rezultat and isinstance(rezultat[0], tip_registru):
+                    self._registru = rezultat[0]
+                    return (self,) + rezultat[1:]
+                return rezultat
+
+        return scriere
+
+
+def _operatii_fir(fir, numar=150):
+    """
+    Modificările unui fir din testul de stres; fiecare fir lucrează pe apartamentele lui, deci starea finală
+    nu depinde de ordinea în care se intercalează firele.
+    """
+    baza = fir * 1000
+    for pas in range(numar):
+        apartament = baza + pas % 40
+        yield "adauga_cheltuiala", (apartament, ("apa", "gaz", "lumina")[pas % 3], pas + 1, "2023-10-30")
+        if pas % 7 == 6:
+            yield "modifica_cheltuiala", (apartament, ("apa", "gaz", "lumina")[pas % 3], pas + 1, pas + 1000)
+        if pas % 11 == 10:
+            yield "sterge_apartament", (baza + (pas * 3) % 40,)
+        if pas % 31 == 30:
+            yield "sterge_apartamente_consecutive", (baza + 5, baza + 9)
+        if pas % 13 == 12:
+            # Nicio sumă nu este sub 1, deci lista este rescrisă pe loc fără să se schimbe
+            yield "elimina_cheltuieli_mai_mici_decat", (1,)
+
+
+def _aplica_operatii(registru, operatii):
+    for nume, args in operatii:
+        try:
+            rezultat = getattr(bussines, nume)(registru, *args)
+        except ValueError:
+            continue
+        registru = rezultat
+    return registru
+
+
+def test_blocare_cititori_scriitor():
+    blocare = BlocareCititoriScriitor()
+    ambii_cititori = threading.Barrier(2, timeout=5)
+
+    def cititor():
+        with blocare.citire():
+            ambii_cititori.wait()  # Trece doar dacă cei doi cititori țin blocarea în același timp
+
+    fire = [threading.Thread(target=cititor) for _ in range(2)]
+    for fir in fire:
+        fir.start()
+    for fir in fire:
+        fir.join()
+    assert not ambii_cititori.broken
+
+    in_scriere = threading.Event()
+
+    def scriitor():
+        with blocare.scriere():
+            in_scriere.set()
+
+    with blocare.citire():
+        fir = threading.Thread(target=scriitor)
+        fir.start()
+        assert not in_scriere.wait(0.1)
+    fir.join(5)
+    assert in_scriere.is_set()
+
+
+def test_registru_concurent(fabrica=dict, numar_fire=4):
+    registru = RegistruConcurent(fabrica())
+    erori = []
+    gata = threading.Event()
+
+    def modificari(fir):
+        try:
+            _aplica_operatii(registru, _operatii_fir(fir))
+        except Exception as e:
+            erori.append(e)
+
+    def rapoarte():
+        try:
+            while not gata.is_set():
+                bussines.afiseaza_apartamente_cu_cheltuieli_mai_mari_decat(registru, 10 ** 9)
+                bussines.group_by(registru, "apartament")
+                bussines.totaluri_interval(registru, 1, 4000, "gaz")
+                sum(1 for _ in bussines.itereaza_cheltuieli(registru))
+                sum(1 for _ in bussines.cheltuieli_inainte_de_o_zi(registru, 50, "2023-06-01"))
+                registru.ca_dictionar()
+        except Exception as e:
+            erori.append(e)
+
+    cititori = [threading.Thread(target=rapoarte) for _ in range(numar_fire)]
+    scriitori = [threading.Thread(target=modificari, args=(fir,)) for fir in range(1, numar_fire + 1)]
+    with redirect_stdout(io.StringIO()):
+        for fir in cititori + scriitori:
+            fir.start()
+        for fir in scriitori:
+            fir.join()
+        gata.set()
+        for fir in cititori:
+            fir.join()
+
+    assert erori == []
+    asteptat = {}
+    for fir in range(1, numar_fire + 1):
+        asteptat.update(_aplica_operatii({}, _operatii_fir(fir)))
+    assert registru.ca_dictionar() == asteptat
+    assert bussines.adauga_cheltuiala(registru, 1, "apa", 1, "2023-10-30") is registru
+
+
+def test_registru_concurent_store():
+    from registru_versionat import RegistruVersionat
+    from store import ExpenseStore
+
+    test_registru_concurent(ExpenseStore)
+    test_registru_concurent(RegistruVersionat)
+
+
+if __name__ == "__main__":
+    test_blocare_cititori_scriitor()
+    test_registru_concurent()
+    test_registru_concurent_store()
@@ -0,0 +1,339 @@
+"""
+Importul și exportul cheltuielilor din fișiere CSV sau JSONL, în flux.
+
+Fișierul este citit pe loturi: fiecare lot este interpretat, validat cu regulile validare_* și adăugat în
+registru cu adauga_cheltuieli_bulk, deci memoria folosită nu depinde de mărimea fișierului. Rândurile
+respinse sunt scrise, împreună cu motivul, într-un fișier separat.
+"""
+import csv
+import json
+import os
+import shutil
+import tempfile
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from bussines import TIPURI_CHELTUIELI, adauga_cheltuieli_bulk, itereaza_cheltuieli, validare_inregistrare
+from store import ExpenseStore, COD_TIP, _format_zi, fara_colector_ciclic, validare_apartament_coloana
+
+CAMPURI = ("apartament", "tip", "suma", "zi")
+FORMATE = ("csv", "jsonl")
+
+
+def format_fisier(cale, format_cerut=None):
+    """
+    Stabilește formatul unui fișier de cheltuieli.
+
+    :param cale: Calea fișierului.
+    :param format_cerut: 'csv', 'jsonl' sau None (formatul se deduce din extensie).
+    :return: Formatul fișierului.
+    :raises: ValueError dacă formatul cerut nu este cunoscut.
+    """
+    if format_cerut is None:
+        return "jsonl" if os.path.splitext(cale)[1].lower() in (".jsonl", ".ndjson") else "csv"
+    if format_cerut not in FORMATE:
+        raise ValueError("Eroare: Formatul fișierului trebuie să fie 'csv' sau 'jsonl'.")
+    return format_cerut
+
+
+def _randuri_csv(fisier):
+    cititor = csv.reader(fisier)
+    antet = next(cititor, None)
+    if antet is not None and tuple(antet) != CAMPURI:
+        yield 1, antet
+    yield from enumerate(cititor, 2)
+
+
+def _randuri_jsonl(fisier):
+    for numar_linie, linie in enumerate(fisier, 1):
+        if not linie.strip():
+            continue
+        try:
+            obiect = json.loads(linie)
+        except ValueError:
+            yield numar_linie, [linie.rstrip("\n")]
+            continue
+        yield numar_linie, [obiect.get(camp) for camp in CAMPURI] if isinstance(obiect, dict) else obiect
+
+
+def citeste_randuri(fisier, format_cerut="csv"):
+    """
+    Citește rândurile brute dintr-un fișier deschis.
+
+    :param fisier: Fișierul text deschis.
+    :param format_cerut: 'csv' (antetul apartament,tip,suma,zi este opțional) sau 'jsonl' (un obiect
+        {"apartament", "tip", "suma", "zi"} sau o listă de patru valori pe linie).
+    :return: Generator de perechi (număr linie, listă de câmpuri).
+    """
+    return _randuri_csv(fisier) if format_cerut == "csv" else _randuri_jsonl(fisier)
+
+
+def _interpreteaza(campuri):
+    """
+    Aduce numărul apartamentului la int; celelalte câmpuri sunt validate de adauga_cheltuieli_bulk.
+    """
+    if not isinstance(campuri, list) or len(campuri) != len(CAMPURI):
+        raise ValueError("Eroare: Înregistrarea trebuie să aibă forma (apartament, tip, suma, zi).")
+    apartament, tip, suma, zi = campuri
+    if isinstance(apartament, str):
+        try:
+            apartament = int(apartament)
+        except ValueError:
+            raise ValueError("Eroare: Numărul apartamentului trebuie să fie un număr întreg.")
+    return apartament, tip, suma, zi
+
+
+def importa(apartamente, cale, format_cerut=None, marime_lot=10000, cale_respinse=None, progres=None):
+    """
+    Importă cheltuielile dintr-un fișier CSV sau JSONL.
+
+    :param apartamente: Registrul în care se adaugă (dicționarul clasic sau un depozit).
+    :param cale: Calea fișierului.
+    :param format_cerut: 'csv', 'jsonl' sau None (după extensie).
+    :param marime_lot: Numărul de rânduri adăugate odată.
+    :param cale_respinse: Fișierul CSV în care se scriu rândurile respinse (linie, motiv, câmpuri) sau None.
+    :param progres: Funcție apelată după fiecare lot cu statisticile de până atunci sau None.
+    :return: Tuplu (apartamente, statistici), statistici fiind {"citite", "importate", "respinse"}.
+    :raises: ValueError dacă formatul nu este cunoscut.
+    """
+    format_cerut = format_fisier(cale, format_cerut)
+    statistici = {"citite": 0, "importate": 0, "respinse": 0}
+
+    with open(cale, newline="", encoding="utf-8") as fisier, \
+            open(cale_respinse or os.devnull, "w", newline="", encoding="utf-8") as fisier_respinse, \
+            fara_colector_ciclic():
+        scriitor_respinse = csv.writer(fisier_respinse)
+        randuri = citeste_randuri(fisier, format_cerut)
+
+        while True:
+            lot = list(islice(randuri, marime_lot))
+            if not lot:
+                break
+
+            linii = []
+            inregistrari = []
+            respinse = []
+            for numar_linie, campuri in lot:
+                try:
+                    inregistrari.append(_interpreteaza(campuri))
+                    linii.append((numar_linie, campuri))
+                except ValueError as e:
+                    respinse.append((numar_linie, str(e), campuri))
+
+            apartamente, erori = adauga_cheltuieli_bulk(apartamente, inregistrari)
+            for pozitie, mesaj in erori:
+                numar_linie, campuri = linii[pozitie]
+                respinse.append((numar_linie, mesaj, campuri))
+
+            respinse.sort(key=lambda respins: respins[0])
+            scriitor_respinse.writerows([numar_linie, mesaj, *(campuri if isinstance(campuri, list) else [campuri])]
+                                        for numar_linie, mesaj, campuri in respinse)
+
+            statistici["citite"] += len(lot)
+            statistici["importate"] += len(inregistrari) - len(erori)
+            statistici["respinse"] += len(respinse)
+            if progres is not None:
+                progres(dict(statistici))
+
+    return apartamente, statistici
+
+
+def _citeste_coloane(cale, format_cerut=None):
+    """
+    Citește și validează un fișier întreg, în procesul unui lucrător din import_many.
+
+    Rezultatul este columnar (array-uri tipizate), deci se transmite procesului părinte ca octeți compacți,
+    nu ca listă de tupluri.
+
+    :return: Dicționar cu "coloane" {"apartament", "tip", "suma", "zi"} și "raport"
+        {"fisier", "citite", "importate", "respinse", "erori": [(linie, mesaj)]}.
+    """
+    coloane = {"apartament": array("i"), "tip": array("B"), "suma": array("d"), "zi": array("i")}
+    raport = {"fisier": cale, "citite": 0, "importate": 0, "respinse": 0, "erori": []}
+
+    with open(cale, newline="", encoding="utf-8") as fisier, fara_colector_ciclic():
+        for numar_linie, campuri in citeste_randuri(fisier, format_fisier(cale, format_cerut)):
+            raport["citite"] += 1
+            try:
+                apartament, tip, suma, zi = validare_inregistrare(_interpreteaza(campuri), zi_ordinala=True)
+                validare_apartament_coloana(apartament)
+            except ValueError as e:
+                raport["erori"].append((numar_linie, str(e)))
+                continue
+            coloane["apartament"].append(apartament)
+            coloane["tip"].append(COD_TIP[tip])
+            coloane["suma"].append(suma)
+            coloane["zi"].append(zi)
+
+    raport["importate"] = len(coloane["suma"])
+    raport["respinse"] = len(raport["erori"])
+    return {"coloane": coloane, "raport": raport}
+
+
+def import_many(apartamente, cai, lucratori=None, format_cerut=None):
+    """
+    Importă mai multe fișiere în paralel: fiecare fișier este citit și validat într-un proces separat, iar
+    procesul curent adaugă rezultatele în registru, în ordinea din `cai`.
+
+    :param apartamente: Registrul în care se adaugă (dicționarul clasic sau un depozit).
+    :param cai: Căile fișierelor.
+    :param lucratori: Numărul de procese (implicit numărul de nuclee; cu 1, totul rulează în procesul curent).
+    :param format_cerut: 'csv', 'jsonl' sau None (după extensia fiecărui fișier).
+    :return: Tuplu (apartamente, rapoarte), câte un raport pe fișier, în ordinea din `cai`.
+    """
+    cai = list(cai)
+    lucratori = lucratori or os.cpu_count() or 1
+
+    if lucratori == 1 or len(cai) <= 1:
+        rezultate = map(_citeste_coloane, cai, [format_cerut] * len(cai))
+        return _adauga_rezultate(apartamente, rezultate)
+
+    with ProcessPoolExecutor(max_workers=min(lucratori, len(cai))) as executor:
+        # executor.map întoarce rezultatele în ordinea fișierelor, indiferent de ordinea terminării lor
+        return _adauga_rezultate(apartamente, executor.map(_citeste_coloane, cai, [format_cerut] * len(cai)))
+
+
+def _adauga_rezultate(apartamente, rezultate):
+    rapoarte = []
+    with fara_colector_ciclic():
+        for rezultat in rezultate:
+            coloane = rezultat["coloane"]
+            if isinstance(apartamente, ExpenseStore):
+                apartamente.adauga_coloane(coloane["apartament"], coloane["tip"], coloane["suma"], coloane["zi"])
+            else:
+                apartamente, _ = adauga_cheltuieli_bulk(apartamente, (
+                    (apartament, TIPURI_CHELTUIELI[cod], suma, _format_zi(zi))
+                    for apartament, cod, suma, zi in zip(coloane["apartament"], coloane["tip"], coloane["suma"],
+                                                         coloane["zi"])))
+            rapoarte.append(rezultat["raport"])
+    return apartamente, rapoarte
+
+
+def exporta(apartamente, cale, format_cerut=None):
+    """
+    Scrie toate cheltuielile registrului într-un fișier CSV sau JSONL, pe măsură ce sunt parcurse.
+
+    :param apartamente: Registrul exportat (dicționarul clasic sau un depozit).
+    :param cale: Calea fișierului.
+    :param format_cerut: 'csv', 'jsonl' sau None (după extensie).
+    :return: Numărul de cheltuieli scrise.
+    :raises: ValueError dacă formatul nu este cunoscut.
+    """
+    format_cerut = format_fisier(cale, format_cerut)
+    numar = 0
+
+    with open(cale, "w", newline="", encoding="utf-8") as fisier:
+        if format_cerut == "csv":
+            scriitor = csv.writer(fisier)
+            scriitor.writerow(CAMPURI)
+            for inregistrare in itereaza_cheltuieli(apartamente):
+                scriitor.writerow(inregistrare)
+                numar += 1
+        else:
+            for inregistrare in itereaza_cheltuieli(apartamente):
+                fisier.write(json.dumps(dict(zip(CAMPURI, inregistrare)), ensure_ascii=False) + "\n")
+                numar += 1
+
+    return numar
+
+
+def test_import_export_csv():
+    director = tempfile.mkdtemp()
+    try:
+        cale = os.path.join(director, "citiri.csv")
+        with open(cale, "w", encoding="utf-8") as fisier:
+            fisier.write("apartament,tip,suma,zi\n"
+                         "1,apa,100,2023-10-30\n"
+                         "x,gaz,10,2023-10-30\n"
+                         "2,gaz,50.5,2023-10-29\n"
+                         "2,internet,5,2023-10-29\n"
+                         "1,gaz,-3,2023-10-28\n"
+                         "3,lumina,75\n"
+                         "1,apa,20,2023-02-30\n"
+                         "3,lumina,12,2023-10-01\n")
+
+        progrese = []
+        cale_respinse = os.path.join(director, "respinse.csv")
+        apartamente, statistici = importa({}, cale, marime_lot=3, cale_respinse=cale_respinse,
+                                          progres=progrese.append)
+
+        assert apartamente == {1: {"apa": [(100.0, "2023-10-30")]}, 2: {"gaz": [(50.5, "2023-10-29")]},
+                               3: {"lumina": [(12.0, "2023-10-01")]}}
+        assert statistici == {"citite": 8, "importate": 3, "respinse": 5}
+        assert [progres["citite"] for progres in progrese] == [3, 6, 8]
+        with open(cale_respinse, encoding="utf-8") as fisier:
+            assert [int(rand[0]) for rand in csv.reader(fisier)] == [3, 5, 6, 7, 8]
+
+        # Exportul produce un fișier care se poate importa din nou, cu același rezultat
+        cale_export = os.path.join(director, "export.csv")
+        assert exporta(apartamente, cale_export) == 3
+        assert importa({}, cale_export)[0] == apartamente
+    finally:
+        shutil.rmtree(director)
+
+
+def test_import_export_jsonl():
+    director = tempfile.mkdtemp()
+    try:
+        cale = os.path.join(director, "citiri.jsonl")
+        with open(cale, "w", encoding="utf-8") as fisier:
+            fisier.write('{"apartament": 4, "tip": "apa", "suma": 10, "zi": "2023-10-30"}\n'
+                         '[4, "gaz", "7.5", "2023-10-29"]\n'
+                         '{"apartament": 4, "tip": "apa"\n'
+                         '\n'
+                         '{"apartament": 5, "tip": "apa", "suma": 1, "zi": "2023-13-01"}\n')
+
+        store, statistici = importa(ExpenseStore(), cale)
+        assert store.ca_dictionar() == {4: {"apa": [(10.0, "2023-10-30")], "gaz": [(7.5, "2023-10-29")]}}
+        assert statistici == {"citite": 4, "importate": 2, "respinse": 2}
+
+        cale_export = os.path.join(director, "export.jsonl")
+        assert exporta(store, cale_export) == 2
+        assert importa({}, cale_export)[0] == store.ca_dictionar()
+
+        try:
+            exporta(store, cale_export, format_cerut="xml")
+            assert False
+        except ValueError:
+            assert True
+    finally:
+        shutil.rmtree(director)
+
+
+def test_import_many():
+    director = tempfile.mkdtemp()
+    try:
+        cai = []
+        for numar in range(4):
+            cale = os.path.join(director, f"bloc{numar}.csv")
+            with open(cale, "w", encoding="utf-8") as fisier:
+                fisier.write("apartament,tip,suma,zi\n")
+                for apartament in range(3):
+                    fisier.write(f"{numar * 10 + apartament},apa,{numar + apartament + 0.5},"
+                                 f"2023-10-0{apartament + 1}\n")
+                fisier.write(f"{numar},gaz,-1,2023-10-01\nx,apa,1,2023-10-01\n")
+            cai.append(cale)
+
+        asteptat = {}
+        for cale in cai:
+            asteptat, _ = importa(asteptat, cale)
+
+        for lucratori in (1, 2):
+            store, rapoarte = import_many(ExpenseStore(), cai, lucratori=lucratori)
+            assert store.ca_dictionar() == asteptat
+            store.verifica_indexuri()
+            assert [raport["fisier"] for raport in rapoarte] == cai
+            assert [(raport["importate"], raport["respinse"]) for raport in rapoarte] == [(3, 2)] * 4
+            assert [linie for linie, _ in rapoarte[0]["erori"]] == [5, 6]
+
+        apartamente, _ = import_many({}, cai, lucratori=2)
+        assert apartamente == asteptat
+    finally:
+        shutil.rmtree(director)
+
+
+if __name__ == "__main__":
+    test_import_export_csv()
+    test_import_export_jsonl()
+    test_import_many()
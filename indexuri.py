@@ -0,0 +1,992 @@
+"""
+Indexuri secundare întreținute incremental de ExpenseStore.
+
+Depozitul apelează metodele de mai jos după fiecare modificare a coloanelor, astfel încât indexurile
+să nu fie reconstruite de la zero la interogări.
+"""
+import heapq
+import math
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from datetime import date
+from functools import lru_cache
+from itertools import accumulate, compress
+
+_BITI_RAND = 40
+_MASCA_RAND = (1 << _BITI_RAND) - 1
+
+
+def _fara_pozitii(coloana, pozitii):
+    """
+    Copiază o coloană fără elementele de pe pozițiile date, pe bucăți contigue (copiere la nivel de C).
+
+    :param coloana: Coloana `array` sursă.
+    :param pozitii: Pozițiile de eliminat, sortate crescător și fără repetiții.
+    :return: Coloana nouă.
+    """
+    rezultat = array(coloana.typecode)
+    inceput = 0
+    for pozitie in pozitii:
+        rezultat.extend(coloana[inceput:pozitie])
+        inceput = pozitie + 1
+    rezultat.extend(coloana[inceput:])
+    return rezultat
+
+
+class Index:
+    """
+    Interfața comună a indexurilor. Implicit, un index ignoră evenimentele care nu îl privesc.
+    """
+
+    def apartament_nou(self, store, apartament):
+        """Apelată când un apartament apare în registru (încă fără liste de cheltuieli)."""
+
+    def apartamente_sterse(self, store, apartamente):
+        """Apelată după ce apartamentele date, deja golite de liste, au fost scoase din registru."""
+
+    def grup_nou(self, store, apartament, cod):
+        """Apelată când un apartament primește o listă (posibil goală) de cheltuieli de un tip."""
+
+    def grup_sters(self, store, apartament, cod):
+        """Apelată după ce lista de cheltuieli de un tip a fost scoasă dintr-un apartament."""
+
+    def randuri_noi(self, store, randuri):
+        """Apelată după ce rândurile au fost adăugate în coloane."""
+
+    def randuri_sterse(self, store, randuri):
+        """Apelată după ce rândurile au fost marcate inactive; valorile lor sunt încă în coloane."""
+
+    def suma_modificata(self, store, rand, suma_veche):
+        """Apelată după ce suma unui rând a fost schimbată."""
+
+    def verifica(self, store):
+        """
+        Compară indexul cu o reconstruire completă din depozit.
+
+        :raises: AssertionError dacă indexul nu mai corespunde datelor.
+        """
+
+
+class IndexTip(Index):
+    """
+    Tip cheltuială -> apartamentele care au o listă de cheltuieli de acel tip.
+    """
+
+    def __init__(self):
+        self._apartamente = {}
+
+    def grup_nou(self, store, apartament, cod):
+        self._apartamente.setdefault(cod, {})[apartament] = None
+
+    def grup_sters(self, store, apartament, cod):
+        del self._apartamente[cod][apartament]
+
+    def apartamente(self, cod):
+        """
+        :param cod: Codul tipului.
+        :return: Apartamentele care au tipul dat (fără o ordine garantată).
+        """
+        return self._apartamente.get(cod, {}).keys()
+
+    def verifica(self, store):
+        asteptat = {}
+        for apartament, cheltuieli in store._grupuri.items():
+            for cod in cheltuieli:
+                asteptat.setdefault(cod, set()).add(apartament)
+
+        obtinut = {cod: set(apartamente) for cod, apartamente in self._apartamente.items() if apartamente}
+        assert obtinut == asteptat, f"Indexul pe tipuri diferă: {obtinut} != {asteptat}"
+
+
+class IndexApartamente(Index):
+    """
+    Numerele apartamentelor, ținute într-o coloană sortată. Apartamentele dintr-un interval (un etaj, o scară)
+    se găsesc cu două căutări binare, deci costul nu depinde de lățimea intervalului, ci de apartamentele
+    existente în el. Apartamentele noi sunt adunate și puse în ordine la prima interogare, ca la IndexZi.
+    """
+
+    PRAG_INSERARE = 32
+
+    def __init__(self):
+        self._chei = array("q")
+        self._noi = array("q")
+
+    def _ordoneaza(self):
+        if not self._noi:
+            return
+        if len(self._noi) <= self.PRAG_INSERARE:
+            for cheie in self._noi:
+                insort(self._chei, cheie)
+        else:
+            chei = self._chei.tolist()
+            chei.extend(self._noi)
+            chei.sort()
+            self._chei = array("q", chei)
+        self._noi = array("q")
+
+    def apartament_nou(self, store, apartament):
+        self._noi.append(apartament)
+
+    def apartamente_sterse(self, store, apartamente):
+        self._ordoneaza()
+        pozitii = sorted(bisect_left(self._chei, apartament) for apartament in apartamente)
+        if pozitii and pozitii[-1] - pozitii[0] + 1 == len(pozitii):
+            # Un interval de apartamente este o felie contiguă a coloanei
+            del self._chei[pozitii[0]:pozitii[-1] + 1]
+        elif pozitii:
+            self._chei = _fara_pozitii(self._chei, pozitii)
+
+    def intre(self, apartament_start, apartament_sfarsit):
+        """
+        :param apartament_start: Primul apartament inclus.
+        :param apartament_sfarsit: Ultimul apartament inclus.
+        :return: Apartamentele existente din intervalul [apartament_start, apartament_sfarsit], crescător.
+        """
+        self._ordoneaza()
+        start = bisect_left(self._chei, apartament_start)
+        return self._chei[start:bisect_right(self._chei, apartament_sfarsit, start)].tolist()
+
+    def verifica(self, store):
+        self._ordoneaza()
+        assert self._chei.tolist() == sorted(store._grupuri), "Indexul pe apartamente nu corespunde registrului."
+
+
+class IndexZi(Index):
+    """
+    Index sortat după zi. Fiecare rând activ are o cheie int64 (zi << 40 | rând), ținută într-o singură
+    coloană ordonată, astfel încât „înainte de ziua X” este o căutare binară urmată de o felie.
+
+    Rândurile noi sunt doar adunate și sunt puse în ordine la prima interogare sau ștergere, ceea ce face
+    ca importurile mari să nu plătească o inserare sortată pentru fiecare rând.
+    """
+
+    PRAG_INSERARE = 32
+
+    def __init__(self):
+        self._chei = array("q")
+        self._noi = array("q")
+
+    @staticmethod
+    def _cheie(store, rand):
+        return store._zi[rand] << _BITI_RAND | rand
+
+    def _ordoneaza(self):
+        if not self._noi:
+            return
+        if len(self._noi) <= self.PRAG_INSERARE:
+            for cheie in self._noi:
+                insort(self._chei, cheie)
+        else:
+            chei = self._chei.tolist()
+            chei.extend(self._noi)
+            chei.sort()
+            self._chei = array("q", chei)
+        self._noi = array("q")
+
+    def randuri_noi(self, store, randuri):
+        zile = store._zi
+        self._noi.extend(zile[rand] << _BITI_RAND | rand for rand in randuri)
+
+    def randuri_sterse(self, store, randuri):
+        self._ordoneaza()
+        pozitii = []
+        for rand in randuri:
+            cheie = self._cheie(store, rand)
+            pozitie = bisect_left(self._chei, cheie)
+            if pozitie < len(self._chei) and self._chei[pozitie] == cheie:
+                pozitii.append(pozitie)
+
+        if len(pozitii) == 1:
+            del self._chei[pozitii[0]]
+        elif pozitii:
+            self._chei = _fara_pozitii(self._chei, sorted(pozitii))
+
+    def intre(self, zi_start=None, zi_sfarsit=None):
+        """
+        Rândurile cu ziua în intervalul [zi_start, zi_sfarsit), ordonate după zi.
+
+        :param zi_start: Prima zi ordinală inclusă sau None pentru „de la început”.
+        :param zi_sfarsit: Prima zi ordinală exclusă sau None pentru „până la sfârșit”.
+        :return: Lista de rânduri.
+        """
+        self._ordoneaza()
+        start = 0 if zi_start is None else bisect_left(self._chei, zi_start << _BITI_RAND)
+        sfarsit = len(self._chei) if zi_sfarsit is None else bisect_left(self._chei, zi_sfarsit << _BITI_RAND)
+        return [cheie & _MASCA_RAND for cheie in self._chei[start:sfarsit]]
+
+    def numar_inainte_de(self, zi):
+        """
+        :param zi: Ziua ordinală limită (exclusă).
+        :return: Câte rânduri au ziua strict înaintea zilei date, fără a le enumera.
+        """
+        self._ordoneaza()
+        return bisect_left(self._chei, zi << _BITI_RAND)
+
+    def inainte_de(self, zi):
+        """
+        :param zi: Ziua ordinală limită (exclusă).
+        :return: Rândurile cu ziua strict înaintea zilei date.
+        """
+        return self.intre(zi_sfarsit=zi)
+
+    def verifica(self, store):
+        self._ordoneaza()
+        asteptat = sorted(self._cheie(store, rand) for rand in range(len(store._activ)) if store._activ[rand])
+        assert self._chei.tolist() == asteptat, "Indexul pe zile nu corespunde rândurilor active."
+
+
+class _SumeTip:
+    """
+    Cheltuielile unui singur tip, ordonate după (sumă, cheie), în două coloane paralele.
+    Cheia (poziția apartamentului << 40 | rând) păstrează, la sume egale, ordinea din registru.
+    """
+
+    def __init__(self):
+        self.sume = array("d")
+        self.chei = array("q")
+        self.noi = []
+
+    def ordoneaza(self):
+        if not self.noi:
+            return
+        if len(self.noi) <= IndexSume.PRAG_INSERARE:
+            for suma, cheie in self.noi:
+                pozitie = self.pozitie(suma, cheie)
+                self.sume.insert(pozitie, suma)
+                self.chei.insert(pozitie, cheie)
+        elif len(self.noi) * 16 < len(self.sume):
+            # Puține cheltuieli noi față de cele ordonate: interclasare prin felii, fără tupluri pentru toate
+            sume, chei = array("d"), array("q")
+            inceput = 0
+            for suma, cheie in sorted(self.noi):
+                pozitie = self.pozitie(suma, cheie)
+                sume += self.sume[inceput:pozitie]
+                chei += self.chei[inceput:pozitie]
+                sume.append(suma)
+                chei.append(cheie)
+                inceput = pozitie
+            sume += self.sume[inceput:]
+            chei += self.chei[inceput:]
+            self.sume, self.chei = sume, chei
+        else:
+            perechi = sorted(list(zip(self.sume, self.chei)) + self.noi)
+            self.sume = array("d", (suma for suma, _ in perechi))
+            self.chei = array("q", (cheie for _, cheie in perechi))
+        self.noi = []
+
+    def pregateste(self):
+        """
+        Ordonează cheltuielile noi doar dacă sunt multe: căutările și ștergerile punctuale parcurg direct o listă
+        scurtă de cheltuieli noi, astfel încât adăugările intercalate cu corecturi nu reordonează tot tipul.
+        """
+        if len(self.noi) > IndexSume.PRAG_AMANARE:
+            self.ordoneaza()
+
+    def pozitie(self, suma, cheie):
+        start = bisect_left(self.sume, suma)
+        sfarsit = bisect_right(self.sume, suma, start)
+        return bisect_left(self.chei, cheie, start, sfarsit)
+
+    def cauta(self, suma, cheie):
+        pozitie = self.pozitie(suma, cheie)
+        if pozitie < len(self.chei) and self.chei[pozitie] == cheie and self.sume[pozitie] == suma:
+            return pozitie
+        return None
+
+    def sterge(self, perechi):
+        if self.noi:
+            noi = set(self.noi)
+            din_noi = {pereche for pereche in perechi if pereche in noi}
+            if din_noi:
+                self.noi = [pereche for pereche in self.noi if pereche not in din_noi]
+                perechi = [pereche for pereche in perechi if pereche not in din_noi]
+        pozitii = sorted(pozitie for pozitie in (self.cauta(suma, cheie) for suma, cheie in perechi)
+                         if pozitie is not None)
+        if len(pozitii) == 1:
+            del self.sume[pozitii[0]]
+            del self.chei[pozitii[0]]
+        elif pozitii:
+            self.sume = _fara_pozitii(self.sume, pozitii)
+            self.chei = _fara_pozitii(self.chei, pozitii)
+
+
+class IndexSume(Index):
+    """
+    Pentru fiecare tip, cheltuielile ordonate după sumă. Lista sortată a unui tip se obține fără sortare,
+    „mai mari decât X” este o felie de la o căutare binară până la capăt, iar „mai mici decât X” se șterge
+    tăind începutul coloanelor.
+    """
+
+    PRAG_INSERARE = 32
+    PRAG_AMANARE = 256
+
+    def __init__(self):
+        self._tipuri = {}
+
+    def _sume_tip(self, cod, complet=True):
+        """
+        :param complet: False dacă apelantul ține seama și de cheltuielile încă neordonate (_SumeTip.noi).
+        """
+        sume_tip = self._tipuri.get(cod)
+        if sume_tip is None:
+            sume_tip = self._tipuri[cod] = _SumeTip()
+        if complet:
+            sume_tip.ordoneaza()
+        else:
+            sume_tip.pregateste()
+        return sume_tip
+
+    @staticmethod
+    def _cheie(store, rand):
+        return store._pozitie[store._apartament[rand]] << _BITI_RAND | rand
+
+    def randuri_noi(self, store, randuri):
+        tipuri, sume, apartamente, pozitie = store._tip, store._suma, store._apartament, store._pozitie
+        noi_pe_tip = {}
+        for rand in randuri:
+            cod = tipuri[rand]
+            noi = noi_pe_tip.get(cod)
+            if noi is None:
+                if cod not in self._tipuri:
+                    self._tipuri[cod] = _SumeTip()
+                noi = noi_pe_tip[cod] = self._tipuri[cod].noi
+            noi.append((sume[rand], pozitie[apartamente[rand]] << _BITI_RAND | rand))
+
+    def randuri_sterse(self, store, randuri):
+        pe_tip = {}
+        for rand in randuri:
+            pe_tip.setdefault(store._tip[rand], []).append(rand)
+
+        for cod, randuri_tip in pe_tip.items():
+            self._sume_tip(cod, complet=False).sterge([(store._suma[rand], self._cheie(store, rand))
+                                                       for rand in randuri_tip])
+
+    def suma_modificata(self, store, rand, suma_veche):
+        sume_tip = self._sume_tip(store._tip[rand], complet=False)
+        cheie = self._cheie(store, rand)
+        sume_tip.sterge([(suma_veche, cheie)])
+        sume_tip.noi.append((store._suma[rand], cheie))
+
+    def sortate(self, cod):
+        """
+        :param cod: Codul tipului.
+        :return: Rândurile tipului, ordonate după sumă și apoi după ordinea din registru.
+        """
+        return [cheie & _MASCA_RAND for cheie in self._sume_tip(cod).chei]
+
+    def mai_mari_decat(self, cod, suma):
+        """
+        :param cod: Codul tipului.
+        :param suma: Pragul (exclus).
+        :return: Rândurile tipului cu suma strict mai mare decât pragul, ordonate după sumă.
+        """
+        sume_tip = self._sume_tip(cod)
+        return [cheie & _MASCA_RAND for cheie in sume_tip.chei[bisect_right(sume_tip.sume, suma):]]
+
+    def cele_mai_mari(self, cod, k):
+        """
+        :param cod: Codul tipului.
+        :param k: Numărul de rânduri cerut.
+        :return: Rândurile tipului cu cele mai mari k sume, plus cele egale cu a k-a sumă, ordonate după sumă.
+        """
+        sume_tip = self._sume_tip(cod)
+        start = bisect_left(sume_tip.sume, sume_tip.sume[-k]) if k < len(sume_tip.sume) else 0
+        return [cheie & _MASCA_RAND for cheie in sume_tip.chei[start:]]
+
+    def numar_mai_mari_decat(self, cod, suma):
+        """
+        :return: Câte cheltuieli ale tipului au suma strict mai mare decât pragul, fără a le enumera.
+        """
+        sume_tip = self._sume_tip(cod)
+        return len(sume_tip.sume) - bisect_right(sume_tip.sume, suma)
+
+    def primul(self, cod, suma, pozitie_apartament):
+        """
+        Primul rând (în ordinea registrului) cu suma dată din apartamentul aflat pe poziția dată.
+
+        :param cod: Codul tipului.
+        :param suma: Suma căutată.
+        :param pozitie_apartament: Poziția apartamentului în registru.
+        :return: Rândul găsit sau None.
+        """
+        sume_tip = self._sume_tip(cod, complet=False)
+        start = bisect_left(sume_tip.sume, suma)
+        sfarsit = bisect_right(sume_tip.sume, suma, start)
+        pozitie = bisect_left(sume_tip.chei, pozitie_apartament << _BITI_RAND, start, sfarsit)
+
+        chei = [cheie for suma_noua, cheie in sume_tip.noi
+                if suma_noua == suma and cheie >> _BITI_RAND == pozitie_apartament]
+        if pozitie < sfarsit and sume_tip.chei[pozitie] >> _BITI_RAND == pozitie_apartament:
+            chei.append(sume_tip.chei[pozitie])
+        return min(chei) & _MASCA_RAND if chei else None
+
+    def taie_sub(self, cod, suma):
+        """
+        Scoate din index toate cheltuielile tipului cu suma strict mai mică decât pragul.
+
+        :param cod: Codul tipului.
+        :param suma: Pragul (inclus în ce rămâne).
+        :return: Rândurile scoase.
+        """
+        sume_tip = self._sume_tip(cod)
+        pozitie = bisect_left(sume_tip.sume, suma)
+        randuri = [cheie & _MASCA_RAND for cheie in sume_tip.chei[:pozitie]]
+        del sume_tip.sume[:pozitie]
+        del sume_tip.chei[:pozitie]
+        return randuri
+
+    def verifica(self, store):
+        asteptat = {}
+        for rand in range(len(store._activ)):
+            if store._activ[rand]:
+                asteptat.setdefault(store._tip[rand], []).append((store._suma[rand], self._cheie(store, rand)))
+
+        for cod in set(asteptat) | set(self._tipuri):
+            sume_tip = self._sume_tip(cod)
+            obtinut = list(zip(sume_tip.sume, sume_tip.chei))
+            assert obtinut == sorted(asteptat.get(cod, [])), f"Indexul pe sume diferă pentru tipul {cod}."
+
+
+class IndexMaxime(Index):
+    """
+    Pentru fiecare tip, cele mai mari CAPACITATE cheltuieli, într-un heap minim mărginit de perechi
+    (sumă, -cheie): rădăcina este cheltuiala care iese prima, cea mai mică și, la sume egale, cea mai târzie
+    din registru.
+
+    O cheltuială nouă costă o comparație cu rădăcina și cel mult O(log CAPACITATE). O ștergere sau o corectură
+    care atinge o cheltuială din heap marchează tipul, iar heap-ul este refăcut la următoarea interogare, dintr-o
+    singură parcurgere a coloanelor.
+    """
+
+    CAPACITATE = 100
+
+    def __init__(self):
+        # Cod tip -> heap; None pentru un heap care trebuie refăcut
+        self._heapuri = {}
+
+    @staticmethod
+    def _pereche(store, rand):
+        return store._suma[rand], -(store._pozitie[store._apartament[rand]] << _BITI_RAND | rand)
+
+    def _adauga(self, cod, pereche):
+        heap = self._heapuri.setdefault(cod, [])
+        if heap is None:
+            return
+        if len(heap) < self.CAPACITATE:
+            heapq.heappush(heap, pereche)
+        elif pereche > heap[0]:
+            heapq.heapreplace(heap, pereche)
+
+    def _scoate(self, cod, pereche):
+        heap = self._heapuri.get(cod)
+        if heap is None or (len(heap) == self.CAPACITATE and pereche < heap[0]):
+            return
+        if len(heap) < self.CAPACITATE:
+            # Heap-ul incomplet conține toate cheltuielile tipului, deci rămâne corect și fără cea scoasă
+            heap.remove(pereche)
+            heapq.heapify(heap)
+        else:
+            self._heapuri[cod] = None
+
+    def randuri_noi(self, store, randuri):
+        pe_tip = defaultdict(list)
+        for rand in randuri:
+            pe_tip[store._tip[rand]].append(self._pereche(store, rand))
+        for cod, perechi in pe_tip.items():
+            if len(perechi) > self.CAPACITATE:
+                perechi = heapq.nlargest(self.CAPACITATE, perechi)
+            for pereche in perechi:
+                self._adauga(cod, pereche)
+
+    def randuri_sterse(self, store, randuri):
+        for rand in randuri:
+            self._scoate(store._tip[rand], self._pereche(store, rand))
+
+    def suma_modificata(self, store, rand, suma_veche):
+        cod = store._tip[rand]
+        suma_noua, cheie = self._pereche(store, rand)
+        self._scoate(cod, (suma_veche, cheie))
+        self._adauga(cod, (suma_noua, cheie))
+
+    def _reconstruieste(self, store, cod):
+        tipuri = store._tip
+        randuri = (rand for rand in compress(range(len(store._activ)), store._activ) if tipuri[rand] == cod)
+        heap = heapq.nlargest(self.CAPACITATE, (self._pereche(store, rand) for rand in randuri))
+        heapq.heapify(heap)
+        return heap
+
+    def maxime(self, store, cod, k):
+        """
+        :param cod: Codul tipului.
+        :param k: Numărul de rânduri cerut, cel mult CAPACITATE.
+        :return: Cele mai mari k rânduri ale tipului, descrescător după sumă și apoi în ordinea din registru.
+        """
+        heap = self._heapuri.get(cod)
+        if heap is None:
+            heap = self._heapuri[cod] = self._reconstruieste(store, cod)
+        return [-cheie & _MASCA_RAND for _, cheie in heapq.nlargest(k, heap)]
+
+    def verifica(self, store):
+        for cod, heap in self._heapuri.items():
+            if heap is not None:
+                assert sorted(heap) == sorted(self._reconstruieste(store, cod)), \
+                    f"Heap-ul celor mai mari cheltuieli diferă pentru tipul {cod}."
+
+
+class _Total:
+    """
+    Sumă și număr de cheltuieli ținute la zi prin însumare compensată (Neumaier): eroarea de rotunjire a
+    fiecărei adunări este păstrată separat, deci adăugările și scăderile repetate nu acumulează derivă.
+    """
+
+    __slots__ = ("suma", "compensare", "numar")
+
+    def __init__(self):
+        self.suma = 0.0
+        self.compensare = 0.0
+        self.numar = 0
+
+    def adauga(self, valoare, numar):
+        total = self.suma + valoare
+        if abs(self.suma) >= abs(valoare):
+            self.compensare += (self.suma - total) + valoare
+        else:
+            self.compensare += (valoare - total) + self.suma
+        self.suma = total
+        self.numar += numar
+        if self.numar == 0:
+            # Fără cheltuieli, totalul este exact zero, indiferent de rotunjirile de până acum
+            self.suma = self.compensare = 0.0
+
+    @property
+    def valoare(self):
+        return self.suma + self.compensare
+
+
+class IndexTotaluri(Index):
+    """
+    Totaluri și numere de cheltuieli pe apartament, pe tip și pe (apartament, tip), actualizate la fiecare
+    modificare, astfel încât citirea lor este O(1).
+
+    Într-un lot, valorile fiecărei perechi (apartament, tip) sunt întâi însumate exact (math.fsum), apoi
+    adăugate la totaluri cu însumare compensată.
+    """
+
+    def __init__(self):
+        self._apartamente = {}
+        self._tipuri = {}
+        self._grupuri = {}
+
+    def _chei(self, apartament, cod):
+        return (self._apartamente, apartament), (self._tipuri, cod), (self._grupuri, (apartament, cod))
+
+    def _aduna(self, store, randuri, semn):
+        apartamente, tipuri, sume = store._apartament, store._tip, store._suma
+        if isinstance(randuri, range) and randuri.step == 1:
+            # Loturile adăugate sunt intervale contigue: coloanele sunt parcurse pe felii, fără indexare pe rând
+            felie = slice(randuri.start, randuri.stop)
+            valori = zip(apartamente[felie], tipuri[felie], sume[felie])
+        else:
+            valori = ((apartamente[rand], tipuri[rand], sume[rand]) for rand in randuri)
+
+        pe_grup = defaultdict(list)
+        for apartament, cod, suma in valori:
+            pe_grup[apartament, cod].append(suma)
+
+        # Valorile sunt însumate exact pe grupuri, apoi sumele grupurilor pe apartamente și pe tipuri, astfel
+        # încât fiecare total primește o singură adunare compensată pe lot
+        pe_apartament = defaultdict(list)
+        pe_tip = defaultdict(list)
+        for (apartament, cod), valori in pe_grup.items():
+            parte = (semn * math.fsum(valori), semn * len(valori))
+            self._adauga_la(self._grupuri, (apartament, cod), *parte)
+            pe_apartament[apartament].append(parte)
+            pe_tip[cod].append(parte)
+
+        for totaluri, parti in ((self._apartamente, pe_apartament), (self._tipuri, pe_tip)):
+            for cheie, valori in parti.items():
+                self._adauga_la(totaluri, cheie, math.fsum(valoare for valoare, _ in valori),
+                                sum(numar for _, numar in valori))
+
+    @staticmethod
+    def _adauga_la(totaluri, cheie, valoare, numar):
+        total = totaluri.get(cheie)
+        if total is None:
+            total = totaluri[cheie] = _Total()
+        total.adauga(valoare, numar)
+        if not total.numar:
+            del totaluri[cheie]
+
+    def randuri_noi(self, store, randuri):
+        self._aduna(store, randuri, 1)
+
+    def randuri_sterse(self, store, randuri):
+        self._aduna(store, randuri, -1)
+
+    def suma_modificata(self, store, rand, suma_veche):
+        for totaluri, cheie in self._chei(store._apartament[rand], store._tip[rand]):
+            totaluri[cheie].adauga(-suma_veche, 0)
+            totaluri[cheie].adauga(store._suma[rand], 0)
+
+    def total(self, apartament=None, cod=None):
+        """
+        :param apartament: Apartamentul sau None pentru toate.
+        :param cod: Codul tipului sau None pentru toate.
+        :return: Tuplu (suma, număr de cheltuieli); (0.0, 0) dacă nu există cheltuieli.
+        """
+        if apartament is None and cod is None:
+            totaluri = self._tipuri.values()
+            return math.fsum(total.valoare for total in totaluri), sum(total.numar for total in totaluri)
+
+        if apartament is None:
+            total = self._tipuri.get(cod)
+        elif cod is None:
+            total = self._apartamente.get(apartament)
+        else:
+            total = self._grupuri.get((apartament, cod))
+        return (total.valoare, total.numar) if total is not None else (0.0, 0)
+
+    def verifica(self, store):
+        asteptat = {}
+        for rand in range(len(store._activ)):
+            if store._activ[rand]:
+                apartament, cod = store._apartament[rand], store._tip[rand]
+                for cheie in (("apartament", apartament), ("tip", cod), ("grup", (apartament, cod))):
+                    asteptat.setdefault(cheie, []).append(store._suma[rand])
+
+        obtinut = {}
+        for nume, totaluri in (("apartament", self._apartamente), ("tip", self._tipuri), ("grup", self._grupuri)):
+            obtinut.update(((nume, cheie), total) for cheie, total in totaluri.items())
+
+        assert set(obtinut) == set(asteptat), "Totalurile nu acoperă aceleași apartamente și tipuri ca depozitul."
+        for cheie, valori in asteptat.items():
+            total = obtinut[cheie]
+            assert total.numar == len(valori), f"Numărul de cheltuieli diferă pentru {cheie}."
+            assert math.isclose(total.valoare, math.fsum(valori), rel_tol=1e-12, abs_tol=1e-9), \
+                f"Totalul diferă pentru {cheie}: {total.valoare} != {math.fsum(valori)}"
+
+
+@lru_cache(maxsize=4096)
+def _luna(ordinal):
+    """Numărul de ordine (an * 12 + lună - 1) al lunii unei zile ordinale."""
+    zi = date.fromordinal(ordinal)
+    return zi.year * 12 + zi.month - 1
+
+
+class _Luna:
+    """
+    Totalurile unei luni pentru un tip, pe apartamente. Sumele prefix peste apartamentele sortate sunt
+    refăcute doar la prima interogare de după o modificare, deci un lot de adăugări costă o singură refacere.
+    """
+
+    __slots__ = ("totaluri", "apartamente", "sume", "numere")
+
+    def __init__(self):
+        self.totaluri = {}
+        self.apartamente = None
+        self.sume = None
+        self.numere = None
+
+    def pregateste(self):
+        if self.apartamente is None:
+            self.apartamente = sorted(self.totaluri)
+            totaluri = [self.totaluri[apartament] for apartament in self.apartamente]
+            self.sume = list(accumulate((total.valoare for total in totaluri), initial=0.0))
+            self.numere = list(accumulate((total.numar for total in totaluri), initial=0))
+
+    def interval(self, apartament_start, apartament_end):
+        """
+        :return: Tuplu (suma, număr de cheltuieli) al apartamentelor din [apartament_start, apartament_end],
+            din două căutări binare și o diferență de sume prefix.
+        """
+        self.pregateste()
+        inceput = bisect_left(self.apartamente, apartament_start)
+        sfarsit = bisect_right(self.apartamente, apartament_end, lo=inceput)
+        return self.sume[sfarsit] - self.sume[inceput], self.numere[sfarsit] - self.numere[inceput]
+
+
+class IndexLuni(Index):
+    """
+    Cub de totaluri pe (apartament, tip, lună), ținut la zi la fiecare modificare.
+
+    Celulele sunt grupate pe (cod tip, lună); fiecare grup are sume prefix pe apartamente, deci totalul unui
+    interval de apartamente pe o perioadă costă O(g log a) pentru g grupuri (luni × tipuri) din perioadă,
+    independent de numărul de cheltuieli.
+    """
+
+    def __init__(self):
+        self._luni = {}
+
+    def _aduna(self, store, randuri, semn):
+        apartamente, tipuri, sume, zile = store._apartament, store._tip, store._suma, store._zi
+        if isinstance(randuri, range) and randuri.step == 1:
+            felie = slice(randuri.start, randuri.stop)
+            valori = zip(tipuri[felie], map(_luna, zile[felie]), apartamente[felie], sume[felie])
+        else:
+            valori = ((tipuri[rand], _luna(zile[rand]), apartamente[rand], sume[rand]) for rand in randuri)
+
+        pe_celula = defaultdict(list)
+        for cod, luna, apartament, suma in valori:
+            pe_celula[cod, luna, apartament].append(suma)
+
+        for (cod, luna, apartament), valori in pe_celula.items():
+            self._adauga_la(cod, luna, apartament, semn * math.fsum(valori), semn * len(valori))
+
+    def _adauga_la(self, cod, luna, apartament, valoare, numar):
+        grup = self._luni.get((cod, luna))
+        if grup is None:
+            grup = self._luni[cod, luna] = _Luna()
+        IndexTotaluri._adauga_la(grup.totaluri, apartament, valoare, numar)
+        if not grup.totaluri:
+            del self._luni[cod, luna]
+        grup.apartamente = None
+
+    def randuri_noi(self, store, randuri):
+        self._aduna(store, randuri, 1)
+
+    def randuri_sterse(self, store, randuri):
+        self._aduna(store, randuri, -1)
+
+    def suma_modificata(self, store, rand, suma_veche):
+        grup = self._luni[store._tip[rand], _luna(store._zi[rand])]
+        total = grup.totaluri[store._apartament[rand]]
+        total.adauga(-suma_veche, 0)
+        total.adauga(store._suma[rand], 0)
+        grup.apartamente = None
+
+    def _grupuri(self, apartament_start, apartament_end, inceput, sfarsit, cod):
+        for (cod_grup, luna), grup in self._luni.items():
+            if inceput <= luna <= sfarsit and cod in (None, cod_grup):
+                suma, numar = grup.interval(apartament_start, apartament_end)
+                if numar:
+                    yield luna, suma, numar
+
+    def total(self, apartament_start, apartament_end, inceput, sfarsit, cod=None):
+        """
+        :param apartament_start: Primul apartament din interval.
+        :param apartament_end: Ultimul apartament din interval.
+        :param inceput: Numărul de ordine al primei luni (an * 12 + lună - 1).
+        :param sfarsit: Numărul de ordine al ultimei luni, inclusă.
+        :param cod: Codul tipului sau None pentru toate.
+        :return: Tuplu (suma, număr de cheltuieli); (0.0, 0) dacă nu există cheltuieli.
+        """
+        parti = list(self._grupuri(apartament_start, apartament_end, inceput, sfarsit, cod))
+        return math.fsum(suma for _, suma, _ in parti), sum(numar for _, _, numar in parti)
+
+    def pe_luni(self, apartament_start, apartament_end, inceput, sfarsit, cod=None):
+        """
+        Aceiași parametri ca total().
+
+        :return: Dicționar {număr de ordine al lunii: (suma, număr de cheltuieli)}, ordonat crescător, doar
+            cu lunile care au cheltuieli în intervalul de apartamente.
+        """
+        luni = defaultdict(list)
+        for luna, suma, numar in self._grupuri(apartament_start, apartament_end, inceput, sfarsit, cod):
+            luni[luna].append((suma, numar))
+        return {luna: (math.fsum(suma for suma, _ in luni[luna]), sum(numar for _, numar in luni[luna]))
+                for luna in sorted(luni)}
+
+    def verifica(self, store):
+        asteptat = defaultdict(list)
+        for rand in range(len(store._activ)):
+            if store._activ[rand]:
+                asteptat[store._tip[rand], _luna(store._zi[rand]), store._apartament[rand]].append(store._suma[rand])
+
+        obtinut = {(cod, luna, apartament): total for (cod, luna), grup in self._luni.items()
+                   for apartament, total in grup.totaluri.items()}
+        assert set(obtinut) == set(asteptat), "Cubul pe luni nu acoperă aceleași celule ca depozitul."
+        for cheie, valori in asteptat.items():
+            total = obtinut[cheie]
+            assert total.numar == len(valori), f"Numărul de cheltuieli diferă pentru celula {cheie}."
+            assert math.isclose(total.valoare, math.fsum(valori), rel_tol=1e-12, abs_tol=1e-9), \
+                f"Totalul diferă pentru celula {cheie}: {total.valoare} != {math.fsum(valori)}"
+
+        for grup in self._luni.values():
+            grup.pregateste()
+            assert grup.apartamente == sorted(grup.totaluri), "Sumele prefix nu urmează apartamentele sortate."
+            assert grup.numere[-1] == sum(total.numar for total in grup.totaluri.values()), \
+                "Sumele prefix nu corespund totalurilor lunii."
+
+
+class IndexVersiuni(Index):
+    """
+    Contoare de versiune pe apartament și pe tip. Fiecare modificare avansează un ceas comun și îl scrie
+    în dreptul apartamentelor și tipurilor atinse, deci o versiune se schimbă doar când se schimbă datele
+    de care depinde. Cache-ul rapoartelor (cache.RegistruCuCache) compară aceste versiuni.
+    """
+
+    def __init__(self):
+        self.ceas = 0
+        self._apartamente = {}
+        self._tipuri = {}
+
+    def marcheaza(self, apartamente, tipuri):
+        """
+        Avansează ceasul și îl atribuie apartamentelor și tipurilor date.
+
+        :param apartamente: Iterabil de apartamente modificate (repetițiile sunt permise).
+        :param tipuri: Iterabil de tipuri (sau coduri de tip) modificate.
+        """
+        self.ceas += 1
+        self._apartamente.update(dict.fromkeys(apartamente, self.ceas))
+        self._tipuri.update(dict.fromkeys(tipuri, self.ceas))
+
+    def _marcheaza_randuri(self, store, randuri):
+        if isinstance(randuri, range) and randuri.step == 1:
+            felie = slice(randuri.start, randuri.stop)
+            self.marcheaza(store._apartament[felie], store._tip[felie])
+        else:
+            self.marcheaza([store._apartament[rand] for rand in randuri], [store._tip[rand] for rand in randuri])
+
+    def grup_nou(self, store, apartament, cod):
+        self.marcheaza((apartament,), (cod,))
+
+    def grup_sters(self, store, apartament, cod):
+        self.marcheaza((apartament,), (cod,))
+
+    def randuri_noi(self, store, randuri):
+        self._marcheaza_randuri(store, randuri)
+
+    def randuri_sterse(self, store, randuri):
+        self._marcheaza_randuri(store, randuri)
+
+    def suma_modificata(self, store, rand, suma_veche):
+        self.marcheaza((store._apartament[rand],), (store._tip[rand],))
+
+    def versiune(self, apartament=None, tip=None):
+        """
+        :param apartament: Apartamentul sau None.
+        :param tip: Tipul (sau codul lui) sau None.
+        :return: Ceasul ultimei modificări a apartamentului și/sau tipului; fără argumente, ceasul ultimei
+            modificări din registru. Cu ambele argumente, cea mai recentă dintre cele două versiuni.
+        """
+        if apartament is None and tip is None:
+            return self.ceas
+        versiuni = []
+        if apartament is not None:
+            versiuni.append(self._apartamente.get(apartament, 0))
+        if tip is not None:
+            versiuni.append(self._tipuri.get(tip, 0))
+        return max(versiuni)
+
+    def verifica(self, store):
+        for versiuni in (self._apartamente, self._tipuri):
+            assert all(versiune <= self.ceas for versiune in versiuni.values()), "O versiune depășește ceasul."
+
+
+def test_index_zi():
+    class Depozit:
+        _zi = array("i", [30, 10, 20, 10])
+
+    index = IndexZi()
+    index.randuri_noi(Depozit, range(4))
+
+    assert index.inainte_de(20) == [1, 3]
+    assert index.intre(10, 30) == [1, 3, 2]
+
+    index.randuri_sterse(Depozit, [3])
+    assert index.intre() == [1, 2, 0]
+
+
+def test_index_apartamente():
+    index = IndexApartamente()
+    for apartament in (120, 5, 101, 199, 200, 150):
+        index.apartament_nou(None, apartament)
+
+    assert index.intre(100, 199) == [101, 120, 150, 199]
+    assert index.intre(10 ** 9, 10 ** 9 + 5) == [] and index.intre(7, 3) == []
+
+    index.apartamente_sterse(None, [120, 101, 150])
+    index.apartamente_sterse(None, [5, 200])
+    assert index.intre(0, 10 ** 9) == [199]
+
+
+def test_total_compensat():
+    total = _Total()
+    for _ in range(10 ** 5):
+        total.adauga(0.1, 1)
+    for _ in range(10 ** 5 - 1):
+        total.adauga(-0.1, -1)
+    # Însumarea naivă ar păstra aici o derivă vizibilă
+    assert total.valoare == 0.1 and total.numar == 1
+
+    total.adauga(-0.1, -1)
+    assert (total.valoare, total.numar) == (0.0, 0)
+
+
+def test_index_versiuni():
+    class Depozit:
+        _apartament = array("i", [1, 1, 2])
+        _tip = array("B", [0, 1, 0])
+
+    index = IndexVersiuni()
+    index.randuri_noi(Depozit, range(3))
+    assert index.versiune() == 1 and index.versiune(apartament=2) == 1
+
+    index.suma_modificata(Depozit, 1, 0.0)
+    assert index.versiune(tip=1) == 2 and index.versiune(tip=0) == 1
+    assert index.versiune(apartament=2, tip=0) == 1 and index.versiune(apartament=1, tip=0) == 2
+    assert index.versiune(apartament=3) == 0
+
+
+def test_index_maxime():
+    class Depozit:
+        _apartament = array("i", [1, 1, 2, 2, 3])
+        _tip = array("B", [0, 0, 0, 1, 0])
+        _suma = array("d", [10.0, 30.0, 30.0, 5.0, 20.0])
+        _activ = array("B", [1] * 5)
+        _pozitie = {1: 0, 2: 1, 3: 2}
+
+    index = IndexMaxime()
+    index.CAPACITATE = 3
+    index.randuri_noi(Depozit, range(5))
+    # La sume egale, rândul apartamentului aflat mai devreme în registru este primul
+    assert index.maxime(Depozit, 0, 3) == [1, 2, 4] and index.maxime(Depozit, 1, 3) == [3]
+
+    # Rândul 0 nu este în heap-ul plin: ștergerea lui nu obligă la o refacere
+    Depozit._activ[0] = 0
+    index.randuri_sterse(Depozit, [0])
+    assert index._heapuri[0] is not None
+
+    Depozit._suma[2] = 1.0
+    index.suma_modificata(Depozit, 2, 30.0)
+    assert index._heapuri[0] is None
+    assert index.maxime(Depozit, 0, 2) == [1, 4]
+    index.verifica(Depozit)
+
+
+def test_index_luni():
+    class Depozit:
+        # 2023-03-05, 2023-03-20, 2023-04-01, 2024-03-05
+        _zi = array("i", [date(2023, 3, 5).toordinal(), date(2023, 3, 20).toordinal(),
+                          date(2023, 4, 1).toordinal(), date(2024, 3, 5).toordinal()] * 2)
+        _apartament = array("i", [1, 2, 2, 1, 10, 10, 20, 30])
+        _tip = array("B", [0, 0, 1, 0, 0, 1, 1, 0])
+        _suma = array("d", [10.0, 20.0, 5.0, 12.0, 1.0, 2.0, 3.0, 4.0])
+        _activ = array("B", [1] * 8)
+
+    martie, aprilie = 2023 * 12 + 2, 2023 * 12 + 3
+    index = IndexLuni()
+    index.randuri_noi(Depozit, range(8))
+    assert index.total(1, 2, martie, martie) == (30.0, 2)
+    assert index.total(1, 10, martie, martie, cod=0) == (31.0, 3)
+    assert index.total(1, 100, 0, math.inf) == (57.0, 8)
+    assert index.pe_luni(1, 2, 0, math.inf) == {martie: (30.0, 2), aprilie: (5.0, 1), martie + 12: (12.0, 1)}
+
+    Depozit._suma[0] = 15.0
+    index.suma_modificata(Depozit, 0, 10.0)
+    Depozit._activ[2] = 0
+    index.randuri_sterse(Depozit, [2])
+    assert index.total(1, 2, martie, aprilie) == (35.0, 2)
+    assert index.pe_luni(20, 30, aprilie, aprilie, cod=1) == {aprilie: (3.0, 1)}
+    index.verifica(Depozit)
+
+
+if __name__ == "__main__":
+    test_index_zi()
+    test_index_apartamente()
+    test_total_compensat()
+    test_index_versiuni()
+    test_index_maxime()
+    test_index_luni()
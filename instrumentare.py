@@ -0,0 +1,454 @@
+"""
+Instrumentare opțională a funcțiilor din bussines.py și măsurarea memoriei ocupate de registru.
+
+activeaza() instalează un observator în bussines._delegheaza care numără apelurile fiecărei funcții, le
+cronometrează (total și p99 peste ultimele `fereastra` apeluri) și reține câte cheltuieli intră în domeniul
+fiecărui apel. Cât timp instrumentarea este oprită, un apel plătește doar testul `_observator is not None`.
+Pentru funcțiile care întorc generatoare, durata include și parcurgerea rezultatului (fără timpul petrecut de
+apelant între elemente), iar apelul este înregistrat când generatorul se termină sau este închis.
+"""
+import cProfile
+import heapq
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+import types
+from array import array
+from collections import deque
+from collections.abc import Iterator
+
+import bussines
+
+# Funcțiile care lucrează pe un lot primit ca prim argument, respectiv pe un apartament sau un interval
+FUNCTII_LOT = frozenset({"adauga_cheltuieli_bulk", "modifica_cheltuieli"})
+FUNCTII_APARTAMENT = frozenset({"adauga_cheltuiala", "modifica_cheltuiala", "sterge_apartament",
+                                "calculeaza_total_cheltuieli"})
+FUNCTII_INTERVAL = frozenset({"sterge_apartamente_consecutive", "totaluri_interval", "totaluri_perioada",
+                              "totaluri_pe_perioade"})
+
+_instrumentare = None
+
+
+class StatisticiFunctie:
+    __slots__ = ("apeluri", "durata_totala", "durate", "randuri", "apeluri_cu_randuri")
+
+    def __init__(self, fereastra):
+        self.apeluri = 0
+        self.durata_totala = 0.0
+        self.durate = deque(maxlen=fereastra)
+        self.randuri = 0
+        self.apeluri_cu_randuri = 0
+
+
+class Instrumentare:
+    """
+    Observatorul instalat în bussines.py; un apel făcut din interiorul altui apel observat (de exemplu un
+    raport al registrului versionat calculat de bussines pe copia lui) este atribuit doar apelului exterior.
+    """
+
+    def __init__(self, fereastra=10000):
+        self.fereastra = fereastra
+        self._statistici = {}
+        self._blocare = threading.Lock()
+        self._local = threading.local()
+
+    def __call__(self, nume, executa, apartamente, args, kwargs):
+        local = self._local
+        if getattr(local, "in_apel", False):
+            return executa(apartamente, *args, **kwargs)
+
+        local.in_apel = True
+        try:
+            randuri = _randuri_in_domeniu(nume, apartamente, args)
+            start = time.perf_counter()
+            try:
+                rezultat = executa(apartamente, *args, **kwargs)
+            except BaseException:
+                self._inregistreaza(nume, time.perf_counter() - start, randuri)
+                raise
+        finally:
+            local.in_apel = False
+
+        durata = time.perf_counter() - start
+        if isinstance(rezultat, Iterator):
+            return self._parcurge(nume, rezultat, durata, randuri)
+        self._inregistreaza(nume, durata, randuri)
+        return rezultat
+
+    def _parcurge(self, nume, rezultat, durata, randuri):
+        """
+        Produce elementele rezultatului, cronometrând doar producerea lor; apelurile observate făcute în
+        timpul parcurgerii sunt atribuite acestui apel.
+        """
+        local = self._local
+        try:
+            while True:
+                exterior = getattr(local, "in_apel", False)
+                local.in_apel = True
+                start = time.perf_counter()
+                try:
+                    element = next(rezultat)
+                except StopIteration:
+                    return
+                finally:
+                    durata += time.perf_counter() - start
+                    local.in_apel = exterior
+                yield element
+        finally:
+            inchide = getattr(rezultat, "close", None)
+            if inchide is not None:
+                inchide()
+            self._inregistreaza(nume, durata, randuri)
+
+    def _inregistreaza(self, nume, durata, randuri):
+        with self._blocare:
+            statistici = self._statistici.get(nume)
+            if statistici is None:
+                statistici = self._statistici[nume] = StatisticiFunctie(self.fereastra)
+            statistici.apeluri += 1
+            statistici.durata_totala += durata
+            statistici.durate.append(durata)
+            if randuri is not None:
+                statistici.randuri += randuri
+                statistici.apeluri_cu_randuri += 1
+
+    def raport(self):
+        """
+        :return: Lista de dicționare {nume, apeluri, total_s, medie_ms, p99_ms, randuri_pe_apel}, descrescător
+            după timpul total; randuri_pe_apel este None dacă domeniul apelurilor nu a putut fi numărat.
+        """
+        with self._blocare:
+            rezultat = []
+            for nume, statistici in self._statistici.items():
+                durate = sorted(statistici.durate)
+                rezultat.append({
+                    "nume": nume,
+                    "apeluri": statistici.apeluri,
+                    "total_s": statistici.durata_totala,
+                    "medie_ms": statistici.durata_totala / statistici.apeluri * 1e3,
+                    "p99_ms": durate[min(len(durate) - 1, len(durate) * 99 // 100)] * 1e3,
+                    "randuri_pe_apel": statistici.randuri / statistici.apeluri_cu_randuri
+                    if statistici.apeluri_cu_randuri else None,
+                })
+        return sorted(rezultat, key=lambda linie: linie["total_s"], reverse=True)
+
+    def reseteaza(self):
+        with self._blocare:
+            self._statistici.clear()
+
+
+def activeaza(fereastra=10000):
+    """
+    Pornește instrumentarea funcțiilor din bussines.py.
+
+    :param fereastra: Câte durate recente sunt păstrate pentru p99, pentru fiecare funcție.
+    :return: Instrumentarea activă.
+    """
+    global _instrumentare
+    _instrumentare = Instrumentare(fereastra)
+    bussines.seteaza_observator(_instrumentare)
+    return _instrumentare
+
+
+def dezactiveaza():
+    global _instrumentare
+    bussines.seteaza_observator(None)
+    _instrumentare = None
+
+
+def instrumentare_activa():
+    """
+    :return: Instrumentarea pornită de activeaza() sau None.
+    """
+    return _instrumentare
+
+
+def _numar_cheltuieli(cheltuieli):
+    return sum(len(lista_cheltuieli) for lista_cheltuieli in cheltuieli.values())
+
+
+def _randuri_in_domeniu(nume, apartamente, args):
+    """
+    Câte cheltuieli intră în domeniul unui apel: lotul primit, cheltuielile apartamentului sau ale intervalului,
+    altfel tot registrul. Pentru registrele cu indexuri este o limită superioară a celor parcurse efectiv.
+
+    :return: Numărul de cheltuieli sau None dacă nu poate fi aflat fără a parcurge registrul.
+    """
+    try:
+        if nume in FUNCTII_LOT:
+            return len(args[0]) if hasattr(args[0], "__len__") else None
+        if not isinstance(apartamente, dict):
+            return None if nume in FUNCTII_APARTAMENT or nume in FUNCTII_INTERVAL else len(apartamente)
+        if nume in FUNCTII_APARTAMENT:
+            return _numar_cheltuieli(apartamente.get(args[0], {}))
+        if nume in FUNCTII_INTERVAL:
+            return sum(_numar_cheltuieli(apartamente[apartament]) for apartament in
+                       bussines._apartamente_in_interval(apartamente, args[0], args[1]))
+        return sum(_numar_cheltuieli(cheltuieli) for cheltuieli in apartamente.values())
+    except (IndexError, TypeError):
+        # Argumentele invalide sunt raportate de funcția apelată
+        return None
+
+
+def formateaza_raport(raport):
+    """
+    :param raport: Rezultatul Instrumentare.raport().
+    :return: Tabelul ca listă de linii de text.
+    """
+    linii = [f"{'functie':>50} | {'apeluri':>8} | {'total (s)':>9} | {'medie (ms)':>10} | {'p99 (ms)':>9} | "
+             f"{'randuri/apel':>12}"]
+    for linie in raport:
+        randuri = f"{linie['randuri_pe_apel']:12.0f}" if linie["randuri_pe_apel"] is not None else f"{'-':>12}"
+        linii.append(f"{linie['nume']:>50} | {linie['apeluri']:>8} | {linie['total_s']:9.3f} | "
+                     f"{linie['medie_ms']:10.3f} | {linie['p99_ms']:9.3f} | {randuri}")
+    return linii
+
+
+_FARA_CONTINUT = (str, bytes, bytearray, int, float, complex, bool, type(None), array, memoryview, range)
+_NEPARCURSE = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+
+def _marime_profunda(obiect, vazute):
+    """
+    Octeții (sys.getsizeof) și numărul obiectelor accesibile din `obiect`, fără cele deja numărate în `vazute`.
+
+    :return: Tuplu (octeți, obiecte).
+    """
+    octeti = obiecte = 0
+    stiva = [obiect]
+    while stiva:
+        curent = stiva.pop()
+        if id(curent) in vazute or isinstance(curent, _NEPARCURSE):
+            continue
+        vazute.add(id(curent))
+        octeti += sys.getsizeof(curent)
+        obiecte += 1
+        if isinstance(curent, _FARA_CONTINUT):
+            continue
+        if isinstance(curent, dict):
+            stiva.extend(curent.keys())
+            stiva.extend(curent.values())
+        elif isinstance(curent, (list, tuple, set, frozenset, deque)):
+            stiva.extend(curent)
+        else:
+            if hasattr(curent, "__dict__"):
+                stiva.append(curent.__dict__)
+            for clasa in type(curent).__mro__:
+                sloturi = clasa.__dict__.get("__slots__", ())
+                for slot in (sloturi,) if isinstance(sloturi, str) else sloturi:
+                    if slot != "__dict__" and hasattr(curent, slot):
+                        stiva.append(getattr(curent, slot))
+    return octeti, obiecte
+
+
+def amprenta_registru(apartamente, top=10):
+    """
+    Memoria ocupată de registru, măsurată parcurgând obiectele lui cu sys.getsizeof.
+
+    Pentru dicționar, memoria este împărțită pe tipuri de cheltuieli și sunt listate cele mai mari `top`
+    apartamente; pentru celelalte registre, pe atributele obiectului (coloane, indexuri). Un obiect comun mai
+    multor părți este numărat o singură dată, la prima parte care îl conține.
+
+    :return: Dicționar cu cheile registru, cheltuieli, obiecte, octeti, pe_tip / pe_atribut, apartamente_mari
+        (doar pentru dicționar) și tracemalloc (octeții urmăriți, dacă tracemalloc este pornit).
+    """
+    vazute = {id(apartamente)}
+    octeti, obiecte = sys.getsizeof(apartamente), 1
+    amprenta = {"registru": type(apartamente).__name__}
+
+    if isinstance(apartamente, dict):
+        pe_tip = {}
+        pe_apartament = []
+        for apartament, cheltuieli in apartamente.items():
+            octeti_apartament, obiecte_apartament = _marime_profunda(apartament, vazute)
+            vazute.add(id(cheltuieli))
+            octeti_apartament += sys.getsizeof(cheltuieli)
+            obiecte_apartament += 1
+            for tip, lista_cheltuieli in cheltuieli.items():
+                octeti_tip, obiecte_tip = _marime_profunda(tip, vazute)
+                octeti_lista, obiecte_lista = _marime_profunda(lista_cheltuieli, vazute)
+                parte = pe_tip.setdefault(tip, {"cheltuieli": 0, "obiecte": 0, "octeti": 0})
+                parte["cheltuieli"] += len(lista_cheltuieli)
+                parte["obiecte"] += obiecte_tip + obiecte_lista
+                parte["octeti"] += octeti_tip + octeti_lista
+                octeti_apartament += octeti_tip + octeti_lista
+                obiecte_apartament += obiecte_tip + obiecte_lista
+            pe_apartament.append((octeti_apartament, apartament, _numar_cheltuieli(cheltuieli)))
+            octeti += octeti_apartament
+            obiecte += obiecte_apartament
+        amprenta["cheltuieli"] = sum(parte["cheltuieli"] for parte in pe_tip.values())
+        amprenta["pe_tip"] = pe_tip
+        amprenta["apartamente_mari"] = [{"apartament": apartament, "cheltuieli": cheltuieli, "octeti": octeti_ap}
+                                        for octeti_ap, apartament, cheltuieli in heapq.nlargest(top, pe_apartament)]
+    else:
+        atribute = dict(getattr(apartamente, "__dict__", {}))
+        for clasa in type(apartamente).__mro__:
+            for slot in clasa.__dict__.get("__slots__", ()):
+                if hasattr(apartamente, slot):
+                    atribute[slot] = getattr(apartamente, slot)
+        pe_atribut = {}
+        for nume, valoare in atribute.items():
+            octeti_atribut, obiecte_atribut = _marime_profunda(valoare, vazute)
+            pe_atribut[nume] = {"obiecte": obiecte_atribut, "octeti": octeti_atribut}
+            octeti += octeti_atribut
+            obiecte += obiecte_atribut
+        amprenta["cheltuieli"] = len(apartamente) if hasattr(apartamente, "__len__") else None
+        amprenta["pe_atribut"] = pe_atribut
+
+    amprenta["obiecte"] = obiecte
+    amprenta["octeti"] = octeti
+    amprenta["tracemalloc"] = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+    return amprenta
+
+
+def formateaza_amprenta(amprenta):
+    """
+    :param amprenta: Rezultatul amprenta_registru().
+    :return: Raportul ca listă de linii de text.
+    """
+    linii = [f"Registru {amprenta['registru']}: {amprenta['cheltuieli']} cheltuieli, {amprenta['obiecte']} obiecte, "
+             f"{amprenta['octeti'] / 2 ** 20:.2f} MiB"]
+    for tip, parte in amprenta.get("pe_tip", {}).items():
+        linii.append(f"  tip {tip}: {parte['cheltuieli']} cheltuieli, {parte['obiecte']} obiecte, "
+                     f"{parte['octeti'] / 2 ** 20:.2f} MiB")
+    for parte in amprenta.get("apartamente_mari", []):
+        linii.append(f"  apartamentul {parte['apartament']}: {parte['cheltuieli']} cheltuieli, "
+                     f"{parte['octeti'] / 1024:.1f} KiB")
+    for nume, parte in sorted(amprenta.get("pe_atribut", {}).items(), key=lambda element: -element[1]["octeti"]):
+        if parte["octeti"]:
+            linii.append(f"  {nume}: {parte['obiecte']} obiecte, {parte['octeti'] / 2 ** 20:.2f} MiB")
+    if amprenta["tracemalloc"] is not None:
+        linii.append(f"Memorie urmărită de tracemalloc: {amprenta['tracemalloc'] / 2 ** 20:.2f} MiB")
+    return linii
+
+
+def porneste_profilare():
+    """
+    Pornește instrumentarea, tracemalloc și cProfile (opțiunea --profile din main.py).
+
+    :return: Profilerul cProfile pornit.
+    """
+    activeaza()
+    tracemalloc.start()
+    profil = cProfile.Profile()
+    profil.enable()
+    return profil
+
+
+def opreste_profilare(profil, registru, fisier=None, linii=25):
+    """
+    Oprește profilarea și scrie rezumatul: statisticile funcțiilor din bussines, memoria registrului și
+    primele `linii` funcții din cProfile, după timpul cumulat.
+    """
+    profil.disable()
+    fisier = fisier or sys.stderr
+    try:
+        raport = _instrumentare.raport() if _instrumentare is not None else []
+        for linie in formateaza_raport(raport) + formateaza_amprenta(amprenta_registru(registru)):
+            print(linie, file=fisier)
+        pstats.Stats(profil, stream=fisier).sort_stats("cumulative").print_stats(linii)
+    finally:
+        tracemalloc.stop()
+        dezactiveaza()
+
+
+def test_instrumentare():
+    from registru_versionat import RegistruVersionat
+    from store import ExpenseStore
+
+    instrumentare = activeaza()
+    try:
+        apartamente = {}
+        for zi in range(1, 11):
+            apartamente = bussines.adauga_cheltuiala(apartamente, 1 + zi % 2, "apa", zi, f"2023-10-{zi:02d}")
+        bussines.adauga_cheltuieli_bulk(apartamente, [(3, "gaz", 5, "2023-10-01")] * 4)
+        bussines.suma_cheltuieli_tip(apartamente, "apa")
+        bussines.totaluri_interval(apartamente, 2, 3)
+        bussines.calculeaza_total_cheltuieli(ExpenseStore.din_dictionar(apartamente), 1)
+        # Raportul registrului versionat este calculat tot de bussines, dar se numără o singură dată
+        bussines.group_by(RegistruVersionat.din_dictionar(apartamente), "tip")
+        try:
+            bussines.adauga_cheltuiala(apartamente, "x", "apa", 1, "2023-10-01")
+            assert False
+        except ValueError:
+            assert True
+
+        raport = {linie["nume"]: linie for linie in instrumentare.raport()}
+        assert raport["adauga_cheltuiala"]["apeluri"] == 11
+        # Înainte de fiecare adăugare apartamentul avea 0, 0, 1, 1, ..., 4, 4 cheltuieli, iar apelul invalid 0
+        assert raport["adauga_cheltuiala"]["randuri_pe_apel"] == 20 / 11
+        assert raport["adauga_cheltuieli_bulk"]["randuri_pe_apel"] == 4
+        assert raport["suma_cheltuieli_tip"]["randuri_pe_apel"] == 14
+        assert raport["totaluri_interval"]["randuri_pe_apel"] == 9
+        assert raport["calculeaza_total_cheltuieli"]["randuri_pe_apel"] is None
+        assert raport["group_by"]["apeluri"] == 1 and raport["group_by"]["randuri_pe_apel"] == 14
+        assert all(linie["p99_ms"] >= 0 and linie["total_s"] >= 0 for linie in raport.values())
+        assert len(formateaza_raport(instrumentare.raport())) == len(raport) + 1
+    finally:
+        dezactiveaza()
+
+    assert bussines._observator is None and instrumentare_activa() is None
+    bussines.suma_cheltuieli_tip({}, "apa")
+    assert "suma_cheltuieli_tip" in {linie["nume"] for linie in instrumentare.raport()}
+    assert [linie["apeluri"] for linie in instrumentare.raport() if linie["nume"] == "suma_cheltuieli_tip"] == [1]
+
+
+def test_instrumentare_generatoare():
+    class RegistruLent:
+        def cheltuieli_mai_mari_decat(self, suma, de_la=None):
+            for rand in range(3):
+                time.sleep(0.02)
+                yield rand
+
+    instrumentare = activeaza()
+    try:
+        rezultat = bussines.cheltuieli_mai_mari_decat(RegistruLent(), 0)
+        # Apelul este înregistrat abia după parcurgere, iar timpul apelantului dintre elemente nu este numărat
+        assert instrumentare.raport() == []
+        elemente = []
+        for element in rezultat:
+            elemente.append(element)
+            time.sleep(0.1)
+        assert elemente == [0, 1, 2]
+        linie, = instrumentare.raport()
+        assert linie["nume"] == "cheltuieli_mai_mari_decat" and linie["apeluri"] == 1
+        assert 0.06 <= linie["total_s"] < 0.25
+
+        # Un generator abandonat este înregistrat la închidere
+        rezultat = bussines.cheltuieli_mai_mari_decat(RegistruLent(), 0)
+        next(rezultat)
+        rezultat.close()
+        assert instrumentare.raport()[0]["apeluri"] == 2
+    finally:
+        dezactiveaza()
+
+
+def test_amprenta_registru():
+    from store import ExpenseStore
+
+    apartamente = {1: {"apa": [(10.0, "2023-10-01"), (20.0, "2023-10-02")], "gaz": [(5.0, "2023-10-03")]},
+                   2: {"apa": [(30.0, "2023-10-04")]}}
+    amprenta = amprenta_registru(apartamente, top=1)
+    assert amprenta["registru"] == "dict" and amprenta["cheltuieli"] == 4
+    assert {tip: parte["cheltuieli"] for tip, parte in amprenta["pe_tip"].items()} == {"apa": 3, "gaz": 1}
+    assert [parte["apartament"] for parte in amprenta["apartamente_mari"]] == [1]
+    # Fiecare cheltuială are tuplul ei, o sumă și o dată
+    assert amprenta["obiecte"] > 4 * 3 and amprenta["octeti"] > sys.getsizeof(apartamente)
+    assert amprenta["tracemalloc"] is None
+
+    tracemalloc.start()
+    try:
+        amprenta = amprenta_registru(ExpenseStore.din_dictionar(apartamente))
+    finally:
+        tracemalloc.stop()
+    assert amprenta["registru"] == "ExpenseStore" and amprenta["cheltuieli"] == 4
+    assert amprenta["pe_atribut"] and amprenta["tracemalloc"] > 0
+    assert formateaza_amprenta(amprenta)[0].startswith("Registru ExpenseStore: 4 cheltuieli")
+
+
+if __name__ == "__main__":
+    test_instrumentare()
+    test_instrumentare_generatoare()
+    test_amprenta_registru()
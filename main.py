@@ -1,6 +1,115 @@
+import argparse
+import asyncio
+import os
+import sys
 
+from cache import RegistruCuCache
+from comenzi import ruleaza_script
+from instrumentare import opreste_profilare, porneste_profilare
+from persistenta import RegistruPersistent, SnapshotMapat
+from registru_partajat import RegistruPartajat
+from registru_versionat import RegistruVersionat
+from serviciu import serveste
+from sqlite_store import SqliteStore
+from store import ExpenseStore
 from ui import main
 
+BACKENDURI = ("store", "sqlite", "dict", "versionat", "partajat")
+
+
+def citeste_argumente(argv=None):
+    parser = argparse.ArgumentParser(description="Evidența cheltuielilor pe apartamente.")
+    parser.add_argument("--backend", choices=BACKENDURI, default="store",
+                        help="Registrul folosit: depozitul columnar (implicit), o bază SQLite, dicționarul clasic, "
+                             "registrul versionat (cu anulare și refacere) sau registrul partajat pe procese.")
+    parser.add_argument("--date", help="Directorul în care registrul este salvat (store: jurnal de operații + "
+                                       "snapshot; sqlite: fișierul cheltuieli.sqlite).")
+    parser.add_argument("--cache", type=int, metavar="N",
+                        help="Câte rapoarte păstrează cache-ul (implicit 256; 0 îl dezactivează).")
+    parser.add_argument("--partitii", type=int, default=os.cpu_count() or 1, metavar="N",
+                        help="Numărul de procese ale registrului partajat (implicit numărul de nuclee).")
+    parser.add_argument("--port", type=int, help="Servește registrul prin HTTP/JSON pe acest port, în locul meniului "
+                                                 "din consolă (vezi serviciu.py).")
+    parser.add_argument("--script", metavar="FISIER",
+                        help="Rulează comenzile din fișier ('-' pentru stdin) în locul meniului din consolă "
+                             "(vezi comenzi.py).")
+    parser.add_argument("--host", default="127.0.0.1", help="Adresa pe care ascultă serviciul HTTP.")
+    parser.add_argument("--doar-citire", action="store_true",
+                        help="Rulează scriptul direct peste snapshot-ul mapat în memorie și jurnalul scris după el, "
+                             "fără refacerea registrului, deci pornirea nu depinde de mărimea lui (cere --date și "
+                             "--script; rapoartele disponibile sunt report sum și report total).")
+    parser.add_argument("--profile", action="store_true",
+                        help="Măsoară operațiile (apeluri, latențe, memoria registrului) și afișează la ieșire un "
+                             "rezumat, inclusiv statisticile cProfile.")
+    argumente = parser.parse_args(argv)
+    if argumente.backend in ("dict", "versionat", "partajat") and argumente.date:
+        parser.error(f"registrul {argumente.backend} nu poate fi salvat pe disc; folosiți --backend store sau sqlite")
+    if argumente.backend in ("dict", "versionat", "partajat") and argumente.cache:
+        parser.error(f"registrul {argumente.backend} nu poate folosi cache-ul de rapoarte; "
+                     f"folosiți --backend store sau sqlite")
+    if argumente.cache is not None and argumente.cache < 0:
+        parser.error("mărimea cache-ului nu poate fi negativă")
+    if argumente.script is not None and argumente.port is not None:
+        parser.error("--script și --port nu pot fi folosite împreună")
+    if argumente.partitii < 1:
+        parser.error("registrul partajat are nevoie de cel puțin o partiție")
+    if argumente.doar_citire and (argumente.backend != "store" or not argumente.date or argumente.script is None):
+        parser.error("--doar-citire se folosește cu --backend store, --date și --script")
+    return argumente
+
+
+def deschide_registru(argumente):
+    """
+    Creează registrul cerut în linia de comandă.
+
+    :param argumente: Argumentele citite de citeste_argumente.
+    :return: Registrul (dict, RegistruVersionat, RegistruPartajat, SnapshotMapat, ExpenseStore, RegistruPersistent
+        sau SqliteStore); ultimele trei sunt învelite în RegistruCuCache dacă cache-ul de rapoarte nu este dezactivat.
+    """
+    if argumente.doar_citire:
+        return SnapshotMapat.deschide(argumente.date)
+    if argumente.backend == "dict":
+        return {}
+    if argumente.backend == "versionat":
+        return RegistruVersionat()
+    if argumente.backend == "partajat":
+        return RegistruPartajat(argumente.partitii)
+    if argumente.backend == "sqlite":
+        if not argumente.date:
+            registru = SqliteStore()
+        else:
+            os.makedirs(argumente.date, exist_ok=True)
+            registru = SqliteStore(os.path.join(argumente.date, "cheltuieli.sqlite"))
+    elif argumente.date:
+        registru = RegistruPersistent.deschide(argumente.date)
+    else:
+        registru = ExpenseStore()
+
+    marime = 256 if argumente.cache is None else argumente.cache
+    return RegistruCuCache(registru, marime) if marime else registru
+
+
 if __name__ == "__main__":
+    argumente = citeste_argumente()
+    apartamente = deschide_registru(argumente)
+    profil = porneste_profilare() if argumente.profile else None
+    erori = 0
 
-    main()
+    try:
+        if argumente.script == "-":
+            apartamente, statistici = ruleaza_script(apartamente, sys.stdin)
+            erori = statistici["erori"]
+        elif argumente.script is not None:
+            with open(argumente.script, encoding="utf-8") as fisier:
+                apartamente, statistici = ruleaza_script(apartamente, fisier)
+            erori = statistici["erori"]
+        elif argumente.port is None:
+            apartamente = main(apartamente)
+        else:
+            asyncio.run(serveste(apartamente, argumente.host, argumente.port))
+    finally:
+        if profil is not None:
+            opreste_profilare(profil, apartamente)
+        if hasattr(apartamente, "inchide"):
+            apartamente.inchide()
+    sys.exit(1 if erori else 0)
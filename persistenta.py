@@ -0,0 +1,931 @@
+"""
+Salvarea registrului pe disc: jurnal append-only de operații (JSONL) plus snapshot-uri binare pe coloane.
+
+La pornire se încarcă ultimul snapshot și se reaplică doar operațiile din jurnal scrise după el. Rapoartele
+care nu modifică registrul pot rula direct peste snapshot, mapat în memorie, cu operațiile din jurnal aplicate
+ca segment delta (vezi SnapshotMapat și main.py --doar-citire).
+"""
+import io
+import json
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from itertools import compress
+
+import bussines
+from bussines import (validare_numar_apartament, validare_tip_cheltuiala, validare_suma, validare_inregistrare,
+                      validare_corectura)
+from store import ExpenseStore, COD_TIP, COLOANE, validare_apartament_coloana
+
+try:
+    import numpy
+except ImportError:  # NumPy este opțional: fără el, rapoartele parcurg direct coloanele mapate
+    numpy = None
+
+
+
+def _argumente(validare):
+    """
+    :return: Funcția care validează argumentele unei operații simple; aceleași argumente validate sunt
+        aplicate registrului și scrise în jurnal.
+    """
+    def valideaza(*args):
+        argumente = validare(*args)
+        return argumente, argumente
+    return valideaza
+
+
+def _lot(validare):
+    """
+    :return: Funcția care validează un lot: elementele valide sunt aplicate și scrise în jurnal în forma
+        validată, iar cele invalide sunt transmise neschimbate registrului (care le raportează ca erori, pe
+        pozițiile lor) și lipsesc din jurnal.
+    """
+    def valideaza(elemente):
+        aplicate, scrise = [], []
+        for element in elemente:
+            try:
+                element = validare(element)
+                scrise.append(element)
+            except ValueError:
+                pass
+            aplicate.append(element)
+        return (aplicate,), (scrise,)
+    return valideaza
+
+
+def _validare_corectura_id(actualizare):
+    try:
+        id_cheltuiala, suma_noua = actualizare
+    except (TypeError, ValueError):
+        raise ValueError("Eroare: Corectura trebuie să aibă forma (id_cheltuiala, suma_noua).")
+    return id_cheltuiala, validare_suma(suma_noua)
+
+
+# Operațiile care modifică registrul și validarea argumentelor lor înainte de scrierea în jurnal
+_VALIDARI = {
+    "adauga_cheltuiala": _argumente(lambda *inregistrare: validare_inregistrare(inregistrare)),
+    "adauga_cheltuieli_bulk": _lot(validare_inregistrare),
+    "adauga_cheltuiala_id": _argumente(lambda *inregistrare: validare_inregistrare(inregistrare)),
+    "modifica_cheltuiala": _argumente(lambda *actualizare: validare_corectura(actualizare)),
+    "modifica_cheltuieli": _lot(validare_corectura),
+    "modifica_cheltuiala_id": _argumente(lambda *actualizare: _validare_corectura_id(actualizare)),
+    "modifica_cheltuieli_id": _lot(_validare_corectura_id),
+    "sterge_cheltuiala_id": _argumente(lambda id_cheltuiala: (id_cheltuiala,)),
+    "sterge_apartament": _argumente(lambda apartament: (validare_numar_apartament(apartament),)),
+    "sterge_apartamente_consecutive": _argumente(lambda apartament_start, apartament_end: (
+        validare_numar_apartament(apartament_start), validare_numar_apartament(apartament_end))),
+    "sterge_cheltuieli_tip": _argumente(lambda tip: (validare_tip_cheltuiala(tip),)),
+    "elimina_cheltuiala": _argumente(lambda tip: (validare_tip_cheltuiala(tip),)),
+    "elimina_cheltuieli_mai_mici_decat": _argumente(lambda suma_minima: (validare_suma(suma_minima),)),
+}
+MUTATORI = frozenset(_VALIDARI)
+
+FISIER_JURNAL = "jurnal.jsonl"
+FISIER_SNAPSHOT = "snapshot.bin"
+
+# Antetul snapshot-ului: semnătură, versiune, ordinea octeților (0 little, 1 big), numărul ultimei operații
+# incluse și numărul de rânduri, de apartamente, de grupuri și de rânduri din grupuri
+_ANTET = struct.Struct("<4sBB2xQQQQQ")
+_SEMNATURA = b"FPCH"
+_VERSIUNE = 1
+
+# Secțiunile care urmează antetului, fiecare aliniată la 8 octeți ca să poată fi văzută direct ca vector:
+# coloanele depozitului, apoi structura grupurilor (pentru fiecare apartament numărul lui de grupuri,
+# pentru fiecare grup codul și lungimea, iar rândurile tuturor grupurilor într-o singură coloană)
+SECTIUNI = COLOANE + (("apartamente", "i"), ("numar_grupuri", "B"), ("coduri", "B"), ("lungimi", "q"),
+                      ("randuri", "q"))
+
+
+def _scrie_atomic(cale, scrie):
+    """
+    Scrie un fișier prin redenumirea unui fișier temporar sincronizat, ca să nu rămână niciodată pe jumătate scris.
+
+    :param cale: Calea fișierului.
+    :param scrie: Funcție care primește fișierul temporar (deschis binar) și scrie conținutul.
+    """
+    director = os.path.dirname(cale) or "."
+    descriptor, temporar = tempfile.mkstemp(dir=director, prefix=".tmp-")
+    with os.fdopen(descriptor, "wb") as fisier:
+        scrie(fisier)
+        fisier.flush()
+        os.fsync(fisier.fileno())
+    os.replace(temporar, cale)
+
+
+def _aliniere(pozitie):
+    return -pozitie % 8
+
+
+def _scrie_snapshot(cale, numar_operatie, stare):
+    """
+    Scrie starea unui depozit (vezi ExpenseStore.exporta_stare) în formatul binar al snapshot-ului.
+    """
+    sectiuni = dict(stare["coloane"])
+    sectiuni.update((nume, array(tip_coloana)) for nume, tip_coloana in SECTIUNI[len(COLOANE):])
+    for apartament, cheltuieli in stare["grupuri"]:
+        sectiuni["apartamente"].append(apartament)
+        sectiuni["numar_grupuri"].append(len(cheltuieli))
+        for cod, randuri in cheltuieli:
+            sectiuni["coduri"].append(cod)
+            sectiuni["lungimi"].append(len(randuri))
+            sectiuni["randuri"].extend(randuri)
+
+    def scrie(fisier):
+        fisier.write(_ANTET.pack(_SEMNATURA, _VERSIUNE, sys.byteorder == "big", numar_operatie,
+                                 len(sectiuni["activ"]), len(sectiuni["apartamente"]), len(sectiuni["coduri"]),
+                                 len(sectiuni["randuri"])))
+        for nume, _ in SECTIUNI:
+            continut = sectiuni[nume].tobytes()
+            fisier.write(continut + bytes(_aliniere(len(continut))))
+
+    _scrie_atomic(cale, scrie)
+
+
+def _citeste_sectiuni(continut):
+    """
+    Împarte conținutul unui snapshot în secțiuni, fără a copia datele.
+
+    :param continut: Conținutul fișierului (bytes sau mmap).
+    :return: (numărul ultimei operații incluse, True dacă ordinea octeților diferă de cea a mașinii curente,
+              dicționar {nume secțiune: memoryview de octeți}).
+    :raises: ValueError dacă fișierul nu este un snapshot valid.
+    """
+    if len(continut) < _ANTET.size:
+        raise ValueError("Snapshot incomplet.")
+    semnatura, versiune, big_endian, numar_operatie, *lungimi = _ANTET.unpack_from(continut)
+    if semnatura != _SEMNATURA or versiune != _VERSIUNE:
+        raise ValueError("Fișierul nu este un snapshot cunoscut.")
+
+    numar_randuri, numar_apartamente, numar_grupuri, numar_randuri_grupuri = lungimi
+    numar_elemente = [numar_randuri] * len(COLOANE) + [numar_apartamente, numar_apartamente, numar_grupuri,
+                                                       numar_grupuri, numar_randuri_grupuri]
+    octeti = memoryview(continut)
+    sectiuni = {}
+    pozitie = _ANTET.size
+    for (nume, tip_coloana), numar in zip(SECTIUNI, numar_elemente):
+        lungime = numar * array(tip_coloana).itemsize
+        if pozitie + lungime > len(octeti):
+            raise ValueError("Snapshot incomplet.")
+        sectiuni[nume] = octeti[pozitie:pozitie + lungime]
+        pozitie += lungime + _aliniere(lungime)
+    return numar_operatie, big_endian != (sys.byteorder == "big"), sectiuni
+
+
+class JurnalOperatii:
+    """
+    Jurnal append-only de operații, câte un obiect JSON pe linie.
+
+    Scrierile sunt grupate: liniile se adună în memorie și sunt scrise și sincronizate pe disc (fsync)
+    o dată pentru tot lotul, când lotul se umple, când a trecut intervalul maxim de la prima scriere
+    nesincronizată sau la apelul explicit al sincronizeaza(). Intervalul este un termen real: un temporizator
+    pornit la prima scriere din lot sincronizează jurnalul chiar dacă nu mai urmează alte scrieri.
+    """
+
+    def __init__(self, cale, lot=64, interval=0.05):
+        self.cale = cale
+        self.lot = lot
+        self.interval = interval
+        self._fisier = open(cale, "a", encoding="utf-8")
+        self._in_asteptare = []
+        self._prima_scriere = None
+        self._temporizator = None
+        self._lacat = threading.RLock()
+
+    @staticmethod
+    def serializeaza(intrare):
+        """
+        :param intrare: Dicționar serializabil JSON.
+        :return: Linia de jurnal a intrării.
+        :raises: TypeError sau ValueError dacă intrarea nu poate fi scrisă în jurnal.
+        """
+        return json.dumps(intrare, ensure_ascii=False, separators=(",", ":"), allow_nan=False)
+
+    def scrie(self, intrare):
+        """
+        Adaugă o intrare în jurnal.
+
+        :param intrare: Dicționar serializabil JSON.
+        """
+        self.scrie_linie(self.serializeaza(intrare))
+
+    def scrie_linie(self, linie):
+        """
+        Adaugă în jurnal o intrare deja serializată (vezi serializeaza).
+        """
+        with self._lacat:
+            self._in_asteptare.append(linie)
+            if self._prima_scriere is None:
+                self._prima_scriere = time.monotonic()
+                if self.interval > 0 and len(self._in_asteptare) < self.lot:
+                    self._temporizator = threading.Timer(self.interval, self.sincronizeaza)
+                    self._temporizator.daemon = True
+                    self._temporizator.start()
+            if len(self._in_asteptare) >= self.lot or time.monotonic() - self._prima_scriere >= self.interval:
+                self.sincronizeaza()
+
+    def sincronizeaza(self):
+        """
+        Scrie pe disc intrările din lotul curent și așteaptă confirmarea (fsync).
+        """
+        with self._lacat:
+            if self._temporizator is not None:
+                self._temporizator.cancel()
+                self._temporizator = None
+            if not self._in_asteptare or self._fisier.closed:
+                return
+            self._fisier.write("\n".join(self._in_asteptare) + "\n")
+            self._fisier.flush()
+            os.fsync(self._fisier.fileno())
+            self._in_asteptare = []
+            self._prima_scriere = None
+
+    def goleste(self):
+        """
+        Golește jurnalul (după ce conținutul lui a fost inclus într-un snapshot).
+        """
+        with self._lacat:
+            self.sincronizeaza()
+            self._fisier.close()
+            self._fisier = open(self.cale, "w", encoding="utf-8")
+
+    def inchide(self):
+        with self._lacat:
+            self.sincronizeaza()
+            self._fisier.close()
+
+    @staticmethod
+    def citeste(cale, dupa=0):
+        """
+        Citește intrările din jurnal cu numărul de ordine mai mare decât `dupa`.
+
+        O ultimă linie incompletă (scriere întreruptă) este ignorată.
+
+        :param cale: Calea jurnalului.
+        :param dupa: Numărul de ordine al ultimei operații deja aplicate.
+        :return: Generator de intrări.
+        """
+        if not os.path.exists(cale):
+            return
+        with open(cale, encoding="utf-8") as fisier:
+            for linie in fisier:
+                try:
+                    intrare = json.loads(linie)
+                except ValueError:
+                    break
+                if intrare["nr"] > dupa:
+                    yield intrare
+
+
+class RegistruPersistent:
+    """
+    Registru salvat pe disc peste un ExpenseStore.
+
+    Expune aceleași metode ca depozitul, deci poate fi transmis funcțiilor din bussines.py. Fiecare
+    modificare reușită este adăugată în jurnal; la fiecare `snapshot_la` operații se scrie un snapshot
+    și jurnalul este golit.
+    """
+
+    def __init__(self, director, store, numar_operatie, lot=64, snapshot_la=10000):
+        self.director = director
+        self.snapshot_la = snapshot_la
+        self._store = store
+        self._numar_operatie = numar_operatie
+        self._operatii_de_la_snapshot = 0
+        self._jurnal = JurnalOperatii(os.path.join(director, FISIER_JURNAL), lot=lot)
+
+    @classmethod
+    def deschide(cls, director, **optiuni):
+        """
+        Deschide (sau creează) un registru salvat în directorul dat.
+
+        :param director: Directorul cu jurnalul și snapshot-ul.
+        :param optiuni: lot, snapshot_la (vezi RegistruPersistent).
+        :return: RegistruPersistent cu starea refăcută.
+        :raises: ValueError dacă o operație din jurnal nu mai poate fi aplicată: în jurnal ajung doar operațiile
+            reușite, deci jurnalul nu mai corespunde snapshot-ului.
+        """
+        os.makedirs(director, exist_ok=True)
+        store, numar_operatie = cls._incarca_snapshot(os.path.join(director, FISIER_SNAPSHOT))
+
+        for intrare in JurnalOperatii.citeste(os.path.join(director, FISIER_JURNAL), dupa=numar_operatie):
+            try:
+                getattr(store, intrare["op"])(*intrare["args"])
+            except ValueError as e:
+                raise ValueError(f"Eroare: Jurnalul nu corespunde datelor: operația {intrare['nr']} "
+                                 f"({intrare['op']}) a eșuat la reaplicare: {e}") from e
+            numar_operatie = intrare["nr"]
+
+        return cls(director, store, numar_operatie, **optiuni)
+
+    @staticmethod
+    def _incarca_snapshot(cale):
+        if not os.path.exists(cale):
+            return ExpenseStore(), 0
+
+        with open(cale, "rb") as fisier:
+            numar_operatie, inversat, sectiuni = _citeste_sectiuni(fisier.read())
+
+        vectori = {}
+        for nume, tip_coloana in SECTIUNI:
+            vectori[nume] = array(tip_coloana)
+            vectori[nume].frombytes(sectiuni[nume])
+            if inversat:
+                vectori[nume].byteswap()
+
+        grupuri = []
+        grup = inceput = 0
+        randuri = vectori["randuri"]
+        for apartament, numar_grupuri in zip(vectori["apartamente"], vectori["numar_grupuri"]):
+            cheltuieli = []
+            for cod, lungime in zip(vectori["coduri"][grup:grup + numar_grupuri],
+                                    vectori["lungimi"][grup:grup + numar_grupuri]):
+                cheltuieli.append((cod, randuri[inceput:inceput + lungime]))
+                inceput += lungime
+            grup += numar_grupuri
+            grupuri.append((apartament, cheltuieli))
+
+        coloane = {nume: vectori[nume] for nume, _ in COLOANE}
+        return ExpenseStore.din_stare({"coloane": coloane, "grupuri": grupuri}), numar_operatie
+
+    def snapshot(self):
+        """
+        Scrie starea curentă într-un snapshot și golește jurnalul (îmbină operațiile din jurnal în snapshot).
+        """
+        self._jurnal.sincronizeaza()
+        _scrie_snapshot(os.path.join(self.director, FISIER_SNAPSHOT), self._numar_operatie,
+                        self._store.exporta_stare())
+        self._jurnal.goleste()
+        self._operatii_de_la_snapshot = 0
+
+    def sincronizeaza(self):
+        self._jurnal.sincronizeaza()
+
+    def inchide(self):
+        self._jurnal.inchide()
+
+    def __len__(self):
+        return len(self._store)
+
+    def __getattr__(self, nume):
+        atribut = getattr(self._store, nume)
+        if nume not in MUTATORI:
+            return atribut
+
+        def operatie(*args):
+            # Intrarea din jurnal este construită și serializată înaintea modificării, din argumentele validate:
+            # o intrare care nu poate fi scrisă lasă registrul neschimbat
+            aplicate, scrise = _VALIDARI[nume](*args)
+            linie = JurnalOperatii.serializeaza({"nr": self._numar_operatie + 1, "op": nume, "args": scrise})
+
+            rezultat = atribut(*aplicate)
+            self._numar_operatie += 1
+            self._jurnal.scrie_linie(linie)
+            self._operatii_de_la_snapshot += 1
+            if self._operatii_de_la_snapshot >= self.snapshot_la:
+                self.snapshot()
+
+            if rezultat is self._store:
+                return self
+            if isinstance(rezultat, tuple) and rezultat and rezultat[0] is self._store:
+                return (self,) + rezultat[1:]
+            return rezultat
+
+        return operatie
+
+
+class SnapshotMapat:
+    """
+    Vedere doar pentru citire peste ultimul snapshot, mapat în memorie.
+
+    Deschiderea nu citește și nu convertește datele: coloanele sunt văzute direct în fișier, iar rapoartele
+    le parcurg (cu NumPy, ca reduceri vectoriale), deci pornirea nu depinde de mărimea registrului.
+    Operațiile din jurnal scrise după snapshot formează un segment delta, aplicat la deschidere peste
+    coloanele mapate: rândurile noi, sumele modificate și rândurile șterse sunt ținute separat, iar
+    totalurile pe tip și pe apartament primesc corecturile lor. Segmentul este îmbinat în snapshot de
+    RegistruPersistent.snapshot(); numărul operațiilor lui este în `operatii_din_jurnal`.
+
+    Metodele poartă aceleași nume ca funcțiile din bussines.py, deci vederea poate fi transmisă acelor funcții;
+    celelalte funcții din bussines.py sunt respinse cu ValueError.
+    """
+
+    def __init__(self, cale=None):
+        """
+        :param cale: Calea snapshot-ului sau None pentru un registru fără snapshot (doar jurnal).
+        """
+        if cale is None:
+            self._harta = None
+            self.nr = 0
+            self._sectiuni = {nume: memoryview(array(tip_coloana)) for nume, tip_coloana in SECTIUNI}
+        else:
+            with open(cale, "rb") as fisier:
+                self._harta = mmap.mmap(fisier.fileno(), 0, access=mmap.ACCESS_READ)
+            self.nr, inversat, sectiuni = _citeste_sectiuni(self._harta)
+            if inversat:
+                for sectiune in sectiuni.values():
+                    sectiune.release()
+                self._harta.close()
+                raise ValueError("Snapshot-ul a fost scris pe o mașină cu altă ordine a octeților.")
+            self._sectiuni = {nume: sectiuni[nume].cast(tip_coloana) for nume, tip_coloana in SECTIUNI}
+
+        self.operatii_din_jurnal = 0
+        # Segmentul delta: corecturile totalurilor, rândurile mapate modificate sau șterse, rândurile noi
+        # (identificator -> [apartament, cod, suma]) și apartamentele adăugate (True) sau șterse (False)
+        self._delta_tip = [0.0] * len(COD_TIP)
+        self._delta_apartament = {}
+        self._sume_modificate = {}
+        self._sterse = set()
+        self._noi = {}
+        self._apartamente = {}
+        self._urmatorul_id = len(self._sectiuni["suma"])
+        self._grupuri_mapate = None
+
+    @classmethod
+    def deschide(cls, director):
+        """
+        Mapează snapshot-ul unui registru salvat și aplică peste el operațiile din jurnal scrise după snapshot.
+
+        :param director: Directorul registrului.
+        :return: SnapshotMapat.
+        :raises: ValueError dacă snapshot-ul nu este valid sau o operație din jurnal nu poate fi aplicată.
+        """
+        cale = os.path.join(director, FISIER_SNAPSHOT)
+        vedere = cls(cale if os.path.exists(cale) else None)
+        try:
+            for intrare in JurnalOperatii.citeste(os.path.join(director, FISIER_JURNAL), dupa=vedere.nr):
+                vedere._aplica(intrare["op"], intrare["args"])
+                vedere.nr = intrare["nr"]
+                vedere.operatii_din_jurnal += 1
+        except ValueError as e:
+            vedere.inchide()
+            raise ValueError(f"Eroare: Jurnalul nu corespunde snapshot-ului: {e}") from e
+        return vedere
+
+    def __getattr__(self, nume):
+        if nume.startswith("_") or not hasattr(bussines, nume):
+            raise AttributeError(nume)
+        raise ValueError(f"Eroare: Operația '{nume}' nu este disponibilă peste snapshot-ul mapat (doar citire).")
+
+    def _vector(self, nume):
+        return numpy.frombuffer(self._sectiuni[nume], dtype=self._sectiuni[nume].format)
+
+    def _grupuri(self):
+        """
+        :return: Dicționar {apartament: {cod: rândurile listei}} al snapshot-ului, construit la prima folosire
+            (doar operațiile delta pe apartamente au nevoie de el).
+        """
+        if self._grupuri_mapate is None:
+            sectiuni = self._sectiuni
+            self._grupuri_mapate = {}
+            grup = inceput = 0
+            for apartament, numar_grupuri in zip(sectiuni["apartamente"], sectiuni["numar_grupuri"]):
+                cheltuieli = self._grupuri_mapate[apartament] = {}
+                for cod, lungime in zip(sectiuni["coduri"][grup:grup + numar_grupuri],
+                                        sectiuni["lungimi"][grup:grup + numar_grupuri]):
+                    cheltuieli[cod] = sectiuni["randuri"][inceput:inceput + lungime]
+                    inceput += lungime
+                grup += numar_grupuri
+        return self._grupuri_mapate
+
+    def _exista(self, apartament):
+        if apartament in self._apartamente:
+            return self._apartamente[apartament]
+        if self._grupuri_mapate is not None:
+            return apartament in self._grupuri_mapate
+        if numpy is not None:
+            return bool((self._vector("apartamente") == apartament).any())
+        return apartament in self._sectiuni["apartamente"]
+
+    def _rand(self, rand):
+        """
+        :return: Lista [apartament, cod, suma] a unui rând activ.
+        """
+        if rand in self._noi:
+            return self._noi[rand]
+        return [self._sectiuni["apartament"][rand], self._sectiuni["tip"][rand],
+                self._sume_modificate.get(rand, self._sectiuni["suma"][rand])]
+
+    def _activ(self, rand):
+        return rand in self._noi or (isinstance(rand, int) and 0 <= rand < len(self._sectiuni["activ"])
+                                     and self._sectiuni["activ"][rand] == 1 and rand not in self._sterse)
+
+    def _corecteaza_totalurile(self, apartament, cod, diferenta):
+        self._delta_tip[cod] += diferenta
+        self._delta_apartament[apartament] = self._delta_apartament.get(apartament, 0.0) + diferenta
+
+    def _adauga(self, apartament, cod, suma):
+        self._noi[self._urmatorul_id] = [apartament, cod, suma]
+        self._urmatorul_id += 1
+        self._apartamente[apartament] = True
+        self._corecteaza_totalurile(apartament, cod, suma)
+
+    def _modifica(self, rand, suma):
+        apartament, cod, suma_veche = self._rand(rand)
+        if rand in self._noi:
+            self._noi[rand][2] = suma
+        else:
+            self._sume_modificate[rand] = suma
+        self._corecteaza_totalurile(apartament, cod, suma - suma_veche)
+
+    def _sterge(self, randuri):
+        for rand in randuri:
+            apartament, cod, suma = self._rand(rand)
+            if self._noi.pop(rand, None) is None:
+                self._sterse.add(rand)
+            self._corecteaza_totalurile(apartament, cod, -suma)
+
+    def _randuri_grup(self, apartament, cod):
+        """
+        :return: Rândurile active ale unei liste, în ordinea ei (rândurile din snapshot, apoi cele noi).
+        """
+        return [rand for rand in self._grupuri().get(apartament, {}).get(cod, ()) if rand not in self._sterse] + \
+            [rand for rand, (apartament_rand, cod_rand, _) in self._noi.items()
+             if apartament_rand == apartament and cod_rand == cod]
+
+    def _randuri_mapate(self, cod=None, sub=None):
+        """
+        :return: Rândurile active din snapshot de tipul `cod` sau (după sumele curente) mai mici decât `sub`.
+        """
+        if numpy is not None:
+            masca = self._vector("activ") == 1
+            masca &= (self._vector("tip") == cod) if cod is not None else (self._vector("suma") < sub)
+            randuri = numpy.flatnonzero(masca).tolist()
+        else:
+            coloana = self._sectiuni["tip"] if cod is not None else self._sectiuni["suma"]
+            randuri = [rand for rand, (activ, valoare) in enumerate(zip(self._sectiuni["activ"], coloana))
+                       if activ and (valoare == cod if cod is not None else valoare < sub)]
+        if sub is not None:
+            # Sumele modificate în jurnal pot trece peste sau sub prag față de valoarea din snapshot
+            sume = self._sectiuni["suma"]
+            randuri = [rand for rand in set(randuri) | self._sume_modificate.keys()
+                       if self._sume_modificate.get(rand, sume[rand]) < sub]
+        return [rand for rand in randuri if rand not in self._sterse]
+
+    def _sterge_apartament(self, apartament):
+        if not self._exista(apartament):
+            return
+        mapate = [rand for randuri in self._grupuri().get(apartament, {}).values() for rand in randuri]
+        self._sterge([rand for rand in mapate if rand not in self._sterse] +
+                     [rand for rand, (apartament_rand, _, _) in self._noi.items() if apartament_rand == apartament])
+        self._apartamente[apartament] = False
+
+    def _corectura(self, actualizare):
+        apartament, tip, suma_veche, suma_noua = validare_corectura(actualizare)
+        if tip not in COD_TIP:
+            return
+        for rand in self._randuri_grup(apartament, COD_TIP[tip]):
+            if self._rand(rand)[2] == suma_veche:
+                self._modifica(rand, suma_noua)
+                return
+
+    def _aplica(self, operatie, args):
+        """
+        Aplică o operație din jurnal peste segmentul delta, cu aceleași reguli ca ExpenseStore. În jurnal ajung
+        doar operațiile reușite, deci elementele invalide ale unui lot sunt ignorate, ca de depozit.
+
+        :raises: ValueError dacă operația nu este cunoscută.
+        """
+        if operatie in ("adauga_cheltuiala", "adauga_cheltuiala_id", "adauga_cheltuieli_bulk"):
+            for inregistrare in ((args,) if operatie != "adauga_cheltuieli_bulk" else args[0]):
+                try:
+                    apartament, tip, suma, _ = validare_inregistrare(inregistrare)
+                    validare_apartament_coloana(apartament)
+                except ValueError:
+                    continue
+                self._adauga(apartament, COD_TIP[tip], suma)
+        elif operatie in ("modifica_cheltuiala", "modifica_cheltuieli"):
+            for actualizare in ((args,) if operatie == "modifica_cheltuiala" else args[0]):
+                try:
+                    self._corectura(actualizare)
+                except ValueError:
+                    continue
+        elif operatie in ("modifica_cheltuiala_id", "modifica_cheltuieli_id"):
+            for id_cheltuiala, suma_noua in ((args,) if operatie == "modifica_cheltuiala_id" else args[0]):
+                if self._activ(id_cheltuiala):
+                    self._modifica(id_cheltuiala, validare_suma(suma_noua))
+        elif operatie == "sterge_cheltuiala_id":
+            if self._activ(args[0]):
+                self._sterge(args)
+        elif operatie == "sterge_apartament":
+            self._sterge_apartament(args[0])
+        elif operatie == "sterge_apartamente_consecutive":
+            apartament_start, apartament_end = args
+            for apartament in sorted(set(self._grupuri()) | set(self._apartamente)):
+                if apartament_start <= apartament <= apartament_end:
+                    self._sterge_apartament(apartament)
+        elif operatie in ("sterge_cheltuieli_tip", "elimina_cheltuiala"):
+            cod = COD_TIP[validare_tip_cheltuiala(args[0])]
+            self._sterge(self._randuri_mapate(cod=cod) +
+                         [rand for rand, (_, cod_rand, _) in self._noi.items() if cod_rand == cod])
+        elif operatie == "elimina_cheltuieli_mai_mici_decat":
+            suma_minima = validare_suma(args[0])
+            self._sterge(self._randuri_mapate(sub=suma_minima) +
+                         [rand for rand, (_, _, suma) in self._noi.items() if suma < suma_minima])
+        else:
+            raise ValueError(f"operația '{operatie}' nu este cunoscută")
+
+    def __len__(self):
+        if numpy is not None:
+            mapate = int(numpy.count_nonzero(self._vector("activ")))
+        else:
+            mapate = sum(self._sectiuni["activ"])
+        return mapate - len(self._sterse) + len(self._noi)
+
+    def suma_cheltuieli_tip(self, tip):
+        """
+        Calculează suma cheltuielilor de un anumit tip.
+
+        :param tip: Tipul cheltuielii.
+        :return: Suma cheltuielilor de acel tip.
+        :raises: ValueError dacă tipul nu este valid.
+        """
+        cod = COD_TIP[validare_tip_cheltuiala(tip)]
+
+        if numpy is not None:
+            masca = (self._vector("activ") == 1) & (self._vector("tip") == cod)
+            return float(self._vector("suma")[masca].sum()) + self._delta_tip[cod]
+
+        tipuri = self._sectiuni["tip"]
+        return sum(suma for suma, cod_rand in compress(zip(self._sectiuni["suma"], tipuri), self._sectiuni["activ"])
+                   if cod_rand == cod) + self._delta_tip[cod]
+
+    def calculeaza_total_cheltuieli(self, numar_apartament):
+        """
+        Calculează totalul de cheltuieli pentru un apartament dat.
+
+        :param numar_apartament: Numărul apartamentului.
+        :return: Totalul de cheltuieli sau None dacă apartamentul nu există în registru.
+        :raises: ValueError dacă numărul apartamentului nu este valid.
+        """
+        numar_apartament = validare_numar_apartament(numar_apartament)
+        if not self._exista(numar_apartament):
+            return None
+        delta = self._delta_apartament.get(numar_apartament, 0.0)
+
+        if numpy is not None:
+            masca = (self._vector("activ") == 1) & (self._vector("apartament") == numar_apartament)
+            return float(self._vector("suma")[masca].sum()) + delta
+
+        perechi = compress(zip(self._sectiuni["suma"], self._sectiuni["apartament"]), self._sectiuni["activ"])
+        return sum(suma for suma, apartament in perechi if apartament == numar_apartament) + delta
+
+    def inchide(self):
+        self._grupuri_mapate = None
+        for sectiune in self._sectiuni.values():
+            sectiune.release()
+        if self._harta is not None:
+            self._harta.close()
+
+
+def test_jurnal_si_snapshot():
+    director = tempfile.mkdtemp()
+    try:
+        registru = RegistruPersistent.deschide(director, lot=4, snapshot_la=5)
+        registru = registru.adauga_cheltuiala(1, "apa", 100, "2023-10-30")
+        registru, erori = registru.adauga_cheltuieli_bulk((2, "gaz", suma, "2023-10-29") for suma in (10, 20, 30))
+        id_lumina = registru.adauga_cheltuiala_id(3, "lumina", 75, "2023-10-28")
+        registru.modifica_cheltuiala(2, "gaz", 20, 25)
+
+        # A cincea operație declanșează un snapshot; următoarele ajung doar în jurnal
+        registru.sterge_cheltuiala_id(id_lumina)
+        registru.sterge_apartament(1)
+        registru.elimina_cheltuieli_mai_mici_decat(15)
+
+        # O operație respinsă nu este scrisă în jurnal
+        try:
+            registru.sterge_apartament(99)
+            assert False
+        except ValueError:
+            assert True
+
+        asteptat = registru.ca_dictionar()
+        registru.inchide()
+        assert erori == []
+        assert len(list(JurnalOperatii.citeste(os.path.join(director, FISIER_JURNAL)))) == 2
+
+        redeschis = RegistruPersistent.deschide(director)
+        assert redeschis.ca_dictionar() == asteptat == {2: {"gaz": [(25.0, "2023-10-29"), (30.0, "2023-10-29")]},
+                                                         3: {"lumina": []}}
+        redeschis.verifica_indexuri()
+        redeschis.inchide()
+    finally:
+        shutil.rmtree(director)
+
+
+def test_jurnal_linie_incompleta():
+    director = tempfile.mkdtemp()
+    try:
+        registru = RegistruPersistent.deschide(director, lot=1)
+        registru.adauga_cheltuiala(1, "apa", 100, "2023-10-30")
+        registru.inchide()
+        with open(os.path.join(director, FISIER_JURNAL), "a", encoding="utf-8") as fisier:
+            fisier.write('{"nr": 2, "op": "sterge_apart')
+
+        assert RegistruPersistent.deschide(director).ca_dictionar() == {1: {"apa": [(100.0, "2023-10-30")]}}
+    finally:
+        shutil.rmtree(director)
+
+
+def test_jurnal_argumente_validate():
+    from decimal import Decimal
+
+    director = tempfile.mkdtemp()
+    try:
+        registru = RegistruPersistent.deschide(director, lot=1)
+        # Argumentele sunt scrise în jurnal în forma validată, deci o sumă Decimal ajunge pe disc ca float
+        registru.adauga_cheltuiala(1, "apa", Decimal("10"), "2023-10-30")
+        _, erori = registru.adauga_cheltuieli_bulk(iter([(2, "gaz", Decimal("2.5"), "2023-10-29"),
+                                                         (2, "gaz", "abc", "2023-10-29"), (3, "apa", 1, "2023-1-2")]))
+        assert erori == [(1, "Eroare: Suma cheltuielii trebuie să fie un număr valid.")]
+
+        # O operație care nu poate fi scrisă în jurnal nu modifică registrul
+        try:
+            registru.modifica_cheltuiala(1, object(), 10, 20)
+            assert False
+        except TypeError:
+            assert True
+        for argumente in ((1, "apa", float("nan"), "2023-10-30"), (1, "apa", 5, "30-10-2023")):
+            try:
+                registru.adauga_cheltuiala(*argumente)
+                assert False
+            except ValueError:
+                assert True
+
+        asteptat = registru.ca_dictionar()
+        assert asteptat == {1: {"apa": [(10.0, "2023-10-30")]}, 2: {"gaz": [(2.5, "2023-10-29")]},
+                            3: {"apa": [(1.0, "2023-01-02")]}}
+        registru.inchide()
+        redeschis = RegistruPersistent.deschide(director)
+        assert redeschis.ca_dictionar() == asteptat and redeschis.calculeaza_total_cheltuieli(1) == 10.0
+        redeschis.inchide()
+
+        # O operație care eșuează la reaplicare înseamnă că jurnalul nu mai corespunde datelor
+        with open(os.path.join(director, FISIER_JURNAL), "a", encoding="utf-8") as fisier:
+            fisier.write('{"nr":4,"op":"sterge_apartament","args":[99]}\n')
+        try:
+            RegistruPersistent.deschide(director)
+            assert False
+        except ValueError as e:
+            assert "operația 4 (sterge_apartament)" in str(e)
+    finally:
+        shutil.rmtree(director)
+
+
+def test_jurnal_termen_sincronizare():
+    director = tempfile.mkdtemp()
+    try:
+        cale = os.path.join(director, FISIER_JURNAL)
+        jurnal = JurnalOperatii(cale, lot=64, interval=0.05)
+        jurnal.scrie({"nr": 1, "op": "sterge_apartament", "args": [1]})
+        assert list(JurnalOperatii.citeste(cale)) == []
+
+        # Fără alte scrieri, intrarea ajunge pe disc după interval
+        termen = time.monotonic() + 2
+        while not list(JurnalOperatii.citeste(cale)) and time.monotonic() < termen:
+            time.sleep(0.01)
+        assert list(JurnalOperatii.citeste(cale)) == [{"nr": 1, "op": "sterge_apartament", "args": [1]}]
+        jurnal.inchide()
+    finally:
+        shutil.rmtree(director)
+
+
+def test_snapshot_mapat():
+    global numpy
+    director = tempfile.mkdtemp()
+    try:
+        registru = RegistruPersistent.deschide(director)
+        registru.adauga_cheltuieli_bulk([(1, "apa", 100, "2023-10-30"), (2, "gaz", 50.5, "2023-10-29"),
+                                         (1, "gaz", 25, "2023-10-28"), (3, "apa", 12.25, "2023-10-27")])
+        registru.sterge_apartament(3)
+        registru.adauga_cheltuiala(4, "lumina", 75, "2023-10-26")
+        registru.sterge_cheltuieli_tip("lumina")
+        registru.snapshot()
+        registru.adauga_cheltuiala(1, "apa", 1000, "2023-10-25")
+        registru.inchide()
+
+        cu_numpy = numpy
+        try:
+            for numpy in (cu_numpy, None):
+                vedere = SnapshotMapat.deschide(director)
+                # Adăugarea scrisă doar în jurnal este aplicată peste snapshot ca segment delta
+                assert vedere.operatii_din_jurnal == 1
+                assert len(vedere) == 4
+                assert vedere.suma_cheltuieli_tip("apa") == 1100
+                assert vedere.suma_cheltuieli_tip("gaz") == 75.5
+                assert vedere.suma_cheltuieli_tip("lumina") == 0
+                assert vedere.calculeaza_total_cheltuieli(1) == 1125
+                assert vedere.calculeaza_total_cheltuieli(4) == 0
+                assert vedere.calculeaza_total_cheltuieli(3) is None
+                try:
+                    bussines.adauga_cheltuiala(vedere, 1, "apa", 1, "2023-10-25")
+                    assert False
+                except ValueError:
+                    assert True
+                vedere.inchide()
+        finally:
+            numpy = cu_numpy
+
+        # După îmbinarea jurnalului, vederea include și operațiile noi
+        registru = RegistruPersistent.deschide(director)
+        registru.snapshot()
+        registru.inchide()
+        vedere = SnapshotMapat.deschide(director)
+        assert vedere.operatii_din_jurnal == 0
+        assert vedere.calculeaza_total_cheltuieli(1) == 1125
+
+        # Modul doar pentru citire din main.py rulează scripturile de comenzi peste vedere
+        from comenzi import ruleaza_script
+        iesire, erori = io.StringIO(), io.StringIO()
+        _, statistici = ruleaza_script(vedere, ["report total 1", "add 1 apa 1 2023-10-01", "report sum gaz"],
+                                       iesire, erori)
+        assert iesire.getvalue().splitlines() == ["Total cheltuieli pentru apartamentul 1: 1125.0",
+                                                  "Suma cheltuielilor de tip 'gaz' este: 75.5"]
+        assert statistici["erori"] == 1 and erori.getvalue().startswith("Linia 2: Eroare: Operația")
+        vedere.inchide()
+    finally:
+        shutil.rmtree(director)
+
+
+
+def test_snapshot_mapat_delta():
+    import random
+    global numpy
+
+    rng = random.Random(23)
+    cu_numpy = numpy
+    for jurnal_fara_snapshot in (False, True):
+        director = tempfile.mkdtemp()
+        try:
+            registru = RegistruPersistent.deschide(director, snapshot_la=float("inf"))
+            if not jurnal_fara_snapshot:
+                registru.adauga_cheltuieli_bulk([(rng.randint(1, 12), rng.choice(bussines.TIPURI_CHELTUIELI),
+                                                  rng.randint(1, 50), "2023-10-01") for _ in range(60)])
+                registru.snapshot()
+
+            # Coada de jurnal atinge și rândurile din snapshot, nu doar pe cele noi
+            for _ in range(150):
+                operatie = rng.random()
+                apartament = rng.randint(1, 14)
+                tip = rng.choice(bussines.TIPURI_CHELTUIELI)
+                try:
+                    if operatie < 0.3:
+                        registru.adauga_cheltuiala(apartament, tip, rng.randint(1, 50), "2023-10-02")
+                    elif operatie < 0.4:
+                        registru.adauga_cheltuieli_bulk([(apartament, tip, rng.choice((5, -1)), "2023-10-03"),
+                                                         (apartament + 1, tip, 7, "2023-10-03")])
+                    elif operatie < 0.55:
+                        sume = [suma for suma, _ in registru.ca_dictionar().get(apartament, {}).get(tip, [])]
+                        registru.modifica_cheltuiala(apartament, tip, rng.choice(sume or [1]), rng.randint(1, 50))
+                    elif operatie < 0.6:
+                        registru.modifica_cheltuieli([(apartament, tip, 7, 8), (apartament, tip, 8, 9)])
+                    elif operatie < 0.7:
+                        id_cheltuieli = registru.id_cheltuieli(apartament, tip)
+                        if id_cheltuieli:
+                            if rng.random() < 0.5:
+                                registru.modifica_cheltuiala_id(rng.choice(id_cheltuieli), rng.randint(1, 50))
+                            else:
+                                registru.sterge_cheltuiala_id(rng.choice(id_cheltuieli))
+                    elif operatie < 0.8:
+                        registru.sterge_apartament(apartament)
+                    elif operatie < 0.85:
+                        registru.sterge_apartamente_consecutive(apartament, apartament + 2)
+                    elif operatie < 0.9:
+                        registru.sterge_cheltuieli_tip(tip)
+                    else:
+                        registru.elimina_cheltuieli_mai_mici_decat(rng.randint(1, 15))
+                except ValueError:
+                    pass
+            asteptat = registru.ca_dictionar()
+            registru.inchide()
+
+            try:
+                for numpy in (cu_numpy, None):
+                    vedere = SnapshotMapat.deschide(director)
+                    assert vedere.operatii_din_jurnal > 0
+                    assert len(vedere) == sum(len(lista) for cheltuieli in asteptat.values()
+                                              for lista in cheltuieli.values())
+                    for tip in bussines.TIPURI_CHELTUIELI:
+                        assert vedere.suma_cheltuieli_tip(tip) == bussines.suma_cheltuieli_tip(asteptat, tip)
+                    for apartament in range(1, 17):
+                        assert vedere.calculeaza_total_cheltuieli(apartament) == \
+                            bussines.calculeaza_total_cheltuieli(asteptat, apartament), apartament
+                    vedere.inchide()
+            finally:
+                numpy = cu_numpy
+        finally:
+            shutil.rmtree(director)
+
+
+if __name__ == "__main__":
+    test_jurnal_si_snapshot()
+    test_jurnal_linie_incompleta()
+    test_jurnal_argumente_validate()
+    test_jurnal_termen_sincronizare()
+    test_snapshot_mapat()
+    test_snapshot_mapat_delta()
@@ -0,0 +1,482 @@
+"""
+Registru împărțit în partiții după intervale de apartamente, fiecare partiție într-un proces separat.
+
+Operațiile pe un apartament sunt trimise unei singure partiții; rapoartele globale sunt trimise tuturor
+partițiilor deodată (scatter-gather), fiecare calculează un rezultat parțial pe propriul ExpenseStore, iar
+rezultatele sunt combinate aici: sumele și numărătorile adunate, listele sortate interclasate cu heapq.merge.
+Listele pe apartamente sunt întoarse în ordinea partițiilor (crescător pe intervale), iar în cadrul unei
+partiții în ordinea registrului; egalitățile din listele sortate după sumă sunt păstrate în aceeași ordine.
+"""
+import heapq
+import math
+import multiprocessing
+import os
+import sys
+import types
+from bisect import bisect_right
+from itertools import chain
+from operator import itemgetter
+
+import bussines
+from bussines import (validare_corectura, validare_grupare, validare_inregistrare, validare_numar_apartament,
+                      validare_numar_rezultate, validare_pas, validare_perioada, validare_suma,
+                      validare_tip_cheltuiala)
+from store import ExpenseStore
+
+APARTAMENT_MAXIM = 10000
+
+
+def _ruleaza_partitie(conexiune):
+    """
+    Bucla procesului unei partiții: primește (operație, argumente) și răspunde cu (True, rezultat) sau
+    (False, excepție). Un mesaj None oprește procesul.
+    """
+    # Mesajele tipărite de rapoarte sunt tipărite o singură dată, de registrul partajat
+    sys.stdout = open(os.devnull, "w")
+    registru = ExpenseStore()
+    while True:
+        cerere = conexiune.recv()
+        if cerere is None:
+            break
+        nume, args = cerere
+        try:
+            functie = getattr(bussines, nume, None)
+            rezultat = functie(registru, *args) if functie is not None else getattr(registru, nume)(*args)
+            if isinstance(rezultat, types.GeneratorType):
+                rezultat = list(rezultat)
+        except Exception as e:
+            conexiune.send((False, e))
+            continue
+        if rezultat is registru:
+            rezultat = None
+        elif isinstance(rezultat, tuple) and rezultat and rezultat[0] is registru:
+            rezultat = rezultat[1:]
+        conexiune.send((True, rezultat))
+    conexiune.close()
+
+
+class RegistruPartajat:
+    """
+    Registru partajat pe procese; poate fi transmis funcțiilor din bussines.py, ca un ExpenseStore.
+
+    Partiția i păstrează apartamentele din [limite[i - 1], limite[i]), prima și ultima partiție primind și
+    apartamentele din afara limitelor. Procesele sunt oprite de inchide().
+    """
+
+    def __init__(self, numar_partitii=4, apartament_maxim=APARTAMENT_MAXIM, limite=None):
+        if limite is None:
+            if not isinstance(numar_partitii, int) or numar_partitii < 1:
+                raise ValueError("Eroare: Numărul de partiții trebuie să fie un număr natural nenul.")
+            limite = [1 + apartament_maxim * partitie // numar_partitii for partitie in range(1, numar_partitii)]
+        elif sorted(limite) != list(limite):
+            raise ValueError("Eroare: Limitele partițiilor trebuie să fie crescătoare.")
+        self.limite = list(limite)
+        self._conexiuni = []
+        self._procese = []
+        for _ in range(len(self.limite) + 1):
+            conexiune, capat = multiprocessing.Pipe()
+            proces = multiprocessing.Process(target=_ruleaza_partitie, args=(capat,), daemon=True)
+            proces.start()
+            capat.close()
+            self._conexiuni.append(conexiune)
+            self._procese.append(proces)
+
+    @classmethod
+    def din_dictionar(cls, apartamente, numar_partitii=4, apartament_maxim=APARTAMENT_MAXIM):
+        registru = cls(numar_partitii, apartament_maxim)
+        registru.adauga_cheltuieli_bulk((apartament, tip, suma, zi) for apartament, cheltuieli in apartamente.items()
+                                        for tip, lista_cheltuieli in cheltuieli.items()
+                                        for suma, zi in lista_cheltuieli)
+        return registru
+
+    @property
+    def numar_partitii(self):
+        return len(self._conexiuni)
+
+    def inchide(self):
+        """
+        Oprește procesele partițiilor.
+        """
+        for conexiune in self._conexiuni:
+            try:
+                conexiune.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            conexiune.close()
+        for proces in self._procese:
+            proces.join()
+        self._conexiuni = []
+        self._procese = []
+
+    def _partitie(self, apartament):
+        return bisect_right(self.limite, apartament)
+
+    def _partitii_interval(self, apartament_start, apartament_end):
+        if apartament_start > apartament_end:
+            return range(0)
+        return range(self._partitie(apartament_start), self._partitie(apartament_end) + 1)
+
+    def _cere(self, cereri):
+        """
+        Trimite întâi toate cererile, ca partițiile să lucreze în paralel, apoi culege răspunsurile.
+
+        :param cereri: Dicționar {partiție: (operație, argumente)}.
+        :return: Rezultatele, în ordinea partițiilor din `cereri`.
+        :raises: Prima excepție ridicată de o partiție, după ce toate au răspuns.
+        """
+        for partitie, cerere in cereri.items():
+            self._conexiuni[partitie].send(cerere)
+        rezultate = []
+        eroare = None
+        for partitie in cereri:
+            reusit, rezultat = self._conexiuni[partitie].recv()
+            if not reusit and eroare is None:
+                eroare = rezultat
+            rezultate.append(rezultat)
+        if eroare is not None:
+            raise eroare
+        return rezultate
+
+    def _toate(self, nume, *args):
+        return self._cere({partitie: (nume, args) for partitie in range(self.numar_partitii)})
+
+    def _una(self, apartament, nume, *args):
+        return self._cere({self._partitie(apartament): (nume, args)})[0]
+
+    def _in_bloc(self, nume, elemente, validare):
+        """
+        Împarte un lot pe partiții după apartament și întoarce erorile cu pozițiile din lotul inițial.
+        """
+        pe_partitii = {}
+        erori = []
+        for pozitie, element in enumerate(elemente):
+            try:
+                element = validare(element)
+            except ValueError as e:
+                erori.append((pozitie, str(e)))
+                continue
+            pozitii, loturi = pe_partitii.setdefault(self._partitie(element[0]), ([], []))
+            pozitii.append(pozitie)
+            loturi.append(element)
+
+        partitii = sorted(pe_partitii)
+        rezultate = self._cere({partitie: (nume, (pe_partitii[partitie][1],)) for partitie in partitii})
+        for partitie, (erori_partitie,) in zip(partitii, rezultate):
+            erori.extend((pe_partitii[partitie][0][pozitie], mesaj) for pozitie, mesaj in erori_partitie)
+        erori.sort()
+        return self, erori
+
+    def __len__(self):
+        return sum(self._toate("__len__"))
+
+    def ca_dictionar(self):
+        apartamente = {}
+        for parte in self._toate("ca_dictionar"):
+            apartamente.update(parte)
+        return apartamente
+
+    def itereaza_cheltuieli(self):
+        for parte in self._toate("itereaza_cheltuieli"):
+            yield from parte
+
+    def adauga_cheltuiala(self, apartament, tip, suma, zi):
+        self._una(validare_numar_apartament(apartament), "adauga_cheltuiala", apartament, tip, suma, zi)
+        return self
+
+    def adauga_cheltuieli_bulk(self, inregistrari):
+        return self._in_bloc("adauga_cheltuieli_bulk", inregistrari, validare_inregistrare)
+
+    def modifica_cheltuiala(self, apartament, tip, suma_veche, suma_noua):
+        self._una(validare_numar_apartament(apartament), "modifica_cheltuiala", apartament, tip, suma_veche,
+                  suma_noua)
+        return self
+
+    def modifica_cheltuieli(self, actualizari):
+        return self._in_bloc("modifica_cheltuieli", actualizari, validare_corectura)
+
+    def sterge_apartament(self, apartament):
+        self._una(validare_numar_apartament(apartament), "sterge_apartament", apartament)
+        return self
+
+    def sterge_apartamente_consecutive(self, apartament_start, apartament_end):
+        apartament_start = validare_numar_apartament(apartament_start)
+        apartament_end = validare_numar_apartament(apartament_end)
+        self._cere({partitie: ("sterge_apartamente_consecutive", (apartament_start, apartament_end))
+                    for partitie in self._partitii_interval(apartament_start, apartament_end)})
+        return self
+
+    def sterge_cheltuieli_tip(self, tip):
+        self._toate("sterge_cheltuieli_tip", validare_tip_cheltuiala(tip))
+        return self
+
+    def elimina_cheltuiala(self, tip):
+        self._toate("elimina_cheltuiala", validare_tip_cheltuiala(tip))
+        return self
+
+    def elimina_cheltuieli_mai_mici_decat(self, suma_minima):
+        self._toate("elimina_cheltuieli_mai_mici_decat", validare_suma(suma_minima))
+        return self
+
+    def _pe_partitii(self, nume, args, de_la):
+        """
+        Un raport pe apartamente cerut partiție cu partiție, începând cu partiția apartamentului de_la: o
+        partiție este interogată abia după ce rândurile celei dinainte au fost parcurse. Prima partiție este
+        interogată la apel, deci argumentele greșite sunt raportate imediat.
+        """
+        start = 0 if de_la is None else self._partitie(validare_numar_apartament(de_la))
+        primele = self._cere({start: (nume, args + (de_la,))})[0]
+        return chain(primele, (rand for partitie in range(start + 1, self.numar_partitii)
+                               for rand in self._cere({partitie: (nume, args)})[0]))
+
+    def cheltuieli_mai_mari_decat(self, suma, de_la=None):
+        return self._pe_partitii("cheltuieli_mai_mari_decat", (validare_suma(suma),), de_la)
+
+    def cheltuieli_de_tip(self, tip, de_la=None):
+        return self._pe_partitii("cheltuieli_de_tip", (validare_tip_cheltuiala(tip),), de_la)
+
+    def cheltuieli_inainte_de_o_zi(self, suma, zi, de_la=None):
+        return self._pe_partitii("cheltuieli_inainte_de_o_zi", (validare_suma(suma), zi), de_la)
+
+    def afiseaza_apartamente_cu_cheltuieli_mai_mari_decat(self, suma):
+        suma = validare_suma(suma)
+        rezultat = [linie for parte in self._toate("afiseaza_apartamente_cu_cheltuieli_mai_mari_decat", suma)
+                    for linie in parte]
+        if not rezultat:
+            print(f"Nicio cheltuială depășește suma {suma}.")
+        return rezultat
+
+    def afiseaza_cheltuieli_tip(self, tip):
+        tip = validare_tip_cheltuiala(tip)
+        return [linie for parte in self._toate("afiseaza_cheltuieli_tip", tip) for linie in parte]
+
+    def afiseaza_cheltuieli_inainte_de_o_zi(self, suma, zi):
+        return [linie for parte in self._toate("afiseaza_cheltuieli_inainte_de_o_zi", suma, zi) for linie in parte]
+
+    def tipareste_apartamente_sortate_dupa_tip(self, tip):
+        try:
+            tip = validare_tip_cheltuiala(tip)
+        except ValueError as e:
+            print(e)
+            return None
+        parti = [parte for parte in self._toate("tipareste_apartamente_sortate_dupa_tip", tip) if parte]
+        return list(heapq.merge(*parti, key=itemgetter(0))) or None
+
+    def suma_cheltuieli_tip(self, tip):
+        return math.fsum(self._toate("suma_cheltuieli_tip", validare_tip_cheltuiala(tip)))
+
+    def calculeaza_total_cheltuieli(self, numar_apartament):
+        numar_apartament = validare_numar_apartament(numar_apartament)
+        return self._una(numar_apartament, "calculeaza_total_cheltuieli", numar_apartament)
+
+    def totaluri_interval(self, apartament_start, apartament_end, tip=None):
+        apartament_start = validare_numar_apartament(apartament_start)
+        apartament_end = validare_numar_apartament(apartament_end)
+        if tip is not None:
+            tip = validare_tip_cheltuiala(tip)
+        parti = self._cere({partitie: ("totaluri_interval", (apartament_start, apartament_end, tip))
+                            for partitie in self._partitii_interval(apartament_start, apartament_end)})
+        return math.fsum(suma for suma, _ in parti), sum(numar for _, numar in parti)
+
+    def top_k(self, tip=None, apartament=None, k=10):
+        """
+        Fiecare partiție întoarce propriile k maxime; lista finală este alcătuită din ele, în ordinea partițiilor
+        la sume egale.
+        """
+        if tip is not None:
+            tip = validare_tip_cheltuiala(tip)
+        if apartament is not None:
+            apartament = validare_numar_apartament(apartament)
+        k = validare_numar_rezultate(k)
+        if apartament is not None:
+            return self._una(apartament, "top_k", tip, apartament, k)
+        return heapq.nlargest(k, chain.from_iterable(self._toate("top_k", tip, None, k)), key=itemgetter(2))
+
+    def totaluri_perioada(self, apartament_start, apartament_end, luna_start=None, luna_end=None, tip=None):
+        apartament_start = validare_numar_apartament(apartament_start)
+        apartament_end = validare_numar_apartament(apartament_end)
+        validare_perioada(luna_start, luna_end)
+        if tip is not None:
+            tip = validare_tip_cheltuiala(tip)
+        argumente = (apartament_start, apartament_end, luna_start, luna_end, tip)
+        parti = self._cere({partitie: ("totaluri_perioada", argumente)
+                            for partitie in self._partitii_interval(apartament_start, apartament_end)})
+        return math.fsum(suma for suma, _ in parti), sum(numar for _, numar in parti)
+
+    def totaluri_pe_perioade(self, apartament_start, apartament_end, luna_start=None, luna_end=None, tip=None,
+                             pas="luna"):
+        """
+        Fiecare partiție din interval întoarce seria ei; perioadele comune sunt adunate aici.
+        """
+        apartament_start = validare_numar_apartament(apartament_start)
+        apartament_end = validare_numar_apartament(apartament_end)
+        validare_perioada(luna_start, luna_end)
+        if tip is not None:
+            tip = validare_tip_cheltuiala(tip)
+        pas = validare_pas(pas)
+        argumente = (apartament_start, apartament_end, luna_start, luna_end, tip, pas)
+        parti = self._cere({partitie: ("totaluri_pe_perioade", argumente)
+                            for partitie in self._partitii_interval(apartament_start, apartament_end)})
+        return self._combina(parti, math.fsum)
+
+    def group_by(self, cheie, agregare="sum"):
+        """
+        Agregare parțială: fiecare partiție grupează propriile cheltuieli, iar grupurile cu aceeași cheie sunt
+        combinate aici; media este calculată din sumele și numărătorile parțiale.
+        """
+        cheie, agregare = validare_grupare(cheie, agregare)
+        if agregare == "mean":
+            sume = self._combina(self._toate("group_by", cheie, "sum"), math.fsum)
+            numere = self._combina(self._toate("group_by", cheie, "count"), sum)
+            return {valoare: sume[valoare] / numere[valoare] for valoare in sume}
+        return self._combina(self._toate("group_by", cheie, agregare),
+                             {"sum": math.fsum, "count": sum, "max": max}[agregare])
+
+    @staticmethod
+    def _combina(parti, combinare):
+        grupuri = {}
+        for parte in parti:
+            for valoare, rezultat in parte.items():
+                grupuri.setdefault(valoare, []).append(rezultat)
+        return {valoare: combinare(grupuri[valoare]) for valoare in sorted(grupuri)}
+
+
+def _normalizeaza(rezultat):
+    """
+    Rezultatul unui raport fără ordinea apartamentelor, care diferă între registrul partajat și dicționar.
+    """
+    if isinstance(rezultat, list) and rezultat and isinstance(rezultat[0], str):
+        return sorted(rezultat)
+    return rezultat
+
+
+def test_registru_partajat():
+    apartamente = {
+        1: {"apa": [(230.0, "2023-10-30"), (20.0, "2023-01-01")], "gaz": [(50.0, "2023-10-29")]},
+        2600: {"apa": [(120.0, "2023-10-28")], "gaz": [(40.0, "2023-10-30")], "lumina": [(75.0, "2023-10-28")]},
+        7501: {"lumina": [(15.0, "2023-09-01")], "apa": [(120.0, "2023-10-01")]},
+    }
+    registru = RegistruPartajat.din_dictionar(apartamente)
+    try:
+        assert registru.limite == [2501, 5001, 7501] and registru.numar_partitii == 4
+        assert registru.ca_dictionar() == apartamente and len(registru) == 8
+
+        # Sortarea interclasează listele partițiilor; la sume egale ordinea partițiilor este păstrată
+        assert bussines.tipareste_apartamente_sortate_dupa_tip(registru, "apa") == \
+            [(20.0, "2023-01-01"), (120.0, "2023-10-28"), (120.0, "2023-10-01"), (230.0, "2023-10-30")]
+        assert bussines.suma_cheltuieli_tip(registru, "apa") == 490.0
+        assert bussines.totaluri_interval(registru, 2, 7501) == (370.0, 5)
+        assert bussines.group_by(registru, "tip", "mean") == {"apa": 122.5, "gaz": 45.0, "lumina": 45.0}
+        assert bussines.group_by(registru, "apartament", "max") == {1: 230.0, 2600: 120.0, 7501: 120.0}
+
+        # Rapoartele pe apartamente sunt cerute partiție cu partiție; paginile pot trece peste partiții goale
+        toate = list(bussines.cheltuieli_mai_mari_decat(apartamente, 30))
+        assert list(bussines.cheltuieli_mai_mari_decat(registru, 30)) == toate
+        pagina, cursor = bussines.pagina_raport(registru, bussines.cheltuieli_mai_mari_decat, 30, limita=4)
+        assert pagina == toate[:4] and cursor == (2600, 2)
+        assert bussines.pagina_raport(registru, bussines.cheltuieli_mai_mari_decat, 30, limita=4, cursor=cursor) == \
+            (toate[4:], None)
+        assert list(bussines.cheltuieli_inainte_de_o_zi(registru, 100, "2023-10-29", de_la=2600)) == \
+            [(2600, "apa"), (7501, "apa")]
+
+        registru, erori = bussines.adauga_cheltuieli_bulk(registru, [(9000, "gaz", 5, "2023-01-01"),
+                                                                      (3, "x", 1, "2023-01-01"),
+                                                                      (2, "apa", 5, "2023-02-30")])
+        assert isinstance(registru, RegistruPartajat) and [pozitie for pozitie, _ in erori] == [1, 2]
+        registru, erori = bussines.modifica_cheltuieli(registru, [(9000, "gaz", 5, 6), (1, "apa", 7, 8)])
+        assert erori == [(1, "Eroare: Suma veche nu a fost găsită")]
+        assert bussines.calculeaza_total_cheltuieli(registru, 9000) == 6.0
+
+        registru = bussines.sterge_apartamente_consecutive(registru, 2, 8000)
+        assert sorted(registru.ca_dictionar()) == [1, 9000]
+        try:
+            bussines.sterge_apartament(registru, 2600)
+            assert False
+        except ValueError as e:
+            assert str(e) == "Eroare: Apartamentul nu există în înregistrări."
+        assert bussines.tipareste_apartamente_sortate_dupa_tip(registru, "internet") is None
+    finally:
+        registru.inchide()
+
+
+def test_paritate_partajat():
+    import random
+
+    rng = random.Random(19)
+    apartamente = {}
+    registru = RegistruPartajat(numar_partitii=3, apartament_maxim=30)
+
+    def aplica(nume_functie, *args):
+        nonlocal apartamente, registru
+        functie = getattr(bussines, nume_functie)
+        rezultate = []
+        for registru_curent in (apartamente, registru):
+            try:
+                rezultat = functie(registru_curent, *args)
+            except ValueError as e:
+                rezultat = str(e)
+            if isinstance(rezultat, tuple) and rezultat and isinstance(rezultat[0], (dict, RegistruPartajat)):
+                rezultat = rezultat[1:]
+            elif isinstance(rezultat, dict) and nume_functie not in ("group_by", "totaluri_pe_perioade"):
+                apartamente = rezultat
+                rezultat = None
+            elif isinstance(rezultat, RegistruPartajat):
+                rezultat = None
+            rezultate.append(_normalizeaza(rezultat))
+        assert rezultate[0] == rezultate[1], f"{nume_functie}{args}: {rezultate[0]} != {rezultate[1]}"
+
+    try:
+        for _ in range(400):
+            operatie = rng.random()
+            apartament = rng.randint(1, 40)
+            tip = rng.choice(bussines.TIPURI_CHELTUIELI)
+            zi = f"2023-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+
+            if operatie < 0.45:
+                aplica("adauga_cheltuiala", apartament, tip, rng.randint(1, 100), zi)
+            elif operatie < 0.55:
+                sume = [suma for suma, _ in apartamente.get(apartament, {}).get(tip, [])] or [1.0]
+                aplica("modifica_cheltuiala", apartament, tip, rng.choice(sume), rng.randint(1, 100))
+            elif operatie < 0.62:
+                aplica("sterge_apartament", apartament)
+            elif operatie < 0.65:
+                aplica("sterge_apartamente_consecutive", apartament, apartament + rng.choice((0, 5, 20)))
+            elif operatie < 0.68:
+                aplica("sterge_cheltuieli_tip", tip)
+            elif operatie < 0.72:
+                # Sumele invalide sunt respinse la fel ca de dicționar
+                aplica("elimina_cheltuieli_mai_mici_decat", rng.choice((rng.randint(1, 30), "12", -1, "abc")))
+            elif operatie < 0.78:
+                aplica("adauga_cheltuieli_bulk", [(rng.randint(1, 40), rng.choice(bussines.TIPURI_CHELTUIELI),
+                                                   rng.choice((rng.randint(1, 100), -1)), zi)
+                                                  for _ in range(rng.randint(1, 20))])
+            else:
+                aplica("afiseaza_apartamente_cu_cheltuieli_mai_mari_decat", rng.randint(1, 100))
+                aplica("afiseaza_cheltuieli_tip", tip)
+                aplica("afiseaza_cheltuieli_inainte_de_o_zi", rng.choice((rng.randint(1, 100), "50", -1)), zi)
+                aplica("suma_cheltuieli_tip", tip)
+                aplica("calculeaza_total_cheltuieli", apartament)
+                aplica("totaluri_interval", apartament, apartament + 15, rng.choice((None, tip)))
+                aplica("totaluri_perioada", apartament, apartament + 15, zi[:7], None, rng.choice((None, tip)))
+                aplica("totaluri_pe_perioade", apartament, apartament + 15, None, zi[:7], rng.choice((None, tip)),
+                       rng.choice(bussines.PASI_PERIOADA))
+                aplica("group_by", rng.choice(bussines.CHEI_GRUPARE), rng.choice(bussines.AGREGARI))
+                # La sume egale, partițiile își păstrează ordinea lor, deci se compară sumele și rândurile
+                tip_maxime = rng.choice((None, tip))
+                maxime = bussines.top_k(registru, tip_maxime, None, 5)
+                asteptat = bussines.top_k(apartamente, tip_maxime, None, 5)
+                assert [rand[2] for rand in maxime] == [rand[2] for rand in asteptat]
+                assert set(maxime) <= set(bussines.top_k(apartamente, tip_maxime, None, 10 ** 6))
+                aplica("top_k", tip, apartament, 3)
+                sortate = bussines.tipareste_apartamente_sortate_dupa_tip(registru, tip)
+                asteptat = bussines.tipareste_apartamente_sortate_dupa_tip(apartamente, tip)
+                assert sortate == asteptat or sorted(sortate) == sorted(asteptat)
+                assert [suma for suma, _ in sortate or []] == [suma for suma, _ in asteptat or []]
+
+            assert registru.ca_dictionar() == apartamente
+    finally:
+        registru.inchide()
+
+
+if __name__ == "__main__":
+    test_registru_partajat()
+    test_paritate_partajat()
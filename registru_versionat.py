@@ -0,0 +1,679 @@
+"""
+Registru versionat: fiecare modificare întoarce o versiune nouă, iar versiunile vechi rămân valabile.
+
+Registrul este ținut în doi arbori treap persistenți (arbori binari de căutare echilibrați prin priorități):
+poziție -> (apartament, cheltuieli), în ordinea registrului, și apartament -> poziție, pentru căutări și
+intervale. O modificare copiază doar drumul de la rădăcină la nodurile atinse, O(log n), restul arborilor
+fiind împărțit între versiuni. De aici vin snapshot-urile fără copiere, anularea/refacerea din meniul
+interactiv și citirile consistente ale unei versiuni cât timp alte modificări continuă.
+"""
+import math
+from collections import deque
+
+import bussines
+from bussines import (validare_numar_apartament, validare_tip_cheltuiala, validare_suma, validare_data,
+                      validare_inregistrare, validare_corectura)
+
+_MASCA = (1 << 64) - 1
+
+# Rapoartele fără o implementare proprie rulează funcția din bussines pe dicționarul versiunii
+RAPOARTE = frozenset({
+    "afiseaza_apartamente_cu_cheltuieli_mai_mari_decat", "afiseaza_cheltuieli_tip",
+    "afiseaza_cheltuieli_inainte_de_o_zi", "tipareste_apartamente_sortate_dupa_tip", "suma_cheltuieli_tip",
+    "group_by",
+})
+
+
+def _prioritate(cheie):
+    """
+    Prioritatea unei chei: pseudo-aleatoare (amestecul splitmix64), dar determinată de cheie, deci forma
+    arborelui depinde doar de cheile pe care le conține, nu de ordinea operațiilor.
+    """
+    x = (cheie + 0x9E3779B97F4A7C15) & _MASCA
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASCA
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASCA
+    return x ^ (x >> 31)
+
+
+class _Nod:
+    """
+    Nod de treap. Nodurile nu sunt modificate după ce devin parte dintr-o versiune.
+    """
+    __slots__ = ("cheie", "valoare", "prioritate", "stanga", "dreapta")
+
+    def __init__(self, cheie, valoare, prioritate, stanga=None, dreapta=None):
+        self.cheie = cheie
+        self.valoare = valoare
+        self.prioritate = prioritate
+        self.stanga = stanga
+        self.dreapta = dreapta
+
+
+def _cauta(nod, cheie):
+    while nod is not None and nod.cheie != cheie:
+        nod = nod.stanga if cheie < nod.cheie else nod.dreapta
+    return nod
+
+
+def _imparte(nod, cheie):
+    """
+    :return: Tuplu (arborele cheilor < cheie, arborele cheilor >= cheie); se copiază doar drumul parcurs.
+    """
+    if nod is None:
+        return None, None
+    if nod.cheie < cheie:
+        stanga, dreapta = _imparte(nod.dreapta, cheie)
+        return _Nod(nod.cheie, nod.valoare, nod.prioritate, nod.stanga, stanga), dreapta
+    stanga, dreapta = _imparte(nod.stanga, cheie)
+    return stanga, _Nod(nod.cheie, nod.valoare, nod.prioritate, dreapta, nod.dreapta)
+
+
+def _uneste(stanga, dreapta):
+    """
+    Unește doi arbori în care toate cheile din stânga sunt mai mici decât cele din dreapta.
+    """
+    if stanga is None:
+        return dreapta
+    if dreapta is None:
+        return stanga
+    if stanga.prioritate > dreapta.prioritate:
+        return _Nod(stanga.cheie, stanga.valoare, stanga.prioritate, stanga.stanga, _uneste(stanga.dreapta, dreapta))
+    return _Nod(dreapta.cheie, dreapta.valoare, dreapta.prioritate, _uneste(stanga, dreapta.stanga), dreapta.dreapta)
+
+
+def _pune(nod, cheie, valoare):
+    """
+    :return: Arborele nou, în care cheia are valoarea dată (adăugată sau înlocuită).
+    """
+    if nod is None:
+        return _Nod(cheie, valoare, _prioritate(cheie))
+    if cheie == nod.cheie:
+        return _Nod(cheie, valoare, nod.prioritate, nod.stanga, nod.dreapta)
+
+    prioritate = _prioritate(cheie)
+    if prioritate > nod.prioritate:
+        # Cheia nu poate fi mai jos (prioritatea ei ar fi fost mai mică), deci nodul nou devine rădăcina aici
+        stanga, dreapta = _imparte(nod, cheie)
+        return _Nod(cheie, valoare, prioritate, stanga, dreapta)
+    if cheie < nod.cheie:
+        return _Nod(nod.cheie, nod.valoare, nod.prioritate, _pune(nod.stanga, cheie, valoare), nod.dreapta)
+    return _Nod(nod.cheie, nod.valoare, nod.prioritate, nod.stanga, _pune(nod.dreapta, cheie, valoare))
+
+
+def _scoate(nod, cheie):
+    """
+    :return: Arborele nou, fără cheia dată (neschimbat dacă cheia lipsește).
+    """
+    if nod is None:
+        return None
+    if cheie == nod.cheie:
+        return _uneste(nod.stanga, nod.dreapta)
+    if cheie < nod.cheie:
+        return _Nod(nod.cheie, nod.valoare, nod.prioritate, _scoate(nod.stanga, cheie), nod.dreapta)
+    return _Nod(nod.cheie, nod.valoare, nod.prioritate, nod.stanga, _scoate(nod.dreapta, cheie))
+
+
+def _construieste(perechi):
+    """
+    Construiește în O(n) treap-ul cheilor date, sortate crescător, cu o stivă (arbore cartezian).
+
+    :param perechi: Iterabil de tupluri (cheie, valoare), în ordinea cheilor.
+    :return: Rădăcina arborelui.
+    """
+    stiva = []
+    for cheie, valoare in perechi:
+        nod = _Nod(cheie, valoare, _prioritate(cheie))
+        ultimul = None
+        while stiva and stiva[-1].prioritate < nod.prioritate:
+            ultimul = stiva.pop()
+        nod.stanga = ultimul
+        if stiva:
+            stiva[-1].dreapta = nod
+        stiva.append(nod)
+    return stiva[0] if stiva else None
+
+
+def _parcurge(nod, start=None, sfarsit=None):
+    """
+    Parcurge în ordine nodurile cu cheia în intervalul [start, sfarsit] (None: fără limită), fără a intra
+    în subarborii aflați în afara intervalului.
+    """
+    stiva = []
+    while stiva or nod is not None:
+        if nod is not None:
+            if start is not None and nod.cheie < start:
+                nod = nod.dreapta
+                continue
+            stiva.append(nod)
+            nod = nod.stanga
+            continue
+        nod = stiva.pop()
+        if sfarsit is not None and nod.cheie > sfarsit:
+            return
+        yield nod
+        nod = nod.dreapta
+
+
+def _verifica_arbore(nod, start=None, sfarsit=None):
+    """
+    :return: Numărul de noduri.
+    :raises: AssertionError dacă ordinea cheilor sau a priorităților nu este respectată.
+    """
+    if nod is None:
+        return 0
+    assert (start is None or start < nod.cheie) and (sfarsit is None or nod.cheie < sfarsit), \
+        f"Cheia {nod.cheie} nu este în ordine."
+    assert nod.prioritate == _prioritate(nod.cheie), f"Prioritatea cheii {nod.cheie} este greșită."
+    for copil in (nod.stanga, nod.dreapta):
+        assert copil is None or copil.prioritate <= nod.prioritate, \
+            f"Ordinea priorităților este greșită la {nod.cheie}."
+    return 1 + _verifica_arbore(nod.stanga, start, nod.cheie) + _verifica_arbore(nod.dreapta, nod.cheie, sfarsit)
+
+
+def _numar_cheltuieli(cheltuieli):
+    return sum(len(lista_cheltuieli) for _, lista_cheltuieli in cheltuieli)
+
+
+def _cu_adaugate(cheltuieli, noi):
+    """
+    :param cheltuieli: Cheltuielile unui apartament, ca tuplu de (tip, tuplu de (suma, zi)).
+    :param noi: Dicționar tip -> listă de (suma, zi) de adăugat la sfârșitul listelor.
+    :return: Tuplul nou; tipurile noi sunt puse la sfârșit, în ordinea din `noi`.
+    """
+    rezultat = [(tip, lista_cheltuieli + tuple(noi.pop(tip, ()))) for tip, lista_cheltuieli in cheltuieli]
+    rezultat.extend((tip, tuple(lista_cheltuieli)) for tip, lista_cheltuieli in noi.items())
+    return tuple(rezultat)
+
+
+class RegistruVersionat:
+    """
+    Versiune imuabilă a registrului de cheltuieli.
+
+    Metodele poartă aceleași nume ca funcțiile din bussines.py, așa că o versiune poate fi transmisă acelor
+    funcții în locul dicționarului. Modificările nu schimbă versiunea pe care sunt apelate: întorc o versiune
+    nouă (sau, pentru operațiile în bloc, tuplul (versiune nouă, erori)), care împarte cu cea veche tot ce
+    nu s-a schimbat.
+    """
+
+    def __init__(self, _ordine=None, _apartamente=None, _urmatoarea_pozitie=0, _numar=0):
+        # poziție -> (apartament, cheltuieli) și apartament -> poziție; cheltuielile sunt tupluri
+        # ((tip, ((suma, zi), ...)), ...), deci nici ele nu pot fi modificate prin versiunea veche
+        self._ordine = _ordine
+        self._apartamente = _apartamente
+        self._urmatoarea_pozitie = _urmatoarea_pozitie
+        self._numar = _numar
+
+    def __len__(self):
+        return self._numar
+
+    def __getattr__(self, nume):
+        if nume not in RAPOARTE:
+            raise AttributeError(nume)
+        functie = getattr(bussines, nume)
+        return lambda *args: functie(self.ca_dictionar(), *args)
+
+    def _cheltuieli(self, apartament):
+        nod = _cauta(self._apartamente, apartament)
+        return None if nod is None else _cauta(self._ordine, nod.valoare).valoare[1]
+
+    def _cu_cheltuieli(self, modificari):
+        """
+        :param modificari: Dicționar apartament -> cheltuielile lui noi; apartamentele lipsă sunt adăugate
+            la sfârșitul registrului, în ordinea din dicționar.
+        :return: Versiunea nouă.
+        """
+        if not modificari:
+            return self
+        ordine, apartamente, urmatoarea_pozitie, numar = (self._ordine, self._apartamente,
+                                                           self._urmatoarea_pozitie, self._numar)
+        for apartament, cheltuieli in modificari.items():
+            nod = _cauta(apartamente, apartament)
+            if nod is None:
+                pozitie = urmatoarea_pozitie
+                urmatoarea_pozitie += 1
+                apartamente = _pune(apartamente, apartament, pozitie)
+            else:
+                pozitie = nod.valoare
+                numar -= _numar_cheltuieli(_cauta(ordine, pozitie).valoare[1])
+            ordine = _pune(ordine, pozitie, (apartament, cheltuieli))
+            numar += _numar_cheltuieli(cheltuieli)
+        return RegistruVersionat(ordine, apartamente, urmatoarea_pozitie, numar)
+
+    def _rescrie(self, transforma):
+        """
+        Aplică transformarea pe cheltuielile fiecărui apartament și reconstruiește arborele ordinii în O(n).
+        """
+        perechi = []
+        numar = 0
+        for nod in _parcurge(self._ordine):
+            apartament, cheltuieli = nod.valoare
+            cheltuieli = transforma(cheltuieli)
+            numar += _numar_cheltuieli(cheltuieli)
+            perechi.append((nod.cheie, (apartament, cheltuieli)))
+        return RegistruVersionat(_construieste(perechi), self._apartamente, self._urmatoarea_pozitie, numar)
+
+    def verifica_indexuri(self):
+        """
+        Verifică ordinea și prioritățile celor doi arbori și faptul că se corespund.
+
+        :raises: AssertionError dacă versiunea nu este consistentă.
+        """
+        assert _verifica_arbore(self._ordine) == _verifica_arbore(self._apartamente), "Arborii au mărimi diferite."
+        numar = 0
+        for nod in _parcurge(self._ordine):
+            apartament, cheltuieli = nod.valoare
+            assert nod.cheie < self._urmatoarea_pozitie, "Poziția unui apartament depășește contorul."
+            assert _cauta(self._apartamente, apartament).valoare == nod.cheie, f"Poziția apartamentului {apartament}."
+            numar += _numar_cheltuieli(cheltuieli)
+        assert numar == self._numar, "Numărul de cheltuieli este greșit."
+
+    @classmethod
+    def din_dictionar(cls, apartamente):
+        """
+        Construiește o versiune din dicționarul clasic {apartament: {tip: [(suma, zi)]}}.
+
+        :param apartamente: Dicționarul care conține datele despre apartamente.
+        :return: RegistruVersionat cu aceleași cheltuieli, în aceeași ordine.
+        """
+        ordine = []
+        for pozitie, (apartament, cheltuieli) in enumerate(apartamente.items()):
+            ordine.append((pozitie, (validare_numar_apartament(apartament), tuple(
+                (validare_tip_cheltuiala(tip), tuple((validare_suma(suma), validare_data(zi))
+                                                     for suma, zi in lista_cheltuieli))
+                for tip, lista_cheltuieli in cheltuieli.items()))))
+
+        pozitii = sorted((apartament, pozitie) for pozitie, (apartament, _) in ordine)
+        return cls(_construieste(ordine), _construieste(pozitii), len(ordine),
+                   sum(_numar_cheltuieli(cheltuieli) for _, (_, cheltuieli) in ordine))
+
+    def ca_dictionar(self):
+        """
+        :return: Dicționarul clasic {apartament: {tip: [(suma, zi)]}} al versiunii (o copie nouă).
+        """
+        return {apartament: {tip: list(lista_cheltuieli) for tip, lista_cheltuieli in cheltuieli}
+                for apartament, cheltuieli in (nod.valoare for nod in _parcurge(self._ordine))}
+
+    def itereaza_cheltuieli(self):
+        """
+        Parcurge cheltuielile versiunii în ordinea registrului.
+
+        :return: Generator de tupluri (apartament, tip, suma, zi).
+        """
+        for nod in _parcurge(self._ordine):
+            apartament, cheltuieli = nod.valoare
+            for tip, lista_cheltuieli in cheltuieli:
+                for suma, zi in lista_cheltuieli:
+                    yield apartament, tip, suma, zi
+
+    def _perechi(self, de_la):
+        """
+        Perechile (apartament, cheltuieli) ale versiunii, începând cu apartamentul de_la; arborele este
+        parcurs direct, fără a construi dicționarul.
+
+        :raises: ValueError dacă apartamentul de_la nu există în versiune.
+        """
+        start = None
+        if de_la is not None:
+            nod = _cauta(self._apartamente, de_la)
+            if nod is None:
+                raise ValueError("Eroare: Apartamentul de la care continuă raportul nu mai există în registru.")
+            start = nod.valoare
+        return (nod.valoare for nod in _parcurge(self._ordine, start))
+
+    def cheltuieli_mai_mari_decat(self, suma, de_la=None):
+        """
+        :return: Generator de tupluri (apartament, tip, suma) cu suma peste prag, în ordinea versiunii.
+        """
+        return bussines._randuri_mai_mari_decat(self._perechi(de_la), validare_suma(suma))
+
+    def cheltuieli_de_tip(self, tip, de_la=None):
+        """
+        :return: Generator de tupluri (apartament, tip, lista de (suma, zi)).
+        """
+        return ((apartament, tip, list(cheltuieli)) for apartament, tip, cheltuieli in
+                bussines._randuri_de_tip(self._perechi(de_la), validare_tip_cheltuiala(tip)))
+
+    def cheltuieli_inainte_de_o_zi(self, suma, zi, de_la=None):
+        """
+        :return: Generator de tupluri (apartament, tip), tipul fiind None pentru apartamentele fără potriviri.
+        """
+        suma = validare_suma(suma)
+        return bussines._randuri_inainte_de_o_zi(self._perechi(de_la), suma, bussines.parseaza_data(zi))
+
+    def adauga_cheltuiala(self, apartament, tip, suma, zi):
+        """
+        Adaugă o cheltuială.
+
+        :return: Versiunea nouă.
+        :raises: ValueError dacă cheltuiala nu este validă.
+        """
+        apartament, tip, suma, zi = validare_inregistrare((apartament, tip, suma, zi))
+        return self._cu_cheltuieli({apartament: _cu_adaugate(self._cheltuieli(apartament) or (),
+                                                             {tip: [(suma, zi)]})})
+
+    def adauga_cheltuieli_bulk(self, inregistrari):
+        """
+        Adaugă mai multe cheltuieli; fiecare apartament atins este copiat o singură dată.
+
+        :param inregistrari: Iterabil de tupluri (apartament, tip, suma, zi).
+        :return: Tuplu (versiunea nouă, erori), unde erori este lista de (poziție, mesaj).
+        """
+        noi = {}
+        erori = []
+        for pozitie, inregistrare in enumerate(inregistrari):
+            try:
+                apartament, tip, suma, zi = validare_inregistrare(inregistrare)
+            except ValueError as e:
+                erori.append((pozitie, str(e)))
+                continue
+            noi.setdefault(apartament, {}).setdefault(tip, []).append((suma, zi))
+
+        return self._cu_cheltuieli({apartament: _cu_adaugate(self._cheltuieli(apartament) or (), cheltuieli_noi)
+                                    for apartament, cheltuieli_noi in noi.items()}), erori
+
+    def modifica_cheltuiala(self, apartament, tip, suma_veche, suma_noua):
+        """
+        Modifică prima cheltuială cu suma veche dată.
+
+        :return: Versiunea nouă.
+        :raises: ValueError dacă suma veche nu este găsită.
+        """
+        versiune, erori = self.modifica_cheltuieli([(apartament, tip, suma_veche, suma_noua)])
+        if erori:
+            raise ValueError(erori[0][1])
+        return versiune
+
+    def modifica_cheltuieli(self, actualizari):
+        """
+        Aplică mai multe corecturi (apartament, tip, suma_veche, suma_noua), în ordine.
+
+        :return: Tuplu (versiunea nouă, erori), unde erori este lista de (poziție, mesaj).
+        """
+        modificate = {}
+        erori = []
+        for pozitie, actualizare in enumerate(actualizari):
+            try:
+                apartament, tip, suma_veche, suma_noua = validare_corectura(actualizare)
+            except ValueError as e:
+                erori.append((pozitie, str(e)))
+                continue
+
+            cheltuieli = modificate.get(apartament)
+            if cheltuieli is None:
+                cheltuieli = self._cheltuieli(apartament)
+                if cheltuieli is None:
+                    continue
+                cheltuieli = modificate[apartament] = {tip: list(lista) for tip, lista in cheltuieli}
+
+            lista_cheltuieli = cheltuieli.get(tip)
+            if lista_cheltuieli is None:
+                continue
+            for i, (suma, zi) in enumerate(lista_cheltuieli):
+                if suma == suma_veche:
+                    lista_cheltuieli[i] = (suma_noua, zi)
+                    break
+            else:
+                erori.append((pozitie, 'Eroare: Suma veche nu a fost găsită'))
+
+        return self._cu_cheltuieli({apartament: tuple((tip, tuple(lista)) for tip, lista in cheltuieli.items())
+                                    for apartament, cheltuieli in modificate.items()}), erori
+
+    def sterge_apartament(self, apartament):
+        """
+        Șterge un apartament cu toate cheltuielile lui.
+
+        :return: Versiunea nouă.
+        :raises: ValueError dacă apartamentul nu există.
+        """
+        apartament = validare_numar_apartament(apartament)
+        if _cauta(self._apartamente, apartament) is None:
+            raise ValueError('Eroare: Apartamentul nu există în înregistrări.')
+        return self.sterge_apartamente_consecutive(apartament, apartament)
+
+    def sterge_apartamente_consecutive(self, apartament_start, apartament_end):
+        """
+        Șterge apartamentele din intervalul [apartament_start, apartament_end]. Intervalul este tăiat din
+        arborele apartamentelor în O(log n), iar fiecare dintre cele k apartamente este scos din ordine în
+        O(log n).
+
+        :return: Versiunea nouă.
+        """
+        apartament_start = validare_numar_apartament(apartament_start)
+        apartament_end = validare_numar_apartament(apartament_end)
+        if apartament_start > apartament_end:
+            return self
+
+        inainte, rest = _imparte(self._apartamente, apartament_start)
+        interval, dupa = _imparte(rest, apartament_end + 1)
+        if interval is None:
+            return self
+
+        ordine = self._ordine
+        numar = self._numar
+        for nod in _parcurge(interval):
+            numar -= _numar_cheltuieli(_cauta(ordine, nod.valoare).valoare[1])
+            ordine = _scoate(ordine, nod.valoare)
+        return RegistruVersionat(ordine, _uneste(inainte, dupa), self._urmatoarea_pozitie, numar)
+
+    def sterge_cheltuieli_tip(self, tip):
+        """
+        Șterge cheltuielile de un anumit tip din toate apartamentele.
+
+        :return: Versiunea nouă.
+        """
+        tip = validare_tip_cheltuiala(tip)
+        return self._rescrie(lambda cheltuieli: tuple((tip_cheltuiala, lista_cheltuieli)
+                                                      for tip_cheltuiala, lista_cheltuieli in cheltuieli
+                                                      if tip_cheltuiala != tip))
+
+    def elimina_cheltuiala(self, tip):
+        """
+        Elimină cheltuielile de un anumit tip din toate apartamentele.
+
+        :return: Versiunea nouă.
+        """
+        return self.sterge_cheltuieli_tip(tip)
+
+    def elimina_cheltuieli_mai_mici_decat(self, suma_minima):
+        """
+        Elimină cheltuielile mai mici decât suma minimă; listele golite rămân în registru.
+
+        :return: Versiunea nouă.
+        """
+        suma_minima = validare_suma(suma_minima)
+        return self._rescrie(lambda cheltuieli: tuple(
+            (tip, tuple((suma, zi) for suma, zi in lista_cheltuieli if suma >= suma_minima))
+            for tip, lista_cheltuieli in cheltuieli))
+
+    def calculeaza_total_cheltuieli(self, numar_apartament):
+        """
+        Calculează totalul cheltuielilor unui apartament (căutat în O(log n)) sau None dacă nu există.
+        """
+        cheltuieli = self._cheltuieli(validare_numar_apartament(numar_apartament))
+        if cheltuieli is None:
+            return None
+        return sum(suma for _, lista_cheltuieli in cheltuieli for suma, _ in lista_cheltuieli)
+
+    def totaluri_interval(self, apartament_start, apartament_end, tip=None):
+        """
+        Totalul și numărul cheltuielilor apartamentelor din intervalul [apartament_start, apartament_end],
+        parcurgând doar apartamentele din interval.
+
+        :return: Tuplu (suma, număr de cheltuieli).
+        """
+        apartament_start = validare_numar_apartament(apartament_start)
+        apartament_end = validare_numar_apartament(apartament_end)
+        if tip is not None:
+            tip = validare_tip_cheltuiala(tip)
+
+        sume = [suma for nod in _parcurge(self._apartamente, apartament_start, apartament_end)
+                for tip_cheltuiala, lista_cheltuieli in _cauta(self._ordine, nod.valoare).valoare[1]
+                if tip in (None, tip_cheltuiala) for suma, _ in lista_cheltuieli]
+        return math.fsum(sume), len(sume)
+
+    def _restrans(self, apartament_start, apartament_end):
+        """
+        Dicționarul clasic restrâns la apartamentele din interval; listele nu sunt copiate, deci rezultatul
+        este doar pentru citire.
+        """
+        return {nod.cheie: dict(_cauta(self._ordine, nod.valoare).valoare[1])
+                for nod in _parcurge(self._apartamente, apartament_start, apartament_end)}
+
+    def top_k(self, tip=None, apartament=None, k=10):
+        """
+        Cele mai mari k cheltuieli; pentru un singur apartament este citit doar acel apartament.
+
+        :return: Lista de tupluri (apartament, tip, suma, zi).
+        """
+        if tip is not None:
+            tip = validare_tip_cheltuiala(tip)
+        if apartament is None:
+            return bussines.top_k(self.ca_dictionar(), tip, None, k)
+        apartament = validare_numar_apartament(apartament)
+        return bussines.top_k(self._restrans(apartament, apartament), tip, apartament, k)
+
+    def totaluri_perioada(self, apartament_start, apartament_end, luna_start=None, luna_end=None, tip=None):
+        """
+        Totalul și numărul cheltuielilor unui interval de apartamente într-o perioadă de luni, parcurgând doar
+        apartamentele din interval.
+
+        :return: Tuplu (suma, număr de cheltuieli).
+        """
+        apartament_start = validare_numar_apartament(apartament_start)
+        apartament_end = validare_numar_apartament(apartament_end)
+        return bussines.totaluri_perioada(self._restrans(apartament_start, apartament_end), apartament_start,
+                                          apartament_end, luna_start, luna_end, tip)
+
+    def totaluri_pe_perioade(self, apartament_start, apartament_end, luna_start=None, luna_end=None, tip=None,
+                             pas="luna"):
+        """
+        Totalurile unui interval de apartamente pe fiecare lună sau an, parcurgând doar apartamentele din interval.
+
+        :return: Dicționar {perioadă: sumă}, ordonat crescător.
+        """
+        apartament_start = validare_numar_apartament(apartament_start)
+        apartament_end = validare_numar_apartament(apartament_end)
+        return bussines.totaluri_pe_perioade(self._restrans(apartament_start, apartament_end), apartament_start,
+                                             apartament_end, luna_start, luna_end, tip, pas)
+
+
+class Istoric:
+    """
+    Istoricul versiunilor unui registru, pentru anulare (undo) și refacere (redo) pe mai multe niveluri.
+
+    Versiunile vechi nu sunt copiate: istoricul ține doar referințe, iar versiunile împart între ele
+    structura nemodificată.
+    """
+
+    def __init__(self, registru, limita=100):
+        self.curent = registru
+        self._anulari = deque(maxlen=limita)
+        self._refaceri = []
+
+    def inregistreaza(self, registru):
+        """
+        Reține o versiune nouă; refacerile rămase se pierd, ca în orice editor.
+
+        :param registru: Registrul după ultima operație (ignorat dacă este versiunea curentă).
+        """
+        if registru is not self.curent:
+            self._anulari.append(self.curent)
+            self._refaceri.clear()
+            self.curent = registru
+
+    def anuleaza(self):
+        """
+        :return: Versiunea dinaintea ultimei operații.
+        :raises: ValueError dacă nu există operații de anulat.
+        """
+        if not self._anulari:
+            raise ValueError("Eroare: Nu există operații de anulat.")
+        self._refaceri.append(self.curent)
+        self.curent = self._anulari.pop()
+        return self.curent
+
+    def reface(self):
+        """
+        :return: Versiunea la care s-a renunțat prin ultima anulare.
+        :raises: ValueError dacă nu există operații de refăcut.
+        """
+        if not self._refaceri:
+            raise ValueError("Eroare: Nu există operații de refăcut.")
+        self._anulari.append(self.curent)
+        self.curent = self._refaceri.pop()
+        return self.curent
+
+
+def test_versiuni_independente():
+    import store
+
+    v0 = RegistruVersionat.din_dictionar(store._registru_exemplu())
+    v1 = bussines.adauga_cheltuiala(v0, 1, "lumina", 10, "2023-11-01")
+    v2 = bussines.sterge_apartamente_consecutive(v1, 2, 10 ** 9)
+    v3, erori = bussines.modifica_cheltuieli(v2, [(1, "apa", 20, 21), (1, "gaz", 7, 8)])
+
+    # Versiunile vechi nu sunt atinse de modificările ulterioare
+    assert v0.ca_dictionar() == store._registru_exemplu()
+    assert v1.ca_dictionar()[1]["lumina"] == [(10, "2023-11-01")] and 2 in v1.ca_dictionar()
+    assert list(v2.ca_dictionar()) == [1]
+    assert v3.ca_dictionar()[1]["apa"] == [(230.0, "2023-10-30"), (21.0, "2023-01-01")]
+    assert erori == [(1, "Eroare: Suma veche nu a fost găsită")]
+    assert (len(v0), len(v1), len(v2), len(v3)) == (7, 8, 4, 4)
+    for versiune in (v0, v1, v2, v3):
+        versiune.verifica_indexuri()
+
+    assert v1.totaluri_interval(1, 2) == (545.0, 7)
+    assert v3.calculeaza_total_cheltuieli(1) == 311.0 and v3.calculeaza_total_cheltuieli(2) is None
+
+
+def test_treap_echilibrat():
+    registru = RegistruVersionat()
+    for apartament in range(1, 2001):
+        registru = registru.adauga_cheltuiala(apartament, "apa", apartament, "2023-01-01")
+
+    def inaltime(nod):
+        return 0 if nod is None else 1 + max(inaltime(nod.stanga), inaltime(nod.dreapta))
+
+    # Cheile consecutive nu degenerează arborii în liste
+    assert inaltime(registru._apartamente) < 40 and inaltime(registru._ordine) < 40
+    registru = registru.sterge_apartamente_consecutive(500, 1499)
+    registru.verifica_indexuri()
+    assert registru.totaluri_interval(1, 10 ** 9) == (math.fsum(range(1, 500)) + math.fsum(range(1500, 2001)), 1000)
+
+
+def test_istoric():
+    istoric = Istoric(RegistruVersionat(), limita=2)
+    for apartament in (1, 2, 3):
+        istoric.inregistreaza(istoric.curent.adauga_cheltuiala(apartament, "gaz", 10, "2023-01-01"))
+
+    assert list(istoric.anuleaza().ca_dictionar()) == [1, 2]
+    assert list(istoric.anuleaza().ca_dictionar()) == [1]
+    try:
+        istoric.anuleaza()  # limita păstrează doar ultimele două versiuni
+        assert False
+    except ValueError:
+        assert True
+
+    assert list(istoric.reface().ca_dictionar()) == [1, 2]
+    istoric.inregistreaza(istoric.curent.sterge_apartament(1))
+    try:
+        istoric.reface()
+        assert False
+    except ValueError:
+        assert list(istoric.curent.ca_dictionar()) == [2]
+
+
+def test_paritate_versionat():
+    import store
+
+    store.test_paritate_cu_dictionarul(depozit=RegistruVersionat)
+    store.test_group_by_store(depozit=RegistruVersionat)
+    store.test_adauga_cheltuiala_store(depozit=RegistruVersionat)
+    store.test_mutatii_amestecate(depozit=RegistruVersionat)
+
+
+if __name__ == "__main__":
+    test_versiuni_independente()
+    test_treap_echilibrat()
+    test_istoric()
+    test_paritate_versionat()
@@ -0,0 +1,585 @@
+"""
+Serviciu HTTP/JSON (asyncio, doar biblioteca standard) peste operațiile din bussines.py.
+
+Modificările (POST) sunt puse într-o coadă și aplicate de o singură sarcină de scriere, în loturi: adăugările
+și corecturile consecutive din coadă devin un singur apel adauga_cheltuieli_bulk / modifica_cheltuieli.
+Rapoartele (GET) sunt calculate direct în bucla de evenimente, deci citesc mereu registrul între două loturi
+și nu așteaptă după coada de modificări. Conexiunile sunt păstrate deschise (keep-alive) între cereri.
+
+Cereri acceptate:
+    POST /adauga_cheltuiala                  {"apartament", "tip", "suma", "zi"}
+    POST /adauga_cheltuieli_bulk             {"inregistrari": [[apartament, tip, suma, zi], ...]}
+    POST /modifica_cheltuiala                {"apartament", "tip", "suma_veche", "suma_noua"}
+    POST /modifica_cheltuieli                {"actualizari": [[apartament, tip, suma_veche, suma_noua], ...]}
+    POST /sterge_apartamente_consecutive     {"apartament_start", "apartament_end"}
+    GET  /<raport>?parametru=valoare         rapoartele din RAPOARTE
+    GET  /<raport>?...&limita=N&cursor=C     rapoartele din RAPOARTE_PAGINATE, câte o pagină; răspunsul are și
+                                             cursorul paginii următoare (null după ultima pagină)
+    GET  /statistici                         numărul de cereri, operații și loturi
+"""
+import asyncio
+import json
+from urllib.parse import parse_qsl, urlsplit
+
+import bussines
+from bussines import validare_numar_apartament, validare_tip_cheltuiala
+
+MARIME_MAXIMA_CORP = 16 * 1024 * 1024
+TIMP_INACTIV = 60
+LIMITA_MAXIMA = 10000
+STARI = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+         500: "Internal Server Error"}
+
+
+def _tip_optional(tip):
+    return None if tip is None else validare_tip_cheltuiala(tip)
+
+
+# Raport -> parametri (nume, conversie, valoare implicită); parametrii fără valoare implicită sunt obligatorii
+RAPOARTE = {
+    "afiseaza_cheltuieli_tip": (("tip", validare_tip_cheltuiala),),
+    "tipareste_apartamente_sortate_dupa_tip": (("tip", validare_tip_cheltuiala),),
+    "afiseaza_apartamente_cu_cheltuieli_mai_mari_decat": (("suma", float),),
+    "afiseaza_cheltuieli_inainte_de_o_zi": (("suma", float), ("zi", str)),
+    "suma_cheltuieli_tip": (("tip", validare_tip_cheltuiala),),
+    "calculeaza_total_cheltuieli": (("apartament", int),),
+    "totaluri_interval": (("apartament_start", int), ("apartament_end", int), ("tip", _tip_optional, None)),
+    "totaluri_perioada": (("apartament_start", int), ("apartament_end", int), ("luna_start", str, None),
+                          ("luna_end", str, None), ("tip", _tip_optional, None)),
+    "totaluri_pe_perioade": (("apartament_start", int), ("apartament_end", int), ("luna_start", str, None),
+                             ("luna_end", str, None), ("tip", _tip_optional, None), ("pas", str, "luna")),
+    "group_by": (("cheie", str), ("agregare", str, "sum")),
+    "top_k": (("tip", _tip_optional, None), ("apartament", int, None), ("k", int, 10)),
+}
+
+
+def _cursor(text):
+    try:
+        apartament, sarite = text.split(":")
+        return int(apartament), int(sarite)
+    except ValueError:
+        raise ValueError("Eroare: Cursorul nu este valid.")
+
+
+def _limita(text):
+    limita = int(text)
+    if not 1 <= limita <= LIMITA_MAXIMA:
+        raise ValueError(f"Eroare: Limita paginii trebuie să fie între 1 și {LIMITA_MAXIMA}.")
+    return limita
+
+
+# Rapoartele pe apartamente, parcurse pe pagini prin bussines.pagina_raport; rândurile sunt structurate
+RAPOARTE_PAGINATE = {
+    "cheltuieli_mai_mari_decat": (("suma", float),),
+    "cheltuieli_de_tip": (("tip", validare_tip_cheltuiala),),
+    "cheltuieli_inainte_de_o_zi": (("suma", float), ("zi", str)),
+}
+PARAMETRI_PAGINA = (("limita", _limita, 100), ("cursor", _cursor, None))
+
+# Modificare -> (tipul operației din coadă, câmpurile corpului JSON, dacă este o cerere în bloc)
+MODIFICARI = {
+    "adauga_cheltuiala": ("adauga", ("apartament", "tip", "suma", "zi"), False),
+    "adauga_cheltuieli_bulk": ("adauga", ("inregistrari",), True),
+    "modifica_cheltuiala": ("modifica", ("apartament", "tip", "suma_veche", "suma_noua"), False),
+    "modifica_cheltuieli": ("modifica", ("actualizari",), True),
+    "sterge_apartamente_consecutive": ("sterge_interval", ("apartament_start", "apartament_end"), False),
+}
+
+
+class ServiciuCheltuieli:
+    """
+    Servește un registru (dicționar sau orice depozit acceptat de bussines.py) prin HTTP/JSON.
+
+    Registrul este modificat doar de sarcina de scriere; după fiecare modificare este păstrat registrul
+    întors de operație, ca în ui.main, deci funcționează și registrele care întorc o versiune nouă.
+    """
+
+    def __init__(self, registru, marime_lot=256):
+        if not isinstance(marime_lot, int) or marime_lot < 1:
+            raise ValueError("Eroare: Mărimea lotului trebuie să fie un număr natural nenul.")
+        self.registru = registru
+        self.marime_lot = marime_lot
+        self._coada = asyncio.Queue()
+        self._scriitor = None
+        self._server = None
+        self._cereri = 0
+        self._operatii = 0
+        self._loturi = 0
+
+    async def porneste(self, host="127.0.0.1", port=0):
+        """
+        Pornește sarcina de scriere și ascultă conexiuni.
+
+        :param port: Portul; 0 alege un port liber.
+        :return: Portul pe care ascultă serviciul.
+        """
+        self._scriitor = asyncio.create_task(self._aplica_loturi())
+        self._server = await asyncio.start_server(self._trateaza_conexiune, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def opreste(self):
+        """
+        Închide serverul după ce modificările deja primite au fost aplicate.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._scriitor is not None:
+            await self._coada.join()
+            self._scriitor.cancel()
+            try:
+                await self._scriitor
+            except asyncio.CancelledError:
+                pass
+        self._server = self._scriitor = None
+
+    def statistici(self):
+        """
+        :return: Dicționar cu numărul de cereri servite, de modificări aplicate și de loturi în care au fost
+            aplicate modificările.
+        """
+        return {"cereri": self._cereri, "operatii": self._operatii, "loturi": self._loturi}
+
+    async def modifica(self, operatie, date):
+        """
+        Pune o modificare în coadă și așteaptă rezultatul ei.
+
+        :param operatie: 'adauga', 'modifica' sau 'sterge_interval'.
+        :param date: Lista de înregistrări / corecturi, respectiv tuplul (apartament_start, apartament_end).
+        :return: Lista de erori (poziție, mesaj) a modificării.
+        """
+        viitor = asyncio.get_running_loop().create_future()
+        await self._coada.put((operatie, date, viitor))
+        return await viitor
+
+    async def _aplica_loturi(self):
+        while True:
+            lot = [await self._coada.get()]
+            while len(lot) < self.marime_lot and not self._coada.empty():
+                lot.append(self._coada.get_nowait())
+            try:
+                self._aplica_lot(lot)
+            finally:
+                for _ in lot:
+                    self._coada.task_done()
+
+    def _aplica_lot(self, lot):
+        """
+        Aplică în ordine un lot de modificări; modificările consecutive de același tip sunt unite într-un apel.
+        """
+        self._loturi += 1
+        self._operatii += len(lot)
+        inceput = 0
+        while inceput < len(lot):
+            operatie = lot[inceput][0]
+            sfarsit = inceput + 1
+            while operatie != "sterge_interval" and sfarsit < len(lot) and lot[sfarsit][0] == operatie:
+                sfarsit += 1
+            grup = lot[inceput:sfarsit]
+            try:
+                rezultate = self._aplica_grup(operatie, [date for _, date, _ in grup])
+            except Exception as e:
+                if len(grup) == 1:
+                    grup[0][2].set_exception(e)
+                else:
+                    # Cererile unite pot veni de la clienți diferiți: reaplicate separat, doar cererea care a
+                    # produs excepția o primește
+                    for cerere in grup:
+                        self._aplica_separat(operatie, cerere)
+            else:
+                for (_, _, viitor), erori in zip(grup, rezultate):
+                    viitor.set_result(erori)
+            inceput = sfarsit
+
+    def _aplica_separat(self, operatie, cerere):
+        _, date, viitor = cerere
+        try:
+            erori, = self._aplica_grup(operatie, [date])
+        except Exception as e:
+            viitor.set_exception(e)
+        else:
+            viitor.set_result(erori)
+
+    def _aplica_grup(self, operatie, cereri):
+        """
+        :return: Pentru fiecare cerere, lista de erori (poziție în cerere, mesaj).
+        """
+        if operatie == "sterge_interval":
+            self.registru = bussines.sterge_apartamente_consecutive(self.registru, *cereri[0])
+            return [[]]
+
+        toate = [element for elemente in cereri for element in elemente]
+        if operatie == "adauga":
+            self.registru, erori = bussines.adauga_cheltuieli_bulk(self.registru, toate)
+        else:
+            self.registru, erori = bussines.modifica_cheltuieli(self.registru, toate)
+
+        rezultate = [[] for _ in cereri]
+        limite = []
+        total = 0
+        for elemente in cereri:
+            limite.append(total)
+            total += len(elemente)
+        cerere = 0
+        for pozitie, mesaj in erori:
+            while cerere + 1 < len(limite) and limite[cerere + 1] <= pozitie:
+                cerere += 1
+            rezultate[cerere].append((pozitie - limite[cerere], mesaj))
+        return rezultate
+
+    async def _trateaza_conexiune(self, reader, writer):
+        try:
+            while True:
+                try:
+                    cerere = await asyncio.wait_for(_citeste_cerere(reader), TIMP_INACTIV)
+                except (asyncio.TimeoutError, ConnectionError):
+                    break
+                if cerere is None:
+                    break
+                metoda, cale, antete, corp = cerere
+                self._cereri += 1
+                stare, raspuns = await self._raspunde(metoda, cale, corp)
+                pastreaza = antete.get("connection", "").lower() != "close" and stare != 413
+                _scrie_raspuns(writer, stare, raspuns, pastreaza)
+                await writer.drain()
+                if not pastreaza:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _raspunde(self, metoda, cale, corp):
+        """
+        :return: Tuplu (cod de stare, obiectul JSON al răspunsului).
+        """
+        if corp is _PREA_MARE:
+            return 413, {"eroare": "Eroare: Corpul cererii este prea mare."}
+        adresa = urlsplit(cale)
+        nume = adresa.path.strip("/")
+        try:
+            if nume in RAPOARTE or nume in RAPOARTE_PAGINATE or nume == "statistici":
+                if metoda != "GET":
+                    return 405, {"eroare": f"Eroare: {nume} acceptă doar GET."}
+                if nume == "statistici":
+                    return 200, self.statistici()
+                return 200, self._raport(nume, dict(parse_qsl(adresa.query)))
+            if nume in MODIFICARI:
+                if metoda != "POST":
+                    return 405, {"eroare": f"Eroare: {nume} acceptă doar POST."}
+                return 200, await self._modificare(nume, corp)
+        except ValueError as e:
+            return 400, {"eroare": str(e)}
+        except Exception as e:
+            # O eroare neprevăzută a registrului primește un răspuns, iar conexiunea rămâne deschisă
+            return 500, {"eroare": f"Eroare internă: {type(e).__name__}: {e}"}
+        return 404, {"eroare": f"Eroare: Operația {nume!r} nu există."}
+
+    def _raport(self, nume, parametri):
+        if nume in RAPOARTE_PAGINATE:
+            *argumente, limita, cursor = _argumente(RAPOARTE_PAGINATE[nume] + PARAMETRI_PAGINA, parametri)
+            randuri, cursor = bussines.pagina_raport(self.registru, getattr(bussines, nume), *argumente,
+                                                     limita=limita, cursor=cursor)
+            return {"rezultat": randuri, "cursor": None if cursor is None else f"{cursor[0]}:{cursor[1]}"}
+        return {"rezultat": getattr(bussines, nume)(self.registru, *_argumente(RAPOARTE[nume], parametri))}
+
+    async def _modificare(self, nume, corp):
+        operatie, campuri, in_bloc = MODIFICARI[nume]
+        try:
+            date = json.loads(corp or b"{}")
+        except ValueError:
+            raise ValueError("Eroare: Corpul cererii nu este JSON valid.")
+        if not isinstance(date, dict):
+            raise ValueError("Eroare: Corpul cererii trebuie să fie un obiect JSON.")
+        lipsa = [camp for camp in campuri if camp not in date]
+        if lipsa:
+            raise ValueError(f"Eroare: Lipsește câmpul {lipsa[0]!r}.")
+
+        valori = [date[camp] for camp in campuri]
+        if operatie == "sterge_interval":
+            valori = tuple(validare_numar_apartament(valoare) for valoare in valori)
+        elif in_bloc:
+            if not isinstance(valori[0], list):
+                raise ValueError(f"Eroare: Câmpul {campuri[0]!r} trebuie să fie o listă.")
+            valori = [tuple(element) if isinstance(element, list) else element for element in valori[0]]
+        else:
+            valori = [tuple(valori)]
+
+        erori = await self.modifica(operatie, valori)
+        if in_bloc:
+            return {"ok": True, "erori": erori}
+        if erori:
+            raise ValueError(erori[0][1])
+        return {"ok": True}
+
+
+def _argumente(definitii, parametri):
+    """
+    Convertește parametrii cererii după definițiile unui raport.
+
+    :param definitii: Tupluri (nume, conversie[, valoare implicită]).
+    :param parametri: Dicționarul parametrilor din adresă.
+    :return: Lista argumentelor raportului.
+    :raises: ValueError dacă un parametru lipsește sau nu este valid.
+    """
+    argumente = []
+    for parametru in definitii:
+        valoare = parametri.get(parametru[0])
+        if valoare is None:
+            if len(parametru) < 3:
+                raise ValueError(f"Eroare: Lipsește parametrul {parametru[0]!r}.")
+            argumente.append(parametru[2])
+            continue
+        try:
+            argumente.append(parametru[1](valoare))
+        except ValueError as e:
+            raise ValueError(str(e) if str(e).startswith("Eroare") else
+                             f"Eroare: Parametrul {parametru[0]!r} nu este valid.")
+    return argumente
+
+
+_PREA_MARE = object()
+
+
+async def _citeste_cerere(reader):
+    """
+    Citește o cerere HTTP/1.1.
+
+    :return: Tuplu (metodă, cale, antete cu nume mici, corp) sau None la închiderea conexiunii; corpul este
+        _PREA_MARE dacă depășește MARIME_MAXIMA_CORP.
+    """
+    linie = await reader.readline()
+    if not linie.strip():
+        return None
+    try:
+        metoda, cale, _ = linie.decode("latin-1").split(" ", 2)
+    except ValueError:
+        return None
+
+    antete = {}
+    while True:
+        linie = await reader.readline()
+        if linie in (b"\r\n", b"\n", b""):
+            break
+        nume, _, valoare = linie.decode("latin-1").partition(":")
+        antete[nume.strip().lower()] = valoare.strip()
+
+    lungime = int(antete.get("content-length") or 0)
+    if lungime > MARIME_MAXIMA_CORP:
+        return metoda, cale, antete, _PREA_MARE
+    corp = await reader.readexactly(lungime) if lungime else b""
+    return metoda, cale, antete, corp
+
+
+def _scrie_raspuns(writer, stare, raspuns, pastreaza):
+    corp = json.dumps(raspuns, ensure_ascii=False).encode("utf-8")
+    writer.write(f"HTTP/1.1 {stare} {STARI[stare]}\r\nContent-Type: application/json; charset=utf-8\r\n"
+                 f"Content-Length: {len(corp)}\r\nConnection: {'keep-alive' if pastreaza else 'close'}\r\n\r\n"
+                 .encode("latin-1") + corp)
+
+
+async def serveste(registru, host="127.0.0.1", port=8000):
+    """
+    Servește registrul până la întreruperea programului.
+    """
+    serviciu = ServiciuCheltuieli(registru)
+    port = await serviciu.porneste(host, port)
+    print(f"Serviciul ascultă pe http://{host}:{port}/")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await serviciu.opreste()
+
+
+class Client:
+    """
+    Client HTTP/JSON minimal care păstrează conexiunea deschisă între cereri.
+    """
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+
+    @classmethod
+    async def conecteaza(cls, host, port):
+        return cls(*await asyncio.open_connection(host, port))
+
+    async def cere(self, metoda, cale, date=None):
+        """
+        :return: Tuplu (cod de stare, răspunsul JSON decodat).
+        """
+        corp = b"" if date is None else json.dumps(date).encode("utf-8")
+        self._writer.write(f"{metoda} {cale} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                           f"Content-Length: {len(corp)}\r\n\r\n".encode("latin-1") + corp)
+        await self._writer.drain()
+
+        stare = int((await self._reader.readline()).split()[1])
+        lungime = 0
+        while True:
+            linie = await self._reader.readline()
+            if linie in (b"\r\n", b"\n", b""):
+                break
+            nume, _, valoare = linie.decode("latin-1").partition(":")
+            if nume.strip().lower() == "content-length":
+                lungime = int(valoare)
+        return stare, json.loads(await self._reader.readexactly(lungime))
+
+    async def inchide(self):
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+def test_serviciu(fabrica=dict):
+    async def scenariu():
+        serviciu = ServiciuCheltuieli(fabrica())
+        port = await serviciu.porneste()
+        client = await Client.conecteaza("127.0.0.1", port)
+        try:
+            assert await client.cere("POST", "/adauga_cheltuiala", {"apartament": 1, "tip": "apa", "suma": 230,
+                                                                    "zi": "2023-10-30"}) == (200, {"ok": True})
+            stare, raspuns = await client.cere("POST", "/adauga_cheltuieli_bulk", {"inregistrari": [
+                [2, "gaz", 40, "2023-10-30"], [3, "gazz", 1, "2023-10-30"], [3, "lumina", 70, "2023-10-01"]]})
+            assert stare == 200 and [pozitie for pozitie, _ in raspuns["erori"]] == [1]
+            assert await client.cere("POST", "/modifica_cheltuiala", {"apartament": 1, "tip": "apa",
+                                                                      "suma_veche": 230, "suma_noua": 200}) == \
+                (200, {"ok": True})
+
+            assert await client.cere("GET", "/afiseaza_cheltuieli_tip?tip=apa") == \
+                (200, {"rezultat": ["Apartamentul 1: Cheltuiala de tip apa este [(200.0, '2023-10-30')]."]})
+            assert await client.cere("GET", "/totaluri_interval?apartament_start=1&apartament_end=2") == \
+                (200, {"rezultat": [240.0, 2]})
+            assert await client.cere("GET", "/group_by?cheie=tip") == \
+                (200, {"rezultat": {"apa": 200.0, "gaz": 40.0, "lumina": 70.0}})
+            assert await client.cere("GET", "/totaluri_perioada?apartament_start=1&apartament_end=3&luna_start=2023-10"
+                                            "&tip=gaz") == (200, {"rezultat": [40.0, 1]})
+            assert await client.cere("GET", "/totaluri_pe_perioade?apartament_start=1&apartament_end=3&pas=an") == \
+                (200, {"rezultat": {"2023": 310.0}})
+            assert await client.cere("GET", "/top_k?k=2") == \
+                (200, {"rezultat": [[1, "apa", 200.0, "2023-10-30"], [3, "lumina", 70.0, "2023-10-01"]]})
+            assert await client.cere("GET", "/cheltuieli_mai_mari_decat?suma=10&limita=2") == \
+                (200, {"rezultat": [[1, "apa", 200.0], [2, "gaz", 40.0]], "cursor": "3:0"})
+            assert await client.cere("GET", "/cheltuieli_mai_mari_decat?suma=10&limita=2&cursor=3:0") == \
+                (200, {"rezultat": [[3, "lumina", 70.0]], "cursor": None})
+            assert (await client.cere("GET", "/cheltuieli_de_tip?tip=apa&cursor=3"))[0] == 400
+
+            assert await client.cere("POST", "/sterge_apartamente_consecutive",
+                                     {"apartament_start": 2, "apartament_end": 3}) == (200, {"ok": True})
+            assert await client.cere("GET", "/calculeaza_total_cheltuieli?apartament=2") == \
+                (200, {"rezultat": None})
+
+            # Erorile nu închid conexiunea
+            assert (await client.cere("POST", "/modifica_cheltuiala", {"apartament": 1, "tip": "apa",
+                                                                       "suma_veche": 5, "suma_noua": 6}))[0] == 400
+            assert (await client.cere("POST", "/adauga_cheltuiala", {"apartament": 1}))[0] == 400
+            assert (await client.cere("GET", "/afiseaza_cheltuieli_tip?tip=gazz"))[0] == 400
+            assert (await client.cere("GET", "/totaluri_interval?apartament_start=x&apartament_end=2"))[0] == 400
+            assert (await client.cere("GET", "/adauga_cheltuiala"))[0] == 405
+            assert (await client.cere("GET", "/nu_exista"))[0] == 404
+            assert (await client.cere("GET", "/statistici"))[1]["cereri"] == 21
+        finally:
+            await client.inchide()
+            await serviciu.opreste()
+
+    asyncio.run(scenariu())
+
+
+def test_serviciu_store():
+    from store import ExpenseStore
+    test_serviciu(ExpenseStore)
+
+
+def test_serviciu_loturi():
+    async def scenariu():
+        serviciu = ServiciuCheltuieli({})
+        await serviciu.porneste()
+        try:
+            # Cererile puse în coadă înainte ca sarcina de scriere să ruleze sunt aplicate într-un singur lot
+            rezultate = await asyncio.gather(
+                *(serviciu.modifica("adauga", [(apartament, "apa", apartament, "2023-10-30")])
+                  for apartament in range(1, 51)),
+                serviciu.modifica("adauga", [(51, "apa", -1, "2023-10-30"), (51, "gaz", 1, "2023-10-30")]),
+                serviciu.modifica("modifica", [(1, "apa", 1, 100)]),
+                serviciu.modifica("sterge_interval", (40, 50)),
+                serviciu.modifica("adauga", [(40, "gaz", 5, "2023-10-30")]))
+            assert serviciu.statistici() == {"cereri": 0, "operatii": 54, "loturi": 1}
+            assert rezultate[50] == [(0, "Eroare: Suma cheltuielii nu poate fi negativă.")]
+            assert all(erori == [] for erori in rezultate[:50] + rezultate[51:])
+            assert sorted(serviciu.registru) == list(range(1, 41)) + [51]
+            assert serviciu.registru[1] == {"apa": [(100.0, "2023-10-30")]}
+            assert serviciu.registru[40] == {"gaz": [(5.0, "2023-10-30")]}
+        finally:
+            await serviciu.opreste()
+
+    asyncio.run(scenariu())
+
+
+def test_serviciu_exceptii():
+    from store import ExpenseStore
+
+    class DepozitFragil(ExpenseStore):
+        def adauga_cheltuieli_bulk(self, inregistrari):
+            inregistrari = list(inregistrari)
+            if any(inregistrare[0] == 13 for inregistrare in inregistrari):
+                raise RuntimeError("apartamentul 13")
+            return super().adauga_cheltuieli_bulk(inregistrari)
+
+    async def scenariu():
+        serviciu = ServiciuCheltuieli(DepozitFragil())
+        port = await serviciu.porneste()
+        client = await Client.conecteaza("127.0.0.1", port)
+        try:
+            # Cele trei cereri sunt unite într-un apel, dar excepția ajunge doar la cererea care a produs-o
+            rezultate = await asyncio.gather(
+                *(serviciu.modifica("adauga", [(apartament, "apa", 1, "2023-10-30")]) for apartament in (1, 13, 2)),
+                return_exceptions=True)
+            assert rezultate[0] == [] and rezultate[2] == [] and isinstance(rezultate[1], RuntimeError)
+            assert serviciu.statistici()["loturi"] == 1
+            assert serviciu.registru.ca_dictionar() == {1: {"apa": [(1.0, "2023-10-30")]},
+                                                        2: {"apa": [(1.0, "2023-10-30")]}}
+
+            stare, raspuns = await client.cere("POST", "/adauga_cheltuiala",
+                                               {"apartament": 13, "tip": "gaz", "suma": 1, "zi": "2023-10-30"})
+            assert stare == 500 and "RuntimeError" in raspuns["eroare"]
+            # Conexiunea rămâne deschisă după eroare
+            assert await client.cere("GET", "/calculeaza_total_cheltuieli?apartament=2") == (200, {"rezultat": 1.0})
+        finally:
+            await client.inchide()
+            await serviciu.opreste()
+
+    asyncio.run(scenariu())
+
+
+def test_serviciu_conexiuni_concurente():
+    async def client(port, apartament):
+        conexiune = await Client.conecteaza("127.0.0.1", port)
+        try:
+            for numar in range(10):
+                await conexiune.cere("POST", "/adauga_cheltuiala",
+                                     {"apartament": apartament, "tip": "gaz", "suma": numar + 1, "zi": "2023-10-30"})
+                await conexiune.cere("GET", f"/calculeaza_total_cheltuieli?apartament={apartament}")
+        finally:
+            await conexiune.inchide()
+
+    async def scenariu():
+        serviciu = ServiciuCheltuieli({})
+        port = await serviciu.porneste()
+        try:
+            await asyncio.gather(*(client(port, apartament) for apartament in range(1, 21)))
+            assert serviciu.statistici()["operatii"] == 200
+            assert all(bussines.calculeaza_total_cheltuieli(serviciu.registru, apartament) == 55
+                       for apartament in range(1, 21))
+        finally:
+            await serviciu.opreste()
+
+    asyncio.run(scenariu())
+
+
+if __name__ == "__main__":
+    test_serviciu()
+    test_serviciu_store()
+    test_serviciu_loturi()
+    test_serviciu_exceptii()
+    test_serviciu_conexiuni_concurente()
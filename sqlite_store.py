@@ -0,0 +1,663 @@
+"""
+Implementarea funcțiilor din bussines.py peste o bază de date SQLite locală.
+
+Ordinea registrului (apartamentele în ordinea adăugării, tipurile în ordinea apariției în fiecare apartament,
+cheltuielile în ordinea adăugării) este păstrată prin coloane de poziție, așa că rezultatele coincid cu cele
+ale dicționarului clasic.
+"""
+import os
+import shutil
+import sqlite3
+import tempfile
+from itertools import groupby
+from operator import itemgetter
+
+import store
+from indexuri import IndexVersiuni
+from bussines import (TIPURI_CHELTUIELI, validare_numar_apartament, validare_tip_cheltuiala, validare_suma,
+                      validare_inregistrare, validare_corectura, validare_grupare, parseaza_data,
+                      formateaza_cheltuiala_mai_mare, formateaza_cheltuieli_de_tip,
+                      formateaza_cheltuiala_inainte_de_o_zi, validare_perioada, validare_pas, formateaza_luna,
+                      validare_numar_rezultate)
+from store import _format_zi
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS apartamente (
+    apartament INTEGER PRIMARY KEY,
+    pozitie INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS grupuri (
+    apartament INTEGER NOT NULL,
+    tip TEXT NOT NULL,
+    pozitie INTEGER NOT NULL,
+    PRIMARY KEY (apartament, tip)
+);
+CREATE TABLE IF NOT EXISTS cheltuieli (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    apartament INTEGER NOT NULL,
+    tip TEXT NOT NULL,
+    suma REAL NOT NULL,
+    zi TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS cheltuieli_apartament ON cheltuieli (apartament);
+CREATE INDEX IF NOT EXISTS cheltuieli_tip ON cheltuieli (tip);
+CREATE INDEX IF NOT EXISTS cheltuieli_zi ON cheltuieli (zi);
+CREATE INDEX IF NOT EXISTS cheltuieli_tip_suma ON cheltuieli (tip, suma);
+"""
+
+# Interogările sunt texte constante, deci sqlite3 le pregătește o singură dată și le refolosește din cache
+SQL_APARTAMENT_NOU = "INSERT OR IGNORE INTO apartamente (apartament, pozitie) VALUES (?, ?)"
+SQL_GRUP_NOU = "INSERT OR IGNORE INTO grupuri (apartament, tip, pozitie) VALUES (?, ?, ?)"
+SQL_CHELTUIALA_NOUA = "INSERT INTO cheltuieli (apartament, tip, suma, zi) VALUES (?, ?, ?, ?)"
+SQL_EXISTA_APARTAMENT = "SELECT 1 FROM apartamente WHERE apartament = ?"
+SQL_EXISTA_GRUP = "SELECT 1 FROM grupuri WHERE apartament = ? AND tip = ?"
+SQL_CAUTA_SUMA = "SELECT id FROM cheltuieli WHERE tip = ? AND suma = ? AND apartament = ? ORDER BY id LIMIT 1"
+SQL_MODIFICA_SUMA = "UPDATE cheltuieli SET suma = ? WHERE id = ?"
+
+# Cheltuielile în ordinea registrului: apartament, apoi tip, apoi ordinea adăugării
+SQL_IN_ORDINE = """
+SELECT c.id, c.apartament, c.tip, c.suma, c.zi FROM cheltuieli c
+JOIN apartamente a ON a.apartament = c.apartament
+JOIN grupuri g ON g.apartament = c.apartament AND g.tip = c.tip
+{conditie}
+ORDER BY a.pozitie, g.pozitie, c.id
+"""
+
+
+class SqliteStore:
+    """
+    Registru de cheltuieli păstrat într-o bază de date SQLite (implicit în memorie).
+
+    Baza folosește jurnalul WAL, deci alte procese pot citi din ea cât timp registrul scrie. Metodele poartă
+    aceleași nume ca funcțiile din bussines.py, așa că un SqliteStore poate fi transmis acelor funcții în
+    locul dicționarului. Fiecare modificare rulează într-o singură tranzacție.
+
+    Versiunile (metoda versiune) sunt ținute în memorie și văd doar modificările făcute prin acest obiect.
+    """
+
+    def __init__(self, cale=":memory:"):
+        self.cale = cale
+        self._conexiune = sqlite3.connect(cale)
+        self._conexiune.execute("PRAGMA journal_mode=WAL")
+        self._conexiune.execute("PRAGMA synchronous=NORMAL")
+        self._conexiune.executescript(SCHEMA)
+        self._pozitie = self._conexiune.execute(
+            "SELECT MAX((SELECT COALESCE(MAX(pozitie), 0) FROM apartamente), "
+            "(SELECT COALESCE(MAX(pozitie), 0) FROM grupuri))").fetchone()[0] + 1
+        self._versiuni = IndexVersiuni()
+
+    def __len__(self):
+        return self._conexiune.execute("SELECT COUNT(*) FROM cheltuieli").fetchone()[0]
+
+    def _pozitie_noua(self):
+        self._pozitie += 1
+        return self._pozitie
+
+    def _exista(self, sql, *parametri):
+        return self._conexiune.execute(sql, parametri).fetchone() is not None
+
+    def _marcheaza(self, perechi):
+        """
+        Avansează versiunile apartamentelor și tipurilor din perechile (apartament, tip) date.
+        """
+        perechi = list(perechi)
+        self._versiuni.marcheaza([apartament for apartament, _ in perechi], [tip for _, tip in perechi])
+
+    def _in_ordine(self, conditie="", parametri=()):
+        return self._conexiune.execute(SQL_IN_ORDINE.format(conditie=conditie), parametri)
+
+    def _adauga(self, inregistrari):
+        """
+        Adaugă înregistrări deja validate (cu data normalizată), creând apartamentele și grupurile lipsă.
+
+        :return: Identificatorul cheltuielii, când se adaugă una singură.
+        """
+        grupuri_noi = {}
+        for apartament, tip, _, _ in inregistrari:
+            if (apartament, tip) not in grupuri_noi:
+                grupuri_noi[apartament, tip] = self._pozitie_noua()
+        if grupuri_noi:
+            self._marcheaza(grupuri_noi)
+
+        self._conexiune.executemany(SQL_APARTAMENT_NOU, ((apartament, pozitie)
+                                                         for (apartament, _), pozitie in grupuri_noi.items()))
+        self._conexiune.executemany(SQL_GRUP_NOU, ((apartament, tip, pozitie)
+                                                   for (apartament, tip), pozitie in grupuri_noi.items()))
+        if len(inregistrari) == 1:
+            return self._conexiune.execute(SQL_CHELTUIALA_NOUA, inregistrari[0]).lastrowid
+        self._conexiune.executemany(SQL_CHELTUIALA_NOUA, inregistrari)
+        return None
+
+    @staticmethod
+    def _valideaza(inregistrare):
+        apartament, tip, suma, zi = validare_inregistrare(inregistrare, zi_ordinala=True)
+        return apartament, tip, suma, _format_zi(zi)
+
+    def verifica_indexuri(self):
+        """
+        Verifică integritatea bazei de date (tabele și indexuri).
+
+        :raises: AssertionError dacă SQLite raportează o problemă.
+        """
+        rezultat = self._conexiune.execute("PRAGMA integrity_check").fetchall()
+        assert rezultat == [("ok",)], rezultat
+
+    @classmethod
+    def din_dictionar(cls, apartamente, cale=":memory:"):
+        """
+        Construiește un registru SQLite din dicționarul clasic {apartament: {tip: [(suma, zi)]}}.
+
+        :param apartamente: Dicționarul care conține datele despre apartamente.
+        :param cale: Fișierul bazei de date.
+        :return: SqliteStore cu aceleași cheltuieli, în aceeași ordine.
+        """
+        registru = cls(cale)
+        with registru._conexiune:
+            for apartament, cheltuieli in apartamente.items():
+                apartament = validare_numar_apartament(apartament)
+                registru._conexiune.execute(SQL_APARTAMENT_NOU, (apartament, registru._pozitie_noua()))
+                for tip, lista_cheltuieli in cheltuieli.items():
+                    tip = validare_tip_cheltuiala(tip)
+                    registru._conexiune.execute(SQL_GRUP_NOU, (apartament, tip, registru._pozitie_noua()))
+                    registru._conexiune.executemany(SQL_CHELTUIALA_NOUA, (registru._valideaza((apartament, tip,
+                                                                                                suma, zi))
+                                                                          for suma, zi in lista_cheltuieli))
+        return registru
+
+    def ca_dictionar(self):
+        """
+        Reconstruiește dicționarul clasic {apartament: {tip: [(suma, zi)]}}.
+
+        :return: Dicționarul care conține datele despre apartamente.
+        """
+        apartamente = {apartament: {} for (apartament,) in self._conexiune.execute(
+            "SELECT apartament FROM apartamente ORDER BY pozitie")}
+        for apartament, tip in self._conexiune.execute("SELECT apartament, tip FROM grupuri ORDER BY pozitie"):
+            apartamente[apartament][tip] = []
+        for _, apartament, tip, suma, zi in self._in_ordine():
+            apartamente[apartament][tip].append((suma, zi))
+        return apartamente
+
+    def inchide(self):
+        self._conexiune.close()
+
+    def adauga_cheltuiala(self, apartament, tip, suma, zi):
+        """
+        Adaugă o cheltuială în registru.
+
+        :return: Registrul (pentru compatibilitate cu bussines.adauga_cheltuiala).
+        """
+        inregistrare = self._valideaza((apartament, tip, suma, zi))
+        with self._conexiune:
+            self._adauga([inregistrare])
+        return self
+
+    def adauga_cheltuieli_bulk(self, inregistrari):
+        """
+        Adaugă mai multe cheltuieli cu un singur executemany, într-o singură tranzacție.
+
+        :param inregistrari: Iterabil de tupluri (apartament, tip, suma, zi).
+        :return: Tuplu (registru, erori), unde erori este lista de (poziție, mesaj).
+        """
+        valide = []
+        erori = []
+        for pozitie, inregistrare in enumerate(inregistrari):
+            try:
+                valide.append(self._valideaza(inregistrare))
+            except ValueError as e:
+                erori.append((pozitie, str(e)))
+
+        with self._conexiune:
+            self._adauga(valide)
+        return self, erori
+
+    def itereaza_cheltuieli(self):
+        """
+        Parcurge cheltuielile în ordinea registrului, direct din cursor.
+
+        :return: Generator de tupluri (apartament, tip, suma, zi).
+        """
+        for _, apartament, tip, suma, zi in self._in_ordine():
+            yield apartament, tip, suma, zi
+
+    def adauga_cheltuiala_id(self, apartament, tip, suma, zi):
+        """
+        Adaugă o cheltuială și întoarce identificatorul ei (cheia primară, care nu este refolosită).
+
+        :return: Identificatorul cheltuielii (int).
+        """
+        inregistrare = self._valideaza((apartament, tip, suma, zi))
+        with self._conexiune:
+            return self._adauga([inregistrare])
+
+    def cheltuiala(self, id_cheltuiala):
+        """
+        :param id_cheltuiala: Identificatorul cheltuielii.
+        :return: Tuplu (apartament, tip, suma, zi).
+        :raises: ValueError dacă cheltuiala nu există.
+        """
+        rand = None
+        if isinstance(id_cheltuiala, int):
+            rand = self._conexiune.execute("SELECT apartament, tip, suma, zi FROM cheltuieli WHERE id = ?",
+                                           (id_cheltuiala,)).fetchone()
+        if rand is None:
+            raise ValueError("Eroare: Cheltuiala nu există în înregistrări.")
+        return rand
+
+    def id_cheltuieli(self, apartament, tip):
+        """
+        :return: Identificatorii cheltuielilor unui apartament de un anumit tip, în ordinea listei.
+        """
+        return [id_cheltuiala for (id_cheltuiala,) in self._conexiune.execute(
+            "SELECT id FROM cheltuieli WHERE apartament = ? AND tip = ? ORDER BY id", (apartament, tip))]
+
+    def modifica_cheltuiala_id(self, id_cheltuiala, suma_noua):
+        """
+        Modifică suma unei cheltuieli identificate direct.
+
+        :raises: ValueError dacă cheltuiala nu există sau suma nu este validă.
+        """
+        suma_noua = validare_suma(suma_noua)
+        apartament, tip, _, _ = self.cheltuiala(id_cheltuiala)
+        with self._conexiune:
+            self._conexiune.execute(SQL_MODIFICA_SUMA, (suma_noua, id_cheltuiala))
+        self._marcheaza([(apartament, tip)])
+        return self
+
+    def sterge_cheltuiala_id(self, id_cheltuiala):
+        """
+        Șterge o cheltuială identificată direct; lista ei rămâne în registru chiar dacă se golește.
+
+        :raises: ValueError dacă cheltuiala nu există.
+        """
+        apartament, tip, _, _ = self.cheltuiala(id_cheltuiala)
+        with self._conexiune:
+            self._conexiune.execute("DELETE FROM cheltuieli WHERE id = ?", (id_cheltuiala,))
+        self._marcheaza([(apartament, tip)])
+        return self
+
+    def modifica_cheltuieli_id(self, actualizari):
+        """
+        Aplică mai multe corecturi date prin identificator, într-o singură tranzacție.
+
+        :param actualizari: Iterabil de tupluri (id_cheltuiala, suma_noua).
+        :return: Tuplu (registru, erori), unde erori este lista de (poziție, mesaj).
+        """
+        erori = []
+        with self._conexiune:
+            for pozitie, (id_cheltuiala, suma_noua) in enumerate(actualizari):
+                try:
+                    suma_noua = validare_suma(suma_noua)
+                    apartament, tip, _, _ = self.cheltuiala(id_cheltuiala)
+                except ValueError as e:
+                    erori.append((pozitie, str(e)))
+                    continue
+                self._conexiune.execute(SQL_MODIFICA_SUMA, (suma_noua, id_cheltuiala))
+                self._marcheaza([(apartament, tip)])
+        return self, erori
+
+    def _modifica(self, apartament, tip, suma_veche, suma_noua):
+        """
+        Modifică prima cheltuială cu suma veche, căutată prin indexul (tip, suma); nu deschide tranzacții.
+        """
+        if not self._exista(SQL_EXISTA_GRUP, apartament, tip):
+            return
+
+        rand = self._conexiune.execute(SQL_CAUTA_SUMA, (tip, suma_veche, apartament)).fetchone()
+        if rand is None:
+            raise ValueError('Eroare: Suma veche nu a fost găsită')
+        self._conexiune.execute(SQL_MODIFICA_SUMA, (suma_noua, rand[0]))
+        self._marcheaza([(apartament, tip)])
+
+    def modifica_cheltuiala(self, apartament, tip, suma_veche, suma_noua):
+        """
+        Modifică prima cheltuială cu suma veche dată.
+
+        :raises: ValueError dacă suma veche nu este găsită.
+        """
+        actualizare = validare_corectura((apartament, tip, suma_veche, suma_noua))
+        with self._conexiune:
+            self._modifica(*actualizare)
+        return self
+
+    def modifica_cheltuieli(self, actualizari):
+        """
+        Aplică mai multe corecturi (apartament, tip, suma_veche, suma_noua), în ordine, într-o singură tranzacție.
+
+        :return: Tuplu (registru, erori), unde erori este lista de (poziție, mesaj).
+        """
+        erori = []
+        with self._conexiune:
+            for pozitie, actualizare in enumerate(actualizari):
+                try:
+                    self._modifica(*validare_corectura(actualizare))
+                except ValueError as e:
+                    erori.append((pozitie, str(e)))
+        return self, erori
+
+    def sterge_apartament(self, apartament):
+        """
+        Șterge un apartament cu toate cheltuielile lui.
+
+        :raises: ValueError dacă apartamentul nu există.
+        """
+        apartament = validare_numar_apartament(apartament)
+
+        if not self._exista(SQL_EXISTA_APARTAMENT, apartament):
+            raise ValueError('Eroare: Apartamentul nu există în înregistrări.')
+
+        return self.sterge_apartamente_consecutive(apartament, apartament)
+
+    def sterge_apartamente_consecutive(self, apartament_start, apartament_end):
+        """
+        Șterge apartamentele din intervalul [apartament_start, apartament_end] prin interogări pe interval.
+        """
+        interval = (validare_numar_apartament(apartament_start), validare_numar_apartament(apartament_end))
+
+        with self._conexiune:
+            self._versiuni.marcheaza(
+                [apartament for (apartament,) in self._conexiune.execute(
+                    "SELECT apartament FROM apartamente WHERE apartament BETWEEN ? AND ?", interval)],
+                [tip for (tip,) in self._conexiune.execute(
+                    "SELECT DISTINCT tip FROM grupuri WHERE apartament BETWEEN ? AND ?", interval)])
+            for tabel in ("cheltuieli", "grupuri", "apartamente"):
+                self._conexiune.execute(f"DELETE FROM {tabel} WHERE apartament BETWEEN ? AND ?", interval)
+        return self
+
+    def sterge_cheltuieli_tip(self, tip):
+        """
+        Șterge cheltuielile de un anumit tip din toate apartamentele.
+        """
+        tip = validare_tip_cheltuiala(tip)
+
+        with self._conexiune:
+            self._marcheaza(self._conexiune.execute("SELECT apartament, tip FROM grupuri WHERE tip = ?", (tip,)))
+            self._conexiune.execute("DELETE FROM cheltuieli WHERE tip = ?", (tip,))
+            self._conexiune.execute("DELETE FROM grupuri WHERE tip = ?", (tip,))
+        return self
+
+    def elimina_cheltuiala(self, tip):
+        """
+        Elimină cheltuielile de un anumit tip din toate apartamentele.
+        """
+        return self.sterge_cheltuieli_tip(tip)
+
+    def elimina_cheltuieli_mai_mici_decat(self, suma_minima):
+        """
+        Elimină cheltuielile mai mici decât suma minimă; listele golite rămân în registru.
+        """
+        suma_minima = validare_suma(suma_minima)
+        with self._conexiune:
+            self._marcheaza(self._conexiune.execute(
+                "SELECT DISTINCT apartament, tip FROM cheltuieli WHERE suma < ?", (suma_minima,)))
+            self._conexiune.executemany("DELETE FROM cheltuieli WHERE tip = ? AND suma < ?",
+                                        ((tip, suma_minima) for tip in TIPURI_CHELTUIELI))
+        return self
+
+    def _pozitie_de_la(self, de_la):
+        """
+        :return: Poziția apartamentului de la care continuă un raport (0 pentru de_la None).
+        :raises: ValueError dacă apartamentul nu (mai) există.
+        """
+        if de_la is None:
+            return 0
+        rand = self._conexiune.execute("SELECT pozitie FROM apartamente WHERE apartament = ?", (de_la,)).fetchone()
+        if rand is None:
+            raise ValueError("Eroare: Apartamentul de la care continuă raportul nu mai există în registru.")
+        return rand[0]
+
+    def cheltuieli_mai_mari_decat(self, suma, de_la=None):
+        """
+        Cheltuielile mai mari decât o sumă, în ordinea registrului, citite din cursor pe măsură ce sunt cerute.
+        """
+        suma = validare_suma(suma)
+        cursor = self._in_ordine("WHERE c.suma > ? AND a.pozitie >= ?", (suma, self._pozitie_de_la(de_la)))
+        return ((apartament, tip, suma_cheltuiala) for _, apartament, tip, suma_cheltuiala, _ in cursor)
+
+    def cheltuieli_de_tip(self, tip, de_la=None):
+        """
+        Apartamentele care au un tip, cu lista cheltuielilor lor (goală pentru listele golite).
+        """
+        tip = validare_tip_cheltuiala(tip)
+        cursor = self._conexiune.execute(
+            "SELECT g.apartament, c.suma, c.zi FROM grupuri g JOIN apartamente a ON a.apartament = g.apartament "
+            "LEFT JOIN cheltuieli c ON c.apartament = g.apartament AND c.tip = g.tip "
+            "WHERE g.tip = ? AND a.pozitie >= ? ORDER BY a.pozitie, c.id", (tip, self._pozitie_de_la(de_la)))
+        return ((apartament, tip, [(suma, zi) for _, suma, zi in randuri if suma is not None])
+                for apartament, randuri in groupby(cursor, key=itemgetter(0)))
+
+    def cheltuieli_inainte_de_o_zi(self, suma, zi, de_la=None):
+        """
+        Cheltuielile efectuate înainte de o zi și mai mari decât o sumă, pe apartamente.
+
+        Datele sunt păstrate normalizate (yyyy-mm-dd), deci comparația pe text folosește indexul pe zi.
+        """
+        suma = validare_suma(suma)
+        limita = _format_zi(parseaza_data(zi))
+        return self._conexiune.execute(
+            "SELECT a.apartament, c.tip FROM apartamente a "
+            "LEFT JOIN cheltuieli c ON c.apartament = a.apartament AND c.zi < ? AND c.suma > ? "
+            "LEFT JOIN grupuri g ON g.apartament = c.apartament AND g.tip = c.tip "
+            "WHERE a.pozitie >= ? ORDER BY a.pozitie, g.pozitie, c.id", (limita, suma, self._pozitie_de_la(de_la)))
+
+    def afiseaza_apartamente_cu_cheltuieli_mai_mari_decat(self, suma):
+        """
+        Returnează cheltuielile mai mari decât o anumită sumă, în ordinea registrului.
+        """
+        suma = validare_suma(suma)
+        rezultat = [formateaza_cheltuiala_mai_mare(*rand) for rand in self.cheltuieli_mai_mari_decat(suma)]
+
+        if not rezultat:
+            print(f"Nicio cheltuială depășește suma {suma}.")
+
+        return rezultat
+
+    def afiseaza_cheltuieli_tip(self, tip):
+        """
+        Returnează cheltuielile de un anumit tip pentru toate apartamentele care au acest tip.
+        """
+        return [formateaza_cheltuieli_de_tip(*rand) for rand in self.cheltuieli_de_tip(tip)]
+
+    def afiseaza_cheltuieli_inainte_de_o_zi(self, suma, zi):
+        """
+        Returnează cheltuielile efectuate înainte de o zi și mai mari decât o sumă, pe apartamente.
+        """
+        return [formateaza_cheltuiala_inainte_de_o_zi(apartament, tip, suma, zi)
+                for apartament, tip in self.cheltuieli_inainte_de_o_zi(suma, zi)]
+
+    def tipareste_apartamente_sortate_dupa_tip(self, tip):
+        """
+        Returnează cheltuielile de un anumit tip sortate după valoare sau None dacă nu există.
+
+        La sume egale se păstrează ordinea din registru.
+        """
+        try:
+            tip = validare_tip_cheltuiala(tip)
+        except ValueError as e:
+            print(e)
+            return None
+
+        cheltuieli = self._conexiune.execute(
+            "SELECT c.suma, c.zi FROM cheltuieli c JOIN apartamente a ON a.apartament = c.apartament "
+            "WHERE c.tip = ? ORDER BY c.suma, a.pozitie, c.id", (tip,)).fetchall()
+        return cheltuieli or None
+
+    def top_k(self, tip=None, apartament=None, k=10):
+        """
+        Cele mai mari k cheltuieli, ca tupluri (apartament, tip, suma, zi); la sume egale se păstrează ordinea
+        din registru. Cu un tip, LIMIT oprește parcurgerea indexului (tip, suma) după primele k rânduri.
+        """
+        conditii, parametri = [], []
+        if tip is not None:
+            conditii.append("c.tip = ?")
+            parametri.append(validare_tip_cheltuiala(tip))
+        if apartament is not None:
+            conditii.append("c.apartament = ?")
+            parametri.append(validare_numar_apartament(apartament))
+        parametri.append(validare_numar_rezultate(k))
+        conditie = "WHERE " + " AND ".join(conditii) if conditii else ""
+        return self._conexiune.execute(
+            "SELECT c.apartament, c.tip, c.suma, c.zi FROM cheltuieli c "
+            "JOIN apartamente a ON a.apartament = c.apartament "
+            "JOIN grupuri g ON g.apartament = c.apartament AND g.tip = c.tip "
+            f"{conditie} ORDER BY c.suma DESC, a.pozitie, g.pozitie, c.id LIMIT ?", parametri).fetchall()
+
+    def suma_cheltuieli_tip(self, tip):
+        """
+        Calculează suma cheltuielilor de un anumit tip.
+        """
+        tip = validare_tip_cheltuiala(tip)
+        return self._conexiune.execute("SELECT COALESCE(SUM(suma), 0) FROM cheltuieli WHERE tip = ?",
+                                       (tip,)).fetchone()[0]
+
+    def calculeaza_total_cheltuieli(self, numar_apartament):
+        """
+        Calculează totalul cheltuielilor unui apartament sau None dacă apartamentul nu există.
+        """
+        numar_apartament = validare_numar_apartament(numar_apartament)
+
+        if not self._exista(SQL_EXISTA_APARTAMENT, numar_apartament):
+            return None
+
+        return self._conexiune.execute("SELECT COALESCE(SUM(suma), 0) FROM cheltuieli WHERE apartament = ?",
+                                       (numar_apartament,)).fetchone()[0]
+
+    def totaluri_interval(self, apartament_start, apartament_end, tip=None):
+        """
+        Totalul și numărul cheltuielilor apartamentelor din intervalul [apartament_start, apartament_end],
+        calculate printr-o căutare pe interval în indexul pe apartament.
+
+        :return: Tuplu (suma, număr de cheltuieli).
+        """
+        parametri = [validare_numar_apartament(apartament_start), validare_numar_apartament(apartament_end)]
+        conditie = ""
+        if tip is not None:
+            parametri.append(validare_tip_cheltuiala(tip))
+            conditie = " AND tip = ?"
+        suma, numar = self._conexiune.execute("SELECT COALESCE(SUM(suma), 0.0), COUNT(*) FROM cheltuieli "
+                                              "WHERE apartament BETWEEN ? AND ?" + conditie, parametri).fetchone()
+        return suma, numar
+
+    @staticmethod
+    def _conditii_perioada(apartament_start, apartament_end, luna_start, luna_end, tip):
+        """
+        Condiția WHERE și parametrii pentru un interval de apartamente într-o perioadă de luni. Datele sunt
+        păstrate ca yyyy-mm-dd, deci perioada devine un interval de șiruri pe indexul pe zi.
+        """
+        parametri = [validare_numar_apartament(apartament_start), validare_numar_apartament(apartament_end)]
+        inceput, sfarsit = validare_perioada(luna_start, luna_end)
+        # Ziua '32' trece de orice dată din ultima lună, dar rămâne înaintea lunii următoare
+        parametri += [formateaza_luna(inceput), formateaza_luna(sfarsit) + "-32"]
+        conditie = "apartament BETWEEN ? AND ? AND zi >= ? AND zi < ?"
+        if tip is not None:
+            parametri.append(validare_tip_cheltuiala(tip))
+            conditie += " AND tip = ?"
+        return conditie, parametri
+
+    def totaluri_perioada(self, apartament_start, apartament_end, luna_start=None, luna_end=None, tip=None):
+        """
+        Totalul și numărul cheltuielilor unui interval de apartamente într-o perioadă de luni.
+
+        :return: Tuplu (suma, număr de cheltuieli).
+        """
+        conditie, parametri = self._conditii_perioada(apartament_start, apartament_end, luna_start, luna_end, tip)
+        suma, numar = self._conexiune.execute("SELECT COALESCE(SUM(suma), 0.0), COUNT(*) FROM cheltuieli "
+                                              "WHERE " + conditie, parametri).fetchone()
+        return suma, numar
+
+    def totaluri_pe_perioade(self, apartament_start, apartament_end, luna_start=None, luna_end=None, tip=None,
+                             pas="luna"):
+        """
+        Totalurile unui interval de apartamente pe fiecare lună sau an, printr-un GROUP BY pe prefixul datei.
+
+        :return: Dicționar {perioadă: sumă}, ordonat crescător.
+        """
+        conditie, parametri = self._conditii_perioada(apartament_start, apartament_end, luna_start, luna_end, tip)
+        lungime = 4 if validare_pas(pas) == "an" else 7
+        return dict(self._conexiune.execute(
+            f"SELECT substr(zi, 1, {lungime}) AS perioada, SUM(suma) FROM cheltuieli WHERE {conditie} "
+            "GROUP BY perioada ORDER BY perioada", parametri))
+
+    def versiune(self, apartament=None, tip=None):
+        """
+        Versiunea datelor unui apartament și/sau tip; se schimbă la fiecare modificare care le atinge.
+
+        :return: Versiunea (int); fără argumente, versiunea întregului registru.
+        :raises: ValueError dacă tipul nu este valid.
+        """
+        if tip is not None:
+            tip = validare_tip_cheltuiala(tip)
+        return self._versiuni.versiune(apartament, tip)
+
+    def group_by(self, cheie, agregare="sum"):
+        """
+        Grupează cheltuielile după apartament, tip sau lună (yyyy-mm) și le agregă printr-un GROUP BY.
+
+        :param cheie: Cheia de grupare ('apartament', 'tip' sau 'luna').
+        :param agregare: Agregarea ('sum', 'count', 'mean' sau 'max').
+        :return: Dicționar {cheie: valoare}, ordonat crescător după cheie.
+        :raises: ValueError dacă cheia sau agregarea nu sunt valide.
+        """
+        cheie, agregare = validare_grupare(cheie, agregare)
+
+        coloana = "substr(zi, 1, 7)" if cheie == "luna" else cheie
+        functie = {"sum": "SUM", "count": "COUNT", "mean": "AVG", "max": "MAX"}[agregare]
+        return dict(self._conexiune.execute(
+            f"SELECT {coloana} AS cheie, {functie}(suma) FROM cheltuieli GROUP BY cheie ORDER BY cheie"))
+
+
+def test_paritate_sqlite():
+    store.test_paritate_cu_dictionarul(depozit=SqliteStore)
+    store.test_group_by_store(depozit=SqliteStore)
+    store.test_adauga_cheltuiala_store(depozit=SqliteStore)
+    store.test_cheltuieli_dupa_id(depozit=SqliteStore)
+    store.test_versiuni(depozit=SqliteStore)
+
+
+def test_mutatii_amestecate_sqlite():
+    store.test_mutatii_amestecate(depozit=SqliteStore)
+
+
+def test_elimina_suma_invalida_sqlite():
+    registru = SqliteStore.din_dictionar(store._registru_exemplu())
+    # Un șir ar fi comparat ca text și mai mare decât orice număr, deci ar șterge toate cheltuielile
+    for suma in ("abc", "nan", -1):
+        try:
+            registru.elimina_cheltuieli_mai_mici_decat(suma)
+            assert False
+        except ValueError:
+            assert True
+    assert registru.ca_dictionar() == store._registru_exemplu()
+    registru.inchide()
+
+
+def test_sqlite_pe_disc():
+    director = tempfile.mkdtemp()
+    try:
+        cale = os.path.join(director, "cheltuieli.sqlite")
+        registru = SqliteStore.din_dictionar(store._registru_exemplu(), cale=cale)
+        registru.sterge_apartament(5)
+        registru.adauga_cheltuiala(5, "gaz", 10, "2023-1-2")
+        registru.inchide()
+
+        redeschis = SqliteStore(cale)
+        asteptat = store._registru_exemplu()
+        del asteptat[5]
+        asteptat[5] = {"gaz": [(10.0, "2023-01-02")]}
+        assert redeschis.ca_dictionar() == asteptat
+        assert redeschis.afiseaza_cheltuieli_inainte_de_o_zi(0, "2023-01-03")[-1] == \
+            "Apartament 5: Cheltuiala gaz efectuată înainte de 2023-01-03 și mai mare decât 0."
+
+        # Un apartament nou ajunge după cele existente
+        redeschis.adauga_cheltuiala(3, "apa", 1, "2023-01-01")
+        assert list(redeschis.ca_dictionar()) == [1, 2, 5, 3]
+        redeschis.inchide()
+    finally:
+        shutil.rmtree(director)
+
+
+if __name__ == "__main__":
+    test_paritate_sqlite()
+    test_mutatii_amestecate_sqlite()
+    test_elimina_suma_invalida_sqlite()
+    test_sqlite_pe_disc()
@@ -0,0 +1,1321 @@
+import copy
+import gc
+import heapq
+import math
+import random
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import date
+from functools import lru_cache
+from itertools import compress, count, dropwhile
+
+import bussines
+from bussines import (TIPURI_CHELTUIELI, validare_numar_apartament, validare_tip_cheltuiala, validare_suma,
+                      validare_inregistrare, validare_corectura, validare_grupare, agrega, parseaza_data,
+                      formateaza_cheltuiala_mai_mare, formateaza_cheltuieli_de_tip,
+                      formateaza_cheltuiala_inainte_de_o_zi, validare_perioada, validare_pas, formateaza_luna,
+                      validare_numar_rezultate)
+from indexuri import (IndexTip, IndexApartamente, IndexZi, IndexSume, IndexMaxime, IndexTotaluri, IndexLuni,
+                      IndexVersiuni)
+
+try:
+    import numpy
+except ImportError:  # NumPy este opțional: fără el, reducerile rulează direct peste coloanele array
+    numpy = None
+
+COD_TIP = {tip: cod for cod, tip in enumerate(TIPURI_CHELTUIELI)}
+COLOANE = (("apartament", "i"), ("tip", "B"), ("suma", "d"), ("zi", "i"), ("activ", "B"))
+# Numerele apartamentelor sunt ținute într-o coloană array("i"), deci trebuie să încapă pe 32 de biți
+APARTAMENT_MINIM, APARTAMENT_MAXIM = -2 ** 31, 2 ** 31 - 1
+# Rapoartele pe apartamente folosesc un index doar dacă selectează cel mult 1/PRAG_SELECTIVITATE din rânduri
+PRAG_SELECTIVITATE = 8
+
+
+def validare_apartament_coloana(apartament):
+    """
+    Validează numărul unui apartament care urmează să fie scris în coloana de apartamente.
+
+    :param apartament: Numărul apartamentului.
+    :return: Numărul validat.
+    :raises: ValueError dacă nu este un număr întreg sau nu încape în coloană.
+    """
+    apartament = validare_numar_apartament(apartament)
+    if not APARTAMENT_MINIM <= apartament <= APARTAMENT_MAXIM:
+        raise ValueError(f"Eroare: Numărul apartamentului trebuie să fie între {APARTAMENT_MINIM} și "
+                         f"{APARTAMENT_MAXIM}.")
+    return apartament
+
+
+def _validare_inregistrare(inregistrare):
+    """
+    validare_inregistrare cu ziua ordinală și cu limitele coloanei de apartamente.
+    """
+    apartament, tip, suma, zi = validare_inregistrare(inregistrare, zi_ordinala=True)
+    return validare_apartament_coloana(apartament), tip, suma, zi
+
+
+@contextmanager
+def fara_colector_ciclic():
+    """
+    Oprește colectorul ciclic pe durata unei operații în bloc. Adăugările mari creează milioane de obiecte
+    fără cicluri, iar colectorul ar parcurge de fiecare dată tot registrul deja construit.
+    """
+    colector_activ = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if colector_activ:
+            gc.enable()
+
+
+@lru_cache(maxsize=4096)
+def _luna(ordinal):
+    """
+    Returnează luna (yyyy-mm) a unei zile ordinale.
+
+    :param ordinal: Ziua ordinală.
+    :return: Luna ca șir de caractere.
+    """
+    return _format_zi(ordinal)[:7]
+
+
+@lru_cache(maxsize=4096)
+def _format_zi(ordinal):
+    """
+    Transformă o zi ordinală înapoi în formatul yyyy-mm-dd.
+
+    :param ordinal: Ziua ordinală.
+    :return: Data ca șir de caractere.
+    """
+    return date.fromordinal(ordinal).isoformat()
+
+
+class ExpenseStore:
+    """
+    Depozit columnar de cheltuieli.
+
+    Fiecare cheltuială este un rând în patru coloane `array` tipizate: apartament (int32), cod tip (uint8),
+    suma (float64) și ziua ordinală (int32). Rândurile șterse sunt doar marcate inactive, deci numărul unui
+    rând nu se schimbă pe durata depozitului. Ordinea apartamentelor și a tipurilor este păstrată într-un
+    index apartament -> cod tip -> rânduri, la fel ca în dicționarul clasic.
+
+    Metodele poartă aceleași nume ca funcțiile din bussines.py (fără parametrul `apartamente`), așa că
+    un ExpenseStore poate fi transmis acelor funcții în locul dicționarului.
+    """
+
+    def __init__(self):
+        self._apartament = array("i")
+        self._tip = array("B")
+        self._suma = array("d")
+        self._zi = array("i")
+        self._activ = array("B")
+        self._grupuri = {}
+        self._numar_active = 0
+        # Poziția fiecărui apartament în ordinea registrului, pentru a ordona rezultatele venite din indexuri
+        self._pozitie = {}
+        self._pozitii = count()
+        self._index_tip = IndexTip()
+        self._index_apartamente = IndexApartamente()
+        self._index_zi = IndexZi()
+        self._index_sume = IndexSume()
+        self._index_maxime = IndexMaxime()
+        self._index_totaluri = IndexTotaluri()
+        self._index_luni = IndexLuni()
+        self._index_versiuni = IndexVersiuni()
+        self._indexuri = [self._index_tip, self._index_apartamente, self._index_zi, self._index_sume,
+                          self._index_maxime, self._index_totaluri, self._index_luni, self._index_versiuni]
+
+    def __len__(self):
+        return self._numar_active
+
+    def _notifica(self, eveniment, *args, sari_peste=None):
+        for index in self._indexuri:
+            if index is not sari_peste:
+                getattr(index, eveniment)(self, *args)
+
+    def _apartament_nou(self, apartament):
+        self._pozitie[apartament] = next(self._pozitii)
+        cheltuieli = self._grupuri[apartament] = {}
+        self._notifica("apartament_nou", apartament)
+        return cheltuieli
+
+    def _grup(self, apartament, cod):
+        cheltuieli = self._grupuri.get(apartament)
+        if cheltuieli is None:
+            cheltuieli = self._apartament_nou(apartament)
+
+        randuri = cheltuieli.get(cod)
+        if randuri is None:
+            randuri = cheltuieli[cod] = array("q")
+            self._notifica("grup_nou", apartament, cod)
+        return randuri
+
+    def _adauga_rand(self, apartament, cod, suma, zi):
+        rand = len(self._suma)
+        self._apartament.append(apartament)
+        self._tip.append(cod)
+        self._suma.append(suma)
+        self._zi.append(zi)
+        self._activ.append(1)
+        self._grup(apartament, cod).append(rand)
+        self._numar_active += 1
+        self._notifica("randuri_noi", (rand,))
+        return rand
+
+    def _dezactiveaza(self, randuri, sari_peste=None):
+        for rand in randuri:
+            self._activ[rand] = 0
+        self._numar_active -= len(randuri)
+        if randuri:
+            self._notifica("randuri_sterse", randuri, sari_peste=sari_peste)
+
+    def _modifica_suma(self, rand, suma):
+        suma_veche = self._suma[rand]
+        self._suma[rand] = suma
+        self._notifica("suma_modificata", rand, suma_veche)
+
+    def _sterge_grupuri(self, grupuri):
+        """
+        Scoate listele (apartament, cod tip) date; rândurile lor sunt dezactivate într-un singur lot, așa că
+        indexurile sortate sunt rescrise o singură dată, nu o dată pentru fiecare listă.
+        """
+        randuri = array("q")
+        for apartament, cod in grupuri:
+            randuri.extend(self._grupuri[apartament].pop(cod))
+        with fara_colector_ciclic():
+            self._dezactiveaza(randuri)
+            for apartament, cod in grupuri:
+                self._notifica("grup_sters", apartament, cod)
+
+    def _sterge_apartamente(self, apartamente):
+        with fara_colector_ciclic():
+            self._sterge_grupuri([(apartament, cod) for apartament in apartamente
+                                  for cod in self._grupuri[apartament]])
+            for apartament in apartamente:
+                del self._grupuri[apartament]
+                del self._pozitie[apartament]
+            if apartamente:
+                self._notifica("apartamente_sterse", apartamente)
+
+    def _apartamente_cu_tip(self, cod):
+        """
+        Apartamentele care au cheltuieli de un tip, luate din index și puse în ordinea registrului.
+        """
+        return sorted(self._index_tip.apartamente(cod), key=self._pozitie.__getitem__)
+
+    def verifica_indexuri(self):
+        """
+        Verifică toate indexurile față de o reconstruire completă din coloane.
+
+        :raises: AssertionError dacă un index nu mai corespunde datelor.
+        """
+        assert set(self._pozitie) == set(self._grupuri), "Pozițiile apartamentelor nu corespund registrului."
+        pozitii = [self._pozitie[apartament] for apartament in self._grupuri]
+        assert pozitii == sorted(pozitii), "Ordinea apartamentelor nu corespunde pozițiilor."
+        assert self._numar_active == sum(self._activ), "Numărul de rânduri active este greșit."
+        for index in self._indexuri:
+            index.verifica(self)
+
+    def _cheltuieli(self, randuri):
+        return [(self._suma[rand], _format_zi(self._zi[rand])) for rand in randuri]
+
+    @staticmethod
+    def _vector(coloana):
+        return numpy.frombuffer(coloana, dtype=coloana.typecode)
+
+    def _selecteaza(self, cod=None):
+        """
+        Selectează rândurile active, opțional doar cele de un anumit tip.
+
+        Cu NumPy selecția este o mască booleană calculată pe coloane întregi; fără NumPy coloanele
+        sunt parcurse o singură dată, fără a trece prin indexul pe apartamente.
+
+        :param cod: Codul tipului cerut sau None.
+        :return: Lista rândurilor selectate, în ordine crescătoare.
+        """
+        if numpy is not None and len(self._activ):
+            masca = self._vector(self._activ) == 1
+            if cod is not None:
+                masca &= self._vector(self._tip) == cod
+            return numpy.flatnonzero(masca).tolist()
+
+        randuri = compress(range(len(self._activ)), self._activ)
+        if cod is None:
+            return list(randuri)
+        tipuri = self._tip
+        return [rand for rand in randuri if tipuri[rand] == cod]
+
+    def _pe_apartamente(self, randuri):
+        """
+        Grupează rândurile selectate pe apartamente, în ordinea tipurilor din fiecare apartament.
+
+        :param randuri: Rândurile selectate, în ordine crescătoare.
+        :return: Dicționar apartament -> rânduri.
+        """
+        pe_apartament = {}
+        for rand in randuri:
+            pe_apartament.setdefault(self._apartament[rand], []).append(rand)
+
+        for apartament, randuri_apartament in pe_apartament.items():
+            ordine = {cod: pozitie for pozitie, cod in enumerate(self._grupuri[apartament])}
+            randuri_apartament.sort(key=lambda rand: ordine[self._tip[rand]])
+        return pe_apartament
+
+    def exporta_stare(self):
+        """
+        Starea completă a depozitului: copii ale coloanelor (inclusiv rândurile șterse) și grupurile în ordinea
+        registrului. Spre deosebire de ca_dictionar, din această stare se reface un depozit cu aceiași
+        identificatori de cheltuieli.
+
+        :return: Dicționar {"coloane": {nume: array}, "grupuri": [(apartament, [(cod, array de rânduri)])]}.
+        """
+        return {"coloane": {nume: getattr(self, "_" + nume)[:] for nume, _ in COLOANE},
+                "grupuri": [(apartament, [(cod, randuri[:]) for cod, randuri in cheltuieli.items()])
+                            for apartament, cheltuieli in self._grupuri.items()]}
+
+    @classmethod
+    def din_stare(cls, stare):
+        """
+        Reface un depozit dintr-o stare produsă de exporta_stare și reconstruiește indexurile.
+
+        :param stare: Starea depozitului (coloanele pot fi array-uri sau liste).
+        :return: ExpenseStore.
+        """
+        store = cls()
+        for nume, tip_coloana in COLOANE:
+            setattr(store, "_" + nume, array(tip_coloana, stare["coloane"][nume]))
+
+        with fara_colector_ciclic():
+            for apartament, grupuri in stare["grupuri"]:
+                store._apartament_nou(apartament)
+                for cod, randuri in grupuri:
+                    store._grupuri[apartament][cod] = array("q", randuri)
+                    store._notifica("grup_nou", apartament, cod)
+
+            active = list(compress(range(len(store._activ)), store._activ))
+            store._numar_active = len(active)
+            store._notifica("randuri_noi", active)
+        return store
+
+    @classmethod
+    def din_dictionar(cls, apartamente):
+        """
+        Construiește un depozit din dicționarul clasic {apartament: {tip: [(suma, zi)]}}.
+
+        :param apartamente: Dicționarul care conține datele despre apartamente.
+        :return: ExpenseStore cu aceleași cheltuieli, în aceeași ordine.
+        """
+        store = cls()
+        for apartament, cheltuieli in apartamente.items():
+            apartament = validare_apartament_coloana(apartament)
+            if apartament not in store._grupuri:
+                store._apartament_nou(apartament)
+            for tip, lista_cheltuieli in cheltuieli.items():
+                cod = COD_TIP[validare_tip_cheltuiala(tip)]
+                store._grup(apartament, cod)
+                for suma, zi in lista_cheltuieli:
+                    store._adauga_rand(apartament, cod, validare_suma(suma), parseaza_data(zi))
+        return store
+
+    def ca_dictionar(self):
+        """
+        Reconstruiește dicționarul clasic {apartament: {tip: [(suma, zi)]}}.
+
+        :return: Dicționarul care conține datele despre apartamente.
+        """
+        return {apartament: {TIPURI_CHELTUIELI[cod]: self._cheltuieli(randuri) for cod, randuri in cheltuieli.items()}
+                for apartament, cheltuieli in self._grupuri.items()}
+
+    def adauga_cheltuiala(self, apartament, tip, suma, zi):
+        """
+        Adaugă o cheltuială în depozit.
+
+        :return: Depozitul (pentru compatibilitate cu bussines.adauga_cheltuiala).
+        """
+        apartament, tip, suma, zi = _validare_inregistrare((apartament, tip, suma, zi))
+        self._adauga_rand(apartament, COD_TIP[tip], suma, zi)
+        return self
+
+    def adauga_cheltuieli_bulk(self, inregistrari):
+        """
+        Adaugă mai multe cheltuieli într-o singură trecere.
+
+        Rândurile sunt adăugate direct în coloane, iar indexurile primesc o singură notificare pentru tot lotul.
+
+        :param inregistrari: Iterabil de tupluri (apartament, tip, suma, zi).
+        :return: Tuplu (depozit, erori), unde erori este lista de (poziție, mesaj).
+        """
+        erori = []
+        apartamente, tipuri, sume, zile = self._apartament, self._tip, self._suma, self._zi
+        inceput = len(sume)
+        with fara_colector_ciclic():
+            try:
+                for pozitie, inregistrare in enumerate(inregistrari):
+                    try:
+                        apartament, tip, suma, zi = _validare_inregistrare(inregistrare)
+                    except ValueError as e:
+                        erori.append((pozitie, str(e)))
+                        continue
+                    cod = COD_TIP[tip]
+                    apartamente.append(apartament)
+                    tipuri.append(cod)
+                    sume.append(suma)
+                    zile.append(zi)
+                    self._grup(apartament, cod).append(len(sume) - 1)
+            finally:
+                adaugate = len(sume) - inceput
+                self._activ.frombytes(b"\x01" * adaugate)
+                self._numar_active += adaugate
+                if adaugate:
+                    self._notifica("randuri_noi", range(inceput, len(sume)))
+        return self, erori
+
+    def adauga_coloane(self, apartamente, coduri, sume, zile):
+        """
+        Adaugă cheltuieli deja validate, date pe coloane (de exemplu loturile din import_export.import_many).
+
+        :param apartamente: array('i') cu numerele apartamentelor.
+        :param coduri: array('B') cu codurile tipurilor (poziții în TIPURI_CHELTUIELI).
+        :param sume: array('d') cu sumele.
+        :param zile: array('i') cu zilele ordinale.
+        :return: Depozitul.
+        :raises: ValueError dacă coloanele nu au aceeași lungime.
+        """
+        if not len(apartamente) == len(coduri) == len(sume) == len(zile):
+            raise ValueError("Eroare: Coloanele adăugate trebuie să aibă aceeași lungime.")
+
+        inceput = len(self._suma)
+        self._apartament.extend(apartamente)
+        self._tip.extend(coduri)
+        self._suma.extend(sume)
+        self._zi.extend(zile)
+        self._activ.frombytes(b"\x01" * len(sume))
+        self._numar_active += len(sume)
+        with fara_colector_ciclic():
+            for rand, apartament, cod in zip(count(inceput), apartamente, coduri):
+                self._grup(apartament, cod).append(rand)
+            if len(sume):
+                self._notifica("randuri_noi", range(inceput, len(self._suma)))
+        return self
+
+    def itereaza_cheltuieli(self):
+        """
+        Parcurge cheltuielile în ordinea registrului, fără a construi dicționarul clasic.
+
+        :return: Generator de tupluri (apartament, tip, suma, zi).
+        """
+        sume, zile = self._suma, self._zi
+        for apartament, cheltuieli in self._grupuri.items():
+            for cod, randuri in cheltuieli.items():
+                tip = TIPURI_CHELTUIELI[cod]
+                for rand in randuri:
+                    yield apartament, tip, sume[rand], _format_zi(zile[rand])
+
+    def adauga_cheltuiala_id(self, apartament, tip, suma, zi):
+        """
+        Adaugă o cheltuială și întoarce identificatorul ei.
+
+        Identificatorul este numărul rândului, care nu se schimbă și nu este refolosit după ștergere.
+
+        :return: Identificatorul cheltuielii (int).
+        """
+        apartament, tip, suma, zi = _validare_inregistrare((apartament, tip, suma, zi))
+        return self._adauga_rand(apartament, COD_TIP[tip], suma, zi)
+
+    def _rand_activ(self, id_cheltuiala):
+        if not isinstance(id_cheltuiala, int) or not 0 <= id_cheltuiala < len(self._activ) \
+                or not self._activ[id_cheltuiala]:
+            raise ValueError("Eroare: Cheltuiala nu există în înregistrări.")
+        return id_cheltuiala
+
+    def cheltuiala(self, id_cheltuiala):
+        """
+        :param id_cheltuiala: Identificatorul cheltuielii.
+        :return: Tuplu (apartament, tip, suma, zi).
+        :raises: ValueError dacă cheltuiala nu există.
+        """
+        rand = self._rand_activ(id_cheltuiala)
+        return (self._apartament[rand], TIPURI_CHELTUIELI[self._tip[rand]], self._suma[rand],
+                _format_zi(self._zi[rand]))
+
+    def id_cheltuieli(self, apartament, tip):
+        """
+        :return: Identificatorii cheltuielilor unui apartament de un anumit tip, în ordinea listei.
+        """
+        return list(self._grupuri.get(apartament, {}).get(COD_TIP.get(tip), ()))
+
+    def modifica_cheltuiala_id(self, id_cheltuiala, suma_noua):
+        """
+        Modifică suma unei cheltuieli identificate direct, fără căutare.
+
+        :raises: ValueError dacă cheltuiala nu există sau suma nu este validă.
+        """
+        suma_noua = validare_suma(suma_noua)
+        self._modifica_suma(self._rand_activ(id_cheltuiala), suma_noua)
+        return self
+
+    def sterge_cheltuiala_id(self, id_cheltuiala):
+        """
+        Șterge o cheltuială identificată direct; lista ei rămâne în registru chiar dacă se golește.
+
+        :raises: ValueError dacă cheltuiala nu există.
+        """
+        rand = self._rand_activ(id_cheltuiala)
+        randuri = self._grupuri[self._apartament[rand]][self._tip[rand]]
+        del randuri[bisect_left(randuri, rand)]
+        self._dezactiveaza([rand])
+        return self
+
+    def modifica_cheltuieli_id(self, actualizari):
+        """
+        Aplică mai multe corecturi date prin identificator.
+
+        :param actualizari: Iterabil de tupluri (id_cheltuiala, suma_noua).
+        :return: Tuplu (depozit, erori), unde erori este lista de (poziție, mesaj).
+        """
+        erori = []
+        for pozitie, (id_cheltuiala, suma_noua) in enumerate(actualizari):
+            try:
+                self.modifica_cheltuiala_id(id_cheltuiala, suma_noua)
+            except ValueError as e:
+                erori.append((pozitie, str(e)))
+        return self, erori
+
+    def _cauta_dupa_suma(self, apartament, tip, suma_veche):
+        """
+        Identificatorul primei cheltuieli cu suma dată, căutat în indexul pe sume.
+
+        :return: Identificatorul, None dacă apartamentul nu are tipul cerut.
+        :raises: ValueError dacă suma veche nu este găsită.
+        """
+        cod = COD_TIP.get(tip)
+        if cod not in self._grupuri.get(apartament, {}):
+            return None
+
+        rand = self._index_sume.primul(cod, suma_veche, self._pozitie[apartament])
+        if rand is None:
+            raise ValueError('Eroare: Suma veche nu a fost găsită')
+        return rand
+
+    def modifica_cheltuiala(self, apartament, tip, suma_veche, suma_noua):
+        """
+        Modifică prima cheltuială cu suma veche dată.
+
+        :raises: ValueError dacă suma veche nu este găsită.
+        """
+        apartament, tip, suma_veche, suma_noua = validare_corectura((apartament, tip, suma_veche, suma_noua))
+
+        rand = self._cauta_dupa_suma(apartament, tip, suma_veche)
+        if rand is not None:
+            self._modifica_suma(rand, suma_noua)
+        return self
+
+    def modifica_cheltuieli(self, actualizari):
+        """
+        Aplică mai multe corecturi (apartament, tip, suma_veche, suma_noua), în ordine.
+
+        :return: Tuplu (depozit, erori), unde erori este lista de (poziție, mesaj).
+        """
+        erori = []
+        for pozitie, actualizare in enumerate(actualizari):
+            try:
+                self.modifica_cheltuiala(*validare_corectura(actualizare))
+            except ValueError as e:
+                erori.append((pozitie, str(e)))
+        return self, erori
+
+    def sterge_apartament(self, apartament):
+        """
+        Șterge toate cheltuielile unui apartament.
+
+        :raises: ValueError dacă apartamentul nu există.
+        """
+        apartament = validare_numar_apartament(apartament)
+
+        if apartament not in self._grupuri:
+            raise ValueError('Eroare: Apartamentul nu există în înregistrări.')
+
+        self._sterge_apartamente([apartament])
+        return self
+
+    def sterge_apartamente_consecutive(self, apartament_start, apartament_end):
+        """
+        Șterge apartamentele din intervalul [apartament_start, apartament_end].
+
+        Apartamentele sunt luate din indexul sortat, deci costul depinde de apartamentele existente în interval
+        (O(log n + k)), nu de lățimea intervalului.
+        """
+        apartament_start = validare_numar_apartament(apartament_start)
+        apartament_end = validare_numar_apartament(apartament_end)
+
+        self._sterge_apartamente(self._index_apartamente.intre(apartament_start, apartament_end))
+        return self
+
+    def sterge_cheltuieli_tip(self, tip):
+        """
+        Șterge cheltuielile de un anumit tip din toate apartamentele.
+        """
+        cod = COD_TIP[validare_tip_cheltuiala(tip)]
+
+        self._sterge_grupuri([(apartament, cod) for apartament in self._index_tip.apartamente(cod)])
+        return self
+
+    def elimina_cheltuiala(self, tip):
+        """
+        Elimină cheltuielile de un anumit tip din toate apartamentele.
+        """
+        return self.sterge_cheltuieli_tip(tip)
+
+    def elimina_cheltuieli_mai_mici_decat(self, suma_minima):
+        """
+        Elimină cheltuielile mai mici decât suma minima; listele golite rămân în registru.
+
+        Cheltuielile de eliminat sunt începutul fiecărui tip din indexul pe sume, așa că sunt tăiate dintr-o
+        singură bucată, fără a parcurge cheltuielile care rămân.
+        """
+        suma_minima = validare_suma(suma_minima)
+        eliminate = []
+        for cod in range(len(TIPURI_CHELTUIELI)):
+            randuri = self._index_sume.taie_sub(cod, suma_minima)
+
+            pe_apartament = {}
+            for rand in randuri:
+                pe_apartament.setdefault(self._apartament[rand], set()).add(rand)
+            for apartament, sterse in pe_apartament.items():
+                cheltuieli = self._grupuri[apartament]
+                cheltuieli[cod] = array("q", (rand for rand in cheltuieli[cod] if rand not in sterse))
+            eliminate.extend(randuri)
+
+        self._dezactiveaza(eliminate, sari_peste=self._index_sume)
+        return self
+
+    def _pozitie_de_la(self, de_la):
+        """
+        :return: Poziția apartamentului de la care continuă un raport (0 pentru de_la None).
+        :raises: ValueError dacă apartamentul nu (mai) există.
+        """
+        if de_la is None:
+            return 0
+        if de_la not in self._pozitie:
+            raise ValueError("Eroare: Apartamentul de la care continuă raportul nu mai există în registru.")
+        return self._pozitie[de_la]
+
+    def _grupuri_de_la(self, start):
+        """
+        Perechile (apartament, grupuri) ale registrului, începând cu apartamentul aflat pe poziția start.
+        """
+        perechi = iter(self._grupuri.items())
+        if start:
+            perechi = dropwhile(lambda pereche: self._pozitie[pereche[0]] < start, perechi)
+        return perechi
+
+    def cheltuieli_mai_mari_decat(self, suma, de_la=None):
+        """
+        Cheltuielile mai mari decât o sumă, ca tupluri (apartament, tip, suma) produse pe măsură ce sunt cerute.
+
+        Dacă indexul pe sume arată că puține cheltuieli trec de prag, rândurile lor sunt luate din index și
+        grupate pe apartamente la apel; altfel registrul este parcurs în ordine, deci primele rânduri sunt
+        disponibile imediat.
+        """
+        suma = validare_suma(suma)
+        start = self._pozitie_de_la(de_la)
+        numar = sum(self._index_sume.numar_mai_mari_decat(cod, suma) for cod in range(len(TIPURI_CHELTUIELI)))
+        if numar * PRAG_SELECTIVITATE >= self._numar_active:
+            return self._parcurge_mai_mari_decat(suma, start)
+
+        apartamente, pozitie = self._apartament, self._pozitie
+        randuri = sorted(rand for cod in range(len(TIPURI_CHELTUIELI))
+                         for rand in self._index_sume.mai_mari_decat(cod, suma) if pozitie[apartamente[rand]] >= start)
+        pe_apartament = self._pe_apartamente(randuri)
+        return ((apartament, TIPURI_CHELTUIELI[self._tip[rand]], self._suma[rand])
+                for apartament in sorted(pe_apartament, key=pozitie.__getitem__) for rand in pe_apartament[apartament])
+
+    def _parcurge_mai_mari_decat(self, suma, start):
+        sume = self._suma
+        for apartament, cheltuieli in self._grupuri_de_la(start):
+            for cod, randuri in cheltuieli.items():
+                for rand in randuri:
+                    if sume[rand] > suma:
+                        yield apartament, TIPURI_CHELTUIELI[cod], sume[rand]
+
+    def cheltuieli_de_tip(self, tip, de_la=None):
+        """
+        Apartamentele cu cheltuieli de un tip, luate din indexul pe tipuri; listele de cheltuieli sunt
+        construite doar pentru rândurile cerute.
+        """
+        tip = validare_tip_cheltuiala(tip)
+        cod = COD_TIP[tip]
+        start = self._pozitie_de_la(de_la)
+
+        apartamente = sorted((apartament for apartament in self._index_tip.apartamente(cod)
+                              if self._pozitie[apartament] >= start), key=self._pozitie.__getitem__)
+        return ((apartament, tip, self._cheltuieli(self._grupuri[apartament][cod])) for apartament in apartamente)
+
+    def cheltuieli_inainte_de_o_zi(self, suma, zi, de_la=None):
+        """
+        Cheltuielile efectuate înainte de o zi și mai mari decât o sumă, pe apartamente; ca la
+        cheltuieli_mai_mari_decat, indexul pe zile este folosit doar când puține cheltuieli sunt mai vechi.
+        """
+        suma = validare_suma(suma)
+        ordinal = parseaza_data(zi)
+        start = self._pozitie_de_la(de_la)
+        if self._index_zi.numar_inainte_de(ordinal) * PRAG_SELECTIVITATE >= self._numar_active:
+            return self._parcurge_inainte_de_o_zi(suma, ordinal, start)
+
+        sume = self._suma
+        randuri = sorted(rand for rand in self._index_zi.inainte_de(ordinal)
+                         if sume[rand] > suma and self._pozitie[self._apartament[rand]] >= start)
+        return self._randuri_inainte_de_o_zi(self._pe_apartamente(randuri), start)
+
+    def _parcurge_inainte_de_o_zi(self, suma, ordinal, start):
+        sume, zile = self._suma, self._zi
+        for apartament, cheltuieli in self._grupuri_de_la(start):
+            gasita = False
+            for cod, randuri in cheltuieli.items():
+                for rand in randuri:
+                    if sume[rand] > suma and zile[rand] < ordinal:
+                        yield apartament, TIPURI_CHELTUIELI[cod]
+                        gasita = True
+            if not gasita:
+                yield apartament, None
+
+    def _randuri_inainte_de_o_zi(self, pe_apartament, start):
+        for apartament, _ in self._grupuri_de_la(start):
+            randuri = pe_apartament.get(apartament)
+            if not randuri:
+                yield apartament, None
+                continue
+            for rand in randuri:
+                yield apartament, TIPURI_CHELTUIELI[self._tip[rand]]
+
+    def afiseaza_apartamente_cu_cheltuieli_mai_mari_decat(self, suma):
+        """
+        Returnează cheltuielile mai mari decât o anumită sumă, luate din indexul pe sume.
+        """
+        suma = validare_suma(suma)
+        rezultat = [formateaza_cheltuiala_mai_mare(*rand) for rand in self.cheltuieli_mai_mari_decat(suma)]
+
+        if not rezultat:
+            print(f"Nicio cheltuială depășește suma {suma}.")
+
+        return rezultat
+
+    def afiseaza_cheltuieli_tip(self, tip):
+        """
+        Returnează cheltuielile de un anumit tip pentru toate apartamentele.
+        """
+        return [formateaza_cheltuieli_de_tip(*rand) for rand in self.cheltuieli_de_tip(tip)]
+
+    def afiseaza_cheltuieli_inainte_de_o_zi(self, suma, zi):
+        """
+        Returnează cheltuielile efectuate înainte de o zi și mai mari decât o sumă, pe apartamente.
+        """
+        return [formateaza_cheltuiala_inainte_de_o_zi(apartament, tip, suma, zi)
+                for apartament, tip in self.cheltuieli_inainte_de_o_zi(suma, zi)]
+
+    def tipareste_apartamente_sortate_dupa_tip(self, tip):
+        """
+        Returnează cheltuielile de un anumit tip sortate după valoare sau None dacă nu există.
+
+        Ordinea vine direct din indexul pe sume; la sume egale se păstrează ordinea din registru.
+        """
+        try:
+            cod = COD_TIP[validare_tip_cheltuiala(tip)]
+        except ValueError as e:
+            print(e)
+            return None
+
+        return self._cheltuieli(self._index_sume.sortate(cod)) or None
+
+    def top_k(self, tip=None, apartament=None, k=10):
+        """
+        Cele mai mari k cheltuieli, ca tupluri (apartament, tip, suma, zi).
+
+        Pentru un apartament sunt comparate doar cheltuielile lui. Altfel candidații vin din heap-urile mărginite
+        ale tipurilor, O(k log k) pe tip; un k peste capacitatea lor citește capătul indexului pe sume.
+
+        :raises: ValueError dacă tipul, apartamentul sau k nu sunt valide.
+        """
+        cod = COD_TIP[validare_tip_cheltuiala(tip)] if tip is not None else None
+        if apartament is not None:
+            apartament = validare_numar_apartament(apartament)
+        k = validare_numar_rezultate(k)
+        coduri = range(len(TIPURI_CHELTUIELI)) if cod is None else (cod,)
+
+        if apartament is not None:
+            # Listele apartamentului sunt deja în ordinea registrului
+            randuri = [rand for cod_grup, randuri_grup in self._grupuri.get(apartament, {}).items()
+                       if cod_grup in coduri for rand in randuri_grup]
+        else:
+            if k <= self._index_maxime.CAPACITATE:
+                randuri = [rand for cod_tip in coduri for rand in self._index_maxime.maxime(self, cod_tip, k)]
+            else:
+                randuri = [rand for cod_tip in coduri for rand in self._index_sume.cele_mai_mari(cod_tip, k)]
+            randuri.sort(key=self._ordine_in_registru)
+
+        # nlargest este stabil, deci la sume egale rândurile rămân în ordinea registrului
+        return [(self._apartament[rand], TIPURI_CHELTUIELI[self._tip[rand]], self._suma[rand],
+                 _format_zi(self._zi[rand])) for rand in heapq.nlargest(k, randuri, key=self._suma.__getitem__)]
+
+    def _ordine_in_registru(self, rand):
+        apartament = self._apartament[rand]
+        return self._pozitie[apartament], list(self._grupuri[apartament]).index(self._tip[rand]), rand
+
+    def suma_cheltuieli_tip(self, tip):
+        """
+        Calculează suma cheltuielilor de un anumit tip; totalul este ținut la zi de indexul de totaluri (O(1)).
+        """
+        return self._index_totaluri.total(cod=COD_TIP[validare_tip_cheltuiala(tip)])[0]
+
+    def calculeaza_total_cheltuieli(self, numar_apartament):
+        """
+        Calculează totalul cheltuielilor unui apartament sau None dacă apartamentul nu există.
+
+        Totalul este ținut la zi de indexul de totaluri, deci citirea lui este O(1).
+        """
+        numar_apartament = validare_numar_apartament(numar_apartament)
+
+        if numar_apartament not in self._grupuri:
+            return None
+
+        return self._index_totaluri.total(apartament=numar_apartament)[0]
+
+    def totaluri(self, apartament=None, tip=None):
+        """
+        Totalul și numărul cheltuielilor pe apartament, pe tip, pe (apartament, tip) sau pentru tot registrul.
+
+        :param apartament: Numărul apartamentului sau None pentru toate apartamentele.
+        :param tip: Tipul cheltuielii sau None pentru toate tipurile.
+        :return: Tuplu (suma, număr de cheltuieli).
+        :raises: ValueError dacă apartamentul sau tipul nu sunt valide.
+        """
+        if apartament is not None:
+            apartament = validare_numar_apartament(apartament)
+        cod = COD_TIP[validare_tip_cheltuiala(tip)] if tip is not None else None
+        return self._index_totaluri.total(apartament, cod)
+
+    def totaluri_interval(self, apartament_start, apartament_end, tip=None):
+        """
+        Totalul și numărul cheltuielilor apartamentelor din intervalul [apartament_start, apartament_end].
+
+        Apartamentele sunt luate din indexul sortat, iar totalul fiecăruia din indexul de totaluri, deci costul
+        este O(log n + k) pentru k apartamente existente în interval.
+
+        :return: Tuplu (suma, număr de cheltuieli).
+        :raises: ValueError dacă apartamentele sau tipul nu sunt valide.
+        """
+        apartament_start = validare_numar_apartament(apartament_start)
+        apartament_end = validare_numar_apartament(apartament_end)
+        cod = COD_TIP[validare_tip_cheltuiala(tip)] if tip is not None else None
+
+        totaluri = [self._index_totaluri.total(apartament, cod)
+                    for apartament in self._index_apartamente.intre(apartament_start, apartament_end)]
+        return math.fsum(suma for suma, _ in totaluri), sum(numar for _, numar in totaluri)
+
+    def totaluri_perioada(self, apartament_start, apartament_end, luna_start=None, luna_end=None, tip=None):
+        """
+        Totalul și numărul cheltuielilor unui interval de apartamente într-o perioadă de luni.
+
+        Răspunsul vine din cubul pe luni: pentru fiecare (tip, lună) din perioadă, o diferență de sume prefix
+        pe apartamente, deci costul nu depinde de numărul de cheltuieli.
+
+        :return: Tuplu (suma, număr de cheltuieli).
+        :raises: ValueError dacă apartamentele, lunile sau tipul nu sunt valide.
+        """
+        apartament_start = validare_numar_apartament(apartament_start)
+        apartament_end = validare_numar_apartament(apartament_end)
+        inceput, sfarsit = validare_perioada(luna_start, luna_end)
+        cod = COD_TIP[validare_tip_cheltuiala(tip)] if tip is not None else None
+        return self._index_luni.total(apartament_start, apartament_end, inceput, sfarsit, cod)
+
+    def totaluri_pe_perioade(self, apartament_start, apartament_end, luna_start=None, luna_end=None, tip=None,
+                             pas="luna"):
+        """
+        Totalurile unui interval de apartamente pe fiecare lună sau an, din cubul pe luni.
+
+        :return: Dicționar {perioadă: sumă}, ordonat crescător.
+        :raises: ValueError dacă apartamentele, tipul sau pasul nu sunt valide.
+        """
+        apartament_start = validare_numar_apartament(apartament_start)
+        apartament_end = validare_numar_apartament(apartament_end)
+        inceput, sfarsit = validare_perioada(luna_start, luna_end)
+        cod = COD_TIP[validare_tip_cheltuiala(tip)] if tip is not None else None
+        pas = validare_pas(pas)
+
+        perioade = {}
+        for luna, (suma, _) in self._index_luni.pe_luni(apartament_start, apartament_end, inceput, sfarsit,
+                                                         cod).items():
+            perioade.setdefault(formateaza_luna(luna, pas), []).append(suma)
+        return {perioada: math.fsum(sume) for perioada, sume in perioade.items()}
+
+    def versiune(self, apartament=None, tip=None):
+        """
+        Versiunea datelor unui apartament și/sau tip; se schimbă la fiecare modificare care le atinge.
+
+        :param apartament: Numărul apartamentului sau None.
+        :param tip: Tipul cheltuielii sau None.
+        :return: Versiunea (int); fără argumente, versiunea întregului registru.
+        :raises: ValueError dacă tipul nu este valid.
+        """
+        cod = COD_TIP[validare_tip_cheltuiala(tip)] if tip is not None else None
+        return self._index_versiuni.versiune(apartament, cod)
+
+    def group_by(self, cheie, agregare="sum"):
+        """
+        Grupează cheltuielile după apartament, tip sau lună (yyyy-mm) și le agregă.
+
+        :param cheie: Cheia de grupare ('apartament', 'tip' sau 'luna').
+        :param agregare: Agregarea ('sum', 'count', 'mean' sau 'max').
+        :return: Dicționar {cheie: valoare}, ordonat crescător după cheie.
+        :raises: ValueError dacă cheia sau agregarea nu sunt valide.
+        """
+        cheie, agregare = validare_grupare(cheie, agregare)
+
+        if numpy is not None and len(self._activ):
+            return self._group_by_numpy(cheie, agregare)
+
+        coloana = self._apartament if cheie == "apartament" else self._tip if cheie == "tip" else self._zi
+        grupuri = {}
+        for rand in self._selecteaza():
+            valoare = _luna(coloana[rand]) if cheie == "luna" else coloana[rand]
+            grupuri.setdefault(valoare, []).append(self._suma[rand])
+
+        return self._chei_grupare(cheie, {valoare: agrega(sume, agregare) for valoare, sume in grupuri.items()})
+
+    def _group_by_numpy(self, cheie, agregare):
+        masca = self._vector(self._activ) == 1
+        sume = self._vector(self._suma)[masca]
+        coloana = self._apartament if cheie == "apartament" else self._tip if cheie == "tip" else self._zi
+        chei = self._vector(coloana)[masca]
+        if cheie == "luna":
+            zile, pozitii = numpy.unique(chei, return_inverse=True)
+            chei = numpy.array([_luna(ordinal) for ordinal in zile.tolist()])[pozitii]
+        valori, pozitii = numpy.unique(chei, return_inverse=True)
+
+        if agregare == "max":
+            rezultate = numpy.full(len(valori), -numpy.inf)
+            numpy.maximum.at(rezultate, pozitii, sume)
+        elif agregare == "count":
+            rezultate = numpy.bincount(pozitii, minlength=len(valori))
+        else:
+            rezultate = numpy.bincount(pozitii, weights=sume, minlength=len(valori))
+            if agregare == "mean":
+                rezultate = rezultate / numpy.bincount(pozitii, minlength=len(valori))
+
+        return self._chei_grupare(cheie, dict(zip(valori.tolist(), rezultate.tolist())))
+
+    @staticmethod
+    def _chei_grupare(cheie, rezultate):
+        """
+        Înlocuiește codurile de tip cu numele tipurilor și ordonează rezultatul după cheie.
+        """
+        if cheie == "tip":
+            return {TIPURI_CHELTUIELI[cod]: rezultate[cod] for cod in sorted(rezultate)}
+        return {valoare: rezultate[valoare] for valoare in sorted(rezultate)}
+
+
+def _verifica_paginare(depozit=ExpenseStore):
+    """
+    Parcurge pe pagini de diverse mărimi rapoartele pe apartamente și compară rândurile cu raportul întreg
+    pe dicționarul clasic.
+    """
+    apartamente = _registru_exemplu()
+    registru = depozit.din_dictionar(apartamente)
+    for raport, args in ((bussines.cheltuieli_mai_mari_decat, (30,)), (bussines.cheltuieli_de_tip, ("apa",)),
+                         (bussines.cheltuieli_inainte_de_o_zi, (30, "2023-10-30"))):
+        toate = list(raport(apartamente, *args))
+        assert list(raport(registru, *args)) == toate, f"{raport.__name__}{args}"
+        for limita in (1, 2, 5):
+            randuri, cursor = [], None
+            while True:
+                pagina, cursor = bussines.pagina_raport(registru, raport, *args, limita=limita, cursor=cursor)
+                randuri.extend(pagina)
+                if cursor is None:
+                    break
+            assert randuri == toate, f"{raport.__name__}{args}, limita {limita}: {randuri} != {toate}"
+
+
+def _registru_exemplu():
+    return {
+        1: {"apa": [(230.0, "2023-10-30"), (20.0, "2023-01-01")], "gaz": [(50.0, "2023-10-29")]},
+        2: {"apa": [(120.0, "2023-10-28")], "gaz": [(40.0, "2023-10-30")], "lumina": [(75.0, "2023-10-28")]},
+        5: {"lumina": [(15.0, "2023-09-01")]},
+    }
+
+
+def _verifica_paritate(nume_functie, *args, depozit=ExpenseStore):
+    """
+    Rulează aceeași funcție din bussines pe dicționarul clasic și pe un depozit (implicit ExpenseStore)
+    și compară rezultatele.
+    """
+    apartamente = _registru_exemplu()
+    store = depozit.din_dictionar(apartamente)
+    functie = getattr(bussines, nume_functie)
+
+    rezultate = []
+    for registru in (copy.deepcopy(apartamente), store):
+        try:
+            rezultat = functie(registru, *args)
+            if isinstance(rezultat, Iterator):
+                rezultat = list(rezultat)
+        except ValueError as e:
+            rezultat = ValueError(str(e))
+        # Registrele imuabile (registru_versionat) întorc o versiune nouă în locul registrului primit
+        if isinstance(rezultat, tuple) and rezultat and isinstance(rezultat[0], type(registru)):
+            # Funcțiile în bloc întorc (registru, erori)
+            rezultat = (rezultat[0] if isinstance(registru, dict) else rezultat[0].ca_dictionar(),) + rezultat[1:]
+        elif isinstance(rezultat, type(registru)):
+            rezultat = rezultat if isinstance(registru, dict) else rezultat.ca_dictionar()
+        rezultate.append(rezultat if not isinstance(rezultat, ValueError) else str(rezultat))
+
+    assert rezultate[0] == rezultate[1], f"{nume_functie}{args}: {rezultate[0]} != {rezultate[1]}"
+
+
+def test_din_dictionar_ca_dictionar():
+    apartamente = _registru_exemplu()
+    store = ExpenseStore.din_dictionar(apartamente)
+
+    assert store.ca_dictionar() == apartamente
+    assert len(store) == 7
+
+
+def test_adauga_cheltuiala_store(depozit=ExpenseStore):
+    store = depozit()
+
+    # Funcțiile din bussines acceptă depozitul în locul dicționarului
+    store = bussines.adauga_cheltuiala(store, 101, "apa", 50, "2023-11-02")
+    store, erori = bussines.adauga_cheltuieli_bulk(store, [(101, "gaz", 10, "2023-11-03"), (102, "x", 1, "")])
+
+    assert store.ca_dictionar() == {101: {"apa": [(50.0, "2023-11-02")], "gaz": [(10.0, "2023-11-03")]}}
+    assert [pozitie for pozitie, _ in erori] == [1]
+
+    try:
+        store.adauga_cheltuiala(101, "apa", 50, "2023-02-30")
+        assert False
+    except ValueError:
+        assert len(store) == 2
+
+
+def test_apartament_in_afara_coloanei():
+    store, erori = ExpenseStore().adauga_cheltuieli_bulk([(1, "apa", 10, "2023-11-01"),
+                                                          (3_000_000_000, "apa", 20, "2023-11-02"),
+                                                          (2, "gaz", 30, "2023-11-03")])
+
+    # Înregistrarea care nu încape în coloană este o eroare obișnuită, iar restul lotului este adăugat
+    assert [pozitie for pozitie, _ in erori] == [1] and erori[0][1].startswith("Eroare")
+    assert store.ca_dictionar() == {1: {"apa": [(10.0, "2023-11-01")]}, 2: {"gaz": [(30.0, "2023-11-03")]}}
+    for adauga in (store.adauga_cheltuiala, store.adauga_cheltuiala_id):
+        try:
+            adauga(-2 ** 31 - 1, "apa", 1, "2023-11-01")
+            assert False
+        except ValueError:
+            assert len(store) == 2
+    store.verifica_indexuri()
+
+
+def test_cheltuieli_dupa_id(depozit=ExpenseStore):
+    store = depozit()
+    id_apa = store.adauga_cheltuiala_id(7, "apa", 100, "2023-10-30")
+    id_gaz = store.adauga_cheltuiala_id(7, "gaz", 50, "2023-10-29")
+    id_apa_2 = store.adauga_cheltuiala_id(7, "apa", 100, "2023-11-30")
+
+    assert store.cheltuiala(id_gaz) == (7, "gaz", 50.0, "2023-10-29")
+    assert store.id_cheltuieli(7, "apa") == [id_apa, id_apa_2]
+
+    # Modificarea după id nu depinde de suma veche, deci nu e ambiguă la sume egale
+    store.modifica_cheltuiala_id(id_apa_2, 120)
+    assert store.ca_dictionar()[7]["apa"] == [(100.0, "2023-10-30"), (120.0, "2023-11-30")]
+
+    store.sterge_cheltuiala_id(id_apa)
+    assert store.ca_dictionar() == {7: {"apa": [(120.0, "2023-11-30")], "gaz": [(50.0, "2023-10-29")]}}
+    assert store.adauga_cheltuiala_id(7, "apa", 1, "2023-12-01") not in (id_apa, id_gaz, id_apa_2)
+
+    for operatie in (lambda: store.cheltuiala(id_apa), lambda: store.sterge_cheltuiala_id(id_apa),
+                     lambda: store.modifica_cheltuiala_id(99, 1)):
+        try:
+            operatie()
+            assert False
+        except ValueError:
+            assert True
+
+    _, erori = store.modifica_cheltuieli_id([(id_gaz, 55), (id_apa, 1)])
+    assert store.cheltuiala(id_gaz)[2] == 55.0
+    assert [pozitie for pozitie, _ in erori] == [1]
+    store.verifica_indexuri()
+
+
+def test_exporta_din_stare():
+    store = ExpenseStore.din_dictionar(_registru_exemplu())
+    id_nou = store.adauga_cheltuiala_id(9, "gaz", 42, "2023-05-05")
+    store.sterge_apartament(2)
+    store.elimina_cheltuieli_mai_mici_decat(30)
+
+    copie = ExpenseStore.din_stare(store.exporta_stare())
+
+    assert copie.ca_dictionar() == store.ca_dictionar()
+    assert copie.cheltuiala(id_nou) == store.cheltuiala(id_nou)
+    assert copie.tipareste_apartamente_sortate_dupa_tip("apa") == store.tipareste_apartamente_sortate_dupa_tip("apa")
+    copie.verifica_indexuri()
+
+
+def test_paritate_cu_dictionarul(depozit=ExpenseStore):
+    _verifica_paritate("modifica_cheltuiala", 1, "apa", 20, 25, depozit=depozit)
+    _verifica_paritate("modifica_cheltuiala", 1, "apa", 999, 25, depozit=depozit)
+    _verifica_paritate("modifica_cheltuiala", 3, "apa", 20, 25, depozit=depozit)
+    _verifica_paritate("modifica_cheltuieli", [(1, "apa", 20, 230), (1, "apa", 230, 5), (2, "gaz", 41, 1),
+                                               (2, "gaz", "x", 1), (9, "apa", 1, 2)], depozit=depozit)
+    _verifica_paritate("sterge_apartament", 2, depozit=depozit)
+    _verifica_paritate("sterge_apartament", 3, depozit=depozit)
+    _verifica_paritate("sterge_apartamente_consecutive", 1, 2, depozit=depozit)
+    _verifica_paritate("sterge_cheltuieli_tip", "lumina", depozit=depozit)
+    _verifica_paritate("elimina_cheltuiala", "apa", depozit=depozit)
+    _verifica_paritate("elimina_cheltuieli_mai_mici_decat", 45, depozit=depozit)
+    # Sumele sunt validate la fel în toate registrele: șirurile numerice sunt acceptate, cele negative nu
+    for suma in ("45", -1, "abc", "nan"):
+        _verifica_paritate("elimina_cheltuieli_mai_mici_decat", suma, depozit=depozit)
+        _verifica_paritate("cheltuieli_inainte_de_o_zi", suma, "2023-10-30", depozit=depozit)
+        _verifica_paritate("afiseaza_cheltuieli_inainte_de_o_zi", suma, "2023-10-30", depozit=depozit)
+    _verifica_paritate("afiseaza_apartamente_cu_cheltuieli_mai_mari_decat", 60, depozit=depozit)
+    _verifica_paritate("afiseaza_apartamente_cu_cheltuieli_mai_mari_decat", 1000, depozit=depozit)
+    _verifica_paritate("afiseaza_cheltuieli_tip", "apa", depozit=depozit)
+    _verifica_paritate("afiseaza_cheltuieli_inainte_de_o_zi", 30, "2023-10-30", depozit=depozit)
+    _verifica_paritate("tipareste_apartamente_sortate_dupa_tip", "apa", depozit=depozit)
+    _verifica_paritate("tipareste_apartamente_sortate_dupa_tip", "internet", depozit=depozit)
+    _verifica_paritate("suma_cheltuieli_tip", "apa", depozit=depozit)
+    _verifica_paritate("calculeaza_total_cheltuieli", 2, depozit=depozit)
+    _verifica_paritate("calculeaza_total_cheltuieli", 3, depozit=depozit)
+    _verifica_paritate("totaluri_interval", 1, 4, depozit=depozit)
+    _verifica_paritate("totaluri_interval", 2, 10 ** 9, "lumina", depozit=depozit)
+    _verifica_paritate("totaluri_interval", 3, 4, depozit=depozit)
+    _verifica_paritate("top_k", depozit=depozit)
+    _verifica_paritate("top_k", "apa", None, 2, depozit=depozit)
+    _verifica_paritate("top_k", None, 1, 2, depozit=depozit)
+    _verifica_paritate("top_k", "gaz", 9, depozit=depozit)
+    _verifica_paritate("top_k", None, None, 0, depozit=depozit)
+    _verifica_paritate("totaluri_perioada", 1, 4, "2023-10", "2023-10", depozit=depozit)
+    _verifica_paritate("totaluri_perioada", 1, 10 ** 9, None, "2023-06", "apa", depozit=depozit)
+    _verifica_paritate("totaluri_perioada", 1, 4, "2023-13", depozit=depozit)
+    _verifica_paritate("totaluri_pe_perioade", 1, 4, depozit=depozit)
+    _verifica_paritate("totaluri_pe_perioade", 2, 10 ** 9, None, None, "gaz", "an", depozit=depozit)
+    _verifica_paritate("totaluri_pe_perioade", 1, 4, "2023-06", "2023-10", depozit=depozit)
+    _verifica_paritate("totaluri_pe_perioade", 1, 4, None, None, None, "zi", depozit=depozit)
+    _verifica_paritate("sterge_apartamente_consecutive", 2, 10 ** 9, depozit=depozit)
+
+    registru = depozit.din_dictionar(_registru_exemplu())
+    assert list(bussines.itereaza_cheltuieli(registru)) == list(bussines.itereaza_cheltuieli(_registru_exemplu()))
+    _verifica_paginare(depozit)
+
+
+def test_group_by_store(depozit=ExpenseStore):
+    for cheie in ("apartament", "tip", "luna"):
+        for agregare in ("sum", "count", "mean", "max"):
+            _verifica_paritate("group_by", cheie, agregare, depozit=depozit)
+    _verifica_paritate("group_by", "an", "sum", depozit=depozit)
+
+    assert depozit().group_by("tip") == {}
+
+
+def test_totaluri():
+    store = ExpenseStore.din_dictionar(_registru_exemplu())
+
+    assert store.totaluri() == (550.0, 7)
+    assert store.totaluri(apartament=1) == (300.0, 3)
+    assert store.totaluri(tip="apa") == (370.0, 3)
+    assert store.totaluri(apartament=2, tip="gaz") == (40.0, 1)
+    assert store.totaluri(apartament=7) == (0.0, 0)
+
+    store.modifica_cheltuiala(1, "apa", 20, 25)
+    store.sterge_cheltuieli_tip("lumina")
+    store.elimina_cheltuieli_mai_mici_decat(45)
+    assert store.totaluri() == (400.0, 3)
+    assert store.totaluri(apartament=5) == (0.0, 0)
+    assert store.calculeaza_total_cheltuieli(5) == 0
+    store.verifica_indexuri()
+
+    # Sumele care nu se reprezintă exact nu lasă derivă după adăugări și ștergeri repetate
+    for _ in range(1000):
+        id_cheltuiala = store.adauga_cheltuiala_id(9, "gaz", 0.1, "2023-01-01")
+        store.modifica_cheltuiala_id(id_cheltuiala, 0.7)
+        store.sterge_cheltuiala_id(id_cheltuiala)
+    assert store.totaluri(tip="gaz") == (50.0, 1)
+    assert store.totaluri(apartament=9) == (0.0, 0)
+    store.verifica_indexuri()
+
+
+def test_versiuni(depozit=ExpenseStore):
+    store = depozit.din_dictionar(_registru_exemplu())
+    inainte = {tip: store.versiune(tip=tip) for tip in TIPURI_CHELTUIELI}
+    registru = store.versiune()
+
+    store.modifica_cheltuiala(1, "apa", 20, 25)
+    assert store.versiune(tip="apa") > inainte["apa"]
+    assert store.versiune(tip="gaz") == inainte["gaz"] and store.versiune(tip="lumina") == inainte["lumina"]
+    assert store.versiune(apartament=1) > store.versiune(apartament=2)
+    assert store.versiune() > registru
+
+    versiune_gaz = store.versiune(tip="gaz")
+    store.sterge_apartament(2)
+    assert store.versiune(tip="gaz") > versiune_gaz
+    store.adauga_cheltuiala(9, "lumina", 5, "2023-01-01")
+    assert store.versiune(apartament=9) == store.versiune(tip="lumina") == store.versiune()
+
+
+def _aplica(apartamente, store, nume_functie, *args):
+    """
+    Aplică aceeași operație pe dicționar și pe depozit și verifică faptul că rezultatele coincid.
+
+    :return: Tuplu (dicționarul actualizat, depozitul actualizat).
+    """
+    functie = getattr(bussines, nume_functie)
+    rezultate = []
+    for registru in (apartamente, store):
+        try:
+            rezultat = functie(registru, *args)
+        except ValueError as e:
+            rezultat = str(e)
+        if isinstance(rezultat, type(registru)):
+            # Unele funcții clasice întorc o copie, iar registrele imuabile o versiune nouă
+            if registru is apartamente:
+                apartamente = rezultat
+            else:
+                store = rezultat
+            rezultat = None
+        rezultate.append(rezultat)
+
+    assert rezultate[0] == rezultate[1], f"{nume_functie}{args}: {rezultate[0]} != {rezultate[1]}"
+    return apartamente, store
+
+
+def test_mutatii_amestecate(depozit=ExpenseStore):
+    rng = random.Random(2023)
+    apartamente = {}
+    store = depozit()
+
+    def zi_aleatoare():
+        return f"2023-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+
+    for _ in range(1500):
+        operatie = rng.random()
+        apartament = rng.randint(1, 25)
+        tip = rng.choice(TIPURI_CHELTUIELI)
+
+        if operatie < 0.45:
+            apartamente, store = _aplica(apartamente, store, "adauga_cheltuiala", apartament, tip,
+                                         float(rng.randint(1, 100)), zi_aleatoare())
+        elif operatie < 0.55:
+            sume = [suma for suma, _ in apartamente.get(apartament, {}).get(tip, [])] or [1.0]
+            apartamente, store = _aplica(apartamente, store, "modifica_cheltuiala", apartament, tip,
+                                         rng.choice(sume), float(rng.randint(1, 100)))
+        elif operatie < 0.62:
+            apartamente, store = _aplica(apartamente, store, "sterge_apartament", apartament)
+        elif operatie < 0.66:
+            apartamente, store = _aplica(apartamente, store, "sterge_apartamente_consecutive", apartament,
+                                         apartament + rng.choice((0, 3, 10 ** 9)))
+        elif operatie < 0.70:
+            apartamente, store = _aplica(apartamente, store, "sterge_cheltuieli_tip", tip)
+        elif operatie < 0.73:
+            apartamente, store = _aplica(apartamente, store, "elimina_cheltuiala", tip)
+        elif operatie < 0.78:
+            apartamente, store = _aplica(apartamente, store, "elimina_cheltuieli_mai_mici_decat", rng.randint(1, 40))
+        elif operatie < 0.83:
+            inregistrari = [(rng.randint(1, 25), rng.choice(TIPURI_CHELTUIELI), float(rng.randint(1, 100)),
+                             zi_aleatoare()) for _ in range(rng.randint(1, 60))]
+            bussines.adauga_cheltuieli_bulk(apartamente, inregistrari)
+            store, _ = bussines.adauga_cheltuieli_bulk(store, inregistrari)
+        else:
+            _aplica(apartamente, store, "afiseaza_cheltuieli_tip", tip)
+            _aplica(apartamente, store, "afiseaza_cheltuieli_inainte_de_o_zi", rng.randint(1, 100), zi_aleatoare())
+            _aplica(apartamente, store, "tipareste_apartamente_sortate_dupa_tip", tip)
+            _aplica(apartamente, store, "suma_cheltuieli_tip", tip)
+            _aplica(apartamente, store, "calculeaza_total_cheltuieli", apartament)
+            _aplica(apartamente, store, "top_k", rng.choice((None, tip)), rng.choice((None, apartament)),
+                    rng.choice((1, 5, 150)))
+            _aplica(apartamente, store, "totaluri_interval", apartament, apartament + 5)
+            _aplica(apartamente, store, "totaluri_interval", apartament, apartament + 5, tip)
+            luna = rng.randint(1, 12)
+            _aplica(apartamente, store, "totaluri_perioada", apartament, apartament + 5, f"2023-{luna:02d}",
+                    f"2023-{rng.randint(luna, 12):02d}", rng.choice((None, tip)))
+            # Seria este un dicționar, pe care _aplica l-ar lua drept registrul întors de o modificare
+            argumente = (apartament, apartament + 5, f"2023-{luna:02d}", None, rng.choice((None, tip)),
+                         rng.choice(bussines.PASI_PERIOADA))
+            assert bussines.totaluri_pe_perioade(apartamente, *argumente) == \
+                bussines.totaluri_pe_perioade(store, *argumente)
+
+        store.verifica_indexuri()
+        assert store.ca_dictionar() == apartamente
+
+
+def test_top_k_heapuri():
+    # Heap-uri mici, ca ștergerile și corecturile să atingă des rădăcina și să forțeze refaceri
+    rng = random.Random(25)
+    apartamente = {}
+    store = ExpenseStore()
+    store._index_maxime.CAPACITATE = 3
+    for pas in range(600):
+        apartament, tip = rng.randint(1, 12), rng.choice(TIPURI_CHELTUIELI)
+        operatie = rng.random()
+        if operatie < 0.6:
+            inregistrare = (apartament, tip, float(rng.randint(1, 30)), f"2023-{rng.randint(1, 12):02d}-01")
+            bussines.adauga_cheltuieli_bulk(apartamente, [inregistrare])
+            bussines.adauga_cheltuieli_bulk(store, [inregistrare])
+        elif operatie < 0.8:
+            sume = [suma for suma, _ in apartamente.get(apartament, {}).get(tip, [])] or [1.0]
+            apartamente, store = _aplica(apartamente, store, "modifica_cheltuiala", apartament, tip,
+                                         rng.choice(sume), float(rng.randint(1, 30)))
+        elif operatie < 0.9:
+            apartamente, store = _aplica(apartamente, store, "sterge_apartament", apartament)
+        else:
+            apartamente, store = _aplica(apartamente, store, "elimina_cheltuieli_mai_mici_decat", rng.randint(1, 8))
+
+        for k in (1, 3, 7):
+            _aplica(apartamente, store, "top_k", rng.choice((None, tip)), None, k)
+        if pas % 50 == 0:
+            store.verifica_indexuri()
+
+
+def test_rapoarte_pe_apartamente_selectivitate():
+    # Pragurile mici parcurg registrul în ordine, cele mari folosesc indexurile; rândurile trebuie să coincidă
+    rng = random.Random(23)
+    inregistrari = [(rng.randint(1, 60), rng.choice(TIPURI_CHELTUIELI), rng.randint(1, 1000),
+                     f"2023-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}") for _ in range(2000)]
+    apartamente, _ = bussines.adauga_cheltuieli_bulk({}, inregistrari)
+    store = ExpenseStore.din_dictionar(apartamente)
+    de_la = list(apartamente)[30]
+
+    for suma in (0, 500, 950, 999, 10 ** 6):
+        for start in (None, de_la):
+            assert list(store.cheltuieli_mai_mari_decat(suma, start)) == \
+                list(bussines.cheltuieli_mai_mari_decat(apartamente, suma, start))
+            for zi in ("2023-01-05", "2023-02-01", "2023-12-01"):
+                assert list(store.cheltuieli_inainte_de_o_zi(suma, zi, start)) == \
+                    list(bussines.cheltuieli_inainte_de_o_zi(apartamente, suma, zi, start))
+
+
+def test_reduceri_fara_numpy():
+    global numpy
+    numpy_original = numpy
+    numpy = None
+    try:
+        test_paritate_cu_dictionarul()
+        test_group_by_store()
+    finally:
+        numpy = numpy_original
+
+
+if __name__ == "__main__":
+    test_din_dictionar_ca_dictionar()
+    test_adauga_cheltuiala_store()
+    test_apartament_in_afara_coloanei()
+    test_cheltuieli_dupa_id()
+    test_exporta_din_stare()
+    test_paritate_cu_dictionarul()
+    test_group_by_store()
+    test_totaluri()
+    test_versiuni()
+    test_mutatii_amestecate()
+    test_top_k_heapuri()
+    test_rapoarte_pe_apartamente_selectivitate()
+    test_reduceri_fara_numpy()
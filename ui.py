@@ -1,25 +1,79 @@
-from bussines import (adauga_cheltuiala, modifica_cheltuiala, sterge_apartament, sterge_apartamente_consecutive,
-                      sterge_cheltuieli_tip, afiseaza_apartamente_cu_cheltuieli_mai_mari_decat,
-                      afiseaza_cheltuieli_tip, afiseaza_cheltuieli_inainte_de_o_zi,
+import sys
+
+from bussines import (adauga_cheltuieli_bulk, modifica_cheltuiala, sterge_apartament, sterge_apartamente_consecutive,
+                      sterge_cheltuieli_tip, cheltuieli_mai_mari_decat, cheltuieli_de_tip, cheltuieli_inainte_de_o_zi,
+                      formateaza_cheltuiala_mai_mare, formateaza_cheltuieli_de_tip,
+                      formateaza_cheltuiala_inainte_de_o_zi, itereaza_cheltuieli,
                       tipareste_apartamente_sortate_dupa_tip, suma_cheltuieli_tip,
-                      calculeaza_total_cheltuieli, elimina_cheltuiala, elimina_cheltuieli_mai_mici_decat)
+                      calculeaza_total_cheltuieli, elimina_cheltuiala, elimina_cheltuieli_mai_mici_decat,
+                      totaluri_interval, totaluri_perioada, totaluri_pe_perioade, top_k, formateaza_cheltuiala)
+from import_export import importa, exporta
+from instrumentare import amprenta_registru, formateaza_amprenta, formateaza_raport, instrumentare_activa
+from registru_versionat import RegistruVersionat, Istoric
+from store import ExpenseStore
+
+
+LINII_PE_BLOC = 1000
+
+
+def scrie_linii(linii):
+    """
+    Scrie liniile pe măsură ce sunt produse, câte LINII_PE_BLOC într-o singură scriere.
+
+    :param linii: Iterabil de linii (fără caracterul de linie nouă).
+    :return: Numărul de linii scrise.
+    """
+    numar = 0
+    bloc = []
+    for linie in linii:
+        bloc.append(linie)
+        if len(bloc) == LINII_PE_BLOC:
+            sys.stdout.write("\n".join(bloc) + "\n")
+            numar += len(bloc)
+            bloc.clear()
+    if bloc:
+        sys.stdout.write("\n".join(bloc) + "\n")
+        numar += len(bloc)
+    return numar
+
+
+def _linii_apartamente(apartamente):
+    if isinstance(apartamente, dict):
+        for apartament, cheltuieli in apartamente.items():
+            for tip, lista_cheltuieli in cheltuieli.items():
+                yield f"Apartamentul {apartament} | Tip cheltuială: {tip}"
+                for suma, data in lista_cheltuieli:
+                    yield f"  - Suma: {suma}, Data: {data}"
+        return
+
+    grup = None
+    for apartament, tip, suma, data in itereaza_cheltuieli(apartamente):
+        if (apartament, tip) != grup:
+            grup = apartament, tip
+            yield f"Apartamentul {apartament} | Tip cheltuială: {tip}"
+        yield f"  - Suma: {suma}, Data: {data}"
 
 
 def afiseaza_apartamente(apartamente):
     """
-    Afiseaza apartamentele existenye
-    :param apartamente: Dicționarul care conține datele despre apartamente.
+    Afiseaza apartamentele existente
+    :param apartamente: Dicționarul care conține datele despre apartamente sau un depozit (ExpenseStore, SqliteStore).
     """
     print("Apartamente disponibile:")
-    for apartament_tip, cheltuieli in apartamente.items():
-        apartament, tip = apartament_tip
-        print(f"Apartamentul {apartament} | Tip cheltuială: {tip}")
-        for suma, data in cheltuieli:
-            print(f"  - Suma: {suma}, Data: {data}")
+    scrie_linii(_linii_apartamente(apartamente))
 
 
-def main():
-    apartamente = {}
+def main(apartamente=None):
+    """
+    Meniul interactiv.
+    :param apartamente: Registrul folosit: dicționarul clasic sau un depozit cu aceleași metode (implicit un
+        ExpenseStore gol, care nu este salvat pe disc).
+    :return: Registrul la ieșirea din meniu.
+    """
+    if apartamente is None:
+        apartamente = ExpenseStore()
+    # Anularea și refacerea au nevoie de versiuni imuabile; celelalte registre sunt modificate pe loc
+    istoric = Istoric(apartamente) if isinstance(apartamente, RegistruVersionat) else None
 
     print("Menu:")
     print("1. Adaugă cheltuială")
@@ -35,7 +89,16 @@ def main():
     print("11. Tipareste suma cheltuielilor pentur un apartament")
     print("12. Elimina chelutieli de un tip")
     print("13. Elimină toate cheltuielile mai mici decât o sumă dată")
+    print("14. Total cheltuieli pentru un interval de apartamente (etaj, scară)")
     print("15. Afisare apartamentele existente")
+    print("17. Importă cheltuieli dintr-un fișier CSV/JSONL")
+    print("18. Exportă cheltuielile într-un fișier CSV/JSONL")
+    print("19. Statistici cache rapoarte")
+    print("20. Anulează ultima operație")
+    print("21. Reface operația anulată")
+    print("22. Statistici de performanță și memoria registrului")
+    print("23. Totaluri pe luni sau ani pentru un interval de apartamente")
+    print("24. Cele mai mari cheltuieli (pe tip și/sau apartament)")
     print("16. Ieși din aplicație")
 
     while True:
@@ -44,14 +107,19 @@ def main():
         if optiune == "1":
             try:
                 apartament = int(input("Număr apartament: "))
+                inregistrari = []
                 while True:
                     tip = input("Tip cheltuială (apa, gaz, lumina sau 'stop' pentru a încheia): ")
                     if tip == "stop":
                         break
-                    suma = float(input("Suma cheltuielii: "))
+                    suma = input("Suma cheltuielii: ")
                     zi = input("Data cheltuielii (format: yyyy-mm-dd): ")
-                    apartamente = adauga_cheltuiala(apartamente, apartament, tip, suma, zi)
-            except AssertionError as e:
+                    inregistrari.append((apartament, tip, suma, zi))
+
+                apartamente, erori = adauga_cheltuieli_bulk(apartamente, inregistrari)
+                for pozitie, mesaj in erori:
+                    print(f"Cheltuiala {pozitie + 1}: {mesaj}")
+            except ValueError as e:
                 print(str(e))
 
         elif optiune == "2":
@@ -61,7 +129,7 @@ def main():
                 suma_veche = float(input("Suma cheltuielii veche: "))
                 suma_noua = float(input("Suma cheltuielii nouă: "))
 
-                modifica_cheltuiala(apartamente, apartament, tip, suma_veche, suma_noua)
+                apartamente = modifica_cheltuiala(apartamente, apartament, tip, suma_veche, suma_noua)
 
             except ValueError as e:
                 print(str(e))
@@ -69,7 +137,7 @@ def main():
         elif optiune == "3":
             try:
                 apartament = int(input("Număr apartament: "))
-                sterge_apartament(apartamente, apartament)
+                apartamente = sterge_apartament(apartamente, apartament)
 
             except ValueError as e:
                 print(e)
@@ -78,7 +146,7 @@ def main():
             try:
                 apartament_start = int(input("Primul apartament: "))
                 apartament_end = int(input("Ultimul apartament: "))
-                sterge_apartamente_consecutive(apartamente, apartament_start, apartament_end)
+                apartamente = sterge_apartamente_consecutive(apartamente, apartament_start, apartament_end)
 
             except ValueError as e:
                 print(e)
@@ -86,14 +154,16 @@ def main():
         elif optiune == "5":
             try:
                 tip = input("Tip cheltuială (apa, gaz, lumina): ")
-                sterge_cheltuieli_tip(apartamente, tip)
+                apartamente = sterge_cheltuieli_tip(apartamente, tip)
             except ValueError as e:
                 print(e)
 
         elif optiune == "6":
             try:
                 suma = float(input("Suma minimă: "))
-                afiseaza_apartamente_cu_cheltuieli_mai_mari_decat(apartamente, suma)
+                randuri = cheltuieli_mai_mari_decat(apartamente, suma)
+                if not scrie_linii(formateaza_cheltuiala_mai_mare(*rand) for rand in randuri):
+                    print(f"Nicio cheltuială depășește suma {suma}.")
 
             except ValueError as e:
                 print(e)
@@ -101,9 +171,7 @@ def main():
         elif optiune == "7":
             try:
                 tip = input("Tip cheltuială (apa, gaz, lumina): ")
-                rezultat = afiseaza_cheltuieli_tip(apartamente, tip)
-                for linie in rezultat:
-                    print(linie)
+                scrie_linii(formateaza_cheltuieli_de_tip(*rand) for rand in cheltuieli_de_tip(apartamente, tip))
             except ValueError as e:
                 print(e)
 
@@ -111,9 +179,8 @@ def main():
             try:
                 suma = int(input("Suma minimă: "))
                 zi = input("Data (format: yyyy-mm-dd): ")
-                rezultat8 = afiseaza_cheltuieli_inainte_de_o_zi(apartamente, suma, zi)
-                for linie in rezultat8:
-                    print(linie)
+                scrie_linii(formateaza_cheltuiala_inainte_de_o_zi(apartament, tip, suma, zi)
+                            for apartament, tip in cheltuieli_inainte_de_o_zi(apartamente, suma, zi))
             except ValueError as e:
                 print(e)
         elif optiune == "9":
@@ -137,9 +204,9 @@ def main():
                 if not rezultat:
                     print(f"Niciun apartament nu are cheltuieli de tipul '{tip}'.")
                 else:
-                    for apartament, cheltuieli in rezultat:
-                        print(
-                            f"Apartamentul {apartament}: Cheltuieli de tip '{tip}': {cheltuieli.get(tip, [])}")
+                    print(f"Cheltuieli de tip '{tip}', sortate după sumă:")
+                    for suma, data in rezultat:
+                        print(f"  - Suma: {suma}, Data: {data}")
 
             except ValueError as e:
                 print(e)
@@ -159,7 +226,7 @@ def main():
         elif optiune == "12":
             try:
                 tip = input("Tip cheltuială (apa, gaz, lumina): ")
-                elimina_cheltuiala(apartamente, tip)
+                apartamente = elimina_cheltuiala(apartamente, tip)
 
             except ValueError as e:
                 print(e)
@@ -167,14 +234,101 @@ def main():
         elif optiune == "13":
             try:
                 suma_minima = float(input("Suma minimă pentru eliminare: "))
-                elimina_cheltuieli_mai_mici_decat(apartamente, suma_minima)
+                apartamente = elimina_cheltuieli_mai_mici_decat(apartamente, suma_minima)
 
             except ValueError as e:
                 print(e)
 
+        elif optiune == "14":
+            try:
+                apartament_start = int(input("Primul apartament din interval: "))
+                apartament_end = int(input("Ultimul apartament din interval: "))
+                tip = input("Tip cheltuială (apa, gaz, lumina sau gol pentru toate): ") or None
+
+                total, numar = totaluri_interval(apartamente, apartament_start, apartament_end, tip)
+                print(f"Apartamentele {apartament_start}-{apartament_end}: {numar} cheltuieli, total {total}")
+            except ValueError as e:
+                print(e)
+
         elif optiune == "15":
             afiseaza_apartamente(apartamente)
+        elif optiune == "17":
+            try:
+                cale = input("Fișierul de importat: ")
+                cale_respinse = input("Fișierul pentru rândurile respinse (gol pentru a nu le salva): ") or None
+                apartamente, statistici = importa(apartamente, cale, cale_respinse=cale_respinse,
+                                                  progres=lambda progres: print(f"  ... {progres['citite']} rânduri"))
+                print(f"Importate: {statistici['importate']}, respinse: {statistici['respinse']}.")
+            except (ValueError, OSError) as e:
+                print(e)
+        elif optiune == "18":
+            try:
+                cale = input("Fișierul în care se exportă: ")
+                print(f"Exportate: {exporta(apartamente, cale)} cheltuieli.")
+            except (ValueError, OSError) as e:
+                print(e)
+        elif optiune == "19":
+            if hasattr(apartamente, "statistici"):
+                statistici = apartamente.statistici()
+                print(f"Rapoarte din cache: {statistici['gasite']}, recalculate: {statistici['ratate']}, "
+                      f"intrări: {statistici['intrari']}/{statistici['marime']}.")
+            else:
+                print("Registrul nu folosește cache pentru rapoarte.")
+        elif optiune in ("20", "21"):
+            if istoric is None:
+                print("Registrul nu păstrează versiuni; porniți aplicația cu --backend versionat.")
+                continue
+            try:
+                apartamente = istoric.anuleaza() if optiune == "20" else istoric.reface()
+            except ValueError as e:
+                print(e)
+        elif optiune == "22":
+            instrumentare = instrumentare_activa()
+            if instrumentare is None:
+                print("Operațiile nu sunt măsurate; porniți aplicația cu --profile.")
+                continue
+            for linie in formateaza_raport(instrumentare.raport()):
+                print(linie)
+            for linie in formateaza_amprenta(amprenta_registru(apartamente)):
+                print(linie)
+        elif optiune == "23":
+            try:
+                apartament_start = int(input("Primul apartament din interval: "))
+                apartament_end = int(input("Ultimul apartament din interval: "))
+                tip = input("Tip cheltuială (apa, gaz, lumina sau gol pentru toate): ") or None
+                luna_start = input("Prima lună (yyyy-mm sau gol pentru început): ") or None
+                luna_end = input("Ultima lună (yyyy-mm sau gol pentru sfârșit): ") or None
+                pas = input("Totaluri pe 'luna' sau pe 'an' (gol pentru luna): ") or "luna"
+
+                perioade = totaluri_pe_perioade(apartamente, apartament_start, apartament_end, luna_start, luna_end,
+                                                tip, pas)
+                total, numar = totaluri_perioada(apartamente, apartament_start, apartament_end, luna_start, luna_end,
+                                                 tip)
+                for perioada, suma in perioade.items():
+                    print(f"  {perioada}: {suma}")
+                print(f"Apartamentele {apartament_start}-{apartament_end}: {numar} cheltuieli, total {total}")
+            except ValueError as e:
+                print(e)
+        elif optiune == "24":
+            try:
+                tip = input("Tip cheltuială (apa, gaz, lumina sau gol pentru toate): ") or None
+                apartament = input("Număr apartament (gol pentru toate): ")
+                apartament = int(apartament) if apartament else None
+                k = int(input("Câte cheltuieli (gol pentru 10): ") or 10)
+
+                maxime = top_k(apartamente, tip, apartament, k)
+                if not maxime:
+                    print("Nu există cheltuieli pentru criteriile date.")
+                for rand in maxime:
+                    print(formateaza_cheltuiala(*rand))
+            except ValueError as e:
+                print(e)
         elif optiune == "16":
             break
         else:
             print("Opțiune invalidă. Încearcă din nou.")
+
+        if istoric is not None:
+            istoric.inregistreaza(apartamente)
+
+    return apartamente